@@ -776,3 +776,29 @@ class LogToBufferHandler(LogToXmlHandler):
         pass # do nothing -- overrides LogToXmlHandler's flush
     
 
+
+class LogToJsonStreamHandler(LogHandlerWithXml):
+    """
+    .. class:: LogToJsonStreamHandler()
+    
+    A log handler that writes each log entry, as it is logged, as a line of JSON ({"log": entry}) to a binary stream,
+    such as the socket of a daemon job's client.  When there is no stream (or it has been closed by its reader) entries
+    are printed to standard error.
+    """
+    def __init__(self):
+        super(LogToJsonStreamHandler, self).__init__()
+        self.stream = None
+        
+    def writeJson(self, obj):
+        if self.stream is not None:
+            try:
+                self.stream.write((json.dumps(obj, ensure_ascii=False, default=str) + "\n").encode("utf-8"))
+                self.stream.flush()
+                return True
+            except (EnvironmentError, ValueError): # client has gone away, continue without it
+                self.stream = None
+        return False
+        
+    def emit(self, logRecord):
+        if not self.writeJson({"log": self.recordToJson(logRecord)}):
+            print(self.format(logRecord), file=sys.stderr)
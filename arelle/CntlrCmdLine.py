@@ -12,10 +12,7 @@ from arelle import PythonUtil # define 2.x or 3.x string types
 import gettext, time, datetime, os, shlex, sys, traceback, fnmatch, threading, json, logging
 from optparse import OptionParser, SUPPRESS_HELP
 import re
-from arelle import (Cntlr, FileSource, ModelDocument, RenderingEvaluator, XmlUtil, XbrlConst, Version, 
-                    ViewFileDTS, ViewFileFactList, ViewFileFactTable, ViewFileConcepts, 
-                    ViewFileFormulae, ViewFileRelationshipSet, ViewFileTests, ViewFileRssFeed,
-                    ViewFileRoleTypes,
+from arelle import (Cntlr, FileSource, ModelDocument, XmlUtil, XbrlConst, Version, 
                     ModelManager)
 from arelle.ModelValue import qname
 from arelle.Locale import format_string
@@ -107,6 +104,11 @@ def parseAndRun(args):
     parser.add_option("--calcDeduplicate", action="store_true", dest="calcDeduplicate",
                       help=_("Specify de-duplication of consistent facts when performing calculation validation, chooses most accurate fact."))
     parser.add_option("--calcdeduplicate", action="store_true", dest="calcDeduplicate", help=SUPPRESS_HELP)
+    parser.add_option("--textBlockWorkers", type="int", action="store", dest="textBlockWorkers",
+                      help=_("Number of worker processes to parse and check the html of text block facts "
+                             "in disclosure system validation, for filings with many large text blocks "
+                             "(default is to check them in the main process)."))
+    parser.add_option("--textblockworkers", type="int", action="store", dest="textBlockWorkers", help=SUPPRESS_HELP)
     parser.add_option("--efm", action="store_true", dest="validateEFM",
                       help=_("Select Edgar Filer Manual (U.S. SEC) disclosure system validation (strict)."))
     parser.add_option("--gfm", action="store", dest="disclosureSystemName", help=SUPPRESS_HELP)
@@ -124,6 +126,10 @@ def parseAndRun(args):
     parser.add_option("--utrurl", action="store", dest="utrUrl", help=SUPPRESS_HELP)
     parser.add_option("--infoset", action="store_true", dest="infosetValidate",
                       help=_("Select validation with respect testcase infosets."))
+    parser.add_option("--compareInstance", action="store", dest="compareInstanceFile",
+                      help=_("FILENAME is an expected instance to compare to the loaded instance's facts "
+                             "(e.g., extracted inline XBRL facts), reporting missing, value mismatched and extra facts."))
+    parser.add_option("--compareinstance", action="store", dest="compareInstanceFile", help=SUPPRESS_HELP)
     parser.add_option("--labelLang", action="store", dest="labelLang",
                       help=_("Language for labels in following file options (override system settings)"))
     parser.add_option("--labellang", action="store", dest="labelLang", help=SUPPRESS_HELP)
@@ -219,6 +225,12 @@ def parseAndRun(args):
     parser.add_option("--parameters", action="store", dest="parameters", help=_("Specify parameters for formula and validation (name=value[,name=value])."))
     parser.add_option("--parameterSeparator", action="store", dest="parameterSeparator", help=_("Specify parameters separator string (if other than comma)."))
     parser.add_option("--parameterseparator", action="store", dest="parameterSeparator", help=SUPPRESS_HELP)
+    parser.add_option("--formulaInputInstances", action="store", dest="formulaInputInstances", 
+                      help=_("Specify named formula input instances, name=file[|file...][,name=file...], where name is the "
+                             "(prefixed or clark notation) name of a formula instance resource, e.g., prior=q1.xbrl|q2.xbrl.  "
+                             "The instances are loaded with the DTS of the entry point instance (which they must share), "
+                             "so their schemas and linkbases are not loaded again. "))
+    parser.add_option("--formulainputinstances", action="store", dest="formulaInputInstances", help=SUPPRESS_HELP)
     parser.add_option("--formula", choices=("validate", "run", "none"), dest="formulaAction", 
                       help=_("Specify formula action: "
                              "validate - validate only, without running, "
@@ -243,6 +255,11 @@ def parseAndRun(args):
     parser.add_option("--formulavarsetexprresult", action="store_true", dest="formulaVarSetExprResult", help=SUPPRESS_HELP)
     parser.add_option("--formulaVarSetTiming", action="store_true", dest="timeVariableSetEvaluation", help=_("Specify showing times of variable set evaluation."))
     parser.add_option("--formulavarsettiming", action="store_true", dest="timeVariableSetEvaluation", help=SUPPRESS_HELP)
+    parser.add_option("--formulaProfileReport", action="store", dest="formulaProfileReport",
+                      help=_("Profile formula execution and save a report ranked by variable set cost, "
+                             "with filter, implicit filter, evaluation and XPath function statistics. "
+                             "The report is CSV if the file name ends in .csv, otherwise JSON."))
+    parser.add_option("--formulaprofilereport", action="store", dest="formulaProfileReport", help=SUPPRESS_HELP)
     parser.add_option("--formulaAsserResultCounts", action="store_true", dest="formulaAsserResultCounts", help=_("Specify formula tracing."))
     parser.add_option("--formulaasserresultcounts", action="store_true", dest="formulaAsserResultCounts", help=SUPPRESS_HELP)
     parser.add_option("--formulaSatisfiedAsser", action="store_true", dest="formulaSatisfiedAsser", help=_("Specify formula tracing."))
@@ -274,6 +291,10 @@ def parseAndRun(args):
     parser.add_option("--formularunids", action="store", dest="formulaRunIDs", help=SUPPRESS_HELP)
     parser.add_option("--formulaCompileOnly", action="store_true", dest="formulaCompileOnly", help=_("Specify formula are to be compiled but not executed."))
     parser.add_option("--formulacompileonly", action="store_true", dest="formulaCompileOnly", help=SUPPRESS_HELP)
+    parser.add_option("--formulaCompareGrammarParser", action="store_true", dest="formulaCompareGrammarParser",
+                      help=_("Also parse formula XPath expressions with the prior pyparsing grammar, warning where its "
+                             "result differs from the XPath parser's, and reporting the time of each in profile statistics."))
+    parser.add_option("--formulacomparegrammarparser", action="store_true", dest="formulaCompareGrammarParser", help=SUPPRESS_HELP)
     parser.add_option("--uiLang", action="store", dest="uiLang",
                       help=_("Language for user interface (override system settings, such as program messages).  Does not save setting."))
     parser.add_option("--uilang", action="store", dest="uiLang", help=SUPPRESS_HELP)
@@ -327,30 +348,30 @@ def parseAndRun(args):
     parser.add_option("--showEnvironment", action="store_true", dest="showEnvironment", help=_("Show Arelle's config and cache directory and host OS environment parameters."))
     parser.add_option("--showenvironment", action="store_true", dest="showEnvironment", help=SUPPRESS_HELP)
     parser.add_option("--collectProfileStats", action="store_true", dest="collectProfileStats", help=_("Collect profile statistics, such as timing of validation activities and formulae."))
+    parser.add_option("--traceSpans", action="store", dest="traceSpansFile",
+                      help=_("Save nested timing spans of loading (each document's parse and discovery), validation phases, "
+                             "formula variable sets, table rendering and database storage, with attributes such as document url "
+                             "and fact counts, to the file. "
+                             "A .json file is saved as Chrome trace event json (for chrome://tracing or Perfetto), "
+                             "other files as folded stacks (in microseconds) for flame graph tools."))
+    parser.add_option("--tracespans", action="store", dest="traceSpansFile", help=SUPPRESS_HELP)
     if hasWebServer:
         parser.add_option("--webserver", action="store", dest="webserver",
                           help=_("start web server on host:port[:server] for REST and web access, e.g., --webserver locahost:8080, "
                                  "or specify nondefault a server name, such as cherrypy, --webserver locahost:8080:cherrypy. "
                                  "(It is possible to specify options to be defaults for the web server, such as disclosureSystem and validations, but not including file names.) "))
+    parser.add_option("--daemon", action="store", dest="daemon",
+                      help=_("Start a resident validation daemon which accepts jobs (command line arguments) from local clients, "
+                             "on a unix domain socket path or a localhost:port TCP address, e.g., --daemon /tmp/arelle.sock. "
+                             "Log entries of each job are streamed back to its client.  Plug-ins specified with the daemon "
+                             "remain loaded for all jobs, and are the only plug-ins a job may specify; options of a job only apply to that job.  "
+                             "DTSes of job instances remain loaded, for later instances with the same schemaRefs.  "
+                             "Submit jobs with python -m arelle.CntlrDaemon address [options].  "
+                             "(There is no client authentication, so only a socket file or a loopback host is accepted.) "))
     pluginOptionsIndex = len(parser.option_list)
 
     # install any dynamic plugins so their command line options can be parsed if present
-    for i, arg in enumerate(args):
-        if arg.startswith('--plugin'): # allow singular or plural (option must simply be non-ambiguous
-            if len(arg) > 9 and arg[9] == '=':
-                preloadPlugins = arg[10:]
-            elif i < len(args) - 1:
-                preloadPlugins = args[i+1]
-            else:
-                preloadPlugins = ""
-            for pluginCmd in preloadPlugins.split('|'):
-                cmd = pluginCmd.strip()
-                if cmd not in ("show", "temp") and len(cmd) > 0 and cmd[0] not in ('-', '~', '+'):
-                    moduleInfo = PluginManager.addPluginModule(cmd)
-                    if moduleInfo:
-                        cntlr.preloadedPlugins[cmd] = moduleInfo
-                        PluginManager.reset()
-            break
+    preloadPlugins(cntlr, args)
     # add plug-in options
     for optionsExtender in pluginClassMethods("CntlrCmdLine.Options"):
         optionsExtender(parser)
@@ -417,6 +438,18 @@ def parseAndRun(args):
             print(text)
         except UnicodeEncodeError:
             print(text.encode("ascii", "replace").decode("ascii"))
+    elif options.daemon:
+        # daemon jobs provide file operations
+        if leftoverArgs or options.entrypointFile or (hasWebServer and options.webserver):
+            parser.error(_("incorrect arguments with --daemon, please try\n  python CntlrCmdLine.py --help"))
+        else:
+            cntlr.startLogging(logHandler=Cntlr.LogToJsonStreamHandler(),
+                               logLevel=(options.logLevel or "DEBUG"),
+                               logTextMaxLength=options.logTextMaxLength,
+                               logRefObjectProperties=options.logRefObjectProperties)
+            cntlr.logHandler.setFormatter(Cntlr.LogFormatter(options.logFormat or "[%(messageCode)s] %(message)s - %(file)s"))
+            from arelle import CntlrDaemon
+            CntlrDaemon.startDaemon(cntlr, options, parser)
     elif len(leftoverArgs) != 0 and (not hasWebServer or options.webserver is None):
         parser.error(_("unrecognized arguments: {}").format(', '.join(leftoverArgs)))
     elif (options.entrypointFile is None and 
@@ -453,6 +486,38 @@ def parseAndRun(args):
         
         return cntlr
     
+def pluginArgCommands(args):
+    """Plug-in commands (modules, or +, - or ~ configuration changes) of a --plugins argument of args, before parsing them
+    
+    :returns: [str] -- stripped non-empty commands, other than show and temp
+    """
+    for i, arg in enumerate(args):
+        if arg.startswith('--plugin'): # allow singular or plural (option must simply be non-ambiguous
+            if len(arg) > 9 and arg[9] == '=':
+                pluginCmds = arg[10:]
+            elif i < len(args) - 1:
+                pluginCmds = args[i+1]
+            else:
+                pluginCmds = ""
+            return [cmd for cmd in (pluginCmd.strip() for pluginCmd in pluginCmds.split('|'))
+                    if len(cmd) > 0 and cmd not in ("show", "temp")]
+    return []
+
+def preloadPlugins(cntlr, args):
+    """Loads plug-ins named by a --plugins argument of args (before parsing them), so their command line options can be parsed
+    
+    :returns: bool -- True if any plug-in was loaded which had not been preloaded
+    """
+    loadedPlugins = False
+    for cmd in pluginArgCommands(args):
+        if cmd[0] not in ('-', '~', '+') and cmd not in cntlr.preloadedPlugins:
+            moduleInfo = PluginManager.addPluginModule(cmd)
+            if moduleInfo:
+                cntlr.preloadedPlugins[cmd] = moduleInfo
+                PluginManager.reset()
+                loadedPlugins = True
+    return loadedPlugins
+
 class ParserForDynamicPlugins:
     def __init__(self, options):
         self.options = options
@@ -714,6 +779,8 @@ class CntlrCmdLine(Cntlr.Cntlr):
             self.modelManager.validateCalcLB = True
         if options.calcDeduplicate:
             self.modelManager.validateDedupCalcs = True
+        if options.textBlockWorkers is not None:
+            self.modelManager.textBlockWorkers = options.textBlockWorkers
         if options.utrValidate:
             self.modelManager.validateUtr = True
         if options.infosetValidate:
@@ -722,6 +789,9 @@ class CntlrCmdLine(Cntlr.Cntlr):
             self.modelManager.abortOnMajorError = True
         if options.collectProfileStats:
             self.modelManager.collectProfileStats = True
+        if options.traceSpansFile:
+            from arelle.Tracer import Tracer
+            self.modelManager.tracer = Tracer()
         if options.outputAttribution:
             self.modelManager.outputAttribution = options.outputAttribution
         if options.internetConnectivity == "offline":
@@ -776,6 +846,8 @@ class CntlrCmdLine(Cntlr.Cntlr):
             fo.traceVariableExpressionResult = True
         if options.timeVariableSetEvaluation:
             fo.timeVariableSetEvaluation = True
+        if options.formulaProfileReport:
+            fo.profileReportFile = options.formulaProfileReport
         if options.formulaVarFilterWinnowing:
             fo.traceVariableFilterWinnowing = True
         if options.formulaVarFiltersResult:
@@ -784,6 +856,8 @@ class CntlrCmdLine(Cntlr.Cntlr):
             fo.traceVariableFiltersResult = True
         if options.testcaseResultsCaptureWarnings:
             fo.testcaseResultsCaptureWarnings = True
+        if options.formulaCompareGrammarParser:
+            fo.compareGrammarParser = True
         if options.formulaRunIDs:
             fo.runIDs = options.formulaRunIDs   
         if options.formulaCompileOnly:
@@ -882,6 +956,7 @@ class CntlrCmdLine(Cntlr.Cntlr):
             firstStartedAt = startedAt = time.time()
             modelDiffReport = None
             modelXbrl = None
+            formulaInputInstances = []
             try:
                 if filesource:
                     modelXbrl = self.modelManager.load(filesource, _("views loading"), entrypoint=_entrypoint)
@@ -902,6 +977,7 @@ class CntlrCmdLine(Cntlr.Cntlr):
                                             (loadTime, timeNow)), 
                                             messageCode="info", file=self.entrypointFile)
                 if modelXbrl.hasTableRendering:
+                    from arelle import RenderingEvaluator
                     RenderingEvaluator.init(modelXbrl)
                 if options.importFiles:
                     for importFile in options.importFiles.split("|"):
@@ -917,6 +993,30 @@ class CntlrCmdLine(Cntlr.Cntlr):
                         modelXbrl.profileStat(_("import"), loadTime)
                     if modelXbrl.errors:
                         success = False    # loading errors, don't attempt to utilize loaded DTS
+                if options.formulaInputInstances and (modelXbrl.errors or not success):
+                    self.addToLog(_("Formula input instances not loaded, loading of the entry point has errors"),
+                                  messageCode="arelle:formulaInputInstancesNotLoaded", file=self.entrypointFile, level=logging.WARNING)
+                    success = False
+                elif options.formulaInputInstances:
+                    from arelle import ModelXbrl
+                    startedAt = time.time()
+                    for param in options.formulaInputInstances.split(options.parameterSeparator or ','):
+                        instanceName, sep, instanceFiles = param.partition('=')
+                        namedInstances = []
+                        for instanceFile in instanceFiles.split('|'):
+                            namedInstance = ModelXbrl.loadSharingDts(modelXbrl, instanceFile.strip(), _("loading formula input instance"))
+                            formulaInputInstances.append(namedInstance)
+                            if namedInstance.modelDocument is None:
+                                success = False
+                            else:
+                                namedInstances.append(namedInstance)
+                        fo.parameterValues[instanceName.strip()] = (None, namedInstances) # value is a sequence of instances
+                    loadTime = time.time() - startedAt
+                    modelXbrl.profileStat(_("load formula input instances"), loadTime)
+                    self.addToLog(format_string(self.modelManager.locale, 
+                                                _("%d formula input instances loaded in %.2f secs"), 
+                                                (len(formulaInputInstances), loadTime)), 
+                                                messageCode="info", file=self.entrypointFile)
                 if modelXbrl.modelDocument.type in ModelDocument.Type.TESTCASETYPES:
                     for pluginXbrlMethod in pluginClassMethods("Testcases.Start"):
                         pluginXbrlMethod(self, options, modelXbrl)
@@ -983,7 +1083,8 @@ class CntlrCmdLine(Cntlr.Cntlr):
                             ValidateXbrlDimensions.loadDimensionDefaults(modelXbrl)
                         # setup fresh parameters from formula optoins
                         modelXbrl.parameters = fo.typedParameters(modelXbrl.prefixedNamespaces)
-                        ValidateFormula.validate(modelXbrl, compileOnly=(options.formulaAction != "run"))
+                        with modelXbrl.traceSpan("formula", "formula", url=modelXbrl.uri):
+                            ValidateFormula.validate(modelXbrl, compileOnly=(options.formulaAction != "run"))
                         self.addToLog(format_string(self.modelManager.locale, 
                                                     _("formula validation and execution in %.2f secs")
                                                     if options.formulaAction == "run"
@@ -992,37 +1093,69 @@ class CntlrCmdLine(Cntlr.Cntlr):
                                                     messageCode="info", file=self.entrypointFile)
                         
     
+                    if options.compareInstanceFile:
+                        from arelle import FactMatcher, ModelXbrl
+                        startedAt = time.time()
+                        expectedInstance = ModelXbrl.load(self.modelManager, options.compareInstanceFile,
+                                                          _("loading comparison instance"))
+                        if expectedInstance.modelDocument is None:
+                            modelXbrl.error("arelle:compareInstanceNotLoaded",
+                                            _("Comparison instance not loaded: %(file)s"),
+                                            modelObject=modelXbrl, file=options.compareInstanceFile)
+                        else:
+                            FactMatcher.logInstanceDiff(modelXbrl, 
+                                                        FactMatcher.compareInstances(expectedInstance, modelXbrl),
+                                                        os.path.basename(options.compareInstanceFile))
+                        expectedInstance.close()
+                        modelXbrl.profileStat(_("compare instance"), time.time() - startedAt)
+    
+                    # view modules are imported when their view is requested (not at startup)
                     if options.testReport:
+                        from arelle import ViewFileTests
                         ViewFileTests.viewTests(self.modelManager.modelXbrl, options.testReport, options.testReportCols)
                         
                     if options.rssReport:
+                        from arelle import ViewFileRssFeed
                         ViewFileRssFeed.viewRssFeed(self.modelManager.modelXbrl, options.rssReport, options.rssReportCols)
                         
                     if options.DTSFile:
+                        from arelle import ViewFileDTS
                         ViewFileDTS.viewDTS(modelXbrl, options.DTSFile)
                     if options.factsFile:
+                        from arelle import ViewFileFactList
                         ViewFileFactList.viewFacts(modelXbrl, options.factsFile, labelrole=options.labelRole, lang=options.labelLang, cols=options.factListCols)
                     if options.factTableFile:
+                        from arelle import ViewFileFactTable
                         ViewFileFactTable.viewFacts(modelXbrl, options.factTableFile, labelrole=options.labelRole, lang=options.labelLang)
                     if options.conceptsFile:
+                        from arelle import ViewFileConcepts
                         ViewFileConcepts.viewConcepts(modelXbrl, options.conceptsFile, labelrole=options.labelRole, lang=options.labelLang)
                     if options.preFile:
+                        from arelle import ViewFileRelationshipSet
                         ViewFileRelationshipSet.viewRelationshipSet(modelXbrl, options.preFile, "Presentation Linkbase", XbrlConst.parentChild, labelrole=options.labelRole, lang=options.labelLang)
                     if options.tableFile:
+                        from arelle import ViewFileRelationshipSet
                         ViewFileRelationshipSet.viewRelationshipSet(modelXbrl, options.tableFile, "Table Linkbase", "Table-rendering", labelrole=options.labelRole, lang=options.labelLang)
                     if options.calFile:
+                        from arelle import ViewFileRelationshipSet
                         ViewFileRelationshipSet.viewRelationshipSet(modelXbrl, options.calFile, "Calculation Linkbase", XbrlConst.summationItem, labelrole=options.labelRole, lang=options.labelLang)
                     if options.dimFile:
+                        from arelle import ViewFileRelationshipSet
                         ViewFileRelationshipSet.viewRelationshipSet(modelXbrl, options.dimFile, "Dimensions", "XBRL-dimensions", labelrole=options.labelRole, lang=options.labelLang)
                     if options.anchFile:
+                        from arelle import ViewFileRelationshipSet
                         ViewFileRelationshipSet.viewRelationshipSet(modelXbrl, options.anchFile, "Anchoring", XbrlConst.widerNarrower, labelrole=options.labelRole, lang=options.labelLang, cols=options.relationshipCols)
                     if options.formulaeFile:
+                        from arelle import ViewFileFormulae
                         ViewFileFormulae.viewFormulae(modelXbrl, options.formulaeFile, "Formulae", lang=options.labelLang)
                     if options.viewArcrole and options.viewFile:
+                        from arelle import ViewFileRelationshipSet
                         ViewFileRelationshipSet.viewRelationshipSet(modelXbrl, options.viewFile, os.path.basename(options.viewArcrole), options.viewArcrole, labelrole=options.labelRole, lang=options.labelLang)
                     if options.roleTypesFile:
+                        from arelle import ViewFileRoleTypes
                         ViewFileRoleTypes.viewRoleTypes(modelXbrl, options.roleTypesFile, "Role Types", isArcrole=False, lang=options.labelLang)
                     if options.arcroleTypesFile:
+                        from arelle import ViewFileRoleTypes
                         ViewFileRoleTypes.viewRoleTypes(modelXbrl, options.arcroleTypesFile, "Arcrole Types", isArcrole=True, lang=options.labelLang)
                     for pluginXbrlMethod in pluginClassMethods("CntlrCmdLine.Xbrl.Run"):
                         pluginXbrlMethod(self, options, modelXbrl, _entrypoint, responseZipStream=responseZipStream)
@@ -1046,6 +1179,8 @@ class CntlrCmdLine(Cntlr.Cntlr):
                 if options.collectProfileStats and modelXbrl:
                     modelXbrl.logProfileStats()
                 if not options.keepOpen:
+                    for namedInstance in formulaInputInstances: # share DTS of modelXbrl, close first
+                        namedInstance.close()
                     if modelDiffReport:
                         self.modelManager.close(modelDiffReport)
                     elif modelXbrl:
@@ -1056,6 +1191,16 @@ class CntlrCmdLine(Cntlr.Cntlr):
                     pluginXbrlMethod(self, options, filesource, _entrypointFiles, sourceZipStream=sourceZipStream, responseZipStream=responseZipStream)
             for pluginXbrlMethod in pluginClassMethods("CntlrCmdLine.Filing.End"):
                 pluginXbrlMethod(self, options, filesource, _entrypointFiles, sourceZipStream=sourceZipStream, responseZipStream=responseZipStream)
+        if options.traceSpansFile and self.modelManager.tracer is not None:
+            try:
+                spanCount = self.modelManager.tracer.save(options.traceSpansFile)
+                self.addToLog(_("Trace of {0} spans saved to {1}").format(spanCount, options.traceSpansFile),
+                              messageCode="info", file=options.traceSpansFile)
+            except (IOError, EnvironmentError) as err:
+                self.addToLog(_("Trace spans file {0} error: {1}").format(options.traceSpansFile, err),
+                              messageCode="arelle:traceSpansFileError", level=logging.ERROR)
+            self.modelManager.tracer.close()
+            self.modelManager.tracer = None
         self.username = self.password = None #dereference password
 
         if options.statusPipe and getattr(self, "statusPipe", None) is not None:
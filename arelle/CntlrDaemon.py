@@ -0,0 +1,399 @@
+'''
+Created on Oct 19, 2026
+
+Use this module to run Arelle as a resident validation daemon, or as its client.
+
+The daemon keeps one command line controller (with its plug-ins, disclosure system, web cache and
+imported formula modules) resident, and accepts jobs from local clients on a unix domain socket
+(accessible only by its user) or a loopback (localhost) TCP port; jobs are not authenticated, so
+the daemon does not listen on other hosts.  A job is a list of command line arguments, as for
+arelleCmdLine; jobs are run one at a time by CntlrCmdLine.run, and their log entries are streamed
+back to the client.  Options of a job do not carry over to later jobs.  Jobs may only name plug-ins
+which are resident (specified by the daemon's own --plugins), so a job can neither load other modules
+(which would run their code in the daemon) nor change the plug-in configuration (+, - or ~ commands).
+
+The DTSes of the instances of jobs are kept resident (up to MAX_RESIDENT_DTSES of them): a later
+instance with the same schemaRefs is loaded sharing the already discovered schemas and linkbases
+(see ModelXbrl.loadSharingDts), including their formula and table linkbase resources, whose
+expressions, once compiled by a job, are not compiled again.  A resident DTS is discarded when any
+of its files has been modified, or when a job logs warnings or errors on its shared objects.
+
+Protocol (lines of utf-8 JSON, one request per connection):
+   client: {"args": [command line arguments], "cwd": client working directory}
+           or {"command": "shutdown"}
+   daemon: {"log": log entry (as in json log files)} for each entry logged by the job, then
+           {"result": {"success": true|false, "time": seconds}}
+
+Client usage:
+   python -m arelle.CntlrDaemon address [arelleCmdLine options]
+   python -m arelle.CntlrDaemon address --shutdown
+
+@author: Arelle contributors
+(c) Copyright 2026 Arelle contributors, licensed under the Apache License, Version 2.0 (see License.txt).
+'''
+import os, sys, json, logging, socket, time, copy, ipaddress
+from collections import OrderedDict
+from arelle import PluginManager, XbrlConst
+
+# model manager options set by CntlrCmdLine.run, restored to the daemon's values after each job
+MODEL_MANAGER_OPTIONS = ("validateDisclosureSystem", "validateCalcLB", "validateInferDecimals", "validateDedupCalcs",
+                         "textBlockWorkers", "validateInfoset", "validateUtr", "skipDTS", "skipLoading",
+                         "abortOnMajorError", "collectProfileStats", "tracer", "outputAttribution")
+WEB_CACHE_OPTIONS = ("workOffline", "timeout", "logDownloads", "noCertificateCheck")
+LOGGER_OPTIONS = ("messageLevelFilter", "messageCodeFilter")
+MAX_RESIDENT_DTSES = 4 # least recently used DTSes are closed when more are loaded
+
+def isUnixSocketAddress(address):
+    # a file path, e.g., /tmp/arelle.sock, vs host:port
+    return hasattr(socket, "AF_UNIX") and (os.sep in address or "/" in address or ":" not in address)
+
+def socketAddress(address):
+    if isUnixSocketAddress(address):
+        return socket.AF_UNIX, address
+    host, sep, port = address.rpartition(":")
+    return socket.AF_INET, (host or "localhost", int(port))
+
+def isLoopbackHost(host):
+    try:
+        return ipaddress.ip_address(socket.gethostbyname(host)).is_loopback
+    except (socket.error, ValueError):
+        return False
+
+def writeJson(stream, obj):
+    stream.write((json.dumps(obj, ensure_ascii=False, default=str) + "\n").encode("utf-8"))
+    stream.flush()
+
+def startDaemon(_cntlr, options, parser):
+    """Called once from main program in CntlrCmdLine to run the daemon at the address of the *daemon* option,
+    until a client requests shutdown (or the process is interrupted).
+
+    :param options: OptionParser options from parse_args of main argv arguments
+    :type options: optparse.Values
+    :param parser: OptionParser of main argv arguments, used to parse the arguments of each job
+    :type parser: optparse.OptionParser
+    """
+    cntlr = _cntlr
+    cntlr.logger.logRefObjectProperties = options.logRefObjectProperties
+    try:
+        family, address = socketAddress(options.daemon)
+    except ValueError:
+        parser.error(_("--daemon {0} is neither a socket file path nor host:port").format(options.daemon))
+    isUnixSocket = family == getattr(socket, "AF_UNIX", None)
+    if not isUnixSocket and not isLoopbackHost(address[0]):
+        # jobs are not authenticated, only local clients may connect
+        parser.error(_("--daemon {0} host must be a loopback address, such as localhost").format(options.daemon))
+    if isUnixSocket and os.path.exists(address):
+        os.unlink(address) # prior daemon's socket file
+    server = socket.socket(family, socket.SOCK_STREAM)
+    if family == socket.AF_INET:
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if isUnixSocket:
+        priorUmask = os.umask(0o077) # socket file is created accessible only by the daemon's user
+    try:
+        server.bind(address)
+    finally:
+        if isUnixSocket:
+            os.umask(priorUmask)
+    server.listen(8)
+
+    # plug-ins specified with the daemon are resident for all jobs
+    if options.plugins:
+        cntlr.run(options)
+    residentState = ResidentState(cntlr)
+    residentDtses = ResidentDtses(cntlr.modelManager)
+
+    def jobArgsError(msg):
+        raise ValueError(msg)
+    parser.error = jobArgsError # report argument errors to the client instead of exiting
+    cntlr.addToLog(_("Daemon started on %(address)s"), messageCode="arelle:daemonStarted",
+                   messageArgs={"address": options.daemon})
+    try:
+        while True:
+            conn, clientAddress = server.accept()
+            try:
+                if not runJob(cntlr, parser, conn, residentState, residentDtses):
+                    break
+            finally:
+                conn.close()
+                residentState.restore()
+                residentDtses.jobFinished()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        residentDtses.close()
+        if isUnixSocket and os.path.exists(address):
+            os.unlink(address)
+    cntlr.addToLog(_("Daemon stopped"), messageCode="arelle:daemonStopped")
+    cntlr.close()
+
+def runJob(cntlr, parser, conn, residentState, residentDtses):
+    """Runs the job requested on connection conn, streaming its log entries back on conn.
+
+    :returns: bool -- False if the daemon is to shut down
+    """
+    from arelle import CntlrCmdLine
+    from arelle.Cntlr import LogFormatter
+    stream = conn.makefile("rwb")
+    try:
+        job = json.loads(stream.readline().decode("utf-8"))
+        if not isinstance(job, dict):
+            raise ValueError("request is not a JSON object")
+    except (ValueError, EnvironmentError):
+        return True # not a job request, ignore
+    if job.get("command") == "shutdown":
+        writeJson(stream, {"result": {"success": True, "time": 0.0}})
+        return False
+    startedAt = time.time()
+    success = False
+    priorCwd = os.getcwd()
+    logHandler = cntlr.logHandler
+    logHandler.stream = stream
+    try:
+        if job.get("cwd"):
+            os.chdir(job["cwd"]) # relative file names of the job are relative to its client
+        args = job.get("args") or []
+        if not isinstance(args, list) or not all(isinstance(arg, str) for arg in args):
+            raise ValueError(_("args must be a list of strings"))
+        # checked before parsing, as parsing doesn't load plug-ins, and again after (for abbreviated option names)
+        residentState.checkPluginCommands(CntlrCmdLine.pluginArgCommands(args))
+        jobOptions, leftoverArgs = parser.parse_args(args)
+        if leftoverArgs:
+            raise ValueError(_("unrecognized arguments: {}").format(', '.join(leftoverArgs)))
+        if jobOptions.daemon or getattr(jobOptions, "webserver", None):
+            raise ValueError(_("--daemon and --webserver can not be requested by a daemon job"))
+        if jobOptions.plugins:
+            residentState.checkPluginCommands(CntlrCmdLine.pluginArgCommands(["--plugins", jobOptions.plugins]))
+        # supplemental documents of --import would be added to a resident DTS
+        cntlr.modelManager.residentDtses = None if jobOptions.importFiles else residentDtses
+        logHandler.setFormatter(LogFormatter(jobOptions.logFormat or "[%(messageCode)s] %(message)s - %(file)s"))
+        cntlr.logger.setLevel((jobOptions.logLevel or "debug").upper())
+        success = cntlr.run(jobOptions)
+    except ValueError as err:
+        cntlr.addToLog(_("Job arguments error: %(error)s"), messageCode="arelle:daemonJobArguments",
+                       messageArgs={"error": str(err)}, level=logging.ERROR)
+    except SystemExit: # e.g., --help, or a plug-in exiting
+        pass
+    except Exception as err:
+        import traceback
+        cntlr.addToLog(_("Job exception: %(error)s \n%(traceback)s"), messageCode="arelle:daemonJobException",
+                       messageArgs={"error": err, "traceback": traceback.format_tb(sys.exc_info()[2])}, level=logging.CRITICAL)
+    finally:
+        os.chdir(priorCwd)
+        logHandler.stream = None
+        cntlr.modelManager.residentDtses = None
+    try:
+        writeJson(stream, {"result": {"success": bool(success), "time": round(time.time() - startedAt, 3)}})
+        stream.close()
+    except EnvironmentError:
+        pass # client has gone away
+    return True
+
+class ResidentState:
+    """Options and plug-ins of the daemon (with the plug-ins of its own command line), which are restored
+    after each job, as CntlrCmdLine.run sets but doesn't reset options, and a job may activate plug-ins
+    """
+    def __init__(self, cntlr):
+        self.cntlr = cntlr
+        self.modelManagerOptions = self.saveAttrs(cntlr.modelManager, MODEL_MANAGER_OPTIONS)
+        self.webCacheOptions = self.saveAttrs(cntlr.webCache, WEB_CACHE_OPTIONS)
+        self.loggerOptions = self.saveAttrs(cntlr.logger, LOGGER_OPTIONS)
+        self.logLevel = cntlr.logger.level
+        self.pluginConfig = copy.deepcopy(PluginManager.pluginConfig)
+        self.preloadedPlugins = dict(cntlr.preloadedPlugins)
+
+    def checkPluginCommands(self, pluginCmds):
+        for cmd in pluginCmds:
+            if cmd not in self.preloadedPlugins: # includes +, - and ~ configuration changes
+                raise ValueError(_("plug-in {0} is not resident in the daemon (only plug-ins of the daemon's --plugins may be requested by a job)").format(cmd))
+
+    @staticmethod
+    def saveAttrs(obj, names):
+        return dict((name, getattr(obj, name)) for name in names if hasattr(obj, name))
+
+    @staticmethod
+    def restoreAttrs(obj, names, values):
+        for name in names:
+            if name in values:
+                if getattr(obj, name) != values[name]:
+                    setattr(obj, name, values[name])
+            elif hasattr(obj, name): # set by the job
+                delattr(obj, name)
+
+    def restore(self):
+        cntlr = self.cntlr
+        self.restoreAttrs(cntlr.modelManager, MODEL_MANAGER_OPTIONS, self.modelManagerOptions)
+        self.restoreAttrs(cntlr.webCache, WEB_CACHE_OPTIONS, self.webCacheOptions)
+        self.restoreAttrs(cntlr.logger, LOGGER_OPTIONS, self.loggerOptions)
+        cntlr.logger.setLevel(self.logLevel)
+        if PluginManager.pluginConfig != self.pluginConfig: # deactivate plug-ins activated by the job
+            PluginManager.pluginConfig.clear()
+            PluginManager.pluginConfig.update(copy.deepcopy(self.pluginConfig))
+            PluginManager.reset()
+            cntlr.preloadedPlugins = dict(self.preloadedPlugins)
+
+class ResidentDtses:
+    """DTSes of the instances of jobs, kept loaded so later instances with the same schemaRefs share them
+    (the model manager's residentDtses during a job, see ModelManager.load)
+    """
+    def __init__(self, modelManager):
+        self.modelManager = modelManager
+        self.dtses = OrderedDict() # key: (dtsModelXbrl, file modification times), least recently used first
+        self.discardedDtses = [] # closed after the job, as modelXbrls of the job may share them
+        self.logger = logging.getLogger("arelle.residentDts") # discovery of a DTS to be resident isn't logged to jobs
+        self.logger.propagate = False
+        self.logger.addHandler(logging.NullHandler())
+        self.logger.messageCodeFilter = self.logger.messageLevelFilter = None
+
+    def load(self, filesource, nextaction=None, **kwargs):
+        """Loads the instance of filesource sharing a resident DTS
+
+        :returns: ModelXbrl -- the instance, or None if it is not a local instance file or its DTS can't be resident (to be loaded as usual)
+        """
+        from arelle import FileSource, ModelXbrl
+        modelManager = self.modelManager
+        if isinstance(filesource, FileSource.FileSource):
+            if filesource.isArchive:
+                return None
+            url = filesource.url
+        else:
+            url = filesource
+        if (not isinstance(url, str) or not os.path.isfile(url) or modelManager.skipDTS or
+            kwargs.get("base") or kwargs.get("useFileSource")):
+            return None
+        schemaRefs = self.instanceSchemaRefs(os.path.abspath(url))
+        if not schemaRefs:
+            return None
+        key = (tuple(sorted(schemaRefs)),
+               modelManager.disclosureSystem.name if modelManager.validateDisclosureSystem else None,
+               tuple(sorted(moduleName for moduleName, moduleInfo in PluginManager.pluginConfig.get("modules", {}).items()
+                            if moduleInfo.get("status") == "enabled")))
+        dts = self.residentDts(key, os.path.abspath(url))
+        if dts is None:
+            return None
+        return ModelXbrl.loadSharingDts(dts, filesource, nextaction, **kwargs)
+
+    def instanceSchemaRefs(self, filepath):
+        # schemaRefs of an instance (which precede its other elements), without parsing the rest of it
+        from lxml import etree
+        schemaRefs = []
+        try:
+            with open(filepath, "rb") as fh:
+                for event, elt in etree.iterparse(fh, events=("start",)):
+                    parent = elt.getparent()
+                    if parent is None:
+                        if elt.tag != "{%s}xbrl" % XbrlConst.xbrli or elt.get("{http://www.w3.org/XML/1998/namespace}base"):
+                            return None # not an instance, or hrefs relative to another base
+                    elif parent.getparent() is None:
+                        if elt.tag == "{%s}schemaRef" % XbrlConst.link:
+                            href = elt.get("{%s}href" % XbrlConst.xlink)
+                            if not href:
+                                return None
+                            schemaRefs.append(self.modelManager.cntlr.webCache.normalizeUrl(href, filepath))
+                        elif elt.tag not in ("{%s}linkbaseRef" % XbrlConst.link, "{%s}roleRef" % XbrlConst.link,
+                                             "{%s}arcroleRef" % XbrlConst.link):
+                            break
+        except (EnvironmentError, etree.LxmlError):
+            return None
+        return schemaRefs
+
+    def residentDts(self, key, uri):
+        if key in self.dtses:
+            dts, fileMtimes = self.dtses[key]
+            if not dts.isClosed and all(self.fileMtime(filepath) == mtime for filepath, mtime in fileMtimes.items()):
+                self.dtses.move_to_end(key)
+                return dts
+            self.discard(key)
+        from arelle import ModelDocument, ModelXbrl
+        dts = ModelXbrl.create(self.modelManager, ModelDocument.Type.INSTANCE, uri, createModelDocument=False)
+        jobLogger = dts.logger
+        dts.logger = self.logger
+        dts.modelDocument = ModelDocument.create(dts, ModelDocument.Type.INSTANCE, uri, schemaRefs=list(key[0]), isEntry=True)
+        if hasattr(dts, "entryLoadingUrl"):
+            del dts.entryLoadingUrl
+        ModelXbrl.loadSchemalocatedSchemas(dts)
+        dts.logger = jobLogger
+        if dts.modelDocument is None or self.problemCount(dts):
+            dts.close() # jobs load the instance as usual, logging its DTS's problems
+            return None
+        fileMtimes = dict((doc.filepath, self.fileMtime(doc.filepath)) for doc in dts.urlDocs.values()
+                          if doc is not dts.modelDocument and doc.filepath and os.path.isfile(doc.filepath))
+        self.dtses[key] = (dts, fileMtimes)
+        return dts
+
+    @staticmethod
+    def fileMtime(filepath):
+        try:
+            return os.path.getmtime(filepath)
+        except EnvironmentError:
+            return None
+
+    @staticmethod
+    def problemCount(modelXbrl):
+        return sum(count for level, count in modelXbrl.logCount.items() if level >= logging.WARNING)
+
+    def discard(self, key):
+        self.discardedDtses.append(self.dtses.pop(key)[0])
+
+    def jobFinished(self):
+        # problems logged on shared objects (such as formula compiling errors) would not be logged again for later jobs
+        for key, (dts, fileMtimes) in list(self.dtses.items()):
+            if self.problemCount(dts):
+                self.discard(key)
+        while len(self.dtses) > MAX_RESIDENT_DTSES:
+            self.discard(next(iter(self.dtses)))
+        for dts in self.discardedDtses:
+            if not dts.isClosed:
+                dts.close()
+        del self.discardedDtses[:]
+
+    def close(self):
+        for key in list(self.dtses.keys()):
+            self.discard(key)
+        self.jobFinished()
+
+def submitJob(address, args=None, command=None, logOutput=None):
+    """Client side: submits a job to the daemon at address, printing (or calling logOutput with) each streamed log entry.
+
+    :returns: dict -- result of job (success and time)
+    """
+    family, sockAddress = socketAddress(address)
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.connect(sockAddress)
+    stream = sock.makefile("rwb")
+    try:
+        if command:
+            writeJson(stream, {"command": command})
+        else:
+            writeJson(stream, {"args": args or [], "cwd": os.getcwd()})
+        for line in stream:
+            response = json.loads(line.decode("utf-8"))
+            if "log" in response:
+                if logOutput is not None:
+                    logOutput(response["log"])
+                else:
+                    print(response["log"]["message"]["text"])
+            elif "result" in response:
+                return response["result"]
+    finally:
+        stream.close()
+        sock.close()
+    return {"success": False}
+
+def main():
+    if len(sys.argv) < 2:
+        print("usage: python -m arelle.CntlrDaemon address [arelleCmdLine options] | address --shutdown", file=sys.stderr)
+        sys.exit(2)
+    address, args = sys.argv[1], sys.argv[2:]
+    try:
+        if args == ["--shutdown"]:
+            result = submitJob(address, command="shutdown")
+        else:
+            result = submitJob(address, args)
+    except (EnvironmentError, ValueError) as err:
+        print("Unable to submit job to daemon at {0}: {1}".format(address, err), file=sys.stderr)
+        sys.exit(2)
+    sys.exit(0 if result.get("success") else 1)
+
+if __name__ == "__main__":
+    main()
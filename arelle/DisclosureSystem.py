@@ -11,6 +11,29 @@ from arelle import UrlUtil
 from arelle.PluginManager import pluginClassMethods
 from arelle.UrlUtil import isHttpUrl
 
+_parsedConfigDocs = {} # parsed config xml documents by (file path, xinclude), reused while file date is unchanged
+
+def parseConfigXml(filepath, xinclude=False):
+    """Parses a disclosure system config file (disclosuresystems, mappings, standard taxonomies), reusing the prior
+    parse of a local file if it hasn't been modified (e.g., for a resident daemon re-selecting the disclosure system).
+    The returned document is shared and must not be modified.
+    """
+    try:
+        fileDate = os.path.getmtime(filepath)
+    except (EnvironmentError, TypeError, ValueError):
+        fileDate = None # not a local file
+    key = (filepath, xinclude)
+    if fileDate is not None and key in _parsedConfigDocs:
+        parsedDate, xmldoc = _parsedConfigDocs[key]
+        if parsedDate == fileDate:
+            return xmldoc
+    xmldoc = etree.parse(filepath)
+    if xinclude:
+        xmldoc.xinclude()
+    if fileDate is not None:
+        _parsedConfigDocs[key] = (fileDate, xmldoc)
+    return xmldoc
+
 def compileAttrPattern(elt, attrName, flags=None, patternIfNoAttr=""):
     attr = elt.get(attrName)
     if attr is None: 
@@ -119,7 +142,7 @@ class DisclosureSystem:
         namesDefined = set()
         try:
             for url in self.urls: # urls in reverse order, last plugin is first
-                xmldoc = etree.parse(url)
+                xmldoc = parseConfigXml(url)
                 for dsElt in xmldoc.iter(tag="DisclosureSystem"):
                     if dsElt.get("names"):
                         names = dsElt.get("names").split("|")
@@ -154,7 +177,7 @@ class DisclosureSystem:
             if name:
                 isSelected = False
                 for url in self.urls: # urls in revese order, last plugin first
-                    xmldoc = etree.parse(url)
+                    xmldoc = parseConfigXml(url)
                     for dsElt in xmldoc.iter(tag="DisclosureSystem"):
                         namesStr = dsElt.get("names")
                         if namesStr:
@@ -265,8 +288,8 @@ class DisclosureSystem:
                 from arelle.FileSource import openXmlFileStream
                 for filepath in (self.standardTaxonomiesUrl, 
                                  os.path.join(self.modelManager.cntlr.configDir,"xbrlschemafiles.xml")):
-                    xmldoc = etree.parse(filepath) # must open with file path for xinclude to know base of file
-                    xmldoc.xinclude() # to include elements below root use xpointer(/*/*)
+                    # must open with file path for xinclude to know base of file
+                    xmldoc = parseConfigXml(filepath, xinclude=True) # to include elements below root use xpointer(/*/*)
                     for erxlElt in xmldoc.iter(tag="Erxl"):
                         v = erxlElt.get("version")
                         if v and re.match(r"[0-9]+([.][0-9]+)*$", v):
@@ -331,8 +354,7 @@ class DisclosureSystem:
         basename = os.path.basename(self.mappingsUrl)
         self.modelManager.cntlr.showStatus(_("parsing {0}").format(basename))
         try:
-            xmldoc = etree.parse(self.mappingsUrl)
-            xmldoc.xinclude()
+            xmldoc = parseConfigXml(self.mappingsUrl, xinclude=True)
             for elt in xmldoc.iter(tag="mapFile"):
                 self.mappedFiles[elt.get("from")] = elt.get("to")
             for elt in xmldoc.iter(tag="mapPath"):
@@ -0,0 +1,198 @@
+'''
+Created on Oct 19, 2026
+
+Duplicate facts of an instance, grouped once for all validators which check them (XBRL 2.1
+calculation de-duplication, EFM 6.5.12, ESEF 2.2.4, EBA/EIOPA 2.16).
+
+Item facts are duplicates when they have the same parent (instance or tuple), concept,
+equal (dimension aware) context and equal unit.  Duplicate sets of string facts whose values
+are in more than one language are multi-language; their facts of each language are a
+further duplicate set.  Validators apply their own rules to the classification, such as
+requiring duplicates of the same decimals to have the same values (EFM, ESEF).
+
+@author: Arelle contributors
+(c) Copyright 2026 Arelle contributors, licensed under the Apache License, Version 2.0 (see License.txt).
+'''
+from collections import OrderedDict
+from decimal import InvalidOperation
+from math import isinf, isnan
+from arelle.ModelValue import DateTime
+from arelle.ValidateXbrlCalcs import rangeValue, roundValue, inferredDecimals
+
+COMPLETE = "complete" # same values and accuracy
+CONSISTENT = "consistent" # values agree to the accuracy of the least accurate fact, or v-equal non-numeric values
+INCONSISTENT = "inconsistent"
+MULTI_LANGUAGE = "multi-language" # string facts in different languages, see languageSets
+
+class DuplicateFactSet:
+    """Facts (in instance order) which are duplicates of each other, classified on first use"""
+    __slots__ = ("facts", "_type", "_languageSets")
+
+    def __init__(self, facts):
+        self.facts = facts
+
+    @property
+    def type(self):
+        """(str) -- COMPLETE, CONSISTENT, INCONSISTENT or MULTI_LANGUAGE"""
+        try:
+            return self._type
+        except AttributeError:
+            self._type = duplicateType(self.facts)
+            return self._type
+
+    @property
+    def isComplete(self):
+        return self.type == COMPLETE
+
+    @property
+    def isConsistent(self):
+        """(bool) -- complete or consistent"""
+        return self.type in (COMPLETE, CONSISTENT)
+
+    @property
+    def isInconsistent(self):
+        return self.type == INCONSISTENT
+
+    @property
+    def isMultiLanguage(self):
+        return self.type == MULTI_LANGUAGE
+
+    @property
+    def languageSets(self):
+        """(dict) -- DuplicateFactSet of the facts of each language of a multi-language set
+        (including single facts), indexed by language"""
+        try:
+            return self._languageSets
+        except AttributeError:
+            factsByLang = OrderedDict()
+            for f in self.facts:
+                factsByLang.setdefault(f.xmlLang, []).append(f)
+            self._languageSets = OrderedDict((lang, DuplicateFactSet(facts))
+                                             for lang, facts in factsByLang.items())
+            return self._languageSets
+
+    @property
+    def hasSameDecimals(self):
+        """(bool) -- numeric facts which all have the same inferred decimals"""
+        concept = self.facts[0].concept
+        if concept is None or not concept.isNumeric:
+            return False
+        d0 = inferredDecimals(self.facts[0])
+        return all(sameDecimals(inferredDecimals(f), d0) for f in self.facts[1:])
+
+    @property
+    def mostAccurateFact(self):
+        """(ModelFact) -- first of the facts having the greatest inferred decimals"""
+        return max(self.facts, key=accuracyKey)
+
+    def __len__(self):
+        return len(self.facts)
+
+    def __iter__(self):
+        return iter(self.facts)
+
+def accuracyKey(fact):
+    d = inferredDecimals(fact)
+    return float("-inf") if isnan(d) else d
+
+def sameDecimals(d1, d2):
+    return d1 == d2 or (isnan(d1) and isnan(d2))
+
+def duplicateType(facts):
+    f0 = facts[0]
+    if any(f.isNil for f in facts):
+        return COMPLETE if all(f.isNil for f in facts) else INCONSISTENT
+    concept = f0.concept
+    if concept is not None and concept.isNumeric:
+        decimals = [inferredDecimals(f) for f in facts]
+        try:
+            if all(sameDecimals(d, decimals[0]) for d in decimals[1:]):
+                v0 = rangeValue(f0.value)
+                if all(rangeValue(f.value) == v0 for f in facts[1:]):
+                    return COMPLETE
+                d = decimals[0]
+                if isnan(d) or isinf(d): # no accuracy to round to
+                    return INCONSISTENT
+                v0 = roundValue(f0.value, decimals=d)
+                return CONSISTENT if all(roundValue(f.value, decimals=d) == v0 for f in facts[1:]) else INCONSISTENT
+            aMax, bMin = rangeValue(f0.value, decimals[0])
+            for f, d in zip(facts[1:], decimals[1:]):
+                a, b = rangeValue(f.value, d)
+                if a > aMax: aMax = a
+                if b < bMin: bMin = b
+            return INCONSISTENT if bMin < aMax else CONSISTENT
+        except InvalidOperation: # invalid value, schema error reported earlier
+            return INCONSISTENT
+    if concept is not None and concept.isFraction:
+        return COMPLETE if all(f.xValue == f0.xValue for f in facts[1:]) else INCONSISTENT
+    if f0.isMultiLanguage and any(f.xmlLang != f0.xmlLang for f in facts[1:]):
+        return MULTI_LANGUAGE
+    v0 = f0.value
+    if all(f.value == v0 for f in facts[1:]):
+        return COMPLETE
+    v0 = ' '.join(v0.split())
+    if all(f.xValue == f0.xValue if type(f.xValue) == DateTime == type(f0.xValue) # as for isVEqualTo
+           else ' '.join(f.value.split()) == v0
+           for f in facts[1:]):
+        return CONSISTENT
+    return INCONSISTENT
+
+class DuplicateFactIndex:
+    """Duplicate fact sets of an instance, in instance order of their first facts.
+
+    Contexts and units are mapped to the first equal context or unit of the instance, so facts
+    are grouped by the identity of the canonical context and unit instead of by their ids or hashes.
+    Only sets of more than one fact are kept.  Facts, if specified, are a batch of (top level)
+    facts to index instead of the facts of the instance, as when streaming.
+    """
+    def __init__(self, modelXbrl, facts=None):
+        self.modelXbrl = modelXbrl
+        self.mapContext = {}
+        self.mapUnit = {}
+        uniqueContextHashes = {}
+        for context in modelXbrl.contexts.values():
+            h = context.contextDimAwareHash
+            if h in uniqueContextHashes:
+                if context.isEqualTo(uniqueContextHashes[h]):
+                    self.mapContext[context] = uniqueContextHashes[h]
+            else:
+                uniqueContextHashes[h] = context
+        uniqueUnitHashes = {}
+        for unit in modelXbrl.units.values():
+            h = unit.hash
+            if h in uniqueUnitHashes:
+                if unit.isEqualTo(uniqueUnitHashes[h]):
+                    self.mapUnit[unit] = uniqueUnitHashes[h]
+            else:
+                uniqueUnitHashes[h] = unit
+        factsByKey = OrderedDict()
+        if facts is None:
+            facts = modelXbrl.facts
+        self.indexFacts(facts, None, factsByKey)
+        self.duplicateFactSets = [DuplicateFactSet(keyFacts)
+                                  for keyFacts in factsByKey.values()
+                                  if len(keyFacts) > 1]
+
+    def indexFacts(self, facts, parent, factsByKey):
+        for f in facts:
+            if f.isTuple:
+                self.indexFacts(f.modelTupleFacts, f, factsByKey)
+            elif f.context is not None:
+                key = (parent, f.qname, self.mapContext.get(f.context, f.context),
+                       self.mapUnit.get(f.unit, f.unit))
+                if key in factsByKey:
+                    factsByKey[key].append(f)
+                else:
+                    factsByKey[key] = [f]
+
+    def __iter__(self):
+        return iter(self.duplicateFactSets)
+
+    def __len__(self):
+        return len(self.duplicateFactSets)
+
+    def close(self):
+        del self.duplicateFactSets[:]
+        self.mapContext.clear()
+        self.mapUnit.clear()
+        self.modelXbrl = None
@@ -0,0 +1,177 @@
+'''
+Created on Oct 19, 2026
+
+Fact matching between instances (test case expected results, infoset and instance comparison).
+
+Facts of an instance are bucketed by aspect keys (concept qname, context and unit equality
+hashes) so that v-equality and duplicate tests are only made against facts of the same bucket,
+instead of against every fact of the instance.
+
+@author: Arelle contributors
+(c) Copyright 2026 Arelle contributors, licensed under the Apache License, Version 2.0 (see License.txt).
+'''
+from collections import defaultdict
+
+NIL_KEY = "(nil)"
+
+def contextMatchHash(cntx, dimensionalAspectModel):
+    """Hash of the context aspects compared by ModelContext.isEqualTo (equal contexts have equal hashes)"""
+    if dimensionalAspectModel:
+        return (cntx.periodHash, cntx.entityIdentifierHash, cntx.dimsHash, cntx.nonDimHash)
+    return (cntx.periodHash, cntx.entityIdentifierHash, cntx.segmentHash, cntx.scenarioHash)
+
+class FactMatchIndex:
+    """Facts of an instance bucketed for matching facts of another instance.
+
+    Item facts are keyed by qname, context and unit (for numeric and fraction concepts), nil items
+    only by qname (as nil items are v-equal to any nil item).  Language is not keyed because only
+    some comparisons require it, it is tested within the bucket.  Tuples are keyed by qname and
+    member count; ModelFact.isDuplicateOf requires each member to match some member of the other
+    tuple (not a one to one correspondence), so member signatures can't be hashed without losing
+    matches.  Buckets keep instance fact order, so the first match is the same as by a scan
+    of the instance facts.
+    """
+    def __init__(self, modelXbrl):
+        self.modelXbrl = modelXbrl
+        self.dimensionalAspectModel = modelXbrl.hasXDT
+        self.buckets = defaultdict(list)
+        for fact in modelXbrl.facts:
+            key = self.indexKey(fact)
+            if key is not None:
+                self.buckets[key].append(fact)
+
+    def indexKey(self, fact):
+        if fact.isTuple:
+            return (fact.qname, len(fact.modelTupleFacts))
+        concept = fact.concept
+        if fact.context is None or concept is None:
+            return None # can't be v-equal to any fact
+        if fact.isNil:
+            return (fact.qname, NIL_KEY)
+        if concept.isNumeric or concept.isFraction:
+            if fact.unit is None:
+                return None
+            unitHash = fact.unit.hash
+        else:
+            unitHash = None
+        return (fact.qname, contextMatchHash(fact.context, self.dimensionalAspectModel), unitHash)
+
+    def probeKey(self, otherFact):
+        # other fact may be in another DTS, key it by this instance's concept of its qname
+        if otherFact.isTuple:
+            return (otherFact.qname, len(otherFact.modelTupleFacts))
+        if otherFact.isNil:
+            return (otherFact.qname, NIL_KEY)
+        concept = self.modelXbrl.qnameConcepts.get(otherFact.qname)
+        if otherFact.context is None or concept is None:
+            return None
+        if concept.isNumeric or concept.isFraction:
+            if otherFact.unit is None:
+                return None
+            unitHash = otherFact.unit.hash
+        else:
+            unitHash = None
+        return (otherFact.qname, contextMatchHash(otherFact.context, self.dimensionalAspectModel), unitHash)
+
+    def candidates(self, otherFact):
+        """Facts of this instance having the same keyed aspects as otherFact (values not compared)
+
+        :returns: list -- candidate facts in instance fact order
+        """
+        key = self.probeKey(otherFact)
+        if key is None:
+            return ()
+        return self.buckets.get(key, ())
+
+    def matchFact(self, otherFact, unmatchedFactsStack=None, deemP0inf=False, matchId=False, matchLang=True, excludedFacts=None):
+        """Finds matching fact with the semantics of ModelXbrl.matchFact, other than facts of excludedFacts
+        (such as facts already matched to other facts)"""
+        for fact in self.candidates(otherFact):
+            if excludedFacts is not None and fact in excludedFacts:
+                continue
+            if not matchId or otherFact.id == fact.id:
+                if (fact.isTuple):
+                    if otherFact.isDuplicateOf(fact, unmatchedFactsStack=unmatchedFactsStack):
+                        return fact
+                elif (fact.qname == otherFact.qname and fact.isVEqualTo(otherFact, deemP0inf=deemP0inf)):
+                    if fact.isFraction:
+                        return fact
+                    elif fact.isMultiLanguage and matchLang:
+                        if fact.xmlLang == otherFact.xmlLang:
+                            return fact
+                    else:
+                        if (fact.decimals == otherFact.decimals and
+                            fact.precision == otherFact.precision):
+                            return fact
+        return None
+
+    def close(self):
+        self.buckets.clear()
+        self.modelXbrl = None
+
+class InstanceDiff:
+    """Result of comparing an expected instance's facts to an actual instance's facts
+
+    matched: list of (expected fact, actual fact) pairs
+    missing: expected facts with no actual fact of the same aspects
+    valueMismatched: list of (expected fact, actual fact) pairs having the same aspects but unequal values,
+                     accuracy or language
+    extra: actual facts which matched no expected fact
+    """
+    def __init__(self):
+        self.matched = []
+        self.missing = []
+        self.valueMismatched = []
+        self.extra = []
+
+    @property
+    def isEqual(self):
+        return not (self.missing or self.valueMismatched or self.extra)
+
+def compareInstances(expectedXbrl, actualXbrl, deemP0inf=False, matchId=False, matchLang=True):
+    """Compares facts of expected instance to those of actual instance
+
+    :returns: InstanceDiff -- matched, missing, value mismatched and extra facts
+    """
+    factMatchIndex = actualXbrl.factMatchIndex
+    diff = InstanceDiff()
+    usedFacts = set()
+    for expectedFact in expectedXbrl.facts:
+        # an actual fact matches at most one expected fact (duplicate expected facts need as many actual facts)
+        actualFact = factMatchIndex.matchFact(expectedFact, [], deemP0inf=deemP0inf, matchId=matchId, matchLang=matchLang,
+                                              excludedFacts=usedFacts)
+        if actualFact is not None:
+            diff.matched.append((expectedFact, actualFact))
+            usedFacts.add(actualFact)
+        else:
+            for actualFact in factMatchIndex.candidates(expectedFact):
+                if actualFact not in usedFacts:
+                    diff.valueMismatched.append((expectedFact, actualFact))
+                    usedFacts.add(actualFact)
+                    break
+            else:
+                diff.missing.append(expectedFact)
+    diff.extra = [f for f in actualXbrl.facts if f not in usedFacts]
+    return diff
+
+def logInstanceDiff(modelXbrl, diff, expectedFile):
+    """Logs the differences of a compareInstances result on the (actual) modelXbrl"""
+    for expectedFact in diff.missing:
+        modelXbrl.error("arelle:compareInstanceMissingFact",
+            _("Expected fact %(fact)s context %(context)s is missing, expected value \"%(value)s\""),
+            modelObject=expectedFact, fact=expectedFact.qname, context=expectedFact.contextID,
+            value=expectedFact.effectiveValue)
+    for expectedFact, actualFact in diff.valueMismatched:
+        modelXbrl.error("arelle:compareInstanceValueMismatch",
+            _("Fact %(fact)s context %(context)s value \"%(value1)s\" expected value \"%(value2)s\""),
+            modelObject=(actualFact, expectedFact), fact=actualFact.qname, context=actualFact.contextID,
+            value1=actualFact.effectiveValue, value2=expectedFact.effectiveValue)
+    for actualFact in diff.extra:
+        modelXbrl.error("arelle:compareInstanceExtraFact",
+            _("Fact %(fact)s context %(context)s value \"%(value)s\" is not expected"),
+            modelObject=actualFact, fact=actualFact.qname, context=actualFact.contextID,
+            value=actualFact.effectiveValue)
+    modelXbrl.info("arelle:compareInstance",
+        _("Compared to %(file)s: %(matched)s facts matched, %(missing)s missing, %(mismatched)s value mismatched, %(extra)s extra"),
+        modelObject=modelXbrl, file=expectedFile, matched=len(diff.matched), missing=len(diff.missing),
+        mismatched=len(diff.valueMismatched), extra=len(diff.extra))
@@ -496,6 +496,51 @@ class FileSource:
         else:
             return openXmlFileStream(self.cntlr, filepath, stripDeclaration)
 
+    def xmlFile(self, filepath):
+        '''
+            for xml parsing, return a tuple of (open binary file handle, encoding)
+
+            Local files (and web cache files) and zip or tar archive members are returned as binary
+            streams, read in chunks by the parser, which decodes per the BOM or xml declaration, so there
+            is no intermediate decoded (and declaration stripped) copy of the whole document.  Otherwise,
+            when the encoding is only known as a non-utf-8 disclosure system default, for other archive
+            types, GAE, or FileSource.File plug-ins (e.g., decryption), returns the text file handle
+            of file(filepath, stripDeclaration=True).
+        '''
+        fh = None
+        if not (self.cntlr is not None and self.cntlr.isGAE) and not any(True for _ in pluginClassMethods("FileSource.File")):
+            archiveFileSource = self.fileSourceContainingFilepath(filepath)
+            if archiveFileSource is None:
+                fh = openFileStream(self.cntlr, filepath, 'rb')
+            else:
+                if filepath.startswith(archiveFileSource.basefile):
+                    archiveFileName = filepath[len(archiveFileSource.basefile) + 1:]
+                else: # filepath.startswith(self.baseurl)
+                    archiveFileName = filepath[len(archiveFileSource.baseurl) + 1:]
+                try:
+                    if archiveFileSource.isZip:
+                        if archiveFileSource.isZipBackslashed:
+                            fh = archiveFileSource.fs.open(archiveFileName.replace("/", "\\"))
+                        else:
+                            fh = archiveFileSource.fs.open(archiveFileName.replace("\\","/"))
+                    elif archiveFileSource.isTarGz:
+                        fh = archiveFileSource.fs.extractfile(archiveFileName)
+                except KeyError:
+                    raise ArchiveFileIOError(self, errno.ENOENT, archiveFileName)
+        if fh is not None:
+            hdrBytes = fh.read(512)
+            fh.seek(0)
+            encoding = XmlUtil.encoding(hdrBytes, default=None)
+            if encoding is None:
+                encoding = (self.cntlr.modelManager.disclosureSystem.defaultXmlEncoding
+                            if self.cntlr is not None and hasattr(self.cntlr, "modelManager") else None) or "utf-8"
+                if encoding.lower() not in ("utf-8", "utf8"):
+                    fh.close() # parser would assume utf-8, decode by disclosure system default
+                    fh = None
+            if fh is not None:
+                return (fh, encoding)
+        return self.file(filepath, stripDeclaration=True)
+
     def exists(self, filepath):
         archiveFileSource = self.fileSourceContainingFilepath(filepath)
         if archiveFileSource is not None:
@@ -34,12 +34,16 @@ def init():
 def evaluate(xpCtx, varSet, variablesInScope=False, uncoveredAspectFacts=None):
     # for each dependent variable, find bindings
     if variablesInScope:
-        stackedEvaluations = (xpCtx.evaluations, xpCtx.evaluationHashDicts)
+        stackedEvaluations = (xpCtx.evaluations, xpCtx.evaluationsIndex)
     else:
         xpCtx.varBindings = {}
         uncoveredAspectFacts = {}
     xpCtx.evaluations = []  # list of evaluations 
-    xpCtx.evaluationHashDicts = {} # hash indexs of evaluations
+    xpCtx.evaluationsIndex = EvaluationsIndex(xpCtx.evaluations) # index of evaluations for duplicate detection
+    formulaProfiler = xpCtx.formulaProfiler
+    if formulaProfiler is not None:
+        formulaProfiler.varSetStat(varSet).runs += 1
+        profileStartedAt = time.time()
     try:
         xpCtx.variableSet = varSet
         if isinstance(varSet, ModelExistenceAssertion):
@@ -102,6 +106,8 @@ def evaluate(xpCtx, varSet, variablesInScope=False, uncoveredAspectFacts=None):
                  _("Variable set %(label)s \nException: %(error)s"), 
                  modelObject=varSet, label=varSet.logLabel(), error=err.message)
         xpCtx.variableSet = None
+    if formulaProfiler is not None:
+        formulaProfiler.varSetStat(varSet).time += time.time() - profileStartedAt
     if xpCtx.formulaOptions.traceVariableSetExpressionResult:
         xpCtx.modelXbrl.info("formula:trace",
                              _("Variable set %(xlinkLabel)s evaluations: %(evaluations)s x %(variables)s"),
@@ -109,9 +115,9 @@ def evaluate(xpCtx, varSet, variablesInScope=False, uncoveredAspectFacts=None):
                              evaluations=len(xpCtx.evaluations), 
                              variables=max(len(e) for e in xpCtx.evaluations) if xpCtx.evaluations else 0)
     del xpCtx.evaluations[:]  # dereference
-    xpCtx.evaluationHashDicts.clear()
+    xpCtx.evaluationsIndex.close()
     if variablesInScope:
-        xpCtx.evaluations, xpCtx.evaluationHashDicts = stackedEvaluations
+        xpCtx.evaluations, xpCtx.evaluationsIndex = stackedEvaluations
     else:
         for vb in xpCtx.varBindings.values():
             vb.close()  # dereference
@@ -120,6 +126,7 @@ def evaluate(xpCtx, varSet, variablesInScope=False, uncoveredAspectFacts=None):
         pass     
     
 def evaluateVar(xpCtx, varSet, varIndex, cachedFilteredFacts, uncoveredAspectFacts):
+    formulaProfiler = xpCtx.formulaProfiler
     if varIndex == len(varSet.orderedVariableRelationships):
         # check if all fact vars are fallen back
         anyFactVar = False; anyBoundFactVar = False
@@ -132,6 +139,8 @@ def evaluateVar(xpCtx, varSet, varIndex, cachedFilteredFacts, uncoveredAspectFac
                 xpCtx.modelXbrl.info("formula:trace",
                      _("Variable set %(xlinkLabel)s skipped evaluation, all fact variables have fallen back"),
                      modelObject=varSet, xlinkLabel=varSet.xlinkLabel)
+            if formulaProfiler is not None:
+                formulaProfiler.varSetStat(varSet).fallenBackEvaluations += 1
             return
         # record completed evaluation, for fallback blocking purposes
         fbVars = set(vb.qname for vb in xpCtx.varBindings.values() if vb.isFallback)
@@ -143,6 +152,8 @@ def evaluateVar(xpCtx, varSet, varIndex, cachedFilteredFacts, uncoveredAspectFac
                 xpCtx.modelXbrl.info("formula:trace",
                     _("Variable set %(xlinkLabel)s skipped non-different or fallback evaluation, duplicates another evaluation"),
                      modelObject=varSet, xlinkLabel=varSet.xlinkLabel)
+            if formulaProfiler is not None:
+                formulaProfiler.varSetStat(varSet).skippedEvaluations += 1
             varSet.evaluationNumber += 1
             if xpCtx.formulaOptions.timeVariableSetEvaluation:
                 now = time.time()
@@ -155,11 +166,7 @@ def evaluateVar(xpCtx, varSet, varIndex, cachedFilteredFacts, uncoveredAspectFac
             xpCtx.modelXbrl.profileActivity("...   evaluation {0} (skipped)".format(varSet.evaluationNumber), minTimeToShow=10.0)
             return
         xpCtx.modelXbrl.profileActivity("...   evaluation {0}".format(varSet.evaluationNumber), minTimeToShow=10.0)
-        for vQn, vBoundFact in thisEvaluation.items(): # varQn, fact or tuple of facts bound to var
-            # while i >= len(xpCtx.evaluationHashDicts): xpCtx.evaluationHashDicts.append(defaultdict(set))
-            if vQn not in xpCtx.evaluationHashDicts: xpCtx.evaluationHashDicts[vQn] = defaultdict(set)
-            xpCtx.evaluationHashDicts[vQn][hash(vBoundFact)].add(len(xpCtx.evaluations))  # hash and eval index        
-        xpCtx.evaluations.append(thisEvaluation)  # complete evaluations tuple
+        xpCtx.evaluationsIndex.add(thisEvaluation)  # complete evaluations dict, appended to xpCtx.evaluations
         # evaluate preconditions
         for precondition in varSet.preconditions:
             result = precondition.evalTest(xpCtx)
@@ -168,6 +175,8 @@ def evaluateVar(xpCtx, varSet, varIndex, cachedFilteredFacts, uncoveredAspectFac
                      _("Variable set %(xlinkLabel)s \nPrecondition %(precondition)s \nResult: %(result)s"), 
                      modelObject=varSet, xlinkLabel=varSet.xlinkLabel, precondition=precondition.xlinkLabel, result=result)
             if not result: # precondition blocks evaluation
+                if formulaProfiler is not None:
+                    formulaProfiler.varSetStat(varSet).preconditionBlocked += 1
                 if xpCtx.formulaOptions.timeVariableSetEvaluation:
                     varSet.evaluationNumber += 1
                     now = time.time()
@@ -180,6 +189,8 @@ def evaluateVar(xpCtx, varSet, varIndex, cachedFilteredFacts, uncoveredAspectFac
                 return
             
         # evaluate variable set
+        if formulaProfiler is not None:
+            formulaProfiler.varSetStat(varSet).evaluations += 1
         if isinstance(varSet, ModelExistenceAssertion):
             varSet.evaluationsCount += 1
         else:
@@ -298,13 +309,19 @@ def evaluateVar(xpCtx, varSet, varIndex, cachedFilteredFacts, uncoveredAspectFac
             vb.values = None
             varHasNoVariableDependencies = var.hasNoVariableDependencies
             varHasNilFacts = var.nils == "true"
+            if formulaProfiler is not None:
+                varStat = formulaProfiler.variableStat(varSet, varQname)
             if varHasNoVariableDependencies and varQname in cachedFilteredFacts:
                 facts, vb.aspectsDefined, vb.aspectsCovered = cachedFilteredFacts[varQname]
+                if formulaProfiler is not None:
+                    varStat.cachedPasses += 1
                 if xpCtx.formulaOptions.traceVariableFilterWinnowing:
                     xpCtx.modelXbrl.info("formula:trace",
                          _("Fact Variable %(variable)s: start with %(factCount)s facts previously cached after explicit filters"), 
                          modelObject=var, variable=varQname, factCount=len(facts))
             else:
+                if formulaProfiler is not None:
+                    filterStartedAt = time.time()
                 if var.fromInstanceQnames:
                     groupFilteredFactsKey = "grp:" + str(varQname) # multi instance vars or  non-var-dependent variables
                 elif varHasNilFacts:
@@ -332,6 +349,8 @@ def evaluateVar(xpCtx, varSet, varIndex, cachedFilteredFacts, uncoveredAspectFac
                     cachedFilteredFacts[groupFilteredFactsKey] = facts
 
                 checkVarFilterInfo(var)
+                if formulaProfiler is not None:
+                    varStat.factsIn += len(facts)
                 facts = trialFilterFacts(xpCtx, vb, facts, var.filterRelationships, None, var=var) # also finds covered aspects (except aspect cover filter dims, not known until after this complete pass)
                     
                 # adding dim aspects must be done after explicit filterin
@@ -341,11 +360,22 @@ def evaluateVar(xpCtx, varSet, varIndex, cachedFilteredFacts, uncoveredAspectFac
                 coverAspectCoverFilterDims(xpCtx, vb, var.filterRelationships) # filters need to know what dims are covered
                 if varHasNoVariableDependencies:
                     cachedFilteredFacts[varQname] = (facts, vb.aspectsDefined, vb.aspectsCovered)
+                if formulaProfiler is not None:
+                    varStat.filterPasses += 1
+                    varStat.factsOut += len(facts)
+                    varStat.filterTime += time.time() - filterStartedAt
             considerFallback = bool(var.fallbackValueProg)
             if varSet.implicitFiltering == "true":
                 if any((_vb.isFactVar and not _vb.isFallback) for _vb in xpCtx.varBindings.values()):
                     factCount = len(facts)
+                    if formulaProfiler is not None:
+                        implicitFilterStartedAt = time.time()
                     facts = implicitFilter(xpCtx, vb, facts, uncoveredAspectFacts)
+                    if formulaProfiler is not None:
+                        varStat.implicitFilterTime += time.time() - implicitFilterStartedAt
+                        varStat.implicitFilterCalls += 1
+                        varStat.implicitFilterProbes += factCount
+                        varStat.implicitFilterFactsOut += len(facts)
                     
                     if (considerFallback and varHasNoVariableDependencies and 
                         factCount and
@@ -380,6 +410,8 @@ def evaluateVar(xpCtx, varSet, varIndex, cachedFilteredFacts, uncoveredAspectFac
                      _("Fact Variable %(variable)s: filters result %(result)s"), 
                      modelObject=var, variable=varQname, result=str(vb.facts))
             if considerFallback:
+                if formulaProfiler is not None:
+                    varStat.fallbacks += 1
                 vb.values = xpCtx.evaluate(var.fallbackValueProg)
                 if xpCtx.formulaOptions.traceVariableExpressionResult:
                     xpCtx.modelXbrl.info("formula:trace",
@@ -501,6 +533,7 @@ def trialFilterFacts(xpCtx, vb, facts, filterRelationships, filterType, var=None
     typeLbl = filterType + " " if filterType else ""
     orFilter = filterType == "or"
     groupFilter = filterType == "group"
+    formulaProfiler = xpCtx.formulaProfiler
     if orFilter: 
         factSet = set()
     filterInfo = None
@@ -539,7 +572,12 @@ def trialFilterFacts(xpCtx, vb, facts, filterRelationships, filterType, var=None
             if filterType is None and len(facts) == 0:
                 pass # still continue to do the aspects covered thing
             else:
+                if formulaProfiler is not None:
+                    filterStartedAt = time.time()
                 result = _filter.filter(xpCtx, vb, facts, varFilterRel.isComplemented)
+                if formulaProfiler is not None:
+                    formulaProfiler.variableStat(xpCtx.variableSet, vb.qname).filterStat(filterType, _filter).record(
+                        time.time() - filterStartedAt, len(facts), len(result))
                            
                 if xpCtx.formulaOptions.traceVariableFilterWinnowing:
                     allFacts = ""
@@ -580,12 +618,18 @@ def filterFacts(xpCtx, vb, facts, filterRelationships, filterType):
     typeLbl = filterType + " " if filterType else ""
     orFilter = filterType == "or"
     groupFilter = filterType == "group"
+    formulaProfiler = xpCtx.formulaProfiler
     if orFilter: 
         factSet = set()
     for varFilterRel in filterRelationships:
         _filter = varFilterRel.toModelObject
         if isinstance(_filter,ModelFilter):  # relationship not constrained to real filters
+            if formulaProfiler is not None:
+                filterStartedAt = time.time()
             result = _filter.filter(xpCtx, vb, facts, varFilterRel.isComplemented)
+            if formulaProfiler is not None:
+                formulaProfiler.variableStat(xpCtx.variableSet, vb.qname).filterStat(filterType, _filter).record(
+                    time.time() - filterStartedAt, len(facts), len(result))
             if xpCtx.formulaOptions.traceVariableFilterWinnowing:
                 xpCtx.modelXbrl.info("formula:trace",
                     _("Fact Variable %(variable)s %(filterType)s %(filter)s filter %(xlinkLabel)s passes %(factCount)s facts"), 
@@ -658,6 +702,12 @@ def implicitFilter(xpCtx, vb, facts, uncoveredAspectFacts):
         #                       if not vb.hasAspectValueCovered(aspect)]
         if testableAspectFacts:
             # not tracing, do bulk aspect filtering
+            typedDimFacts = typedDimValueFacts(xpCtx, vb, testableAspectFacts)
+            if typedDimFacts is not None: # only facts having the typed dimension value(s) can match
+                if isinstance(facts, (set, frozenset)):
+                    facts = sorted(typedDimFacts & facts, key=lambda f: f.objectIndex)
+                else:
+                    facts = [fact for fact in facts if fact in typedDimFacts]
             _facts = [fact
                       for fact in facts
                       if all(aspectMatches(xpCtx, uncoveredAspectFact, fact, aspect)
@@ -667,6 +717,25 @@ def implicitFilter(xpCtx, vb, facts, uncoveredAspectFacts):
             
     return _facts
     
+def typedDimValueFacts(xpCtx, vb, testableAspectFacts):
+    # facts of the variable's instance having the typed dimension values of uncovered typed dimension aspects, 
+    # by the instance's typed dimension value index, or None if no uncovered aspect is an indexable typed dimension
+    if len(vb.instances) != 1:
+        return None
+    inst = vb.instances[0]
+    typedDimFacts = None
+    for aspect, uncoveredAspectFact in testableAspectFacts:
+        if (isinstance(aspect, QName) and uncoveredAspectFact is not None and 
+            uncoveredAspectFact.modelXbrl is inst and 
+            uncoveredAspectFact.isItem and uncoveredAspectFact.context is not None):
+            dimValue = uncoveredAspectFact.context.dimValue(aspect)
+            if (isinstance(dimValue, ModelDimensionValue) and dimValue.isTyped and 
+                dimValue.typedMemberKey is not None and dimValue.dimension is not None and
+                dimValue.dimension.typedDomainElement not in xpCtx.modelXbrl.modelFormulaEqualityDefinitions):
+                facts = inst.factsByTypedDimValue(aspect, dimValue.typedMemberKey)
+                typedDimFacts = facts if typedDimFacts is None else (typedDimFacts & facts)
+    return typedDimFacts
+
 def aspectsMatch(xpCtx, fact1, fact2, aspects):
     return all(aspectMatches(xpCtx, fact1, fact2, aspect) for aspect in aspects)
 
@@ -757,6 +826,10 @@ def aspectMatches(xpCtx, fact1, fact2, aspect):
                     elif dimValue1.dimension.typedDomainElement in xpCtx.modelXbrl.modelFormulaEqualityDefinitions:
                         equalityDefinition = xpCtx.modelXbrl.modelFormulaEqualityDefinitions[dimValue1.dimension.typedDomainElement]
                         return equalityDefinition.evalTest(xpCtx, fact1, fact2)
+                    elif (fact1.modelXbrl is fact2.modelXbrl and isinstance(dimValue2, ModelDimensionValue) and 
+                          dimValue1.typedMemberKey is not None):
+                        if dimValue1.typedMemberKey != dimValue2.typedMemberKey: # cached canonical values
+                            return False
                     elif not XbrlUtil.nodesCorrespond(fact1.modelXbrl, dimValue1.typedMember, dimValue2.typedMember, dts2=fact2.modelXbrl):
                         return False
                 elif dimValue2 is None:
@@ -809,48 +882,103 @@ def factsPartitions(xpCtx, facts, aspects):
 #     return factsPartitions
 
 def evaluationIsUnnecessary(thisEval, xpCtx):
-    otherEvals = xpCtx.evaluations
-    if otherEvals:
-        otherEvalHashDicts = xpCtx.evaluationHashDicts
-        # HF try
-        # if all(e is None for e in thisEval):
-        if all(e is None for e in thisEval.values()):
+    return xpCtx.evaluationsIndex.isUnnecessary(thisEval, xpCtx.varBindings)
+
+class EvaluationsIndex:
+    """ Index of the completed evaluations of a variable set, answering whether a new evaluation
+    duplicates (or is a fallback evaluation subsumed by) a prior one without scanning prior evaluations.
+    
+    Evaluations are dicts of variable qname to bound fact (or tuple of facts), None when fallen back or
+    not matchable.  An evaluation is unnecessary if all its variables are fallen back, or if some prior
+    evaluation binds the same facts to its bound variables, excusing variables which depend on a variable
+    that is fallen back here but bound in a matching prior evaluation.
+    """
+    __slots__ = ("evaluations", "boundValues", "boundVars", "projections", "varRefs")
+    
+    def __init__(self, evaluations):
+        self.evaluations = evaluations  # list of evaluations, shared with xpCtx.evaluations
+        self.boundValues = defaultdict(set) # per variable qname, facts it has been bound to
+        self.boundVars = set() # variable qnames bound (not fallen back) in any evaluation
+        self.projections = {} # frozenset of var qnames: (ordered var qnames, {bound facts: frozenset of bound var qnames})
+        self.varRefs = {}
+        
+    def add(self, evaluation):
+        self.evaluations.append(evaluation)
+        boundVars = []
+        for vQn, vBoundFact in evaluation.items():
+            if vBoundFact is not None:
+                self.boundValues[vQn].add(vBoundFact)
+                boundVars.append(vQn)
+        boundVars = frozenset(boundVars) # shared by the signatures first seen in this evaluation
+        self.boundVars |= boundVars
+        for vQns, signatures in self.projections.values():
+            signature = tuple(map(evaluation.get, vQns))
+            priorBoundVars = signatures.get(signature)
+            if priorBoundVars is None:
+                signatures[signature] = boundVars
+            elif not boundVars <= priorBoundVars:
+                signatures[signature] = priorBoundVars | boundVars
+                
+    def signatures(self, vQns):
+        # lazily build a signature index for this combination of variables (one per distinct fallback mask)
+        # returns the variable qnames in the order of the index's signature tuples, and the index
+        key = frozenset(vQns)
+        try:
+            return self.projections[key]
+        except KeyError:
+            signatures = {}
+            for evaluation in self.evaluations:
+                signature = tuple(map(evaluation.get, vQns))
+                boundVars = frozenset(vQn for vQn, vBoundFact in evaluation.items() if vBoundFact is not None)
+                priorBoundVars = signatures.get(signature)
+                if priorBoundVars is None:
+                    signatures[signature] = boundVars
+                elif not boundVars <= priorBoundVars:
+                    signatures[signature] = priorBoundVars | boundVars
+            projection = self.projections[key] = (vQns, signatures)
+            return projection
+        
+    def variableRefs(self, var):
+        try:
+            return self.varRefs[var]
+        except KeyError:
+            varRefs = self.varRefs[var] = var.variableRefs()
+            return varRefs
+        
+    def isUnnecessary(self, thisEval, varBindings):
+        if not self.evaluations:
+            return False
+        bound = [(vQn, vBoundFact) for vQn, vBoundFact in thisEval.items() if vBoundFact is not None]
+        if not bound:
             return True  # evaluation not necessary, all fallen back
-        # hash check if any hashes merit further look for equality
-        otherEvalSets = [otherEvalHashDicts[vQn][hash(vBoundFact)]
-                         for vQn, vBoundFact in thisEval.items()
-                         if vBoundFact is not None
-                         if vQn in otherEvalHashDicts
-                         if hash(vBoundFact) in otherEvalHashDicts[vQn]]
-        if otherEvalSets:
-            matchingEvals = [otherEvals[i] for i in  set.intersection(*otherEvalSets)]
+        boundValues = self.boundValues
+        seenVQns = tuple(vQn for vQn, vBoundFact in bound 
+                         if vQn in boundValues and vBoundFact in boundValues[vQn])
+        if seenVQns:
+            # bound variables of prior evaluations matching this evaluation's facts
+            # signature in the order of the index, which may differ from this evaluation's order
+            signatureVQns, signatures = self.signatures(seenVQns)
+            matchingBoundVars = signatures.get(tuple(thisEval[vQn] for vQn in signatureVQns))
+            if matchingBoundVars is None:
+                return False # no prior evaluation has these facts
         else:
-            matchingEvals = otherEvals
-        # find set of vQn whose dependencies are fallen back in this eval but not others that match
-        varBindings = xpCtx.varBindings
-        vQnDependentOnOtherVarFallenBackButBoundInOtherEval = set(
-            vQn
-            for vQn, vBoundFact in thisEval.items()
-            if vBoundFact is not None and vQn in varBindings and
-               any(varBindings[varRefQn].isFallback and 
-                   any(m[varRefQn] is not None for m in matchingEvals)
-                   for varRefQn in varBindings[vQn].var.variableRefs()
-                   if varRefQn in varBindings))
-        # detects evaluations which are not different (duplicate) and extra fallback evaluations
-        # vBoundFact may be single fact or tuple of facts
-        return any(all([vBoundFact == matchingEval[vQn] 
-                        for vQn, vBoundFact in thisEval.items() 
-                        if vBoundFact is not None
-                        and vQn not in vQnDependentOnOtherVarFallenBackButBoundInOtherEval])
-                   for matchingEval in matchingEvals)
-    return False
-    '''
-    r = range(len(thisEval))
-    for otherEval in otherEvals:
-        if all([thisEval[i] is None or thisEval[i] == otherEval[i] for i in r]):
-            return True
-    return False
-    '''
+            matchingBoundVars = self.boundVars
+        # a variable bound to a fact no prior evaluation had is only excused from comparison if it depends on 
+        # a variable fallen back in this evaluation but bound in a matching evaluation
+        for vQn, vBoundFact in bound:
+            if vQn not in seenVQns:
+                vb = varBindings.get(vQn)
+                if vb is None or not any(varBindings[varRefQn].isFallback and varRefQn in matchingBoundVars
+                                         for varRefQn in self.variableRefs(vb.var)
+                                         if varRefQn in varBindings):
+                    return False
+        return True
+    
+    def close(self):
+        self.boundValues.clear()
+        self.boundVars.clear()
+        self.projections.clear()
+        self.varRefs.clear()
 
 def produceOutputFact(xpCtx, formula, result):
     priorErrorCount = len(xpCtx.modelXbrl.errors)
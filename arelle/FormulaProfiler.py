@@ -0,0 +1,220 @@
+'''
+Created on Oct 19, 2026
+
+Formula profiler: collects structured per variable set statistics of formula execution
+(filter winnowing, implicit filtering, evaluations, skipped duplicate evaluations and XPath
+function calls) and saves them as a JSON or CSV report ranked by cost.
+
+@author: Arelle contributors
+(c) Copyright 2026 Arelle contributors, licensed under the Apache License, Version 2.0 (see License.txt).
+'''
+import csv, io, json, os, time
+from collections import OrderedDict
+
+class FilterStat:
+    __slots__ = ("filterType", "name", "label", "calls", "time", "factsIn", "factsOut")
+    def __init__(self, filterType, name, label):
+        self.filterType = filterType
+        self.name = name
+        self.label = label
+        self.calls = 0
+        self.time = 0.0
+        self.factsIn = 0
+        self.factsOut = 0
+
+    def record(self, elapsed, factsIn, factsOut):
+        self.calls += 1
+        self.time += elapsed
+        self.factsIn += factsIn
+        self.factsOut += factsOut
+
+    def report(self):
+        return OrderedDict((("filter", self.name),
+                            ("label", self.label),
+                            ("filterType", self.filterType),
+                            ("calls", self.calls),
+                            ("time", round(self.time, 6)),
+                            ("factsIn", self.factsIn),
+                            ("factsOut", self.factsOut)))
+
+class FactVariableStat:
+    __slots__ = ("qname", "filterTime", "filterPasses", "cachedPasses", "factsIn", "factsOut",
+                 "implicitFilterTime", "implicitFilterCalls", "implicitFilterProbes", "implicitFilterFactsOut",
+                 "fallbacks", "filters")
+    def __init__(self, qname):
+        self.qname = qname
+        self.filterTime = 0.0
+        self.filterPasses = 0  # explicit filtering passes (not satisfied from cached filtered facts)
+        self.cachedPasses = 0  # passes satisfied from cached filtered facts
+        self.factsIn = 0
+        self.factsOut = 0
+        self.implicitFilterTime = 0.0
+        self.implicitFilterCalls = 0
+        self.implicitFilterProbes = 0  # facts tested for implicit aspect matching
+        self.implicitFilterFactsOut = 0
+        self.fallbacks = 0
+        self.filters = OrderedDict()
+
+    def filterStat(self, filterType, _filter):
+        key = (filterType, _filter)
+        try:
+            return self.filters[key]
+        except KeyError:
+            stat = self.filters[key] = FilterStat(filterType or "variable", _filter.localName, _filter.xlinkLabel)
+            return stat
+
+    @property
+    def time(self):
+        return self.filterTime + self.implicitFilterTime
+
+    def report(self):
+        return OrderedDict((("variable", str(self.qname)),
+                            ("time", round(self.time, 6)),
+                            ("filterTime", round(self.filterTime, 6)),
+                            ("filterPasses", self.filterPasses),
+                            ("cachedPasses", self.cachedPasses),
+                            ("factsIn", self.factsIn),
+                            ("factsOut", self.factsOut),
+                            ("implicitFilterTime", round(self.implicitFilterTime, 6)),
+                            ("implicitFilterCalls", self.implicitFilterCalls),
+                            ("implicitFilterProbes", self.implicitFilterProbes),
+                            ("implicitFilterFactsOut", self.implicitFilterFactsOut),
+                            ("fallbacks", self.fallbacks),
+                            ("filters", [f.report()
+                                         for f in sorted(self.filters.values(), key=lambda f: -f.time)])))
+
+class FunctionStat:
+    __slots__ = ("calls", "time")
+    def __init__(self):
+        self.calls = 0
+        self.time = 0.0
+
+class VariableSetStat:
+    def __init__(self, varSet):
+        if varSet is not None:
+            self.id = varSet.id or varSet.xlinkLabel
+            self.localName = varSet.localName
+        else: # e.g., filtering after a variables-scope nested variable set has completed
+            self.id = self.localName = None
+        self.time = 0.0
+        self.runs = 0
+        self.evaluations = 0
+        self.skippedEvaluations = 0  # evaluationIsUnnecessary duplicates and fallback evaluations
+        self.fallenBackEvaluations = 0 # all fact variables fallen back
+        self.preconditionBlocked = 0
+        self.variables = OrderedDict()
+        self.functions = {}
+
+    def variableStat(self, qname):
+        try:
+            return self.variables[qname]
+        except KeyError:
+            stat = self.variables[qname] = FactVariableStat(qname)
+            return stat
+
+    @property
+    def filterTime(self):
+        return sum(v.time for v in self.variables.values())
+
+    @property
+    def functionTime(self):
+        return sum(f.time for f in self.functions.values())
+
+    def report(self):
+        return OrderedDict((("variableSet", self.id),
+                            ("type", self.localName),
+                            ("time", round(self.time, 6)),
+                            ("filterTime", round(self.filterTime, 6)),
+                            ("functionTime", round(self.functionTime, 6)),
+                            ("runs", self.runs),
+                            ("evaluations", self.evaluations),
+                            ("skippedEvaluations", self.skippedEvaluations),
+                            ("fallenBackEvaluations", self.fallenBackEvaluations),
+                            ("preconditionBlocked", self.preconditionBlocked),
+                            ("variables", [v.report()
+                                           for v in sorted(self.variables.values(), key=lambda v: -v.time)]),
+                            ("functions", [OrderedDict((("function", str(fn)),
+                                                        ("calls", f.calls),
+                                                        ("time", round(f.time, 6))))
+                                           for fn, f in sorted(self.functions.items(), key=lambda i: -i[1].time)])))
+
+class FormulaProfiler:
+    ''' Accumulates formula execution statistics; attached to an XPathContext as formulaProfiler
+        (None when not profiling, so instrumentation costs only an attribute test).
+    '''
+    def __init__(self, modelXbrl):
+        self.modelXbrl = modelXbrl
+        self.varSetStats = OrderedDict()
+        self.functionStats = {}
+        self.startedAt = time.time()
+
+    def varSetStat(self, varSet):
+        try:
+            return self.varSetStats[varSet]
+        except KeyError:
+            stat = self.varSetStats[varSet] = VariableSetStat(varSet)
+            return stat
+
+    def variableStat(self, varSet, varQname):
+        return self.varSetStat(varSet).variableStat(varQname)
+
+    def functionCall(self, varSet, functionQname, elapsed):
+        for functionStats in (self.functionStats,
+                              self.varSetStat(varSet).functions if varSet is not None else None):
+            if functionStats is not None:
+                try:
+                    stat = functionStats[functionQname]
+                except KeyError:
+                    stat = functionStats[functionQname] = FunctionStat()
+                stat.calls += 1
+                stat.time += elapsed
+
+    def report(self):
+        varSetStats = sorted(self.varSetStats.values(), key=lambda s: -s.time)
+        totalTime = sum(s.time for s in varSetStats) or 1.0
+        return OrderedDict((
+            ("entryPoint", self.modelXbrl.modelDocument.uri if self.modelXbrl.modelDocument is not None else None),
+            ("elapsedTime", round(time.time() - self.startedAt, 3)),
+            ("variableSets", [OrderedDict([("rank", i + 1),
+                                           ("share", round(s.time / totalTime, 4))] + list(s.report().items()))
+                              for i, s in enumerate(varSetStats)]),
+            ("functions", [OrderedDict((("function", str(fn)),
+                                        ("calls", f.calls),
+                                        ("time", round(f.time, 6))))
+                           for fn, f in sorted(self.functionStats.items(), key=lambda i: -i[1].time)])))
+
+    def save(self, reportFile):
+        report = self.report()
+        if reportFile.endswith(".csv"):
+            with io.open(reportFile, "w", newline="", encoding="utf-8") as fh:
+                writer = csv.writer(fh)
+                writer.writerow(("rank", "variableSet", "type", "variable", "filter", "label", "function",
+                                 "time", "evaluations", "skippedEvaluations", "calls",
+                                 "factsIn", "factsOut", "implicitFilterProbes"))
+                for v in report["variableSets"]:
+                    writer.writerow((v["rank"], v["variableSet"], v["type"], "", "", "", "",
+                                     v["time"], v["evaluations"], v["skippedEvaluations"], v["runs"],
+                                     "", "", ""))
+                    for fv in v["variables"]:
+                        writer.writerow((v["rank"], v["variableSet"], v["type"], fv["variable"], "", "", "",
+                                         fv["time"], "", "", fv["filterPasses"],
+                                         fv["factsIn"], fv["factsOut"], fv["implicitFilterProbes"]))
+                        for f in fv["filters"]:
+                            writer.writerow((v["rank"], v["variableSet"], v["type"], fv["variable"], f["filter"], f["label"], "",
+                                             f["time"], "", "", f["calls"],
+                                             f["factsIn"], f["factsOut"], ""))
+                    for fn in v["functions"]:
+                        writer.writerow((v["rank"], v["variableSet"], v["type"], "", "", "", fn["function"],
+                                         fn["time"], "", "", fn["calls"], "", "", ""))
+        else:
+            with io.open(reportFile, "w", encoding="utf-8") as fh:
+                fh.write(json.dumps(report, indent=1))
+        self.modelXbrl.info("formula:profile",
+                            _("Formula profile report for %(count)s variable sets saved to %(file)s"),
+                            modelObject=self.modelXbrl, count=len(report["variableSets"]),
+                            file=os.path.basename(reportFile))
+
+    def close(self):
+        self.varSetStats.clear()
+        self.functionStats.clear()
+        self.modelXbrl = None
@@ -8,7 +8,7 @@ import math, re, sre_constants
 from arelle.ModelObject import ModelObject, ModelAttribute
 from arelle.ModelValue import (qname, dateTime, DateTime, DATE, DATETIME, dayTimeDuration,
                          YearMonthDuration, DayTimeDuration, time, Time)
-from arelle.FunctionUtil import anytypeArg, atomicArg, stringArg, numericArg, integerArg, qnameArg, nodeArg
+from arelle.FunctionUtil import anytypeArg, atomicArg, stringArg, numericArg, integerArg, qnameArg, nodeArg, numericSum
 from arelle import FunctionXs, XPathContext, XbrlUtil, XmlUtil, UrlUtil, ModelDocument, XmlValidate
 from arelle.Locale import format_picture
 from arelle.XmlValidate import VALID_NO_CONTENT
@@ -671,19 +671,7 @@ def avg(xc, p, contextItem, args):
         l = len(addends)
         if l == 0: 
             return ()  # xpath allows empty sequence argument
-        hasFloat = False
-        hasDecimal = False
-        for a in addends:
-            if math.isnan(a) or math.isinf(a):
-                return NaN
-            if isinstance(a, float):
-                hasFloat = True
-            elif isinstance(a, Decimal):
-                hasDecimal = True
-        if hasFloat and hasDecimal: # promote decimals to float
-            addends = [float(a) if isinstance(a, Decimal) else a
-                       for a in addends]
-        return sum( addends ) / len( args[0] )
+        return numericSum( addends, infIsNaN=True ) / len( args[0] )
     except TypeError:
         raise XPathContext.FunctionArgType(1,"sumable values", addends, errCode='err:FORG0001')
 
@@ -717,19 +705,7 @@ def fn_sum(xc, p, contextItem, args):
     try:
         if len(addends) == 0: 
             return 0  # xpath allows empty sequence argument
-        hasFloat = False
-        hasDecimal = False
-        for a in addends:
-            if math.isnan(a):
-                return NaN
-            if isinstance(a, float):
-                hasFloat = True
-            elif isinstance(a, Decimal):
-                hasDecimal = True
-        if hasFloat and hasDecimal: # promote decimals to float
-            addends = [float(a) if isinstance(a, Decimal) else a
-                       for a in addends]
-        return sum( addends )
+        return numericSum( addends )
     except TypeError:
         raise XPathContext.FunctionArgType(1,"summable sequence", addends, errCode='err:FORG0001')
 
@@ -14,6 +14,7 @@ from arelle.PluginManager import pluginClassMethods
 from arelle.XmlValidate import decimalPattern
 from arelle import XPathContext
 from datetime import datetime
+from functools import lru_cache
 
 class ixtFunctionNotAvailable(Exception):
     def __init__(self):
@@ -23,13 +24,28 @@ class ixtFunctionNotAvailable(Exception):
     
 def call(xc, p, qn, args):
     try:
-        _ixtFunction = ixtNamespaceFunctions[qn.namespaceURI][qn.localName]
+        _ixtFunction = ixtTransform(qn)
     except KeyError:
         raise XPathContext.FunctionNotAvailable(str(qn))
     if len(args) != 1: raise XPathContext.FunctionNumArgs()
     if len(args[0]) != 1: raise XPathContext.FunctionArgType(0,"xs:string")
     return _ixtFunction(str(args[0][0]))
 
+# transforms resolved by format QName, memoized on the text transformed 
+# (ESEF and SEC inline documents repeat the same formatted text many times)
+IXT_TRANSFORM_CACHE_SIZE = 65536
+_ixtTransforms = {}
+
+def ixtTransform(formatQname):
+    ''' Resolve an ixt format QName once to its memoized transform callable (raises KeyError if not a
+    transform of a known transformation registry). '''
+    try:
+        return _ixtTransforms[formatQname]
+    except KeyError:
+        _ixtFunction = ixtNamespaceFunctions[formatQname.namespaceURI][formatQname.localName]
+        _ixtTransforms[formatQname] = memoizedTransform = lru_cache(maxsize=IXT_TRANSFORM_CACHE_SIZE)(_ixtFunction)
+        return memoizedTransform
+
 # class of deferred-compilation patterns
 # reduces load time by .5 sec (debug) .15 sec (compiled)
 class RePattern:
@@ -5,6 +5,8 @@ Created on Dec 31, 2010
 (c) Copyright 2010 Mark V Systems Limited, All rights reserved.
 '''
 import xml.dom, datetime
+from math import isnan, isinf
+from decimal import Decimal
 from arelle import (ModelValue, XmlUtil)
 from arelle.ModelObject import ModelObject, ModelAttribute
 from arelle.XPathContext import (XPathException, FunctionArgType)
@@ -72,6 +74,30 @@ def nodeArg(xc, args, i, type, missingArgFallback=None, emptyFallback=None):
     if not isinstance(item, (ModelObject,ModelAttribute)): raise FunctionArgType(i,type,item)
     return item
 
+def numericSum(values, infIsNaN=False):
+    ''' Single pass sum of atomized numeric values, as for fn:sum.  Integers and decimals accumulate exactly
+    (in the decimal context), floats accumulate in sequence order; when both floats and decimals are present
+    the decimals are promoted to float.  Returns NaN if any value is NaN (or infinite, if infIsNaN).
+    Raises TypeError for non-numeric values.
+    '''
+    exactSum = 0
+    floatSum = 0.0
+    hasFloat = hasExact = False
+    for v in values:
+        if isnan(v) or (infIsNaN and isinf(v)):
+            return float("NaN")
+        if isinstance(v, float):
+            floatSum += v
+            hasFloat = True
+        else:
+            exactSum += v
+            hasExact = True
+    if hasFloat:
+        if hasExact: # promote decimals to float in sequence order
+            return sum(float(v) if isinstance(v, Decimal) else v for v in values)
+        return floatSum
+    return exactSum
+
 def testTypeCompatiblity(xc, p, op, a1, a2):
     if (isinstance(a1,ModelValue.DateTime) and isinstance(a2,ModelValue.DateTime)):
         if a1.dateOnly == a2.dateOnly:
@@ -152,7 +152,7 @@ def load(modelXbrl, uri, base=None, referringElement=None, isEntry=False, isDisc
             not normalizedUri in modelXbrl.modelManager.disclosureSystem.standardTaxonomiesDict):
             file, _encoding = ValidateFilingText.checkfile(modelXbrl,filepath)
         else:
-            file, _encoding = modelXbrl.fileSource.file(filepath, stripDeclaration=True)
+            file, _encoding = modelXbrl.fileSource.xmlFile(filepath)
         xmlDocument = None
         isPluginParserDocument = False
         for pluginMethod in pluginClassMethods("ModelDocument.CustomLoader"):
@@ -161,7 +161,8 @@ def load(modelXbrl, uri, base=None, referringElement=None, isEntry=False, isDisc
                 file.close()
                 return modelDocument
         _parser, _parserLookupName, _parserLookupClass = parser(modelXbrl,filepath)
-        xmlDocument = etree.parse(file,parser=_parser,base_url=filepath)
+        with modelXbrl.traceSpan("parse", "load", url=normalizedUri):
+            xmlDocument = etree.parse(file,parser=_parser,base_url=filepath)
         for error in _parser.error_log:
             modelXbrl.error("xmlSchema:syntax",
                     _("%(error)s, %(fileName)s, line %(line)s, column %(column)s"),
@@ -313,31 +314,32 @@ def load(modelXbrl, uri, base=None, referringElement=None, isEntry=False, isDisc
             modelDocument.inDTS = True
         
         # discovery (parsing)
-        if any(pluginMethod(modelDocument)
-               for pluginMethod in pluginClassMethods("ModelDocument.Discover")):
-            pass # discovery was performed by plug-in, we're done
-        elif _type == Type.SCHEMA:
-            modelDocument.schemaDiscover(rootNode, isIncluded, isSupplemental, namespace)
-        elif _type == Type.LINKBASE:
-            modelDocument.linkbaseDiscover(rootNode)
-        elif _type == Type.INSTANCE:
-            modelDocument.instanceDiscover(rootNode)
-        elif _type == Type.INLINEXBRL:
-            modelDocument.inlineXbrlDiscover(rootNode)
-        elif _type == Type.VERSIONINGREPORT:
-            modelDocument.versioningReportDiscover(rootNode)
-        elif _type == Type.TESTCASESINDEX:
-            modelDocument.testcasesIndexDiscover(xmlDocument)
-        elif _type == Type.TESTCASE:
-            modelDocument.testcaseDiscover(rootNode)
-        elif _type == Type.REGISTRY:
-            modelDocument.registryDiscover(rootNode)
-        elif _type == Type.XPATHTESTSUITE:
-            modelDocument.xPathTestSuiteDiscover(rootNode)
-        elif _type == Type.VERSIONINGREPORT:
-            modelDocument.versioningReportDiscover(rootNode)
-        elif _type == Type.RSSFEED:
-            modelDocument.rssFeedDiscover(rootNode)
+        with modelXbrl.traceSpan("discover", "load", url=normalizedUri, type=modelDocument.gettype()):
+            if any(pluginMethod(modelDocument)
+                   for pluginMethod in pluginClassMethods("ModelDocument.Discover")):
+                pass # discovery was performed by plug-in, we're done
+            elif _type == Type.SCHEMA:
+                modelDocument.schemaDiscover(rootNode, isIncluded, isSupplemental, namespace)
+            elif _type == Type.LINKBASE:
+                modelDocument.linkbaseDiscover(rootNode)
+            elif _type == Type.INSTANCE:
+                modelDocument.instanceDiscover(rootNode)
+            elif _type == Type.INLINEXBRL:
+                modelDocument.inlineXbrlDiscover(rootNode)
+            elif _type == Type.VERSIONINGREPORT:
+                modelDocument.versioningReportDiscover(rootNode)
+            elif _type == Type.TESTCASESINDEX:
+                modelDocument.testcasesIndexDiscover(xmlDocument)
+            elif _type == Type.TESTCASE:
+                modelDocument.testcaseDiscover(rootNode)
+            elif _type == Type.REGISTRY:
+                modelDocument.registryDiscover(rootNode)
+            elif _type == Type.XPATHTESTSUITE:
+                modelDocument.xPathTestSuiteDiscover(rootNode)
+            elif _type == Type.VERSIONINGREPORT:
+                modelDocument.versioningReportDiscover(rootNode)
+            elif _type == Type.RSSFEED:
+                modelDocument.rssFeedDiscover(rootNode)
             
         if isEntry or _type == Type.INLINEXBRL: # inline doc set members may not be entry but may have processing instructions
             for pi in modelDocument.processingInstructions:
@@ -1202,11 +1204,13 @@ class ModelDocument:
                                     modelContext.errorDimValues.append(sElt)
                         else:
                             containerNonDimValues.append(sElt)
+        self.modelXbrl.contextDiscovered(modelContext)
                             
     def unitDiscover(self, unitElement):
         if not self.skipDTS:
             xmlValidate(self.modelXbrl, unitElement) # validation may have not completed due to errors elsewhere
         self.modelXbrl.units[unitElement.id] = unitElement
+        self.modelXbrl.unitDiscovered(unitElement)
                 
     def inlineXbrlDiscover(self, htmlElement):
         ixNS = None
@@ -1354,21 +1358,39 @@ class ModelDocument:
         # no child documents to reference
         pass
     
+IXNS_TAG_PREFIXES = tuple("{{{}}}".format(ns) for ns in XbrlConst.ixbrlAll)
+
 # inline document set level compilation
 # modelIxdsDocument is an inlineDocumentSet or entry inline document (if not a document set)
 def inlineIxdsDiscover(modelXbrl, modelIxdsDocument): 
     # extract for a single target document
     ixdsTarget = getattr(modelXbrl, "ixdsTarget", None)
     # compile inline result set
+    # one walk of each document's tree collects ids and the ix elements (by clark tag, in document order)
+    # which the passes below use, instead of a separate tree traversal per ix element kind and pass
     ixdsEltById = defaultdict(list)
+    ixdsEltsByTag = {} # key htmlElement, value dict by ix element clark tag of list of elements
+    ixdsFactElts = {} # key htmlElement, value list of nonNumeric, nonFraction and fraction elements
     for htmlElement in modelXbrl.ixdsHtmlElements:
-        for elt in htmlElement.iterfind(".//*[@id]"):
-            if isinstance(elt,ModelObject) and elt.id:
-                ixdsEltById[elt.id].append(elt)
+        ixNStag = htmlElement.modelDocument.ixNStag
+        ixFactTags = {ixNStag + "nonNumeric", ixNStag + "nonFraction", ixNStag + "fraction"}
+        eltsByTag = ixdsEltsByTag[htmlElement] = defaultdict(list)
+        factElts = ixdsFactElts[htmlElement] = []
+        for elt in htmlElement.iterdescendants():
+            if isinstance(elt,ModelObject):
+                _id = elt.get("id")
+                if _id:
+                    ixdsEltById[_id].append(elt)
+                tag = elt.tag
+                if tag.startswith(IXNS_TAG_PREFIXES):
+                    eltsByTag[tag].append(elt)
+                    if tag in ixFactTags and isinstance(elt,ModelInlineFact):
+                        factElts.append(elt)
                 
     # TODO: ixdsEltById duplication should be tested here and removed from ValidateXbrlDTS (about line 346 after if name == "id" and attrValue in val.elementIDs)
     footnoteRefs = defaultdict(list)
     tupleElements = []
+    tupleElementsByDoc = defaultdict(list)
     continuationElements = {}
     continuationReferences = defaultdict(set) # set of elements that have continuedAt source value
     tuplesByTupleID = {}
@@ -1382,7 +1404,8 @@ def inlineIxdsDiscover(modelXbrl, modelIxdsDocument):
     hasResources = False
     for htmlElement in modelXbrl.ixdsHtmlElements:  
         mdlDoc = htmlElement.modelDocument
-        for modelInlineTuple in htmlElement.iterdescendants(tag=mdlDoc.ixNStag + "tuple"):
+        eltsByTag = ixdsEltsByTag[htmlElement]
+        for modelInlineTuple in eltsByTag[mdlDoc.ixNStag + "tuple"]:
             if isinstance(modelInlineTuple,ModelObject):
                 modelInlineTuple.unorderedTupleFacts = defaultdict(list)
                 if modelInlineTuple.qname is not None:
@@ -1396,15 +1419,16 @@ def inlineIxdsDiscover(modelXbrl, modelIxdsDocument):
                                             tupleID=modelInlineTuple.tupleID, qname1=modelInlineTuple.qname, 
                                             qname2=tuplesByTupleID[modelInlineTuple.tupleID].qname)
                     tupleElements.append(modelInlineTuple)
+                    tupleElementsByDoc[mdlDoc].append(modelInlineTuple)
                     for r in modelInlineTuple.footnoteRefs:
                         footnoteRefs[r].append(modelInlineTuple)
                     if modelInlineTuple.id:
                         factsByFactID[modelInlineTuple.id] = modelInlineTuple
                 factTargetIDs.add(modelInlineTuple.get("target"))
-        for elt in htmlElement.iterdescendants(tag=mdlDoc.ixNStag + "continuation"):
+        for elt in eltsByTag[mdlDoc.ixNStag + "continuation"]:
             if isinstance(elt,ModelObject) and elt.id:
                 continuationElements[elt.id] = elt
-        for elt in htmlElement.iterdescendants(tag=mdlDoc.ixNStag + "references"):
+        for elt in eltsByTag[mdlDoc.ixNStag + "references"]:
             if isinstance(elt,ModelObject):
                 target = elt.get("target")
                 targetReferenceAttrsDict = targetReferenceAttrElts[target]
@@ -1437,7 +1461,7 @@ def inlineIxdsDiscover(modelXbrl, modelIxdsDocument):
                     else:
                         targetReferencePrefixNsDict[_prefix] = (_ns, elt)
 
-        for elt in htmlElement.iterdescendants(tag=mdlDoc.ixNStag + "resources"):
+        for elt in eltsByTag[mdlDoc.ixNStag + "resources"]:
             hasResources = True
             for subEltTag in ("{http://www.xbrl.org/2003/instance}context","{http://www.xbrl.org/2003/instance}unit"):
                 for resElt in elt.iterdescendants(tag=subEltTag):
@@ -1569,81 +1593,79 @@ def inlineIxdsDiscover(modelXbrl, modelIxdsDocument):
         mdlDoc = htmlElement.modelDocument
         ixNStag = mdlDoc.ixNStag
         # hook up tuples to their container
-        for tupleFact in tupleElements:
-            if tupleFact.modelDocument == mdlDoc:
-                locateFactInTuple(tupleFact, tuplesByTupleID, ixNStag)
-                if tupleFact.get("target") == ixdsTarget:
-                    addItemFactToTarget(tupleFact) # needs to be in factsInInstance
-                
+        for tupleFact in tupleElementsByDoc[mdlDoc]:
+            locateFactInTuple(tupleFact, tuplesByTupleID, ixNStag)
+            if tupleFact.get("target") == ixdsTarget:
+                addItemFactToTarget(tupleFact) # needs to be in factsInInstance
 
-        for modelInlineFact in htmlElement.iterdescendants(tag=ixNStag + '*'):
-            if isinstance(modelInlineFact,ModelInlineFact) and modelInlineFact.localName in ("nonNumeric", "nonFraction", "fraction"):
-                _target = modelInlineFact.get("target")
-                factTargetIDs.add(_target)
-                if modelInlineFact.qname is not None: # must have a qname to be in facts
-                    if _target == ixdsTarget: # if not the selected target, schema isn't loaded
-                        addItemFactToTarget(modelInlineFact)
-                    locateFactInTuple(modelInlineFact, tuplesByTupleID, ixNStag)
-                    locateContinuation(modelInlineFact)
-                    for r in modelInlineFact.footnoteRefs:
-                        footnoteRefs[r].append(modelInlineFact)
-                    if modelInlineFact.id:
-                        factsByFactID[modelInlineFact.id] = modelInlineFact
-        # order tuple facts
-        for tupleFact in tupleElements:
-            # check for duplicates
-            for order, facts in tupleFact.unorderedTupleFacts.items():
-                if len(facts) > 1:
-                    if not all(normalizeSpace(facts[0].value) == normalizeSpace(f.value) and
-                               all(normalizeSpace(facts[0].get(attr)) == normalizeSpace(f.get(attr))
-                                   for attr in facts[0].keys() if attr != "order")
-                               for f in facts[1:]):
-                        modelXbrl.error(ixMsgCode("tupleSameOrderMembersUnequal", facts[0], sect="validation"),
-                                        _("Inline XBRL tuple members %(qnames)s values %(values)s and attributes not whitespace-normalized equal"),
-                                        modelObject=facts, qnames=", ".join(str(f.qname) for f in facts), 
-                                        values=", ".join(f.value for f in facts))
-            # check nearest ix: descendants
-            checkTupleIxDescendants(tupleFact, tupleFact)
-            tupleFact.modelTupleFacts = [facts[0] # this deduplicates by order number
-                                         for order,facts in sorted(tupleFact.unorderedTupleFacts.items(), key=lambda i:i[0])
-                                         if len(facts) > 0]
-            
-        # check for tuple cycles
-        def checkForTupleCycle(parentTuple, tupleNesting):
-            for fact in parentTuple.modelTupleFacts:
-                if fact in tupleNesting:
-                    tupleNesting.append(fact)
-                    modelXbrl.error(ixMsgCode("tupleNestingCycle", fact, sect="validation"),
-                                    _("Tuple nesting cycle: %(tupleCycle)s"),
-                                    modelObject=tupleNesting, tupleCycle="->".join(str(t.qname) for t in tupleNesting))
-                    tupleNesting.pop()
-                else:
-                    tupleNesting.append(fact)
-                    checkForTupleCycle(fact, tupleNesting)
-                    tupleNesting.pop()
-                    
-        for tupleFact in tupleElements:
-            checkForTupleCycle(tupleFact, [tupleFact])
-                        
-        # validate particle structure of elements after transformations and established tuple structure
-        fractionTermTags = (ixNStag + "numerator", ixNStag + "denominator")
-        for rootModelFact in modelXbrl.facts:
-            # validate XBRL (after complete document set is loaded)
-            if rootModelFact.localName == "fraction":
-                numDenom = [None,None]
-                for i, tag in enumerate(fractionTermTags):
-                    for modelInlineFractionTerm in rootModelFact.iterchildren(tag=tag):
-                        xmlValidate(modelXbrl, modelInlineFractionTerm, ixFacts=True)
-                        if modelInlineFractionTerm.xValid >= VALID:
-                            numDenom[i] = modelInlineFractionTerm.xValue
-                rootModelFact._fractionValue = numDenom
-            xmlValidate(modelXbrl, rootModelFact, ixFacts=True)
+        for modelInlineFact in ixdsFactElts[htmlElement]:
+            _target = modelInlineFact.get("target")
+            factTargetIDs.add(_target)
+            if modelInlineFact.qname is not None: # must have a qname to be in facts
+                if _target == ixdsTarget: # if not the selected target, schema isn't loaded
+                    addItemFactToTarget(modelInlineFact)
+                locateFactInTuple(modelInlineFact, tuplesByTupleID, ixNStag)
+                locateContinuation(modelInlineFact)
+                for r in modelInlineFact.footnoteRefs:
+                    footnoteRefs[r].append(modelInlineFact)
+                if modelInlineFact.id:
+                    factsByFactID[modelInlineFact.id] = modelInlineFact
 
-        for modelInlineFootnote in htmlElement.iterdescendants(tag=XbrlConst.qnIXbrl11Footnote.clarkNotation):
+        for modelInlineFootnote in ixdsEltsByTag[htmlElement][XbrlConst.qnIXbrl11Footnote.clarkNotation]:
             if isinstance(modelInlineFootnote,ModelObject):
                 locateContinuation(modelInlineFootnote)
                 modelInlineFootnotesById[modelInlineFootnote.footnoteID] = modelInlineFootnote
 
+    # tuple members may be in any document of the set, so order tuple facts once all documents are located
+    for tupleFact in tupleElements:
+        # check for duplicates
+        for order, facts in tupleFact.unorderedTupleFacts.items():
+            if len(facts) > 1:
+                if not all(normalizeSpace(facts[0].value) == normalizeSpace(f.value) and
+                           all(normalizeSpace(facts[0].get(attr)) == normalizeSpace(f.get(attr))
+                               for attr in facts[0].keys() if attr != "order")
+                           for f in facts[1:]):
+                    modelXbrl.error(ixMsgCode("tupleSameOrderMembersUnequal", facts[0], sect="validation"),
+                                    _("Inline XBRL tuple members %(qnames)s values %(values)s and attributes not whitespace-normalized equal"),
+                                    modelObject=facts, qnames=", ".join(str(f.qname) for f in facts), 
+                                    values=", ".join(f.value for f in facts))
+        # check nearest ix: descendants
+        checkTupleIxDescendants(tupleFact, tupleFact)
+        tupleFact.modelTupleFacts = [facts[0] # this deduplicates by order number
+                                     for order,facts in sorted(tupleFact.unorderedTupleFacts.items(), key=lambda i:i[0])
+                                     if len(facts) > 0]
+        
+    # check for tuple cycles
+    def checkForTupleCycle(parentTuple, tupleNesting):
+        for fact in parentTuple.modelTupleFacts:
+            if fact in tupleNesting:
+                tupleNesting.append(fact)
+                modelXbrl.error(ixMsgCode("tupleNestingCycle", fact, sect="validation"),
+                                _("Tuple nesting cycle: %(tupleCycle)s"),
+                                modelObject=tupleNesting, tupleCycle="->".join(str(t.qname) for t in tupleNesting))
+                tupleNesting.pop()
+            else:
+                tupleNesting.append(fact)
+                checkForTupleCycle(fact, tupleNesting)
+                tupleNesting.pop()
+                
+    for tupleFact in tupleElements:
+        checkForTupleCycle(tupleFact, [tupleFact])
+                    
+    # validate particle structure of elements after transformations and established tuple structure
+    for rootModelFact in modelXbrl.facts:
+        # validate XBRL (after complete document set is loaded)
+        if rootModelFact.localName == "fraction":
+            ixNStag = rootModelFact.modelDocument.ixNStag
+            numDenom = [None,None]
+            for i, tag in enumerate((ixNStag + "numerator", ixNStag + "denominator")):
+                for modelInlineFractionTerm in rootModelFact.iterchildren(tag=tag):
+                    xmlValidate(modelXbrl, modelInlineFractionTerm, ixFacts=True)
+                    if modelInlineFractionTerm.xValid >= VALID:
+                        numDenom[i] = modelInlineFractionTerm.xValue
+            rootModelFact._fractionValue = numDenom
+        xmlValidate(modelXbrl, rootModelFact, ixFacts=True)
+
             
     if len(targetReferenceAttrElts) == 0:
         modelXbrl.error(ixMsgCode("missingReferences", None, name="references", sect="validation"),
@@ -1674,7 +1696,7 @@ def inlineIxdsDiscover(modelXbrl, modelIxdsDocument):
     for htmlElement in modelXbrl.ixdsHtmlElements:  
         mdlDoc = htmlElement.modelDocument
         # inline 1.0 ixFootnotes, build resources (with ixContinuation)
-        for modelInlineFootnote in htmlElement.iterdescendants(tag=XbrlConst.qnIXbrlFootnote.clarkNotation):
+        for modelInlineFootnote in ixdsEltsByTag[htmlElement][XbrlConst.qnIXbrlFootnote.clarkNotation]:
             if isinstance(modelInlineFootnote,ModelObject):
                 # link
                 linkrole = modelInlineFootnote.get("footnoteLinkRole", XbrlConst.defaultLinkRole)
@@ -1708,7 +1730,7 @@ def inlineIxdsDiscover(modelXbrl, modelIxdsDocument):
                                                                 footnoteLocLabel, footnoteID,
                                                                 linkrole, arcrole, sourceElement=modelInlineFootnote))
                 
-        for modelInlineRel in htmlElement.iterdescendants(tag=XbrlConst.qnIXbrl11Relationship.clarkNotation):
+        for modelInlineRel in ixdsEltsByTag[htmlElement][XbrlConst.qnIXbrl11Relationship.clarkNotation]:
             if isinstance(modelInlineRel,ModelObject):
                 linkrole = modelInlineRel.get("linkRole", XbrlConst.defaultLinkRole)
                 if linkrole not in linkPrototypes:
@@ -1717,7 +1739,7 @@ def inlineIxdsDiscover(modelXbrl, modelIxdsDocument):
         
     for htmlElement in modelXbrl.ixdsHtmlElements:  
         mdlDoc = htmlElement.modelDocument
-        for modelInlineRel in htmlElement.iterdescendants(tag=XbrlConst.qnIXbrl11Relationship.clarkNotation):
+        for modelInlineRel in ixdsEltsByTag[htmlElement][XbrlConst.qnIXbrl11Relationship.clarkNotation]:
             if isinstance(modelInlineRel,ModelObject):
                 fromLabels = set()
                 relHasFromFactsInTarget = False
@@ -1799,7 +1821,7 @@ def inlineIxdsDiscover(modelXbrl, modelIxdsDocument):
                                     modelObject=modelInlineRel, toFootnoteIds=', '.join(sorted(toFootnoteIds)), 
                                     toFactQnames=', '.join(sorted(toFactQnames)))
 
-    del modelInlineFootnotesById, linkPrototypes, linkModelInlineFootnoteIds # dereference
+    del modelInlineFootnotesById, linkPrototypes, linkModelInlineFootnoteIds, ixdsEltsByTag, ixdsFactElts # dereference
         
     # check for multiple use of continuation reference (same continuationAt on different elements)
     for _contAt, _contReferences in continuationReferences.items():
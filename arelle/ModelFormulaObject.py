@@ -138,6 +138,7 @@ class FormulaOptions():
         self.traceVariableSetExpressionEvaluation = False
         self.traceVariableSetExpressionResult = False
         self.timeVariableSetEvaluation = False
+        self.profileReportFile = None # .json or .csv file for formula profiler report
         self.traceAssertionResultCounts = False
         self.traceSatisfiedAssertions = False
         self.errorUnsatisfiedAssertions = False
@@ -151,6 +152,7 @@ class FormulaOptions():
         self.traceVariableExpressionCode = False
         self.traceVariableExpressionEvaluation = False
         self.traceVariableExpressionResult = False
+        self.compareGrammarParser = False # also parse XPath by pyparsing grammar, warning of differences
         self.testcaseResultsCaptureWarnings = False
         if isinstance(savedValues, dict):
             self.__dict__.update(savedValues)
@@ -882,6 +884,27 @@ class ModelPrecondition(ModelFormulaResource):
     def viewExpression(self):
         return self.test
 
+def evaluationOncePerKey(evaluate, itemKey=None):
+    # evaluate(item) is called once per distinct itemKey(item) (or item) within a filter call (same variable bindings)
+    results = {}
+    def evaluateOnce(item):
+        key = item if itemKey is None else itemKey(item)
+        try:
+            return results[key]
+        except KeyError:
+            result = results[key] = evaluate(item)
+            return result
+    return evaluateOnce
+
+def factEvaluation(evaluate, contextItemDependence):
+    # evaluate(fact) of an expression with the fact as context item is called once per filter call if the
+    # expression doesn't use the context item, once per fact context if it only uses the fact's context
+    if contextItemDependence == XPathParser.CONTEXT_ITEM_INDEPENDENT:
+        return evaluationOncePerKey(evaluate, lambda fact: None)
+    if contextItemDependence == XPathParser.CONTEXT_DEPENDENT:
+        return evaluationOncePerKey(evaluate, lambda fact: fact.context)
+    return evaluate
+
 class ModelFilter(ModelFormulaResource):
     def init(self, modelDocument):
         super(ModelFilter, self).init(modelDocument)
@@ -939,7 +962,15 @@ class ModelTestFilter(ModelFilter):
             return xpCtx.evaluateBooleanValue(self.testProg, fact)
         except AttributeError:
             return True # true if no test attribute because predicate has no filtering action
-    
+
+    @property
+    def testContextItemDependence(self):
+        try:
+            return self._testContextItemDependence
+        except AttributeError:
+            self._testContextItemDependence = XPathParser.contextItemDependence(getattr(self, "testProg", None))
+            return self._testContextItemDependence
+
     @property
     def propertyView(self):
         return (("label", self.xlinkLabel),
@@ -1557,28 +1588,40 @@ class ModelConceptRelation(ModelFilter):
                                                             self.generations,
                                                             linkQname,
                                                             arcQname))
+        # index related concepts' relationships by qname, so each fact is matched by lookup
+        relsByQname = defaultdict(list)
+        for modelRel in relationships:
+            relatedConcept = modelRel.fromModelObject if isFromAxis else modelRel.toModelObject
+            if isinstance(relatedConcept, ModelObject):
+                relsByQname[relatedConcept.qname].append(modelRel)
+        hasRelsCache = {}
+        def hasRels(conceptQname, relAxis): # parent or child relationships exist (same for facts of a concept)
+            try:
+                return hasRelsCache[conceptQname, relAxis]
+            except KeyError:
+                _hasRels = hasRelsCache[conceptQname, relAxis] = bool(
+                    concept_relationships(xpCtx, None, (conceptQname, linkrole, arcrole, relAxis, 1, linkQname, arcQname)))
+                return _hasRels
         outFacts = set()
         for fact in facts:
             factOk = False
             factQname = fact.qname
-            for modelRel in relationships:
-                if (((isFromAxis and isinstance(modelRel.fromModelObject, ModelObject) and factQname == modelRel.fromModelObject.qname) or
-                     (not isFromAxis and isinstance(modelRel.toModelObject, ModelObject) and factQname == modelRel.toModelObject.qname)) and
-                     (hasNoTest or self.evalTest(xpCtx, modelRel))):
+            for modelRel in relsByQname.get(factQname, ()):
+                if hasNoTest or self.evalTest(xpCtx, modelRel):
                     factOk = True
                     break
             if (not factOk and
                 axis.startswith('sibling') and
                 factQname != sourceQname and 
-                not concept_relationships(xpCtx, None, (sourceQname, linkrole, arcrole, 'parent', 1, linkQname, arcQname)) and
-                not concept_relationships(xpCtx, None, (factQname, linkrole, arcrole, 'parent', 1, linkQname, arcQname)) and
-                concept_relationships(xpCtx, None, (factQname, linkrole, arcrole, 'child', 1, linkQname, arcQname))):
+                not hasRels(sourceQname, 'parent') and
+                not hasRels(factQname, 'parent') and
+                hasRels(factQname, 'child')):
                 factOk = True
             if (not factOk and
                 axis.endswith('-or-self')):
                 if sourceQname == XbrlConst.qnXfiRoot:
-                    if (not concept_relationships(xpCtx, None, (factQname, linkrole, arcrole, 'parent', 1, linkQname, arcQname)) and
-                        concept_relationships(xpCtx, None, (factQname, linkrole, arcrole, 'child', 1, linkQname, arcQname))):
+                    if (not hasRels(factQname, 'parent') and
+                        hasRels(factQname, 'child')):
                         factOk = True
                 else:
                     if factQname == sourceQname:
@@ -1600,10 +1643,10 @@ class ModelEntityIdentifier(ModelTestFilter):
         super(ModelEntityIdentifier, self).init(modelDocument)
 
     def filter(self, xpCtx, varBinding, facts, cmplmt):
-        return set(fact for fact in facts 
+        evalTest = evaluationOncePerKey(lambda identifier: self.evalTest(xpCtx, identifier)) # once per identifier element
+        return set(fact for fact in facts
                    if cmplmt ^ (fact.isItem and
-                                self.evalTest(xpCtx, 
-                                              fact.context.entityIdentifierElement)))
+                                evalTest(fact.context.entityIdentifierElement)))
     
     def aspectsCovered(self, varBinding):
         return {Aspect.ENTITY_IDENTIFIER}
@@ -1725,17 +1768,19 @@ class ModelGeneral(ModelTestFilter):
         super(ModelGeneral, self).init(modelDocument)
 
     def filter(self, xpCtx, varBinding, facts, cmplmt):
+        # test is evaluated once (per context) when it doesn't use the fact (except for its context)
+        evalTest = factEvaluation(lambda fact: self.evalTest(xpCtx, fact), self.testContextItemDependence)
         if self.isFilterShared and self.hasNoFilterVariableDependencies(xpCtx): # cache this filter by fact
             if self in xpCtx.cachedFilterResults:
                 qualifyingFacts = xpCtx.cachedFilterResults[self]
             else:
-                xpCtx.cachedFilterResults[self] = qualifyingFacts = set(fact 
-                                                                        for inst in varBinding.instances 
+                xpCtx.cachedFilterResults[self] = qualifyingFacts = set(fact
+                                                                        for inst in varBinding.instances
                                                                         for fact in inst.factsInInstance
-                                                                        if self.evalTest(xpCtx, fact))
-            return (facts - qualifyingFacts) if cmplmt else (facts & qualifyingFacts)            
-        return set(fact for fact in facts 
-                   if cmplmt ^ (self.evalTest(xpCtx, fact))) 
+                                                                        if evalTest(fact))
+            return (facts - qualifyingFacts) if cmplmt else (facts & qualifyingFacts)
+        return set(fact for fact in facts
+                   if cmplmt ^ (evalTest(fact)))
     
     
 class ModelMatchFilter(ModelFilter):
@@ -1843,9 +1888,10 @@ class ModelPeriod(ModelTestFilter):
         return {Aspect.PERIOD}
         
     def filter(self, xpCtx, varBinding, facts, cmplmt):
-        return set(fact for fact in facts 
-                   if cmplmt ^ (fact.isItem and 
-                                self.evalTest(xpCtx, fact.context.period))) 
+        evalTest = evaluationOncePerKey(lambda period: self.evalTest(xpCtx, period)) # once per period element
+        return set(fact for fact in facts
+                   if cmplmt ^ (fact.isItem and
+                                evalTest(fact.context.period)))
     
 class ModelDateTimeFilter(ModelFilter):
     def init(self, modelDocument):
@@ -1885,6 +1931,20 @@ class ModelDateTimeFilter(ModelFilter):
         if addOneDay:
             return date + datetime.timedelta(1)
         return date
+
+    @property
+    def datetimeContextItemDependence(self):
+        try:
+            return self._datetimeContextItemDependence
+        except AttributeError:
+            self._datetimeContextItemDependence = max(XPathParser.contextItemDependence(getattr(self, "dateProg", None)),
+                                                      XPathParser.contextItemDependence(getattr(self, "timeProg", None)))
+            return self._datetimeContextItemDependence
+
+    def factDatetimeEvaluation(self, xpCtx, addOneDay):
+        # date and time are evaluated once (per context) when they don't use the fact (except for its context)
+        return factEvaluation(lambda fact: self.evalDatetime(xpCtx, fact, addOneDay=addOneDay),
+                              self.datetimeContextItemDependence)
     
     @property
     def propertyView(self):
@@ -1905,27 +1965,30 @@ class ModelPeriodStart(ModelDateTimeFilter):
         super(ModelPeriodStart, self).init(modelDocument)
 
     def filter(self, xpCtx, varBinding, facts, cmplmt):
-        return set(fact for fact in facts 
-                   if cmplmt ^ (fact.isItem and 
-                                fact.context.startDatetime == self.evalDatetime(xpCtx, fact, addOneDay=False))) 
+        evalDatetime = self.factDatetimeEvaluation(xpCtx, addOneDay=False)
+        return set(fact for fact in facts
+                   if cmplmt ^ (fact.isItem and
+                                fact.context.startDatetime == evalDatetime(fact)))
 
 class ModelPeriodEnd(ModelDateTimeFilter):
     def init(self, modelDocument):
         super(ModelPeriodEnd, self).init(modelDocument)
 
     def filter(self, xpCtx, varBinding, facts, cmplmt):
-        return set(fact for fact in facts 
-                   if cmplmt ^ (fact.isItem and (fact.context.isStartEndPeriod 
-                                                 and fact.context.endDatetime == self.evalDatetime(xpCtx, fact, addOneDay=True)))) 
+        evalDatetime = self.factDatetimeEvaluation(xpCtx, addOneDay=True)
+        return set(fact for fact in facts
+                   if cmplmt ^ (fact.isItem and (fact.context.isStartEndPeriod
+                                                 and fact.context.endDatetime == evalDatetime(fact))))
 
 class ModelPeriodInstant(ModelDateTimeFilter):
     def init(self, modelDocument):
         super(ModelPeriodInstant, self).init(modelDocument)
 
     def filter(self, xpCtx, varBinding, facts, cmplmt):
-        return set(fact for fact in facts 
-                   if cmplmt ^ (fact.isItem and 
-                                fact.context.instantDatetime == self.evalDatetime(xpCtx, fact, addOneDay=True))) 
+        evalDatetime = self.factDatetimeEvaluation(xpCtx, addOneDay=True)
+        return set(fact for fact in facts
+                   if cmplmt ^ (fact.isItem and
+                                fact.context.instantDatetime == evalDatetime(fact)))
     
 class ModelForever(ModelFilter):
     def init(self, modelDocument):
@@ -2245,13 +2308,17 @@ class ModelTypedDimension(ModelTestFilter):
     
     def filter(self, xpCtx, varBinding, facts, cmplmt):
         outFacts = set()
+        evalDimQname = factEvaluation(lambda fact: self.evalDimQname(xpCtx, fact),
+                                      XPathParser.contextItemDependence(getattr(self, "dimQnameExpressionProg", None)))
+        evalTest = evaluationOncePerKey(lambda dim: self.evalTest(xpCtx, dim)) # once per typed member element
+        hasTest = bool(self.test)
         for fact in facts:
-            dimQname = self.evalDimQname(xpCtx, fact)
+            dimQname = evalDimQname(fact)
             dim = fact.context.qnameDims.get(dimQname) if fact.isItem else None
             if cmplmt ^ (dim is not None and
-                         (not self.test or
+                         (not hasTest or
                           # typed dimension test item is the <typedMember> element, not its contents, e.g. dim
-                          self.evalTest(xpCtx, dim))):
+                          evalTest(dim))):
                 outFacts.add(fact)
         return outFacts 
     
@@ -2546,9 +2613,10 @@ class ModelGeneralMeasures(ModelTestFilter):
         return {Aspect.UNIT}
         
     def filter(self, xpCtx, varBinding, facts, cmplmt):
-        return set(fact for fact in facts 
-                   if cmplmt ^ (fact.isItem and 
-                                (fact.isNumeric and self.evalTest(xpCtx, fact.unit))))
+        evalTest = evaluationOncePerKey(lambda unit: self.evalTest(xpCtx, unit)) # once per unit element
+        return set(fact for fact in facts
+                   if cmplmt ^ (fact.isItem and
+                                (fact.isNumeric and evalTest(fact.unit))))
     
 class ModelSingleMeasure(ModelFilter):
     def init(self, modelDocument):
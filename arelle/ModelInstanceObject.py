@@ -41,6 +41,7 @@ from math import isnan, isinf
 from arelle.ModelObject import ModelObject
 from decimal import Decimal, InvalidOperation
 from hashlib import md5
+from functools import lru_cache
 from arelle.HashUtil import md5hash, Md5Sum
 
 Aspect = None
@@ -50,6 +51,28 @@ POSINF = float("inf")
 NEGINF = float("-inf")
 DECIMALONE = Decimal(1)
 
+@lru_cache(maxsize=65536)
+def inlineNumericValue(v, scale, negate, isInteger):
+    """Lexical value of an inline numeric fact for its transformed text, scale and sign (memoized,
+    tagged numbers repeat across large inline documents).  Returns None if the text is not a number, 
+    raises ValueError or InvalidOperation for an invalid scale."""
+    try:
+        # concept may be unknown or invalid but transformation would still occur
+        # use decimal so all number forms work properly
+        num = Decimal(v)
+    except (ValueError, InvalidOperation):
+        return None
+    if scale is not None:
+        num *= 10 ** Decimal(scale)
+    num *= negate
+    if isinf(num):
+        return "-INF" if num < 0 else "INF"
+    elif isnan(num):
+        return "NaN"
+    if num == num.to_integral() and (".0" not in v or isInteger):
+        num = num.quantize(DECIMALONE) # drop any .0
+    return "{:f}".format(num)
+
 class NewFactItemOptions():
     """
     .. class:: NewFactItemOptions(savedOptions=None, xbrlInstance=None)
@@ -636,7 +659,7 @@ class ModelInlineValueObject:
                 if f is not None:
                     if f.namespaceURI in FunctionIxt.ixtNamespaceFunctions:
                         try:
-                            v = FunctionIxt.ixtNamespaceFunctions[f.namespaceURI][f.localName](v)
+                            v = FunctionIxt.ixtTransform(f)(v)
                         except Exception as err:
                             self._ixValue = ModelValue.INVALIDixVALUE
                             raise err
@@ -659,30 +682,15 @@ class ModelInlineValueObject:
                     else:
                         self._ixValue = "NaN"
                 else:  # determine string value of transformed value
-                    negate = -1 if self.sign else 1
+                    scale = self.scale
                     try:
-                        # concept may be unknown or invalid but transformation would still occur
-                        # use decimal so all number forms work properly
-                        num = Decimal(v)
-                    except (ValueError, InvalidOperation):
-                        self.setInvalid()
-                        raise ValueError("Invalid value for {} number: {}".format(self.localName, v))
-                    try:
-                        scale = self.scale
-                        if scale is not None:
-                            num *= 10 ** Decimal(scale)
-                        num *= negate
-                        if isinf(num):
-                            self._ixValue = "-INF" if num < 0 else "INF"
-                        elif isnan(num):
-                            self._ixValue = "NaN"
-                        else:
-                            if num == num.to_integral() and (".0" not in v or self.isInteger):
-                                num = num.quantize(DECIMALONE) # drop any .0
-                            self._ixValue = "{:f}".format(num)
+                        self._ixValue = inlineNumericValue(v, scale, -1 if self.sign else 1, self.isInteger)
                     except (ValueError, InvalidOperation):
                         self.setInvalid()
                         raise ValueError("Invalid value for {} scale {} for number {}".format(self.localName, scale, v))
+                    if self._ixValue is None:
+                        self.setInvalid()
+                        raise ValueError("Invalid value for {} number: {}".format(self.localName, v))
             return self._ixValue
 
     @property
@@ -1343,6 +1351,31 @@ class ModelDimensionValue(ModelObject):
         """(bool) -- True if typedMember element"""
         return self.localName == "typedMember"
 
+    @property
+    def typedMemberKey(self):
+        """(tuple) -- Hashable canonical value of a typed member, equal for typed members which are XPath-equal 
+        (as by isEqualTo), cached.  None for an explicit member or a typed member having an unhashable (list) value.
+        """
+        try:
+            return self._typedMemberKey
+        except AttributeError:
+            if self.isTyped:
+                self._typedMemberKey = XbrlUtil.equalityKey(self.typedMember, equalMode=XbrlUtil.XPATH_EQ, 
+                                                            excludeIDs=XbrlUtil.ALL_IDs_EXCLUDED)
+            else:
+                self._typedMemberKey = None
+            return self._typedMemberKey
+
+    @property
+    def typedMemberXml(self):
+        """(str) -- Typed member element serialized without xmlns (e.g., for DPM signatures), cached"""
+        try:
+            return self._typedMemberXml
+        except AttributeError:
+            typedMember = self.typedMember if self.isTyped else None
+            self._typedMemberXml = XmlUtil.xmlstring(typedMember, stripXmlns=True) if typedMember is not None else None
+            return self._typedMemberXml
+
     @property
     def memberQname(self):
         """(QName) -- QName of an explicit dimension member"""
@@ -45,6 +45,14 @@ class ModelManager:
         
         True for validation of unit type registry
         
+        .. attribute:: tracer
+        
+        Tracer recording nested timing spans of processing, or None when not tracing
+        
+        .. attribute:: residentDtses
+        
+        Loader of instances sharing DTSes kept loaded by a daemon (see CntlrDaemon.ResidentDtses), or None
+        
         .. attribute:: defaultLang
         
         The default language code for labels selection and views (e.g. 'en-US'), set from the operating system defaults on startup.
@@ -57,12 +65,15 @@ class ModelManager:
         self.validateCalcLB = False
         self.validateInferDecimals = True
         self.validateDedupCalcs = False
+        self.textBlockWorkers = 0 # worker processes for disclosure system text block html checks, 0 for none
         self.validateInfoset = False
         self.validateUtr = False
         self.skipDTS = False
         self.skipLoading = None
         self.abortOnMajorError = False
         self.collectProfileStats = False
+        self.tracer = None # Tracer when recording nested timing spans (for Chrome trace or flame graph output)
+        self.residentDtses = None # CntlrDaemon.ResidentDtses when a daemon job may share an already loaded DTS
         self.loadedModelXbrls = []
         from arelle import Locale
         self.locale = Locale.getUserLocale(cntlr.config.get("userInterfaceLocaleOverride",""))
@@ -153,6 +164,8 @@ class ModelManager:
             modelXbrl = customLoader(self, filesource)
             if modelXbrl is not None:
                 break # custom loader did the loading
+        if modelXbrl is None and self.residentDtses is not None: # instance of a DTS kept loaded by the daemon
+            modelXbrl = self.residentDtses.load(filesource, nextaction, **kwargs)
         if modelXbrl is None:  # use default xbrl loader
             modelXbrl = ModelXbrl.load(self, filesource, nextaction, **kwargs)
         self.modelXbrl = modelXbrl
@@ -179,7 +192,8 @@ class ModelManager:
         """
         try:
             if self.modelXbrl:
-                Validate.validate(self.modelXbrl)
+                with self.modelXbrl.traceSpan("validate", "validation", url=self.modelXbrl.uri):
+                    Validate.validate(self.modelXbrl)
         except Exception as err:
             self.addToLog(_("[exception] Validation exception: {0} at {1}").format(
                            err,
@@ -102,7 +102,7 @@ def baseSetRelationship(arcElement):
 class ModelRelationshipSet:
     __slots__ = ("isChanged", "modelXbrl", "arcrole", "linkrole", "linkqname", "arcqname",
                  "modelRelationshipsFrom", "modelRelationshipsTo", "modelConceptRoots", "modellinkRoleUris",
-                 "modelRelationships", "_testHintedLabelLinkrole")
+                 "modelRelationships", "_testHintedLabelLinkrole", "_labelCache", "_reachable")
     
     # arcrole can either be a single string or a tuple or frozenset of strings
     def __init__(self, modelXbrl, arcrole, linkrole=None, linkqname=None, arcqname=None, includeProhibits=False):
@@ -112,6 +112,8 @@ class ModelRelationshipSet:
         self.linkrole = linkrole # may be str, tuple or frozenset
         self.linkqname = linkqname
         self.arcqname = arcqname
+        self._labelCache = {} # resolved labels by label arguments (for label relationship sets)
+        self._reachable = {} # descendants/ancestors closures and DRS isRelated results, computed on first query
 
         relationshipSetKey = (arcrole, linkrole, linkqname, arcqname, includeProhibits) 
             
@@ -203,6 +205,8 @@ class ModelRelationshipSet:
             self.modelRelationshipsFrom.clear()
         if self.modelConceptRoots is not None:
             del self.modelConceptRoots[:]
+        self._labelCache.clear()
+        self._reachable.clear()
         self.linkqname = self.arcqname = None
         
     def __bool__(self):  # some modelRelationships exist
@@ -295,6 +299,15 @@ class ModelRelationshipSet:
             axis = axis[7:] # remove sibling, else recursion will loop
             return any(self.isRelated(modelRel.fromModelObject, axis, modelTo)
                        for modelRel in self.toModelObject(modelFrom))
+        if isDescendantAxis and visited is None and modelTo is not None: # top level query, answer from index
+            if not isDRS:
+                return modelTo in self.descendants(modelFrom)
+            key = (modelFrom, axis, modelTo) # DRS networks follow targetRoles, cache result per query
+            try:
+                return self._reachable[key]
+            except KeyError:
+                isRel = self._reachable[key] = self.isRelated(modelFrom, axis, modelTo, set(), isDRS)
+                return isRel
         for modelRel in self.fromModelObject(modelFrom):
             toConcept = modelRel.toModelObject
             if modelTo is None or modelTo == toConcept:
@@ -314,7 +327,67 @@ class ModelRelationshipSet:
                     visited.discard(toConcept)
         return False
     
+    def descendants(self, modelFrom):
+        """(frozenset) -- objects related from modelFrom by any number of relationships in this set"""
+        return self.reachable(modelFrom, True)
+    
+    def ancestors(self, modelTo):
+        """(frozenset) -- objects relating to modelTo by any number of relationships in this set"""
+        return self.reachable(modelTo, False)
+    
+    def reachable(self, modelObject, isDescendant):
+        key = (isDescendant, modelObject)
+        try:
+            return self._reachable[key]
+        except KeyError:
+            pass
+        reached = set()
+        pending = [modelObject]
+        while pending:
+            pendingObject = pending.pop()
+            for modelRel in (self.fromModelObject(pendingObject) if isDescendant else self.toModelObject(pendingObject)):
+                relatedObject = modelRel.toModelObject if isDescendant else modelRel.fromModelObject
+                if relatedObject is not None and relatedObject not in reached:
+                    reached.add(relatedObject)
+                    pending.append(relatedObject)
+        reached = self._reachable[key] = frozenset(reached)
+        return reached
+    
     def label(self, modelFrom, role, lang, returnMultiple=False, returnText=True, linkroleHint=None):
+        # views, renderers and messages request the same labels repeatedly, resolve each (with its 
+        # role, linkrole preference and language fallback) only once per relationship set
+        key = (modelFrom, role, lang, returnMultiple, returnText, linkroleHint)
+        try:
+            result = self._labelCache[key]
+        except KeyError:
+            result = self._labelCache[key] = self.resolveLabel(modelFrom, role, lang, returnMultiple, returnText, linkroleHint)
+        except TypeError: # unhashable argument
+            return self.resolveLabel(modelFrom, role, lang, returnMultiple, returnText, linkroleHint)
+        if returnMultiple and result is not None:
+            return list(result) # caller may modify list
+        return result
+    
+    def preResolveLabels(self, lang, roles=None, returnText=True, linkroleHint=None):
+        """Resolves (and caches) the labels of every object having labels in this relationship set, 
+        such as before producing a report or view of all concepts in one language.
+        
+        :param lang: language of labels (with fallback as for label)
+        :param roles: label roles to resolve, if None all roles of labels in this relationship set
+        :returns: dict -- label by (modelFrom, role), for those resolved to a label
+        """
+        if roles is None:
+            roles = set(modelRel.toModelObject.role
+                        for modelRel in self.modelRelationships
+                        if modelRel.toModelObject is not None)
+        labels = {}
+        for modelFrom in self.fromModelObjects().keys():
+            for role in roles:
+                label = self.label(modelFrom, role, lang, returnText=returnText, linkroleHint=linkroleHint)
+                if label is not None:
+                    labels[modelFrom, role] = label
+        return labels
+    
+    def resolveLabel(self, modelFrom, role, lang, returnMultiple=False, returnText=True, linkroleHint=None):
         shorterLangInLabel = longerLangInLabel = None
         shorterLangLabels = longerLangLabels = None
         langLabels = []
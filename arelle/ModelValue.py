@@ -320,18 +320,17 @@ class DateTime(datetime.datetime):
                 if isinstance(other, Time): other = dayTimeDuration(other)
                 return DateTime(dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second, dt.microsecond, dt.tzinfo, self.dateOnly)
     
+def dateUnionKey(dateUnion, instantEndDate=False):
+    """Hashable value of a date union, equal for date unions which dateUnionEqual would consider equal"""
+    if isinstance(dateUnion,DateTime):
+        if instantEndDate and dateUnion.dateOnly:
+            dateUnion += datetime.timedelta(1)
+    elif isinstance(dateUnion,datetime.date):
+        dateUnion = dateTime(dateUnion, addOneDay=instantEndDate)
+    return dateUnion
+
 def dateUnionEqual(dateUnion1, dateUnion2, instantEndDate=False):
-    if isinstance(dateUnion1,DateTime):
-        if instantEndDate and dateUnion1.dateOnly:
-            dateUnion1 += datetime.timedelta(1)
-    elif isinstance(dateUnion1,datetime.date):
-        dateUnion1 = dateTime(dateUnion1, addOneDay=instantEndDate)
-    if isinstance(dateUnion2,DateTime):
-        if instantEndDate and dateUnion2.dateOnly:
-            dateUnion2 += datetime.timedelta(1)
-    elif isinstance(dateUnion2,datetime.date):
-        dateUnion2 = dateTime(dateUnion2, addOneDay=instantEndDate)
-    return dateUnion1 == dateUnion2
+    return dateUnionKey(dateUnion1, instantEndDate) == dateUnionKey(dateUnion2, instantEndDate)
         
 def dateunionDate(datetimeValue, subtractOneDay=False):
     isDate = (hasattr(datetimeValue,'dateOnly') and datetimeValue.dateOnly) or not hasattr(datetimeValue, 'hour')
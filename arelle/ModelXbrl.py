@@ -14,6 +14,7 @@ from arelle.ModelObject import ModelObject, ObjectPropertyViewWrapper
 from arelle.Locale import format_string
 from arelle.PluginManager import pluginClassMethods
 from arelle.PrototypeInstanceObject import FactPrototype, DimValuePrototype
+from arelle.Tracer import NO_SPAN
 from arelle.PythonUtil import flattenSequence
 from arelle.UrlUtil import isHttpUrl
 from arelle.ValidateXbrlDimensions import isFactDimensionallyValid
@@ -64,17 +65,52 @@ def load(modelManager, url, nextaction=None, base=None, useFileSource=None, erro
     else:
         modelXbrl.fileSource = FileSource.FileSource(url, modelManager.cntlr)
         modelXbrl.closeFileSource= True
+    with modelXbrl.traceSpan("load", "load", url=url) as span:
+        modelXbrl.modelDocument = ModelDocument.load(modelXbrl, url, base, isEntry=True, **kwargs)
+        if supplementalUrls:
+            for url in supplementalUrls:
+                ModelDocument.load(modelXbrl, url, base, isEntry=False, isDiscovered=True, **kwargs)
+        if hasattr(modelXbrl, "entryLoadingUrl"):
+            del modelXbrl.entryLoadingUrl
+        loadSchemalocatedSchemas(modelXbrl)
+        
+        #from arelle import XmlValidate
+        #uncomment for trial use of lxml xml schema validation of entry document
+        #XmlValidate.xmlValidate(modelXbrl.modelDocument)
+        modelManager.cntlr.webCache.saveUrlCheckTimes()
+        for pluginXbrlMethod in pluginClassMethods("ModelXbrl.LoadComplete"):
+            pluginXbrlMethod(modelXbrl)
+        span.set(documents=len(modelXbrl.urlDocs), facts=len(modelXbrl.factsInInstance), contexts=len(modelXbrl.contexts))
+    modelManager.showStatus(_("xbrl loading finished, {0}...").format(nextaction))
+    return modelXbrl
+
+def loadSharingDts(dtsModelXbrl, url, nextaction=None, base=None, errorCaptureLevel=None, **kwargs):
+    """Loads an additional instance (such as a prior period filing, for formula named input instances) into a new
+    ModelXbrl which shares the already discovered schemas and linkbases of dtsModelXbrl, instead of discovering and
+    loading them again.  Schemas or linkbases only referenced by the additional instance are discovered as usual.
+    
+    :param dtsModelXbrl: modelXbrl whose DTS is to be shared (it must remain open while the new modelXbrl is in use)
+    :type dtsModelXbrl: ModelXbrl
+    :param url: may be a filename or FileSource object
+    :type url: str or FileSource
+    :returns: ModelXbrl -- a new modelXbrl, of the instance with the shared DTS
+    """
+    if nextaction is None: nextaction = _("loading")
+    from arelle import (ModelDocument, FileSource)
+    modelManager = dtsModelXbrl.modelManager
+    modelXbrl = create(modelManager, errorCaptureLevel=errorCaptureLevel)
+    modelXbrl.shareDts(dtsModelXbrl)
+    if isinstance(url,FileSource.FileSource):
+        modelXbrl.fileSource = url
+        url = url.url
+    else:
+        modelXbrl.fileSource = FileSource.FileSource(url, modelManager.cntlr)
+    modelXbrl.closeFileSource= True
     modelXbrl.modelDocument = ModelDocument.load(modelXbrl, url, base, isEntry=True, **kwargs)
-    if supplementalUrls:
-        for url in supplementalUrls:
-            ModelDocument.load(modelXbrl, url, base, isEntry=False, isDiscovered=True, **kwargs)
     if hasattr(modelXbrl, "entryLoadingUrl"):
         del modelXbrl.entryLoadingUrl
     loadSchemalocatedSchemas(modelXbrl)
-    
-    #from arelle import XmlValidate
-    #uncomment for trial use of lxml xml schema validation of entry document
-    #XmlValidate.xmlValidate(modelXbrl.modelDocument)
+    modelXbrl.unshareChangedRelationshipSets()
     modelManager.cntlr.webCache.saveUrlCheckTimes()
     for pluginXbrlMethod in pluginClassMethods("ModelXbrl.LoadComplete"):
         pluginXbrlMethod(modelXbrl)
@@ -108,6 +144,42 @@ def loadSchemalocatedSchemas(modelXbrl):
             modelDocumentsSchemaLocated.add(modelDocument)
             modelDocument.loadSchemalocatedSchemas()
         
+# pseudo-arcroles of relationship sets of all arcs having any arcrole of a group (see ModelRelationshipSet)
+pseudoArcroleMembers = {"XBRL-dimensions": XbrlConst.isDimensionArcrole,
+                        "XBRL-formulae": XbrlConst.isFormulaArcrole,
+                        "Table-rendering": XbrlConst.isTableRenderingArcrole}
+
+def relationshipSetHasArcroles(arcrole, arcroles):
+    # whether a relationshipSets key's arcrole (which may be a tuple or frozenset of arcroles, or a pseudo-arcrole
+    # such as XBRL-dimensions) includes any of arcroles (arcroles of base set keys, which include the pseudo-arcroles
+    # of base sets of footnote links and of links of dimension, formula or table arcs)
+    for ar in (arcrole if isinstance(arcrole, (tuple, frozenset)) else (arcrole,)):
+        if ar in arcroles:
+            return True
+        isMember = pseudoArcroleMembers.get(ar)
+        if isMember is not None and any(isMember(a) for a in arcroles if a):
+            return True
+    return False
+
+def contextMatchPeriodKey(periodType, periodStart, periodEndInstant):
+    """Hashable period of matchContext arguments, equal for periods matchContext considers equal"""
+    if periodType == "instant":
+        return (periodType, ModelValue.dateUnionKey(periodEndInstant, instantEndDate=True))
+    elif periodType == "duration":
+        return (periodType, ModelValue.dateUnionKey(periodStart), ModelValue.dateUnionKey(periodEndInstant, instantEndDate=True))
+    return (periodType,)
+
+def contextMatchKey(entityIdentifier, periodKey, dimItems):
+    """Hashable key of a context's matchContext aspects, dimItems are (dimension qname, dimension value) pairs,
+    or None for the key not considering dimensions.  Typed dimension values are only keyed by dimension
+    as their equality is by node correspondence.
+    """
+    if dimItems is None:
+        return (entityIdentifier, periodKey)
+    return (entityIdentifier, periodKey, 
+            frozenset((dimQn, dimValue if isinstance(dimValue, ModelValue.QName) else getattr(dimValue, "memberQname", None))
+                      for dimQn, dimValue in dimItems))
+
 class ModelXbrl:
     """
     .. class:: ModelXbrl(modelManager)
@@ -279,6 +351,8 @@ class ModelXbrl:
         self.contexts = {}
         self.units = {}
         self.modelObjects = []
+        self._contextMatchIndex = None # contexts by aspect key for matchContext, built on first use (see clearMatchIndexes)
+        self._unitMatchIndex = None # units by measures for matchUnit, built on first use
         self.qnameParameters = {}
         self.modelVariableSets = set()
         self.modelCustomFunctionSignatures = {}
@@ -317,12 +391,94 @@ class ModelXbrl:
                 self.fileSource.close()
             modelDocument = getattr(self,"modelDocument",None)
             urlDocs = getattr(self,"urlDocs",None)
+            sharedDtsDocs = getattr(self,"sharedDtsDocs",None)
+            sharedRelationshipSets = getattr(self,"sharedRelationshipSets",())
             for relSet in self.relationshipSets.values():
-                relSet.clear()
+                if relSet not in sharedRelationshipSets:
+                    relSet.clear()
             self.__dict__.clear() # dereference everything before closing document
+            if sharedDtsDocs: # shared DTS documents are closed by the modelXbrl which loaded them
+                for doc in list(urlDocs.values()):
+                    if doc in sharedDtsDocs:
+                        del urlDocs[doc.uri]
+                    else:
+                        for referencedDoc in [d for d in doc.referencesDocument.keys() if d in sharedDtsDocs]:
+                            del doc.referencesDocument[referencedDoc]
             if modelDocument:
                 modelDocument.close(urlDocs=urlDocs)
             
+    def shareDts(self, dtsModelXbrl):
+        """Shares the discovered schemas and linkbases of dtsModelXbrl with this (newly created) modelXbrl, for loading
+        another instance of the same DTS (see loadSharingDts).  The shared documents and their model objects (concepts,
+        types, links and already resolved relationship sets) are not copied, but the DTS indexes of this modelXbrl are
+        copies of those of dtsModelXbrl, so documents discovered only by this modelXbrl (such as an extension schema
+        or footnote links) don't change dtsModelXbrl.  Fact, context and unit indexes are this modelXbrl's own, and
+        built lazily as for any instance.
+        """
+        from arelle.ModelDocument import Type
+        self.sharedDtsDocs = set(doc for doc in dtsModelXbrl.urlDocs.values()
+                                 if doc.type in (Type.SCHEMA, Type.LINKBASE))
+        for url, doc in dtsModelXbrl.urlDocs.items():
+            if doc in self.sharedDtsDocs:
+                self.urlDocs[url] = doc
+        self.urlUnloadableDocs.update(dtsModelXbrl.urlUnloadableDocs)
+        sharedDtsDocs = self.sharedDtsDocs
+        def sharedObjects(objects):
+            return [obj for obj in objects if obj.modelDocument in sharedDtsDocs]
+        for ns, docs in dtsModelXbrl.namespaceDocs.items():
+            self.namespaceDocs[ns] = [doc for doc in docs if doc in sharedDtsDocs]
+        for uri, modelRoleTypes in dtsModelXbrl.arcroleTypes.items():
+            self.arcroleTypes[uri] = sharedObjects(modelRoleTypes)
+        for uri, modelRoleTypes in dtsModelXbrl.roleTypes.items():
+            self.roleTypes[uri] = sharedObjects(modelRoleTypes)
+        for name, concepts in dtsModelXbrl.nameConcepts.items():
+            self.nameConcepts[name] = list(concepts)
+        self.qnameConcepts.update(dtsModelXbrl.qnameConcepts)
+        self.qnameAttributes.update(dtsModelXbrl.qnameAttributes)
+        self.qnameAttributeGroups.update(dtsModelXbrl.qnameAttributeGroups)
+        self.qnameGroupDefinitions.update(dtsModelXbrl.qnameGroupDefinitions)
+        self.qnameTypes.update(dtsModelXbrl.qnameTypes)
+        self.qnameDimensionDefaults.update(dtsModelXbrl.qnameDimensionDefaults)
+        # formula and table resources of the shared linkbases (and their compiled expressions)
+        self.qnameParameters.update((qn, p) for qn, p in dtsModelXbrl.qnameParameters.items() if p.modelDocument in sharedDtsDocs)
+        self.modelVariableSets.update(sharedObjects(dtsModelXbrl.modelVariableSets))
+        self.modelCustomFunctionSignatures.update((key, cfSig) for key, cfSig in dtsModelXbrl.modelCustomFunctionSignatures.items()
+                                                  if cfSig is None or cfSig.modelDocument in sharedDtsDocs)
+        self.modelCustomFunctionImplementations.update(sharedObjects(dtsModelXbrl.modelCustomFunctionImplementations))
+        self.modelRenderingTables.update(sharedObjects(dtsModelXbrl.modelRenderingTables))
+        self.hasFormulae = dtsModelXbrl.hasFormulae
+        # base sets without dtsModelXbrl's instance links (e.g., footnote links), relationship sets of the other arcroles
+        unsharedArcroles = set()
+        for baseSetKey, modelLinks in dtsModelXbrl.baseSets.items():
+            links = sharedObjects(modelLinks)
+            if len(links) < len(modelLinks):
+                unsharedArcroles.add(baseSetKey[0])
+            self.baseSets[baseSetKey] = links
+        self.sharedBaseSetLengths = dict((baseSetKey, len(modelLinks)) for baseSetKey, modelLinks in self.baseSets.items())
+        for relSetKey, relSet in dtsModelXbrl.relationshipSets.items():
+            if not relationshipSetHasArcroles(relSetKey[0], unsharedArcroles):
+                self.relationshipSets[relSetKey] = relSet
+        self.sharedRelationshipSets = set(self.relationshipSets.values())
+        self.langs |= dtsModelXbrl.langs
+        self.labelroles |= dtsModelXbrl.labelroles
+        self.hasXDT = dtsModelXbrl.hasXDT
+        self.hasTableRendering = dtsModelXbrl.hasTableRendering
+        self.hasTableIndexing = dtsModelXbrl.hasTableIndexing
+        
+    def unshareChangedRelationshipSets(self):
+        """After loading an instance with a shared DTS, its own links (such as footnote links) or documents discovered
+        by the instance may have added to base sets, shared relationship sets of their arcroles are no longer applicable
+        """
+        changedArcroles = set(baseSetKey[0]
+                              for baseSetKey, modelLinks in self.baseSets.items()
+                              if len(modelLinks) != self.sharedBaseSetLengths.get(baseSetKey, 0))
+        if changedArcroles:
+            for relSetKey, relSet in list(self.relationshipSets.items()):
+                if relSet in self.sharedRelationshipSets and relationshipSetHasArcroles(relSetKey[0], changedArcroles):
+                    del self.relationshipSets[relSetKey]
+                    self.sharedRelationshipSets.discard(relSet)
+        del self.sharedBaseSetLengths
+            
     @property
     def isClosed(self):
         """
@@ -384,6 +540,20 @@ class ModelXbrl:
             ModelRelationshipSet.create(self, arcrole, linkrole, linkqname, arcqname, includeProhibits)
         return self.relationshipSets[key]
     
+    def preResolveLabels(self, lang=None, linkrole=None):
+        """Resolves all concept labels of the label linkbase(s) in one language, which subsequent 
+        concept label requests (such as by views and reports) obtain without resolving again.
+        
+        :param lang: Language of labels (defaults to modelManager's default language)
+        :type lang: str
+        :param linkrole: Linkrole of label relationships (wild if None)
+        :type linkrole: str
+        :returns: dict -- label text by (concept, label role)
+        """
+        if lang is None:
+            lang = self.modelManager.defaultLang
+        return self.relationshipSet(XbrlConst.conceptLabel, linkrole).preResolveLabels(lang)
+    
     def baseSetModelLink(self, linkElement):
         for modelLink in self.baseSets[("XBRL-footnotes",None,None,None)]:
             if modelLink == linkElement:
@@ -460,6 +630,8 @@ class ModelXbrl:
             del self.undefinedFacts[:]
             self.contexts.clear()
             self.units.clear()
+            self.clearMatchIndexes()
+            self.clearFactIndexes()
             self.modelDocument.idObjects.clear
             del self.modelDocument.hrefObjects[:]
             self.modelDocument.schemaLocationElements.clear()
@@ -534,7 +706,13 @@ class ModelXbrl:
         from arelle.XbrlUtil import sEqual
         if dims: segAspect, scenAspect = (Aspect.NON_XDT_SEGMENT, Aspect.NON_XDT_SCENARIO)
         else: segAspect, scenAspect = (Aspect.COMPLETE_SEGMENT, Aspect.COMPLETE_SCENARIO)
-        for c in self.contexts.values():
+        # probe the contexts with the same entity, period and dimension members, then compare exactly
+        for c in self.contextMatchIndex.get(contextMatchKey((entityIdentScheme, entityIdentValue),
+                                                            contextMatchPeriodKey(periodType, periodStart, periodEndInstant),
+                                                            None if dims is None else dims.items()), ()):
+            if self.contexts.get(c.id) is not c: # replaced or removed without clearMatchIndexes
+                self.clearMatchIndexes()
+                return self.matchContext(entityIdentScheme, entityIdentValue, periodType, periodStart, periodEndInstant, dims, segOCCs, scenOCCs)
             if (c.entityIdentifier == (entityIdentScheme, entityIdentValue) and
                 ((c.isInstantPeriod and periodType == "instant" and dateUnionEqual(c.instantDatetime, periodEndInstant, instantEndDate=True)) or
                  (c.isStartEndPeriod and periodType == "duration" and dateUnionEqual(c.startDatetime, periodStart) and dateUnionEqual(c.endDatetime, periodEndInstant, instantEndDate=True)) or
@@ -552,6 +730,48 @@ class ModelXbrl:
                 ):
                     return c
         return None
+    
+    @property
+    def contextMatchIndex(self):
+        """Contexts indexed by their entity, period and dimension member aspects (for matchContext), 
+        built on first use, extended as contexts are discovered and rebuilt after clearMatchIndexes
+        
+        :returns: dict -- lists of contexts by contextMatchKey, both with and without dimensions keys
+        """
+        index = self._contextMatchIndex
+        if index is None:
+            index = self._contextMatchIndex = defaultdict(list)
+            for c in self.contexts.values():
+                self._indexContextMatch(c)
+        return index
+    
+    def clearMatchIndexes(self):
+        """Invalidates the context and unit indexes of matchContext and matchUnit, to be called when
+        contexts or units are removed or changed other than by discovery (they are rebuilt on next use)
+        """
+        self._contextMatchIndex = self._unitMatchIndex = None
+    
+    def contextDiscovered(self, c):
+        # keep the match index (if built) current as contexts are discovered, such as by createContext
+        if self._contextMatchIndex is not None:
+            self._indexContextMatch(c)
+    
+    def unitDiscovered(self, u):
+        if self._unitMatchIndex is not None:
+            self._unitMatchIndex.setdefault(u.measures, u)
+    
+    def _indexContextMatch(self, c):
+        if c.isInstantPeriod:
+            periodKey = contextMatchPeriodKey("instant", None, c.instantDatetime)
+        elif c.isStartEndPeriod:
+            periodKey = contextMatchPeriodKey("duration", c.startDatetime, c.endDatetime)
+        elif c.isForeverPeriod:
+            periodKey = contextMatchPeriodKey("forever", None, None)
+        else:
+            periodKey = None
+        entityIdentifier = c.entityIdentifier
+        self._contextMatchIndex[contextMatchKey(entityIdentifier, periodKey, None)].append(c)
+        self._contextMatchIndex[contextMatchKey(entityIdentifier, periodKey, c.qnameDims.items())].append(c)
                  
     def createContext(self, entityIdentScheme, entityIdentValue, periodType, periodStart, periodEndInstant, priItem, dims, segOCCs, scenOCCs,
                       afterSibling=None, beforeSibling=None, id=None):
@@ -676,12 +896,16 @@ class ModelXbrl:
         :type divideBy: [QName]
         :returns: ModelUnit -- Matching unit object or None
         """
-        _multiplyBy = tuple(sorted(multiplyBy))
-        _divideBy = tuple(sorted(divideBy))
-        for u in self.units.values():
-            if u.measures == (_multiplyBy,_divideBy):
-                return u
-        return None
+        index = self._unitMatchIndex
+        if index is None:
+            index = self._unitMatchIndex = {}
+            for u in self.units.values():
+                index.setdefault(u.measures, u) # first unit of instance having the measures
+        u = index.get((tuple(sorted(multiplyBy)), tuple(sorted(divideBy))))
+        if u is not None and self.units.get(u.id) is not u: # replaced or removed without clearMatchIndexes
+            self.clearMatchIndexes()
+            return self.matchUnit(multiplyBy, divideBy)
+        return u
 
     def createUnit(self, multiplyBy, divideBy, afterSibling=None, beforeSibling=None, id=None):
         """Creates new unit, by measures, as in formula usage, if any
@@ -832,6 +1056,29 @@ class ModelXbrl:
                     else: # default typed dimension
                         fbdq[DEFAULT].add(fact)
             return fbdq[memQname]
+
+    def factsByTypedDimValue(self, dimQname, typedMemberKey):
+        """Facts in the instance indexed by their typed Dimension QName and typed member canonical value, cached
+
+        :param typedMemberKey: typedMemberKey of a ModelDimensionValue (of this or another instance)
+        :returns: set -- ModelFacts whose typed dimension value is XPath-equal to the typed member of typedMemberKey
+        """
+        try:
+            return self._factsByTypedDimValue[dimQname][typedMemberKey]
+        except AttributeError:
+            self._factsByTypedDimValue = {}
+            return self.factsByTypedDimValue(dimQname, typedMemberKey)
+        except KeyError:
+            if dimQname in self._factsByTypedDimValue:
+                return set() # no facts have this typed member value
+            self._factsByTypedDimValue[dimQname] = fbtv = {}
+            for fact in self.factsByDimMemQname(dimQname, NONDEFAULT):
+                dimValue = fact.context.dimValue(dimQname)
+                if dimValue.isTyped:
+                    key = dimValue.typedMemberKey
+                    if key is not None:
+                        fbtv.setdefault(key, set()).add(fact)
+            return fbtv.get(typedMemberKey, set())
         
     def matchFact(self, otherFact, unmatchedFactsStack=None, deemP0inf=False, matchId=False, matchLang=True):
         """Finds matching fact, by XBRL 2.1 duplicate definition (if tuple), or by
@@ -842,24 +1089,47 @@ class ModelXbrl:
         :deemP0inf: boolean for formula validation to deem P0 facts to be VEqual as if they were P=INF
         :returns: ModelFact -- Matching fact or None
         """
-        for fact in self.facts:
-            if not matchId or otherFact.id == fact.id:
-                if (fact.isTuple):
-                    if otherFact.isDuplicateOf(fact, unmatchedFactsStack=unmatchedFactsStack):
-                        return fact
-                elif (fact.qname == otherFact.qname and fact.isVEqualTo(otherFact, deemP0inf=deemP0inf)):
-                    if fact.isFraction:
-                        return fact
-                    elif fact.isMultiLanguage and matchLang:
-                        if fact.xmlLang == otherFact.xmlLang:
-                            return fact
-                        # else: print('*** lang mismatch extracted "{}" expected "{}" on {} in {}'.format(fact.xmlLang or "", otherFact.xmlLang or "", fact.qname, otherFact.modelDocument.uri))
-                    else:
-                        if (fact.decimals == otherFact.decimals and
-                            fact.precision == otherFact.precision):
-                            return fact
-        return None
-            
+        return self.factMatchIndex.matchFact(otherFact, unmatchedFactsStack, deemP0inf=deemP0inf, matchId=matchId, matchLang=matchLang)
+    
+    @property
+    def factMatchIndex(self):
+        """Facts of the instance bucketed by aspects for matching facts of other instances, built on first use
+        (and rebuilt after clearFactIndexes)
+        
+        :returns: FactMatcher.FactMatchIndex
+        """
+        try:
+            return self._factMatchIndex
+        except AttributeError:
+            pass
+        from arelle.FactMatcher import FactMatchIndex
+        self._factMatchIndex = FactMatchIndex(self)
+        return self._factMatchIndex
+
+    @property
+    def duplicateFactIndex(self):
+        """Duplicate fact sets of the instance, classified as complete, consistent, inconsistent
+        or multi-language, built on first use (and rebuilt after clearFactIndexes)
+
+        :returns: DuplicateFacts.DuplicateFactIndex
+        """
+        try:
+            return self._duplicateFactIndex
+        except AttributeError:
+            pass
+        from arelle.DuplicateFacts import DuplicateFactIndex
+        self._duplicateFactIndex = DuplicateFactIndex(self)
+        return self._duplicateFactIndex
+
+    def clearFactIndexes(self):
+        """Invalidates the fact indexes built on first use (factMatchIndex and duplicateFactIndex), to be
+        called when facts are created, changed or removed (they are rebuilt on next use)
+        """
+        if hasattr(self, "_factMatchIndex"):
+            del self._factMatchIndex
+        if hasattr(self, "_duplicateFactIndex"):
+            del self._duplicateFactIndex
+        
     def createFact(self, conceptQname, attributes=None, text=None, parent=None, afterSibling=None, beforeSibling=None, validate=True):
         """Creates new fact, as in formula output instance creation, and validates into object model
         
@@ -894,6 +1164,7 @@ class ModelXbrl:
             XmlValidate.validate(self, newFact)
         self.modelDocument.factDiscover(newFact, parentElement=parent)
         # update cached sets
+        self.clearFactIndexes()
         if not newFact.isNil and hasattr(self, "_nonNilFactsInInstance"):
             self._nonNilFactsInInstance.add(newFact)
         if newFact.concept is not None:
@@ -903,6 +1174,8 @@ class ModelXbrl:
                 self._factsByPeriodType[newFact.concept.periodType].add(newFact)
             if hasattr(self, "_factsByDimQname"):
                 del self._factsByDimQname
+            if hasattr(self, "_factsByTypedDimValue"):
+                del self._factsByTypedDimValue
         self.setIsModified()
         return newFact    
         
@@ -1222,21 +1495,41 @@ class ModelXbrl:
         5xx validation
         6xx formula
         '''
-        if self.modelManager.collectProfileStats:
+        tracer = self.modelManager.tracer
+        if self.modelManager.collectProfileStats or tracer is not None:
             import time
             global profileStatNumber
             try:
                 if name:
                     thisTime = stat if stat is not None else time.time() - self._startedTimeStat
-                    mem = self.modelXbrl.modelManager.cntlr.memoryUsed
-                    prevTime = self.profileStats.get(name, (0,0,0))[1]
-                    self.profileStats[name] = (profileStatNumber, thisTime + prevTime, mem)
-                    profileStatNumber += 1
+                    if tracer is not None and stat is None: # interval since prior profileStat, traced as a span
+                        tracer.complete(name, "profileStat", thisTime)
+                    if self.modelManager.collectProfileStats:
+                        mem = self.modelXbrl.modelManager.cntlr.memoryUsed
+                        prevTime = self.profileStats.get(name, (0,0,0))[1]
+                        self.profileStats[name] = (profileStatNumber, thisTime + prevTime, mem)
+                        profileStatNumber += 1
             except AttributeError:
                 pass
             if stat is None:
                 self._startedTimeStat = time.time()
         
+    def traceSpan(self, name, category="arelle", **attributes):
+        """Returns a context manager timing a span of processing, nested in the span in progress, when 
+        modelManager.tracer is recording spans (for Chrome trace or flame graph output), otherwise a
+        shared span which does nothing.
+        
+        :param name: Span name, such as parse, discover, validate or a variable set id
+        :type name: str
+        :param category: Span category, such as load, validation, formula or rendering
+        :type category: str
+        :param attributes: Span attributes, such as url, which may be added to by span.set(...)
+        """
+        tracer = self.modelManager.tracer
+        if tracer is None:
+            return NO_SPAN
+        return tracer.span(name, category, attributes)
+        
     def profileActivity(self, activityCompleted=None, minTimeToShow=0):
         """Used to provide interactive GUI messages of long-running processes.
         
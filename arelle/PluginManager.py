@@ -28,6 +28,8 @@ pluginMethodsForClasses = {}
 _cntlr = None
 _pluginBase = None
 EMPTYLIST = []
+_moduleInfoCache = None # scanned moduleInfos by moduleURL, saved in pluginInfoCache.json of userAppDir
+_moduleInfoScanDepth = 0
 
 def init(cntlr, loadPluginConfig=True):
     global pluginJsonFile, pluginConfig, modulePluginInfos, pluginMethodsForClasses, pluginConfigChanged, _cntlr, _pluginBase
@@ -173,7 +175,67 @@ def freshenModuleInfos():
             else:
                 print(_msg, file=sys.stderr)
 
+def moduleInfoFileDate(moduleURL):
+    # file date of module source (as in moduleInfo fileDate), None if not a readable file
+    moduleFilename = _cntlr.webCache.getfilename(moduleURL, normalize=True, base=_pluginBase)
+    if moduleFilename:
+        if os.path.isdir(moduleFilename):
+            moduleFilename = os.path.join(moduleFilename, "__init__.py")
+        elif not moduleFilename.endswith(".py") and not os.path.exists(moduleFilename) and os.path.exists(moduleFilename + ".py"):
+            moduleFilename += ".py" # extension module without .py suffix
+        if os.path.isfile(moduleFilename):
+            return time.strftime('%Y-%m-%dT%H:%M:%S UTC', time.gmtime(os.path.getmtime(moduleFilename)))
+    return None
+
+def moduleInfoIsCurrent(moduleInfo):
+    return (moduleInfo.get("fileDate") == moduleInfoFileDate(moduleInfo["moduleURL"]) and
+            all(moduleInfoIsCurrent(importModuleInfo) for importModuleInfo in moduleInfo.get("imports", EMPTYLIST)))
+
+def moduleInfoCache():
+    global _moduleInfoCache
+    if _moduleInfoCache is None:
+        _moduleInfoCache = {}
+        if _cntlr.hasFileSystem:
+            try:
+                with io.open(os.path.join(_cntlr.userAppDir, "pluginInfoCache.json"), 'rt', encoding='utf-8') as f:
+                    _moduleInfoCache = json.load(f)
+            except Exception:
+                pass # no cache yet or unreadable, rebuilt as modules are scanned
+    return _moduleInfoCache
+
+def saveModuleInfoCache():
+    if _cntlr.hasFileSystem:
+        try:
+            with io.open(os.path.join(_cntlr.userAppDir, "pluginInfoCache.json"), 'wt', encoding='utf-8') as f:
+                f.write(_STR_UNICODE(json.dumps(_moduleInfoCache, ensure_ascii=False)))
+        except Exception:
+            pass # cache is an optimization, plug-in info is rescanned if not saved
+
 def moduleModuleInfo(moduleURL, reload=False, parentImportsSubtree=False):
+    ''' Returns moduleInfo of plug-in at moduleURL (and its imported plug-ins).
+    
+    Plug-in source files are AST-parsed to obtain their __pluginInfo__ without executing them; the result
+    is cached (in memory and in pluginInfoCache.json of userAppDir) and reused while the file dates of the
+    module and its imports are unchanged, so command line invocations naming plug-ins don't re-parse them.
+    '''
+    global _moduleInfoScanDepth
+    cacheKey = moduleURL + ("#importsSubtree" if parentImportsSubtree else "")
+    if not reload:
+        moduleInfo = moduleInfoCache().get(cacheKey)
+        if moduleInfo is not None and moduleInfoIsCurrent(moduleInfo):
+            return json.loads(json.dumps(moduleInfo)) # copy, callers modify moduleInfos
+    _moduleInfoScanDepth += 1
+    try:
+        moduleInfo = scanModuleInfo(moduleURL, reload, parentImportsSubtree)
+    finally:
+        _moduleInfoScanDepth -= 1
+    if moduleInfo is not None and moduleInfo.get("fileDate"):
+        moduleInfoCache()[cacheKey] = json.loads(json.dumps(moduleInfo))
+        if _moduleInfoScanDepth == 0: # save once imported modules have been scanned
+            saveModuleInfoCache()
+    return moduleInfo
+
+def scanModuleInfo(moduleURL, reload=False, parentImportsSubtree=False):
     #TODO several directories, eg User Application Data
     moduleFilename = _cntlr.webCache.getfilename(moduleURL, reload=reload, normalize=True, base=_pluginBase)
     if moduleFilename:
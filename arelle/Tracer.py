@@ -0,0 +1,196 @@
+'''
+Created on Oct 19, 2026
+
+Tracer: records nested timed spans of processing (loading, discovery and parsing of each
+document, validation phases, formula variable sets, table rendering, database storage) with
+their attributes, and saves them as Chrome trace event json (for chrome://tracing or Perfetto)
+or as folded stacks for flame graph tools.
+
+@author: Arelle contributors
+(c) Copyright 2026 Arelle contributors, licensed under the Apache License, Version 2.0 (see License.txt).
+'''
+import io, json, os, threading, time
+from collections import defaultdict, OrderedDict
+
+class Span:
+    ''' A timed span, used as a context manager (with modelXbrl.traceSpan(name, category, **attributes) as span:)
+        or by span.begin() and span.end()
+    '''
+    __slots__ = ("tracer", "name", "category", "attributes", "startedAt", "duration", "parent", "threadId", "children")
+    def __init__(self, tracer, name, category, attributes):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.attributes = attributes
+        self.startedAt = None
+        self.duration = None
+        self.parent = None
+        self.threadId = None
+        self.children = None # completed child spans, while open
+
+    def __enter__(self):
+        return self.begin()
+
+    def __exit__(self, excType, excValue, traceback):
+        if excType is not None:
+            self.attributes["exception"] = excType.__name__
+        self.end()
+        return False
+
+    def begin(self):
+        ''' Starts the span, for spans not used as a context manager (an exception before end abandons the span)
+        '''
+        self.tracer.begin(self)
+        return self
+
+    def end(self):
+        self.tracer.end(self)
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+class NoSpan:
+    ''' Shared span returned when not tracing, does nothing
+    '''
+    __slots__ = ()
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        return False
+
+    def begin(self):
+        return self
+
+    def end(self):
+        pass
+
+    def set(self, **attributes):
+        pass
+
+NO_SPAN = NoSpan()
+
+class Tracer:
+    ''' Collects spans; modelManager.tracer when tracing (None when not tracing, so ModelXbrl.traceSpan
+        costs an attribute test and returns NO_SPAN).
+    '''
+    def __init__(self):
+        self.spans = [] # completed spans, in order of completion
+        self.openSpans = {} # per thread, stack of open spans
+        self.rootSpans = {} # per thread, completed spans not nested in another span
+        self.startedAt = time.perf_counter()
+
+    def span(self, name, category, attributes):
+        return Span(self, name, category, attributes)
+
+    def threadStack(self):
+        threadId = threading.get_ident()
+        try:
+            return threadId, self.openSpans[threadId]
+        except KeyError:
+            self.rootSpans[threadId] = []
+            stack = self.openSpans[threadId] = []
+            return threadId, stack
+
+    def begin(self, span):
+        span.threadId, stack = self.threadStack()
+        if stack:
+            span.parent = stack[-1]
+        span.children = []
+        stack.append(span)
+        span.startedAt = time.perf_counter()
+
+    def end(self, span):
+        span.duration = time.perf_counter() - span.startedAt
+        stack = self.openSpans[span.threadId]
+        if span in stack: # spans opened within this span and not ended are abandoned
+            while stack.pop() is not span:
+                pass
+        self.completed(span, stack)
+
+    def complete(self, name, category, duration, attributes=None):
+        ''' Adds a span of an interval ending now (such as of a profileStat), the completed spans
+            started within the interval become its children.
+        '''
+        endedAt = time.perf_counter()
+        threadId, stack = self.threadStack()
+        span = Span(self, name, category, attributes or {})
+        span.threadId = threadId
+        span.startedAt = endedAt - duration
+        if stack:
+            span.parent = stack[-1]
+            span.startedAt = max(span.startedAt, span.parent.startedAt)
+            siblings = span.parent.children
+        else:
+            siblings = self.rootSpans[threadId]
+        i = len(siblings)
+        while i > 0 and siblings[i-1].startedAt >= span.startedAt:
+            i -= 1
+        if len(siblings) - i == 1 and siblings[i].name == name:
+            return # interval already traced by a span of this name
+        span.duration = endedAt - span.startedAt
+        span.children = siblings[i:]
+        for child in span.children:
+            child.parent = span
+        del siblings[i:]
+        self.completed(span, stack)
+
+    def completed(self, span, stack):
+        span.children = None
+        if stack:
+            stack[-1].children.append(span)
+        else:
+            self.rootSpans[span.threadId].append(span)
+        self.spans.append(span)
+
+    def chromeTrace(self):
+        pid = os.getpid()
+        events = []
+        for span in sorted(self.spans, key=lambda s: s.startedAt):
+            event = OrderedDict((("name", span.name),
+                                 ("cat", span.category),
+                                 ("ph", "X"),
+                                 ("ts", round((span.startedAt - self.startedAt) * 1000000.0, 1)),
+                                 ("dur", round(span.duration * 1000000.0, 1)),
+                                 ("pid", pid),
+                                 ("tid", span.threadId)))
+            if span.attributes:
+                event["args"] = span.attributes
+            events.append(event)
+        return OrderedDict((("traceEvents", events),
+                            ("displayTimeUnit", "ms")))
+
+    def foldedStacks(self):
+        # lines of semicolon separated span names and the span's own (exclusive) microseconds
+        childrenTime = defaultdict(float)
+        for span in self.spans:
+            if span.parent is not None:
+                childrenTime[span.parent] += span.duration
+        stackTimes = OrderedDict()
+        for span in self.spans:
+            names = []
+            s = span
+            while s is not None:
+                names.append(s.name.replace(";", ","))
+                s = s.parent
+            stack = ";".join(reversed(names))
+            stackTimes[stack] = stackTimes.get(stack, 0.0) + max(0.0, span.duration - childrenTime[span])
+        return ["{} {}".format(stack, int(round(t * 1000000.0)))
+                for stack, t in stackTimes.items()]
+
+    def save(self, traceFile):
+        ''' Saves Chrome trace event json if traceFile is .json, otherwise flame graph folded stacks.
+            Returns the number of spans saved.
+        '''
+        if traceFile.endswith(".json"):
+            with io.open(traceFile, "w", encoding="utf-8") as fh:
+                fh.write(json.dumps(self.chromeTrace(), default=str))
+        else:
+            with io.open(traceFile, "w", encoding="utf-8") as fh:
+                fh.write("\n".join(self.foldedStacks()) + "\n")
+        return len(self.spans)
+
+    def close(self):
+        self.spans = []
+        self.openSpans.clear()
+        self.rootSpans.clear()
@@ -6,9 +6,9 @@ Created on Oct 17, 2010
 '''
 import os, sys, traceback, re, logging
 from collections import defaultdict, OrderedDict
-from arelle import (FileSource, ModelXbrl, ModelDocument, ModelVersReport, XbrlConst, 
-               ValidateXbrl, ValidateFiling, ValidateHmrc, ValidateVersReport, ValidateFormula,
-               ValidateInfoset, RenderingEvaluator, ViewFileRenderedGrid, UrlUtil)
+from arelle import (FileSource, ModelXbrl, ModelDocument, XbrlConst, 
+               ValidateXbrl, ValidateFiling, ValidateHmrc, ValidateFormula, UrlUtil)
+# versioning report, infoset and rendering modules are imported when used (not at startup)
 from arelle.ModelDocument import Type, ModelDocumentReference, load as modelDocumentLoad
 from arelle.ModelDtsObject import ModelResource
 from arelle.ModelInstanceObject import ModelFact
@@ -100,6 +100,7 @@ class Validate:
                     exc_info=True)
         elif self.modelXbrl.modelDocument.type == Type.VERSIONINGREPORT:
             try:
+                from arelle import ValidateVersReport
                 ValidateVersReport.ValidateVersReport(self.modelXbrl).validate(self.modelXbrl)
             except Exception as err:
                 self.modelXbrl.error("exception:" + type(err).__name__,
@@ -258,6 +259,7 @@ class Validate:
                     elif resultIsVersioningReport or resultIsTaxonomyPackage:
                         inputDTSes[dtsName] = modelXbrl
                     elif modelXbrl.modelDocument.type == Type.VERSIONINGREPORT:
+                        from arelle import ValidateVersReport
                         ValidateVersReport.ValidateVersReport(self.modelXbrl).validate(modelXbrl)
                         self.determineTestStatus(modelTestcaseVariation, modelXbrl.errors)
                         modelXbrl.close()
@@ -290,10 +292,12 @@ class Validate:
                     if os.path.exists(versReportFile): #validate existing
                         modelVersReport = ModelXbrl.load(self.modelXbrl.modelManager, versReportFile, _("validating existing version report"))
                         if modelVersReport and modelVersReport.modelDocument and modelVersReport.modelDocument.type == Type.VERSIONINGREPORT:
+                            from arelle import ValidateVersReport
                             ValidateVersReport.ValidateVersReport(self.modelXbrl).validate(modelVersReport)
                             self.determineTestStatus(modelTestcaseVariation, modelVersReport.errors)
                             modelVersReport.close()
                     elif len(inputDTSes) == 2:
+                        from arelle import ModelVersReport
                         ModelVersReport.ModelVersReport(self.modelXbrl).diffDTSes(
                               versReportFile, inputDTSes["from"], inputDTSes["to"])
                         modelTestcaseVariation.status = "generated"
@@ -340,6 +344,7 @@ class Validate:
                             unexpectedDataFiles=", ".join(sorted(os.path.basename(f) for f in foundDataFiles - expectedDataFiles)))
                     if modelXbrl.hasTableRendering or modelTestcaseVariation.resultIsTable:
                         try:
+                            from arelle import RenderingEvaluator
                             RenderingEvaluator.init(modelXbrl)
                         except Exception as err:
                             modelXbrl.error("exception:" + type(err).__name__,
@@ -371,6 +376,7 @@ class Validate:
                                 file=os.path.basename(modelTestcaseVariation.resultXbrlInstance))
                             modelTestcaseVariation.status = "result infoset not loadable"
                         else:   # check infoset
+                            from arelle import ValidateInfoset
                             ValidateInfoset.validate(self.instValidator, modelXbrl, infoset)
                         infoset.close()
                     if modelXbrl.hasTableRendering or modelTestcaseVariation.resultIsTable: # and self.modelXbrl.modelManager.validateInfoset:
@@ -379,6 +385,7 @@ class Validate:
                         if not any(alternativeValidation(modelXbrl, resultTableUri)
                                    for alternativeValidation in pluginClassMethods("Validate.TableInfoset")):
                             try:
+                                from arelle import ViewFileRenderedGrid
                                 ViewFileRenderedGrid.viewRenderedGrid(modelXbrl, resultTableUri, diffToFile=True)  # false to save infoset files
                             except Exception as err:
                                 modelXbrl.error("exception:" + type(err).__name__,
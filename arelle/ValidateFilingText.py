@@ -6,7 +6,8 @@ Created on Oct 17, 2010
 '''
 #import xml.sax, xml.sax.handler
 from lxml.etree import XML, DTD, SubElement, _ElementTree, _Comment, _ProcessingInstruction, XMLSyntaxError, XMLParser
-import os, re, io
+import os, re, io, codecs, hashlib
+from arelle import XmlUtil
 from arelle.XbrlConst import ixbrlAll, xhtml
 from arelle.XmlUtil import setXmlns, xmlstring
 from arelle.ModelObject import ModelObject
@@ -416,16 +417,103 @@ def initModelDocumentTypeReferences():
         ModelDocumentTypeINLINEXBRL = Type.INLINEXBRL
         ModelDocumentTypeINLINEXBRLDOCUMENTSET = Type.INLINEXBRLDOCUMENTSET
 
+# screening of file text in its encoded bytes (for encodings where ascii bytes are only ascii characters):
+# candidates start at a disallowed ascii character, '&' or a run of non-ascii bytes, each candidate is decoded
+# and rescanned by docCheckPattern, giving the same matches as scanning the decoded text
+docCheckBytesPattern = re.compile(rb"[^0-9A-Za-z`~!@#$%\*\(\)\.\-+ \[\]\{\}\|\\:;\"'<>,_?/=\t\n\r\f][\x80-\xff]*")
+entityBytesPattern = re.compile(rb"&(?:\w|[\x80-\xff])+;")
+inlineBytesPattern = re.compile(rb"xmlns:[\w.-]+=['\"]http://www.xbrl.org/2013/inlineXBRL['\"]")
+inlineSelfClosedElementBytesPattern = re.compile(rb"<(([\w.-]+:)?(\w+))([^\w/][^<]*)?/>")
+SCREEN_VERSION = "1" # change when screening rules change, to invalidate clean hashes of prior versions
+SCREENED_CLEAN_CACHE_FILE = "screenedCleanFileHashes.txt"
+MAX_SCREENED_CLEAN_HASHES = 100000
+_screenedCleanHashes = None # hashes of file contents screened without messages, saved in userAppDir
+
+def screenedCleanHashes(cntlr):
+    global _screenedCleanHashes
+    if _screenedCleanHashes is None:
+        _screenedCleanHashes = set()
+        if cntlr.hasFileSystem:
+            cacheFile = os.path.join(cntlr.userAppDir, SCREENED_CLEAN_CACHE_FILE)
+            try:
+                with io.open(cacheFile, 'rt', encoding='utf-8') as f:
+                    hashes = f.read().split()
+                if len(hashes) > MAX_SCREENED_CLEAN_HASHES: # keep most recently screened
+                    hashes = hashes[-(MAX_SCREENED_CLEAN_HASHES // 2):]
+                    with io.open(cacheFile, 'wt', encoding='utf-8') as f:
+                        f.write("".join(h + "\n" for h in hashes))
+                _screenedCleanHashes.update(hashes)
+            except Exception:
+                pass # no cache yet or unreadable
+    return _screenedCleanHashes
+
+def saveScreenedCleanHash(cntlr, contentHash):
+    screenedCleanHashes(cntlr).add(contentHash)
+    if cntlr.hasFileSystem:
+        try:
+            with io.open(os.path.join(cntlr.userAppDir, SCREENED_CLEAN_CACHE_FILE), 'at', encoding='utf-8') as f:
+                f.write(contentHash + "\n")
+        except Exception:
+            pass # cache is an optimization, file is screened again if not saved
+
+def isByteScannable(encoding):
+    # ascii bytes never occur within multi-byte characters (and runs of non-ascii bytes are whole characters)
+    try:
+        name = codecs.lookup(encoding).name
+    except LookupError:
+        return False
+    return name in ("utf-8", "utf-8-sig", "ascii", "iso8859-1", "latin-1") or name.startswith(("iso8859-", "cp125"))
+
+def selfClosedElementMatches(content, pattern):
+    # matches of inlineSelfClosedElementPattern, as by pattern.finditer, but only trying the '<' positions which
+    # can start a match: a match has at most two '<' (its own and one directly after the element name), so
+    # its start is the last or next to last '<' before a "/>" in the match
+    opening, closing = ("<", "/>") if isinstance(content, str) else (b"<", b"/>")
+    triedStart = -1
+    matchEnd = 0
+    pos = content.find(closing)
+    while pos >= 0:
+        start = content.rfind(opening, 0, pos)
+        for tagStart in (content.rfind(opening, 0, start) if start > 0 else -1, start):
+            if tagStart > triedStart and tagStart >= matchEnd:
+                triedStart = tagStart
+                match = pattern.match(content, tagStart)
+                if match is not None:
+                    matchEnd = match.end()
+                    yield match
+        pos = content.find(closing, pos + 2)
+
 def checkfile(modelXbrl, filepath):
-    result = []
-    lineNum = 1
-    foundXmlDeclaration = False
-    isEFM = modelXbrl.modelManager.disclosureSystem.validationType == "EFM"
-    file, encoding = modelXbrl.fileSource.file(filepath)
+    """Screens file text for disallowed characters, entities and (inline) self-closed elements, in one
+    scan of the whole file, returning (file, encoding) for parsing the file contents.  Line and column
+    of a message are only determined for the matches reported.  Files whose contents were screened
+    without messages are remembered by content hash and default encoding (in userAppDir) and not
+    screened again.
+    """
+    disclosureSystem = modelXbrl.modelManager.disclosureSystem
+    isEFM = disclosureSystem.validationType == "EFM"
+    cntlr = modelXbrl.modelManager.cntlr
+    with modelXbrl.fileSource.file(filepath, binary=True)[0] as f:
+        b = f.read()
+    encoding = XmlUtil.encoding(b, default=None)
+    isEncodingDeclared = encoding is not None # declared or by byte-order mark
+    if not isEncodingDeclared:
+        encoding = disclosureSystem.defaultXmlEncoding or "utf-8"
     if isEFM and encoding == "utf-8-sig":
         modelXbrl.error("EFM.5.02.01.01",
             _("Disallowed byte-order mark in file %(file)s."),
             modelDocument=filepath, text="byte-order mark", unicodeIndex="U+FEFF", file=os.path.basename(filepath), line=1, column=1)
+    # lxml decodes bytes by declaration, byte-order mark or as utf-8, otherwise provide decoded text
+    if isEncodingDeclared or codecs.lookup(encoding).name == "utf-8":
+        parseFile = io.BytesIO(b) # shares buffer b, not a copy
+    else:
+        parseFile = io.StringIO(b.decode(encoding))
+    # screening depends on the default encoding (for files without a declaration), so it is part of the key
+    contentHash = "{}-{}-{}-{}".format(SCREEN_VERSION, "efm" if isEFM else "gfm",
+                                       disclosureSystem.defaultXmlEncoding or "utf-8", hashlib.sha256(b).hexdigest())
+    if contentHash in screenedCleanHashes(cntlr):
+        return (parseFile, encoding)
+
     parserResults = {}
     class checkFileType(object):
         def start(self, tag, attr, nsmap=None): # check root XML element type
@@ -438,69 +526,113 @@ def checkfile(modelXbrl, filepath):
         def end(self, tag): pass
         def data(self, data): pass
         def close(self): pass
-    _parser = XMLParser(huge_tree=True, target=checkFileType())
-    _isTestcase = False
-    mayBeInline = isInline = False
-    
-    with file as f:
+    # parse only up to the root element
+    _parser = XMLParser(huge_tree=True, target=checkFileType(), encoding=None if isEncodingDeclared else encoding)
+    try:
+        for i in range(0, len(b), 65536):
+            _parser.feed(b[i:i+65536])
+            if "rootIsTestcase" in parserResults: # root XML element has been encountered
+                break
+    except XMLSyntaxError:
+        pass # reported by parsing of the document
+    _isTestcase = parserResults.get("rootIsTestcase", False)
+    isInline = "isInline" in parserResults
+
+    # scan encoded bytes if possible, otherwise decoded text; positions are of the scanned content
+    isByteScan = isByteScannable(encoding)
+    if isByteScan:
+        content = b
+        scanEncoding = "utf-8" if encoding == "utf-8-sig" else encoding # U+FEFF after start is a character
+        contentStart = 3 if b.startswith(codecs.BOM_UTF8) else 0
+        cr, lf = b"\r", b"\n"
+        _inlinePattern = inlineBytesPattern
+        _selfClosedElementPattern = inlineSelfClosedElementBytesPattern
+    else:
+        content = b.decode(encoding)
+        contentStart = 0
+        cr, lf = "\r", "\n"
+        _inlinePattern = inlinePattern
+        _selfClosedElementPattern = inlineSelfClosedElementPattern
+    if not isInline and "maybeInline" in parserResults:
+        isInline = _inlinePattern.search(content) is not None
+    def contentText(s):
+        return s.decode(scanEncoding, "replace") if isByteScan else s
+
+    lineNum = 1
+    lineScanned = 0
+    crlf = cr + lf
+    def lineColumn(pos): # line and column of content position, positions must be requested in ascending order
+        nonlocal lineNum, lineScanned
+        # lines end with \r\n, \r or \n, as for universal newlines
+        lineNum += (content.count(lf, lineScanned, pos) + content.count(cr, lineScanned, pos) -
+                    content.count(crlf, lineScanned, pos))
+        lineScanned = pos
+        lineStart = max(content.rfind(lf, 0, pos) + 1, content.rfind(cr, 0, pos) + 1, contentStart)
+        return lineNum, len(contentText(content[lineStart:pos]))
+
+    def byteCandidates():
+        pos = contentStart
         while True:
-            line = f.readline()
-            if line == "":
-                break;
-            # check for disallowed characters or entity codes
-            for match in docCheckPattern.finditer(line):
-                text = match.group()
-                if text.startswith("&"):
-                    if not text in xhtmlEntities:
-                        modelXbrl.error(("EFM.5.02.02.06", "GFM.1.01.02"),
-                            _("Disallowed entity code %(text)s in file %(file)s line %(line)s column %(column)s"),
-                            modelDocument=filepath, text=text, file=os.path.basename(filepath), line=lineNum, column=match.start())
-                elif isEFM and not _isTestcase:
-                    if len(text) == 1:
-                        modelXbrl.error("EFM.5.02.01.01",
-                            _("Disallowed character '%(text)s' (%(unicodeIndex)s) in file %(file)s at line %(line)s col %(column)s"),
-                            modelDocument=filepath, text=text, unicodeIndex="U+{:04X}".format(ord(text)), 
-                            file=os.path.basename(filepath), line=lineNum, column=match.start())
-                    else:
-                        modelXbrl.error("EFM.5.02.01.01",
-                            _("Disallowed character '%(text)s' in file %(file)s at line %(line)s col %(column)s"),
-                            modelDocument=filepath, text=text, file=os.path.basename(filepath), line=lineNum, column=match.start())
-            if lineNum == 1:
-                xmlDeclarationMatch = XMLdeclaration.search(line)
-                if xmlDeclarationMatch: # remove it for lxml
-                    start,end = xmlDeclarationMatch.span()
-                    line = line[0:start] + line[end:]
-                    foundXmlDeclaration = True
-            if _parser: # feed line after removal of xml declaration
-                _parser.feed(line.encode('utf-8','ignore'))
-                if "rootIsTestcase" in parserResults: # root XML element has been encountered
-                    _isTestcase = parserResults["rootIsTestcase"]
-                    if "isInline" in parserResults:
-                        isInline = True
-                    elif "maybeInline" in parserResults:
-                        mayBeInline = True
-                    _parser = None # no point to parse past the root element
-            if mayBeInline and inlinePattern.search(line):
-                mayBeInline = False
-                isInline = True
-            if isInline:
-                for match in inlineSelfClosedElementPattern.finditer(line):
-                    selfClosedLocalName = match.group(3)
-                    if selfClosedLocalName not in elementsWithNoContent:
-                        modelXbrl.warning("ixbrl:selfClosedTagWarning",
-                                          _("Self-closed element \"%(element)s\" may contain text or other elements and should not use self-closing tag syntax (/>) when empty; change these to end-tags in file %(file)s line %(line)s column %(column)s"),
-                                          modelDocument=filepath, element=match.group(1), file=os.path.basename(filepath), line=lineNum, column=match.start())
-            result.append(line)
-            lineNum += 1
-    result = ''.join(result)
-    if not foundXmlDeclaration: # may be multiline, try again
-        xmlDeclarationMatch = XMLdeclaration.search(result)
-        if xmlDeclarationMatch: # remove it for lxml
-            start,end = xmlDeclarationMatch.span()
-            result = result[0:start] + result[end:]
-            foundXmlDeclaration = True
-
-    return (io.StringIO(initial_value=result), encoding)
+            match = docCheckBytesPattern.search(content, pos)
+            if match is None:
+                return
+            start = match.start()
+            if content[start] == 0x26: # &
+                match = entityBytesPattern.match(content, start)
+                if match is None: # not an entity code, '&' is allowed
+                    pos = start + 1
+                    continue
+            yield start, match.group().decode(scanEncoding, "replace")
+            pos = match.end()
+    if isByteScan:
+        candidates = byteCandidates()
+    else:
+        candidates = ((0, content),)
+    messages = [] # (line, order within line, message), logged in order of lines of the file
+    for candidatePos, candidateText in candidates:
+        for match in docCheckPattern.finditer(candidateText):
+            text = match.group()
+            if text.startswith("&"):
+                if text in xhtmlEntities:
+                    continue
+            elif not isEFM or _isTestcase:
+                continue
+            if isByteScan: # candidate position is in bytes, match column is within the candidate
+                line, column = lineColumn(candidatePos)
+                column += match.start()
+            else:
+                line, column = lineColumn(match.start())
+            messages.append((line, 0, text, column))
+    if isInline:
+        lineNum = 1
+        lineScanned = 0
+        for match in selfClosedElementMatches(content, _selfClosedElementPattern):
+            selfClosedLocalName = contentText(match.group(3))
+            if selfClosedLocalName not in elementsWithNoContent:
+                line, column = lineColumn(match.start())
+                messages.append((line, 1, contentText(match.group(1)), column))
+    messages.sort(key=lambda m: m[0:2]) # stable, matches of a line remain in column order
+    for line, isSelfClosed, text, column in messages:
+        if isSelfClosed:
+            modelXbrl.warning("ixbrl:selfClosedTagWarning",
+                              _("Self-closed element \"%(element)s\" may contain text or other elements and should not use self-closing tag syntax (/>) when empty; change these to end-tags in file %(file)s line %(line)s column %(column)s"),
+                              modelDocument=filepath, element=text, file=os.path.basename(filepath), line=line, column=column)
+        elif text.startswith("&"):
+            modelXbrl.error(("EFM.5.02.02.06", "GFM.1.01.02"),
+                _("Disallowed entity code %(text)s in file %(file)s line %(line)s column %(column)s"),
+                modelDocument=filepath, text=text, file=os.path.basename(filepath), line=line, column=column)
+        elif len(text) == 1:
+            modelXbrl.error("EFM.5.02.01.01",
+                _("Disallowed character '%(text)s' (%(unicodeIndex)s) in file %(file)s at line %(line)s col %(column)s"),
+                modelDocument=filepath, text=text, unicodeIndex="U+{:04X}".format(ord(text)), 
+                file=os.path.basename(filepath), line=line, column=column)
+        else:
+            modelXbrl.error("EFM.5.02.01.01",
+                _("Disallowed character '%(text)s' in file %(file)s at line %(line)s col %(column)s"),
+                modelDocument=filepath, text=text, file=os.path.basename(filepath), line=line, column=column)
+    if not messages:
+        saveScreenedCleanHash(cntlr, contentHash)
+    return (parseFile, encoding)
 
 def loadDTD(modelXbrl):
     global edbodyDTD, isInlineDTD
@@ -508,9 +640,14 @@ def loadDTD(modelXbrl):
     _isInline = modelXbrl.modelDocument.type == ModelDocumentTypeINLINEXBRL
     if isInlineDTD is None or isInlineDTD != _isInline:
         isInlineDTD = _isInline
-        with open(os.path.join(modelXbrl.modelManager.cntlr.configDir, 
-                               "xhtml1-strict-ix.dtd" if _isInline else "edbody.dtd")) as fh:
-            edbodyDTD = DTD(fh)
+        edbodyDTD = loadDTDfile(dtdFilePath(modelXbrl.modelManager.cntlr, _isInline))
+
+def dtdFilePath(cntlr, isInline):
+    return os.path.join(cntlr.configDir, "xhtml1-strict-ix.dtd" if isInline else "edbody.dtd")
+
+def loadDTDfile(dtdPath):
+    with open(dtdPath) as fh:
+        return DTD(fh)
         
 def removeEntities(text):
     ''' ARELLE-128
@@ -528,137 +665,190 @@ def removeEntities(text):
     '''
     return namedEntityPattern.sub("", text).replace('&','&amp;')
 
-def validateTextBlockFacts(modelXbrl):
-    #handler = TextBlockHandler(modelXbrl)
-    loadDTD(modelXbrl)
-    checkedGraphicsFiles = set() #  only check any graphics file reference once per fact
-    allowedExternalHrefPattern = modelXbrl.modelManager.disclosureSystem.allowedExternalHrefPattern
-    
+# findings of textBlockFindings, logged by validateTextBlockFacts in fact document order
+TB_ENTITY = 1            # (TB_ENTITY, entity)
+TB_DTD_ERROR = 2         # (TB_DTD_ERROR, isHtmlError, errorMessages)
+TB_ELEMENT = 3           # (TB_ELEMENT, element, sourceline)
+TB_ATTRIBUTE = 4         # (TB_ATTRIBUTE, element, attribute, value, sourceline)
+TB_JAVASCRIPT = 5        # (TB_JAVASCRIPT, element, attribute)
+TB_EXTERNAL_REF = 6      # (TB_EXTERNAL_REF, element, attribute)
+TB_GRAPHIC = 7           # (TB_GRAPHIC, element, graphic reference), once per graphic of each html text
+TB_NESTED_TABLE = 8      # (TB_NESTED_TABLE,)
+TB_XML_ERROR = 9         # (TB_XML_ERROR, error)
+
+MIN_TEXT_BLOCKS_PER_WORKER = 8 # fewer text blocks are validated serially, not worth worker startup
+
+class HtmlElementRef:
+    """Stands in for a text block html element (parsed apart from the instance) as a log modelObject, which 
+    only has a source line"""
+    __slots__ = ("sourceline",)
+    def __init__(self, sourceline):
+        self.sourceline = sourceline
+
+def textBlockFindings(value, allowedExternalHrefPattern):
+    """Parses and checks the html of a text block fact value, with the DTD last loaded by loadDTD (or 
+    initTextBlockWorker).  Has no model access so it can run in a worker process.
+
+    :returns: list -- finding tuples (TB_xxx, args...) in the order they are to be logged
+    """
+    findings = []
+    # test encoded entity tags
+    for match in namedEntityPattern.finditer(value):
+        entity = match.group()
+        if not entity in xhtmlEntities:
+            findings.append((TB_ENTITY, entity))
     if isInlineDTD:
         htmlBodyTemplate = "<body><div>\n{0}\n</div></body>\n"
     else:
         htmlBodyTemplate = "<body>\n{0}\n</body>\n"
     _xhtmlNs = "{{{}}}".format(xhtml)
     _xhtmlNsLen = len(_xhtmlNs)
+    # test html
+    for xmltext in [value] + CDATApattern.findall(value):
+        checkedGraphicsFiles = set() #  only check any graphics file reference once per html text
+        xmlBodyWithoutEntities = htmlBodyTemplate.format(removeEntities(xmltext))
+        try:
+            textblockXml = XML(xmlBodyWithoutEntities)
+            if not edbodyDTD.validate( textblockXml ):
+                errors = edbodyDTD.error_log.filter_from_errors()
+                htmlError = any(e.type_name in ("DTD_INVALID_CHILD", "DTD_UNKNOWN_ATTRIBUTE") 
+                                for e in errors)
+                findings.append((TB_DTD_ERROR, htmlError, ', '.join(e.message for e in errors)))
+            for elt in textblockXml.iter():
+                if isinstance(elt, (_ElementTree, _Comment, _ProcessingInstruction)):
+                    continue # comment or other non-parsed element
+                eltTag = elt.tag
+                if eltTag.startswith(_xhtmlNs):
+                    eltTag = eltTag[_xhtmlNsLen:]
+                if isInlineDTD and eltTag in efmBlockedInlineHtmlElements:
+                    findings.append((TB_ELEMENT, eltTag, elt.sourceline))
+                for attrTag, attrValue in elt.items():
+                    if isInlineDTD:
+                        if attrTag in efmBlockedInlineHtmlElementAttributes.get(eltTag,()):
+                            findings.append((TB_ATTRIBUTE, eltTag, attrTag, attrValue, elt.sourceline))
+                    if ((attrTag == "href" and eltTag == "a") or 
+                        (attrTag == "src" and eltTag == "img")):
+                        if "javascript:" in attrValue:
+                            findings.append((TB_JAVASCRIPT, eltTag, attrTag))
+                        elif eltTag == "a" and (not allowedExternalHrefPattern or allowedExternalHrefPattern.match(attrValue)):
+                            pass
+                        elif scheme(attrValue) in ("http", "https", "ftp"):
+                            findings.append((TB_EXTERNAL_REF, eltTag, attrTag))
+                        if attrTag == "src" and attrValue not in checkedGraphicsFiles:
+                            findings.append((TB_GRAPHIC, eltTag, attrValue))
+                            checkedGraphicsFiles.add(attrValue)
+                if eltTag == "table" and any(a is not None for a in elt.iterancestors("table")):
+                    findings.append((TB_NESTED_TABLE,))
+        except (XMLSyntaxError,
+                UnicodeDecodeError) as err:
+            #if not err.endswith("undefined entity"):
+            findings.append((TB_XML_ERROR, str(err)))
+    return findings
+
+_workerAllowedExternalHrefPattern = None
+
+def initTextBlockWorker(dtdPath, isInline, allowedExternalHrefPattern):
+    global edbodyDTD, isInlineDTD, _workerAllowedExternalHrefPattern
+    edbodyDTD = loadDTDfile(dtdPath)
+    isInlineDTD = isInline
+    _workerAllowedExternalHrefPattern = allowedExternalHrefPattern
     
-    for f1 in modelXbrl.facts:
-        # build keys table for 6.5.14
-        concept = f1.concept
-        if f1.xsiNil != "true" and \
-           concept is not None and \
-           concept.isTextBlock and \
-           XMLpattern.match(f1.value):
-            #handler.fact = f1
-            # test encoded entity tags
-            for match in namedEntityPattern.finditer(f1.value):
-                entity = match.group()
-                if not entity in xhtmlEntities:
-                    modelXbrl.error(("EFM.6.05.16", "GFM.1.2.15"),
-                        _("Fact %(fact)s contextID %(contextID)s has disallowed entity %(entity)s"),
-                        modelObject=f1, fact=f1.qname, contextID=f1.contextID, entity=entity, error=entity)
-            # test html
-            for xmltext in [f1.value] + CDATApattern.findall(f1.value):
-                '''
-                try:
-                    xml.sax.parseString(
-                        "<?xml version='1.0' encoding='utf-8' ?>\n<body>\n{0}\n</body>\n".format(
-                         removeEntities(xmltext)).encode('utf-8'),handler,handler)
-                except (xml.sax.SAXParseException,
-                        xml.sax.SAXException,
-                        UnicodeDecodeError) as err:
-                    # ignore errors which are not errors (e.g., entity codes checked previously
-                    if not err.endswith("undefined entity"):
-                        handler.modelXbrl.error(("EFM.6.05.15", "GFM.1.02.14"),
-                            _("Fact %(fact)s contextID %(contextID)s has text which causes the XML error %(error)s"),
-                            modelObject=f1, fact=f1.qname, contextID=f1.contextID, error=err)
-                '''
-                xmlBodyWithoutEntities = htmlBodyTemplate.format(removeEntities(xmltext))
+def textBlockWorkerFindings(value):
+    return textBlockFindings(value, _workerAllowedExternalHrefPattern)
+
+def validateTextBlockFacts(modelXbrl):
+    loadDTD(modelXbrl)
+    allowedExternalHrefPattern = modelXbrl.modelManager.disclosureSystem.allowedExternalHrefPattern
+    
+    textBlockFacts = [f1
+                      for f1 in modelXbrl.facts
+                      if f1.xsiNil != "true" and
+                         f1.concept is not None and
+                         f1.concept.isTextBlock and
+                         XMLpattern.match(f1.value)]
+    workers = min(modelXbrl.modelManager.textBlockWorkers or 0,
+                  len(textBlockFacts) // MIN_TEXT_BLOCKS_PER_WORKER)
+    if workers > 1:
+        # html of each text block is parsed and checked in a worker process, imap returns findings in fact order
+        import multiprocessing
+        with multiprocessing.Pool(workers, initTextBlockWorker,
+                                  (dtdFilePath(modelXbrl.modelManager.cntlr, isInlineDTD), isInlineDTD, 
+                                   allowedExternalHrefPattern)) as pool:
+            for f1, findings in zip(textBlockFacts,
+                                    pool.imap(textBlockWorkerFindings, 
+                                              (f1.value for f1 in textBlockFacts),
+                                              chunksize=max(1, len(textBlockFacts) // (workers * 4)))):
+                logTextBlockFindings(modelXbrl, f1, findings)
+    else:
+        for f1 in textBlockFacts:
+            logTextBlockFindings(modelXbrl, f1, textBlockFindings(f1.value, allowedExternalHrefPattern))
+            
+def logTextBlockFindings(modelXbrl, f1, findings):
+    for finding in findings:
+        kind = finding[0]
+        if kind == TB_ENTITY:
+            entity = finding[1]
+            modelXbrl.error(("EFM.6.05.16", "GFM.1.2.15"),
+                _("Fact %(fact)s contextID %(contextID)s has disallowed entity %(entity)s"),
+                modelObject=f1, fact=f1.qname, contextID=f1.contextID, entity=entity, error=entity)
+        elif kind == TB_DTD_ERROR:
+            modelXbrl.error("EFM.6.05.16" if finding[1] else ("EFM.6.05.15.dtdError", "GFM.1.02.14"),
+                _("Fact %(fact)s contextID %(contextID)s has text which causes the XML error %(error)s"),
+                modelObject=f1, fact=f1.qname, contextID=f1.contextID, 
+                error=finding[2],
+                messageCodes=("EFM.6.05.16", "EFM.6.05.15.dtdError", "GFM.1.02.14"))
+        elif kind == TB_ELEMENT:
+            modelXbrl.error("EFM.5.02.05.disallowedElement",
+                _("%(validatedObjectLabel)s has disallowed element <%(element)s>"),
+                modelObject=HtmlElementRef(finding[2]), validatedObjectLabel=f1.qname,
+                element=finding[1])
+        elif kind == TB_ATTRIBUTE:
+            modelXbrl.error("EFM.5.02.05.disallowedAttribute",
+                _("%(validatedObjectLabel)s has disallowed attribute on element <%(element)s>: %(attribute)s=\"%(value)s\""),
+                modelObject=HtmlElementRef(finding[4]), validatedObjectLabel=f1.qname,
+                element=finding[1], attribute=finding[2], value=finding[3])
+        elif kind == TB_JAVASCRIPT:
+            modelXbrl.error("EFM.6.05.16.activeContent",
+                _("Fact %(fact)s of context %(contextID)s has javascript in '%(attribute)s' for <%(element)s>"),
+                modelObject=f1, fact=f1.qname, contextID=f1.contextID,
+                attribute=finding[2], element=finding[1])
+        elif kind == TB_EXTERNAL_REF:
+            modelXbrl.error("EFM.6.05.16.externalReference",
+                _("Fact %(fact)s of context %(contextID)s has an invalid external reference in '%(attribute)s' for <%(element)s>"),
+                modelObject=f1, fact=f1.qname, contextID=f1.contextID,
+                attribute=finding[2], element=finding[1])
+        elif kind == TB_GRAPHIC:
+            eltTag, attrValue = finding[1:]
+            if scheme(attrValue)  == "data":
+                modelXbrl.error("EFM.6.05.16.graphicDataUrl",
+                    _("Fact %(fact)s of context %(contextID)s references a graphics data URL which isn't accepted '%(attribute)s' for <%(element)s>"),
+                    modelObject=f1, fact=f1.qname, contextID=f1.contextID,
+                    attribute=attrValue[:32], element=eltTag)
+            elif attrValue.lower()[-4:] not in ('.jpg', '.gif'):
+                modelXbrl.error("EFM.6.05.16.graphicFileType",
+                    _("Fact %(fact)s of context %(contextID)s references a graphics file which isn't .gif or .jpg '%(attribute)s' for <%(element)s>"),
+                    modelObject=f1, fact=f1.qname, contextID=f1.contextID,
+                    attribute=attrValue, element=eltTag)
+            else:   # test file contents
                 try:
-                    textblockXml = XML(xmlBodyWithoutEntities)
-                    if not edbodyDTD.validate( textblockXml ):
-                        errors = edbodyDTD.error_log.filter_from_errors()
-                        htmlError = any(e.type_name in ("DTD_INVALID_CHILD", "DTD_UNKNOWN_ATTRIBUTE") 
-                                        for e in errors)
-                        modelXbrl.error("EFM.6.05.16" if htmlError else ("EFM.6.05.15.dtdError", "GFM.1.02.14"),
-                            _("Fact %(fact)s contextID %(contextID)s has text which causes the XML error %(error)s"),
-                            modelObject=f1, fact=f1.qname, contextID=f1.contextID, 
-                            error=', '.join(e.message for e in errors),
-                            messageCodes=("EFM.6.05.16", "EFM.6.05.15.dtdError", "GFM.1.02.14"))
-                    for elt in textblockXml.iter():
-                        eltTag = elt.tag
-                        if isinstance(elt, ModelObject) and elt.namespaceURI == xhtml:
-                            eltTag = elt.localName
-                        elif isinstance(elt, (_ElementTree, _Comment, _ProcessingInstruction)):
-                            continue # comment or other non-parsed element
-                        else:
-                            eltTag = elt.tag
-                            if eltTag.startswith(_xhtmlNs):
-                                eltTag = eltTag[_xhtmlNsLen:]
-                        if isInlineDTD and eltTag in efmBlockedInlineHtmlElements:
-                            modelXbrl.error("EFM.5.02.05.disallowedElement",
-                                _("%(validatedObjectLabel)s has disallowed element <%(element)s>"),
-                                modelObject=elt, validatedObjectLabel=f1.qname,
-                                element=eltTag)
-                        for attrTag, attrValue in elt.items():
-                            if isInlineDTD:
-                                if attrTag in efmBlockedInlineHtmlElementAttributes.get(eltTag,()):
-                                    modelXbrl.error("EFM.5.02.05.disallowedAttribute",
-                                        _("%(validatedObjectLabel)s has disallowed attribute on element <%(element)s>: %(attribute)s=\"%(value)s\""),
-                                        modelObject=elt, validatedObjectLabel=validatedObjectLabel,
-                                        element=eltTag, attribute=attrTag, value=attrValue)
-                            if ((attrTag == "href" and eltTag == "a") or 
-                                (attrTag == "src" and eltTag == "img")):
-                                if "javascript:" in attrValue:
-                                    modelXbrl.error("EFM.6.05.16.activeContent",
-                                        _("Fact %(fact)s of context %(contextID)s has javascript in '%(attribute)s' for <%(element)s>"),
-                                        modelObject=f1, fact=f1.qname, contextID=f1.contextID,
-                                        attribute=attrTag, element=eltTag)
-                                elif eltTag == "a" and (not allowedExternalHrefPattern or allowedExternalHrefPattern.match(attrValue)):
-                                    pass
-                                elif scheme(attrValue) in ("http", "https", "ftp"):
-                                    modelXbrl.error("EFM.6.05.16.externalReference",
-                                        _("Fact %(fact)s of context %(contextID)s has an invalid external reference in '%(attribute)s' for <%(element)s>"),
-                                        modelObject=f1, fact=f1.qname, contextID=f1.contextID,
-                                        attribute=attrTag, element=eltTag)
-                                if attrTag == "src" and attrValue not in checkedGraphicsFiles:
-                                    if scheme(attrValue)  == "data":
-                                        modelXbrl.error("EFM.6.05.16.graphicDataUrl",
-                                            _("Fact %(fact)s of context %(contextID)s references a graphics data URL which isn't accepted '%(attribute)s' for <%(element)s>"),
-                                            modelObject=f1, fact=f1.qname, contextID=f1.contextID,
-                                            attribute=attrValue[:32], element=eltTag)
-                                    elif attrValue.lower()[-4:] not in ('.jpg', '.gif'):
-                                        modelXbrl.error("EFM.6.05.16.graphicFileType",
-                                            _("Fact %(fact)s of context %(contextID)s references a graphics file which isn't .gif or .jpg '%(attribute)s' for <%(element)s>"),
-                                            modelObject=f1, fact=f1.qname, contextID=f1.contextID,
-                                            attribute=attrValue, element=eltTag)
-                                    else:   # test file contents
-                                        try:
-                                            if validateGraphicFile(f1, attrValue) != attrValue.lower()[-3:]:
-                                                modelXbrl.error("EFM.6.05.16.graphicFileContent",
-                                                    _("Fact %(fact)s of context %(contextID)s references a graphics file which doesn't have expected content '%(attribute)s' for <%(element)s>"),
-                                                    modelObject=f1, fact=f1.qname, contextID=f1.contextID,
-                                                    attribute=attrValue, element=eltTag)
-                                        except IOError as err:
-                                            modelXbrl.error("EFM.6.05.16.graphicFileError",
-                                                _("Fact %(fact)s of context %(contextID)s references a graphics file which isn't openable '%(attribute)s' for <%(element)s>, error: %(error)s"),
-                                                modelObject=f1, fact=f1.qname, contextID=f1.contextID,
-                                                attribute=attrValue, element=eltTag, error=err)
-                                    checkedGraphicsFiles.add(attrValue)
-                        if eltTag == "table" and any(a is not None for a in elt.iterancestors("table")):
-                            modelXbrl.error("EFM.6.05.16.nestedTable",
-                                _("Fact %(fact)s of context %(contextID)s has nested <table> elements."),
-                                modelObject=f1, fact=f1.qname, contextID=f1.contextID)
-                except (XMLSyntaxError,
-                        UnicodeDecodeError) as err:
-                    #if not err.endswith("undefined entity"):
-                    modelXbrl.error(("EFM.6.05.15", "GFM.1.02.14"),
-                        _("Fact %(fact)s contextID %(contextID)s has text which causes the XML error %(error)s"),
-                        modelObject=f1, fact=f1.qname, contextID=f1.contextID, error=err)
-                    
-                checkedGraphicsFiles.clear()
-                
-            #handler.fact = None
-                #handler.modelXbrl = None
+                    if validateGraphicFile(f1, attrValue) != attrValue.lower()[-3:]:
+                        modelXbrl.error("EFM.6.05.16.graphicFileContent",
+                            _("Fact %(fact)s of context %(contextID)s references a graphics file which doesn't have expected content '%(attribute)s' for <%(element)s>"),
+                            modelObject=f1, fact=f1.qname, contextID=f1.contextID,
+                            attribute=attrValue, element=eltTag)
+                except IOError as err:
+                    modelXbrl.error("EFM.6.05.16.graphicFileError",
+                        _("Fact %(fact)s of context %(contextID)s references a graphics file which isn't openable '%(attribute)s' for <%(element)s>, error: %(error)s"),
+                        modelObject=f1, fact=f1.qname, contextID=f1.contextID,
+                        attribute=attrValue, element=eltTag, error=err)
+        elif kind == TB_NESTED_TABLE:
+            modelXbrl.error("EFM.6.05.16.nestedTable",
+                _("Fact %(fact)s of context %(contextID)s has nested <table> elements."),
+                modelObject=f1, fact=f1.qname, contextID=f1.contextID)
+        elif kind == TB_XML_ERROR:
+            modelXbrl.error(("EFM.6.05.15", "GFM.1.02.14"),
+                _("Fact %(fact)s contextID %(contextID)s has text which causes the XML error %(error)s"),
+                modelObject=f1, fact=f1.qname, contextID=f1.contextID, error=finding[1])
     
 def copyHtml(sourceXml, targetHtml):
     for sourceChild in sourceXml.iterchildren():
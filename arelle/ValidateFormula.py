@@ -379,6 +379,7 @@ def validate(val, xpathContext=None, parametersOnly=False, statusMsg='', compile
     
     if xpathContext is None:
         xpathContext = XPathContext.create(val.modelXbrl) 
+    xpathContext.factNumericValues = {} # facts may have been edited since a prior formula run
     xpathContext.parameterQnames = parameterQnames  # needed for formula filters to determine variable dependencies
     for paramQname in orderedParameters:
         modelParameter = val.modelXbrl.qnameParameters[paramQname]
@@ -474,6 +475,7 @@ def validate(val, xpathContext=None, parametersOnly=False, statusMsg='', compile
     for modelVariableSet in val.modelXbrl.modelVariableSets:
         modelVariableSet.compile()
     val.modelXbrl.profileStat(_("formulaCompilation"))
+    XPathParser.profileStatInternedProgs(val.modelXbrl)
 
     produceOutputXbrlInstance = False
     instanceProducingVariableSets = defaultdict(list)
@@ -871,6 +873,9 @@ def validate(val, xpathContext=None, parametersOnly=False, statusMsg='', compile
     val.modelXbrl.profileActivity("... output instances setup", minTimeToShow=1.0)
     val.modelXbrl.profileStat(_("formulaInstancesSetup"))
     timeFormulasStarted = time.time()
+    if formulaOptions.profileReportFile:
+        from arelle.FormulaProfiler import FormulaProfiler
+        xpathContext.formulaProfiler = FormulaProfiler(val.modelXbrl)
         
     val.modelXbrl.modelManager.showStatus(_("running formulae"))
     
@@ -907,7 +912,9 @@ def validate(val, xpathContext=None, parametersOnly=False, statusMsg='', compile
                             val.modelXbrl.profileActivity("... evaluating " + varSetId, minTimeToShow=10.0)
                             val.modelXbrl.modelManager.showStatus(_("evaluating {0}").format(varSetId))
                             val.modelXbrl.profileActivity("... evaluating " + varSetId, minTimeToShow=1.0)
-                            evaluate(xpathContext, modelVariableSet)
+                            with val.modelXbrl.traceSpan(modelVariableSet.localName + "_" + varSetId, "formula") as span:
+                                evaluate(xpathContext, modelVariableSet)
+                                span.set(evaluations=modelVariableSet.evaluationNumber)
                             val.modelXbrl.profileStat(modelVariableSet.localName + "_" + varSetId)
                         except XPathContext.XPathException as err:
                             val.modelXbrl.error(err.code,
@@ -965,6 +972,14 @@ def validate(val, xpathContext=None, parametersOnly=False, statusMsg='', compile
     dependencyResolvedParameters.clear()
     orderedInstancesSet.clear()
     del orderedParameters, orderedInstances, orderedInstancesList
+    if xpathContext.formulaProfiler is not None:
+        try:
+            xpathContext.formulaProfiler.save(formulaOptions.profileReportFile)
+        except (IOError, EnvironmentError) as err:
+            val.modelXbrl.error("arelle:formulaProfileReportError",
+                _("Formula profile report %(file)s could not be saved: %(error)s"),
+                modelObject=val.modelXbrl, file=formulaOptions.profileReportFile, error=err)
+        xpathContext.formulaProfiler.close()
     xpathContext.close()  # dereference everything
     val.modelXbrl.profileStat(_("formulaExecutionTotal"), time.time() - timeFormulasStarted)
 
@@ -4,7 +4,6 @@ Created on Feb 15, 2012
 @author: Mark V Systems Limited
 (c) Copyright 2012 Mark V Systems Limited, All rights reserved.
 '''
-from collections import defaultdict
 from arelle.ModelDocument import Type
 from arelle.ModelValue import qname
 from arelle import XmlUtil, XbrlConst
@@ -13,10 +12,8 @@ from arelle.ValidateXbrlCalcs import inferredPrecision, inferredDecimals
 def validate(val, modelXbrl, infosetModelXbrl):
     infoset = infosetModelXbrl.modelDocument
     if infoset.type == Type.INSTANCE:
-        # compare facts (assumed out of order)
-        infosetFacts = defaultdict(list)
-        for fact in infosetModelXbrl.facts:
-            infosetFacts[fact.qname].append(fact)
+        # compare facts (assumed out of order), matched within infoset facts bucketed by aspects
+        infosetFactMatchIndex = infosetModelXbrl.factMatchIndex
         if len(modelXbrl.factsInInstance) != len(infosetModelXbrl.factsInInstance):
             modelXbrl.error("arelle:infosetTest",
                 _("Fact counts mismatch, testcase instance %(foundFactCount)s, infoset instance %(expectedFactCount)s"),
@@ -25,8 +22,8 @@ def validate(val, modelXbrl, infosetModelXbrl):
                             expectedFactCount=len(infosetModelXbrl.factsInInstance))
         else:
             for i, instFact in enumerate(modelXbrl.facts):
-                infosetFact = None
-                for fact in infosetFacts[instFact.qname]:
+                infosetFact = fact = None
+                for fact in infosetFactMatchIndex.candidates(instFact):
                     if fact.isTuple and fact.isDuplicateOf(instFact, deemP0Equal=True):
                         infosetFact = fact
                         break
@@ -39,7 +39,6 @@ class ValidateXbrlCalcs:
         self.sumConceptBindKeys = defaultdict(set)
         self.itemFacts = defaultdict(list)
         self.itemConceptBindKeys = defaultdict(set)
-        self.duplicateKeyFacts = {}
         self.duplicatedFacts = set()
         self.consistentDupFacts = set() # when deDuplicatig, holds the less-precise of v-equal dups
         self.esAlFacts = defaultdict(list)
@@ -94,6 +93,19 @@ class ValidateXbrlCalcs:
                                 conceptsSet.add(concept)
         self.modelXbrl.profileActivity("... identify requires-element and esseance-aliased concepts", minTimeToShow=1.0)
 
+        # identify duplicate facts, when deDuplicating all but the most accurate of consistent duplicates
+        for dupSet in self.modelXbrl.duplicateFactIndex:
+            concept = dupSet.facts[0].concept
+            if concept is None or not concept.isNumeric:
+                continue
+            if (self.deDuplicate and dupSet.isConsistent and
+                all(not f.isNil and not isnan(inferredDecimals(f)) for f in dupSet)): # has accuracy
+                mostAccurateFact = dupSet.mostAccurateFact
+                self.consistentDupFacts.update(f for f in dupSet if f is not mostAccurateFact)
+            else: # inconsistent duplicates, nil duplicates or without accuracy
+                self.duplicatedFacts.update(dupSet.facts)
+        self.modelXbrl.profileActivity("... identify duplicate facts", minTimeToShow=1.0)
+
         self.bindFacts(self.modelXbrl.facts,[self.modelXbrl.modelDocument.xmlRootElement])
         self.modelXbrl.profileActivity("... bind facts", minTimeToShow=1.0)
         
@@ -231,37 +243,6 @@ class ValidateXbrlCalcs:
                     if not f.isNil:
                         self.sumFacts[calcKey].append(f) # sum only for immediate parent
                         self.sumConceptBindKeys[concept].add(bindKey)
-                    # calcKey is the last ancestor added (immediate parent of fact)
-                    if calcKey in self.duplicateKeyFacts:
-                        fDup = self.duplicateKeyFacts[calcKey]
-                        if self.deDuplicate: # add lesser precision fact to consistentDupFacts
-                            if self.inferDecimals:
-                                d = inferredDecimals(f); dDup = inferredDecimals(fDup)
-                                dMin = min((d, dDup)); pMin = None
-                                hasAccuracy = (not isnan(d) and not isnan(dDup))
-                                fIsMorePrecise = (d > dDup)
-                            else:
-                                p = inferredPrecision(f); pDup = inferredPrecision(fDup)
-                                dMin = None; pMin = min((p, pDup))
-                                hasAccuracy = (p != 0)
-                                fIsMorePrecise = (p > pDup)
-                            if (hasAccuracy and
-                                roundValue(f.value,precision=pMin,decimals=dMin) == 
-                                roundValue(fDup.value,precision=pMin,decimals=dMin)):
-                                # consistent duplicate, f more precise than fDup, replace fDup with f
-                                if fIsMorePrecise: # works for inf and integer mixtures
-                                    self.duplicateKeyFacts[calcKey] = f
-                                    self.consistentDupFacts.add(fDup)
-                                else: # fDup is more precise or equally precise
-                                    self.consistentDupFacts.add(f)
-                            else: # invalid accuracy or inconsistent duplicates
-                                self.duplicatedFacts.add(f)
-                                self.duplicatedFacts.add(fDup)
-                        else: # add both this fact and matching calcKey'ed fact to duplicatedFacts
-                            self.duplicatedFacts.add(f)
-                            self.duplicatedFacts.add(fDup)
-                    else:
-                        self.duplicateKeyFacts[calcKey] = f
                 elif concept.isTuple:
                     self.bindFacts(f.modelTupleFacts, ancestors + [f])
 
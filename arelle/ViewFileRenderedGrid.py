@@ -91,6 +91,7 @@ class ViewRenderedGrid(ViewFile.View):
             self.tblElt.append(etree.Comment("Entry point file: {0}".format(self.modelXbrl.modelDocument.basename)))
         
         for tblELR in tblELRs:
+            span = self.modelXbrl.traceSpan("renderTable", "rendering", linkrole=tblELR).begin()
             self.zOrdinateChoices = {}
             
                 
@@ -212,6 +213,7 @@ class ViewRenderedGrid(ViewFile.View):
                         # continue incrementing next outermore z choices index
                 if not moreDiscriminators:
                     break
+            span.end()
 
             
     def zAxis(self, row, zStructuralNode, zAspectStructuralNodes, discriminatorsTable):
@@ -1053,6 +1053,7 @@ class ViewRenderedGrid(ViewWinTkTable.ViewTkTable):
                                                 unitId = newUnit.id
                                             fact.unitID = unitId
                                         fact.text = str(value)
+                                        instance.clearFactIndexes()
                                         instance.setIsModified()
                                         fact.xValid = UNVALIDATED
                                         xmlValidate(instance, fact)
@@ -16,6 +16,7 @@ from arelle.PluginManager import pluginClassMethods
 from decimal import Decimal, InvalidOperation
 from lxml import etree
 from types import LambdaType
+import time
 
 # deferred types initialization
 boolean = None
@@ -101,6 +102,12 @@ FORSOMEEVERY_OPS = {'for','some','every'}
 PATH_OPS = {'/', '//', 'rootChild', 'rootDescendant'}
 SEQUENCE_TYPES = (tuple,list,set)
 GREGORIAN_TYPES = (gYearMonth, gYear, gMonthDay, gDay, gMonth)
+INTEGER_TYPES = {"integer",
+                 "nonPositiveInteger","negativeInteger","nonNegativeInteger","positiveInteger",
+                 "long","unsignedLong",
+                 "int","unsignedInt",
+                 "short","unsignedShort",
+                 "byte","unsignedByte"}
 
 class XPathContext:
     def __init__(self, modelXbrl, inputXbrlInstance, sourceElement, inScopeVars=None):
@@ -118,6 +125,8 @@ class XPathContext:
         self.variableSet = None
         self.inScopeVars = {} if inScopeVars is None else inScopeVars
         self.cachedFilterResults = {}
+        self.formulaProfiler = None # FormulaProfiler when collecting formula profile statistics
+        self.factNumericValues = None # atomized numeric fact values by fact objectIndex, only during a formula run (for aggregations)
         if inputXbrlInstance: 
             self.inScopeVars[XbrlConst.qnStandardInputInstance] = inputXbrlInstance.modelXbrl
         self.customFunctions = {}
@@ -128,6 +137,7 @@ class XPathContext:
         xpCtxCpy = XPathContext(self.modelXbrl, self.inputXbrlInstance, self.sourceElement, 
                                 self.inScopeVars.copy())
         # note: not currently duplicating cachedFilterResults
+        xpCtxCpy.factNumericValues = self.factNumericValues # shared with the formula run
         return xpCtxCpy
             
     def close(self):
@@ -172,6 +182,9 @@ class XPathContext:
                 if isinstance(op, QNameDef): # function call
                     args = self.evaluate(p.args, contextItem=contextItem)
                     ns = op.namespaceURI; localname = op.localName
+                    formulaProfiler = self.formulaProfiler
+                    if formulaProfiler is not None:
+                        functionCallStartedAt = time.time()
                     try:
                         from arelle import (FunctionXs, FunctionFn, FunctionXfi, FunctionIxt, FunctionCustom)
                         if op in self.modelXbrl.modelCustomFunctionSignatures:
@@ -206,6 +219,8 @@ class XPathContext:
                                              .format(err.argNum, err.expectedType, op, err.foundObject))
                     except FunctionNotAvailable:
                         raise XPathException(p, 'err:XPST0017', _('Function named {0} does not have a custom or built-in implementation.').format(op))
+                    if formulaProfiler is not None:
+                        formulaProfiler.functionCall(self.variableSet, op, time.time() - functionCallStartedAt)
                 elif op in VALUE_OPS:
                     # binary arithmetic operations and value comparisons
                     s1 = self.atomize( p, resultStack.pop() ) if len(resultStack) > 0 else []
@@ -645,11 +660,18 @@ class XPathContext:
             return x
         baseXsdType = None
         e = None
+        factNumericValues = None
         if isinstance(x, ModelFact):
             if x.isTuple:
                 raise XPathException(p, 'err:FOTY0012', _('Atomizing tuple {0} that does not have a typed value').format(x))
             if x.isNil:
                 return []
+            factNumericValues = self.factNumericValues
+            if factNumericValues is not None:
+                try:
+                    return factNumericValues[x.objectIndex] # previously atomized numeric fact
+                except KeyError:
+                    pass
             baseXsdType = x.concept.baseXsdType
             v = x.value # resolves default value
             e = x
@@ -678,21 +700,22 @@ class XPathContext:
                 x = float(v)
             except ValueError:
                 raise XPathException(p, 'err:FORG0001', _('Atomizing {0} to a {1} does not have a proper value').format(x,baseXsdType))
+            if factNumericValues is not None:
+                factNumericValues[e.objectIndex] = x
         elif baseXsdType == "decimal":
             try:
                 x = Decimal(v)
             except InvalidOperation:
                 raise XPathException(p, 'err:FORG0001', _('Atomizing {0} to decimal does not have a proper value'))
-        elif baseXsdType in ("integer",
-                             "nonPositiveInteger","negativeInteger","nonNegativeInteger","positiveInteger",
-                             "long","unsignedLong",
-                             "int","unsignedInt",
-                             "short","unsignedShort",
-                             "byte","unsignedByte"):
+            if factNumericValues is not None:
+                factNumericValues[e.objectIndex] = x
+        elif baseXsdType in INTEGER_TYPES:
             try:
                 x = _INT(v)
             except ValueError:
                 raise XPathException(p, 'err:FORG0001', _('Atomizing {0} to an integer does not have a proper value').format(x))
+            if factNumericValues is not None:
+                factNumericValues[e.objectIndex] = x
         elif baseXsdType == "boolean":
             x = (v == "true" or v == "1")
         elif baseXsdType == "QName" and e is not None:
@@ -8,25 +8,20 @@ import sys
 
 from arelle import PythonUtil # define 2.x or 3.x string types (only needed when running as unit test from __main__
 from arelle.PluginManager import pluginClassMethods
-
-if sys.version[0] >= '3':
-    # python 3 requires modified parser to allow release of global objects when closing DTS
-    from arelle.pyparsing.pyparsing_py3 import (Word, Keyword, alphas, ParseException, ParseSyntaxException,
-                 Literal, CaselessLiteral,
-                 Combine, Optional, nums, Or, Forward, Group, ZeroOrMore, StringEnd, alphanums,
-                 ParserElement, quotedString, delimitedList, Suppress, Regex)
-else:
-    # installed for python 2.7 and clean packages, otherwise use tweaked version
-    from arelle.pyparsing.pyparsing_py2 import (Word, Keyword, alphas, ParseException, ParseSyntaxException,
-                 Literal, CaselessLiteral,
-                 Combine, Optional, nums, Or, Forward, Group, ZeroOrMore, StringEnd, alphanums,
-                 ParserElement, quotedString, delimitedList, Suppress, Regex)
-from arelle.Locale import format_string
-import time, xml.dom, traceback
+import re, time, xml.dom, traceback
+from collections import defaultdict
 from decimal import Decimal
 from arelle import (XmlUtil, ModelValue, XbrlConst)
 FunctionIxt = None
 
+def parseExceptions():
+    # pyparsing exceptions raised by the XPath grammar (pyparsing is only imported when parsing)
+    if sys.version[0] >= '3':
+        from arelle.pyparsing.pyparsing_py3 import ParseException, ParseSyntaxException
+    else:
+        from arelle.pyparsing.pyparsing_py2 import ParseException, ParseSyntaxException
+    return (ParseException, ParseSyntaxException)
+
 
 # Debugging flag can be set to either "debug_flag=True" or "debug_flag=False"
 debug_flag=True
@@ -36,6 +31,8 @@ xmlElement = None
 modelXbrl = None
 xbrlResource = None
 pluginCustomFunctions = None
+parseErrorCount = 0 # errors logged by parse actions, which then depend on the expression's element (not interned)
+deferredParseErrors = None # errors of the descent parser, logged unless the expression is parsed by the grammar instead
 
 class ProgHeader:
     def __init__(self, modelObject, name, element, sourceStr, traceType):
@@ -118,15 +115,23 @@ axesSupported = {"", "child", "descendant", "attribute", "self", "descendant-or-
                  "following-sibling", "following", "namespace", "parent", "ancestor",
                  "preceding-sibling", "preceding", "ancestor-or-self"}
 
-def pushQName( sourceStr, loc, toks ):
-    step = toks[0]
+def parseError(codes, msg, **args):
+    global parseErrorCount
+    if deferredParseErrors is not None:
+        deferredParseErrors.append((codes, msg, args))
+        return
+    parseErrorCount += 1
+    modelXbrl.error(codes, msg, **args)
+
+def stepQNameDef( loc, step ):
+    # QNameDef of a step, name test or function name (which may have an axis), None if it has an error
     axis, sep, qname = step.rpartition("::") # axes are not splitting correctly
     if axis not in axesSupported:
-        modelXbrl.error("err:XPST0010",
+        parseError("err:XPST0010",
             _("Axis %(axis)s is not supported in %(step)s"),
             modelObject=xmlElement,
             axis=axis, step=step)
-        return
+        return None
     if xmlElement is not None:
         if qname == '*': # prevent simple wildcard from taking the default namespace
             nsLocalname = (None, '*', None)
@@ -135,26 +140,33 @@ def pushQName( sourceStr, loc, toks ):
             if nsLocalname is None:
                 if qname.startswith("*:"): # wildcad QName special case
                     prefix,sep,localName = qname.partition(":")
-                    q = QNameDef(loc, prefix, prefix, localName, axis=axis)
-                    if len(exprStack) == 0 or exprStack[-1] != q:
-                        exprStack.append( q )
-                    return q
-                modelXbrl.error("err:XPST0081",
+                    return QNameDef(loc, prefix, prefix, localName, axis=axis)
+                parseError("err:XPST0081",
                     _("QName prefix not defined for %(name)s"),
                     modelObject=xmlElement,
                     name=qname)
-                return
+                return None
             
         if (nsLocalname == (XbrlConst.xff,"uncovered-aspect","xff") and
             xmlElement.localName not in ("formula", "consistencyAssertion", "valueAssertion", "message")):
-                modelXbrl.error("xffe:invalidFunctionUse",
+                parseError("xffe:invalidFunctionUse",
                     _("Function %(name)s cannot be used on an XPath expression associated with a %(name2)s"),
                     modelObject=xmlElement,
                     name=qname, name2=xmlElement.localName)
     else:
         nsLocalname = (None,qname)
-    q = QNameDef(loc, nsLocalname[2], nsLocalname[0], nsLocalname[1], axis=axis)
-    if qname not in ("INF", "NaN", "for", "some", "every", "return") and \
+    return QNameDef(loc, nsLocalname[2], nsLocalname[0], nsLocalname[1], axis=axis)
+
+def pushQName( sourceStr, loc, toks ):
+    step = toks[0]
+    q = stepQNameDef(loc, step)
+    if q is None:
+        return
+    if q.prefix == "*" and q.namespaceURI == "*": # wildcard prefix
+        if len(exprStack) == 0 or exprStack[-1] != q:
+            exprStack.append( q )
+        return q
+    if step.rpartition("::")[2] not in ("INF", "NaN", "for", "some", "every", "return") and \
         len(exprStack) == 0 or exprStack[-1] != q:
         exprStack.append( q )
     return q
@@ -207,7 +219,7 @@ class OperationDef:
                     prefix = toks1[:-2]
                     ns = XmlUtil.xmlns(xmlElement, prefix)
                     if ns is None:
-                        modelXbrl.error("err:XPST0081",
+                        parseError("err:XPST0081",
                             _("wildcard prefix not defined for %(token)s"),
                             modelObject=xmlElement,
                             token=toks1)
@@ -264,19 +276,22 @@ def pushFunction( sourceStr, loc, toks ):
     operation = OperationDef(sourceStr, loc, name, toks, True)
     exprStack[exprStack.index(toks[0]):] = [operation]  # replace tokens with production
     if isinstance(name, QNameDef): # function call
-        ns = name.namespaceURI
-        if (not name.unprefixed and 
-            ns not in {XbrlConst.fn, XbrlConst.xfi, XbrlConst.xff, XbrlConst.xsd} and
-            ns not in FunctionIxt.ixtNamespaceFunctions and
-            name not in modelXbrl.modelManager.customTransforms):
-            if name not in modelXbrl.modelCustomFunctionSignatures and name not in pluginCustomFunctions: # indexed by both [qname] and [qname,arity]
-                modelXbrl.error("xbrlve:noCustomFunctionSignature",
-                    _("No custom function signature for %(custFunction)s in %(resource)s"),
-                    modelObject=xmlElement,
-                    resource=xmlElement.localName,
-                    custFunction=name)
+        checkFunctionName(name)
     return operation
 
+def checkFunctionName( name ):
+    ns = name.namespaceURI
+    if (not name.unprefixed and 
+        ns not in {XbrlConst.fn, XbrlConst.xfi, XbrlConst.xff, XbrlConst.xsd} and
+        ns not in FunctionIxt.ixtNamespaceFunctions and
+        name not in modelXbrl.modelManager.customTransforms):
+        if name not in modelXbrl.modelCustomFunctionSignatures and name not in pluginCustomFunctions: # indexed by both [qname] and [qname,arity]
+            parseError("xbrlve:noCustomFunctionSignature",
+                _("No custom function signature for %(custFunction)s in %(resource)s"),
+                modelObject=xmlElement,
+                resource=xmlElement.localName,
+                custFunction=name)
+
 def pushSequence( sourceStr, loc, toks ):
     operation = OperationDef(sourceStr, loc, 'sequence', toks, False)
     # print ("push seq toks={} \n  op={}\n  exprStk1={}".format(toks, operation, exprStack))
@@ -322,15 +337,18 @@ class VariableRef:
     def __repr__(self):
         return ("variableRef('{0}')".format(self.name))
 
-def pushVarRef( sourceStr, loc, toks ):
-    qname = ModelValue.qname(xmlElement, toks[0][1:], noPrefixIsNoNamespace=True)
+def variableRefQName( name ):
+    qname = ModelValue.qname(xmlElement, name, noPrefixIsNoNamespace=True)
     if qname is None:
-        modelXbrl.error("err:XPST0081",
+        parseError("err:XPST0081",
             _("QName prefix not defined for variable reference $%(variable)s"),
             modelObject=xmlElement,
-            variable=toks[0][1:])
+            variable=name)
         qname = ModelValue.qname(XbrlConst.xpath2err,"XPST0081") # use as qname to allow parsing to complete
-    varRef = VariableRef(loc, qname)
+    return qname
+
+def pushVarRef( sourceStr, loc, toks ):
+    varRef = VariableRef(loc, variableRefQName(toks[0][1:]))
     exprStack.append( varRef )
     return varRef
 
@@ -361,238 +379,708 @@ def pushExpr( sourceStr, loc, toks ):
     exprStack[exprStackToksRIndex(toks):] = [expr]  # replace tokens with production
     return expr
 
-ParserElement.enablePackrat()
-# define grammar
-variableRef = Regex("[$]"  # variable prefix
-                    # optional prefix part
-                    "([A-Za-z\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD_]"
-                    "[A-Za-z0-9\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD\u0300-\u036F\u203F-\u2040\xB7_.-]*:)?"
-                    # localname part
-                    "([A-Za-z\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD_]"
-                    "[A-Za-z0-9\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD\u0300-\u036F\u203F-\u2040\xB7_.-]*)"
-                    )
-# for now :: axis step is expected in QName production (processed in parser's QName structure)
-#qName = Word(alphas + '_',alphanums + ':_-.*') # note: this will pick up forward and reverse axes and handle by pushQName
-
-# try to match axis step, prefix, and localname, allowin wildcard prefix or localname
-# don't grab occurence indicator if on qname, e.g., not * of xs:string*
-qName = Regex("([A-Za-z-]+::)?"  # axis step part (just ansi characters)
-              # prefix or wildcard-prefix part
-              "([A-Za-z\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD_]"
-              "[A-Za-z0-9\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD\u0300-\u036F\u203F-\u2040\xB7_.-]*:|[*]:)?"
-              # localname or wildcard-localname part  
-              "([A-Za-z\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD_]"
-              "[A-Za-z0-9\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD\u0300-\u036F\u203F-\u2040\xB7_.-]*|[*])"
-              )
-''' above qName definition allows double :: and excludes non-ascii letters
-qName = Regex("[_A-Za-z\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD]"
-              r"[_\-\." 
-              "\xB7A-Za-z0-9\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD\u0300-\u036F\u203F-\u2040]*"
-              "[:]?"
-              r"[_\-\." 
-              "\xB7A-Za-z0-9\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD\u0300-\u036F\u203F-\u2040]*")
-'''    
-ncName = Word(alphas + '_',alphanums + '_-.')
-prefixOp = Literal(":")
-
-decimalPoint = Literal('.')
-exponentLiteral = CaselessLiteral('e')
-plusorminusLiteral = Literal('+') | Literal('-')
-digits = Word(nums) 
-integerLiteral = Combine( Optional(plusorminusLiteral) + digits )
-decimalFractionLiteral = Combine( Optional(plusorminusLiteral) + decimalPoint + digits )
-infLiteral = Combine( Optional(plusorminusLiteral) + Literal("INF") )
-nanLiteral = Literal("NaN")
-floatLiteral = ( Combine( integerLiteral +
-                     ( ( decimalPoint + Optional(digits) + exponentLiteral + integerLiteral ) |
-                       ( exponentLiteral + integerLiteral ) )
-                     ) | 
-                 Combine( decimalFractionLiteral + exponentLiteral + integerLiteral ) |
-                 infLiteral | nanLiteral ) 
-decimalLiteral =  ( Combine( integerLiteral + decimalPoint + Optional(digits) ) |
-                    decimalFractionLiteral )
-
-
-#emptySequence = Literal( "(" ) + Literal( ")" )
-lParen  = Literal( "(" )
-rParen  = Literal( ")" )
-lPred  = Literal( "[" )
-rPred  = Literal( "]" )
-expOp = Literal( "^" )
-
-commaOp = Literal(",")
-forOp = Keyword("for").setParseAction(pushOp)
-someOp = Keyword("some")
-everyOp = Keyword("every")
-quantifiedOp = ( someOp | everyOp ).setParseAction(pushOp)
-inOp = Keyword("in")
-returnOp = Keyword("return").setParseAction(pushOp)
-satisfiesOp = Keyword("satisfies").setParseAction(pushOp)
-ifOp = Keyword("if").setParseAction(pushOp)
-thenOp = Keyword("then").setParseAction(pushOp)
-elseOp = Keyword("else").setParseAction(pushOp)
-andOp = Keyword("and")
-orOp = Keyword("or")
-eqValueOp = Keyword("eq")
-neValueOp = Keyword("ne")
-ltValueOp = Keyword("lt")
-leValueOp = Keyword("le")
-gtValueOp = Keyword("gt")
-geValueOp = Keyword("ge")
-valueCompOp = eqValueOp | neValueOp | ltValueOp | leValueOp | gtValueOp | geValueOp
-isNodeOp = Keyword("is")
-precedesNodeOp = Literal("<<")
-followsNodeOp = Literal(">>")
-nodeCompOp = isNodeOp | precedesNodeOp | followsNodeOp
-neGeneralOp = Literal("!=")
-leGeneralOp = Literal("<=")
-ltGeneralOp = Literal("<")
-geGeneralOp = Literal(">=")
-gtGeneralOp = Literal(">")
-eqGeneralOp = Literal("=")
-generalCompOp = neGeneralOp | leGeneralOp | ltGeneralOp | geGeneralOp | gtGeneralOp | eqGeneralOp
-comparisonOp = ( nodeCompOp | valueCompOp | generalCompOp ).setParseAction(pushOp)
-toOp = Keyword("to").setParseAction(pushOp)
-plusOp  = Literal("+")
-minusOp = Literal("-")
-plusMinusOp  = ( plusOp | minusOp ).setParseAction(pushOp)
-multOp  = Literal("*")
-divOp   = Keyword("div")
-idivOp  = Keyword("idiv")
-modOp  = Keyword("mod")
-multDivOp = ( multOp | divOp | idivOp | modOp ).setParseAction(pushOp)
-unionWordOp = Keyword("union")
-unionSymbOp = Literal("|")
-unionOp = unionWordOp | unionSymbOp
-intersectOp = Keyword("intersect")
-exceptOp = Keyword("except")
-intersectExceptOp = intersectOp | exceptOp
-instanceOp = Keyword("instance")
-ofOp = Keyword("of")
-treatOp = Keyword("treat")
-asOp = Keyword("as")
-castableOp = Keyword("castable")
-castOp = Keyword("cast")
-unaryOp  = plusOp | minusOp
-occurOptionalOp = Literal("?")
-occurAnyOp = multOp
-occurAtLeastOnceOp = plusOp
-occurrenceOp = occurOptionalOp | occurAnyOp | occurAtLeastOnceOp
-wildOp = multOp
-typeName = qName
-elementName = qName
-attributeName = qName
-elementDeclaration = elementName
-schemaElementTest = ( Keyword("schema-element") + Suppress(lParen) + elementDeclaration + Suppress(rParen) ).setParseAction(pushOperation)
-elementNameOrWildcard = ( elementName | wildOp )
-elementTest = ( Keyword("element") + Suppress(lParen) + Optional( elementNameOrWildcard + Optional( Suppress(commaOp) + typeName + Optional( Literal("?") ) ) ) + Suppress(rParen) ).setParseAction(pushOperation)
-attributeDeclaration = ( attributeName )
-schemaAttributeTest = ( Keyword("schema-attribute") + Suppress(lParen) + attributeDeclaration + Suppress(rParen) ).setParseAction(pushOperation)
-attribNameOrWildcard = ( attributeName | wildOp )
-attributeTest = ( Keyword("attribute") + Suppress(lParen) + Optional( attribNameOrWildcard + Optional( commaOp + typeName ) ) + Suppress(rParen) ).setParseAction(pushOperation)
-PITest = ( Keyword("processing-instruction") + Suppress(lParen) + Optional( ncName | quotedString ) + Suppress(rParen) ).setParseAction(pushOperation)
-commentTest = ( Keyword("comment") + Suppress(lParen) + Suppress(rParen) ).setParseAction(pushOperation)
-textTest = ( Keyword("text") + Suppress(lParen) + Suppress(rParen) ).setParseAction(pushOperation)
-documentTest = ( Keyword("document-node") + Suppress(lParen) + Optional(elementTest | schemaElementTest) + Suppress(rParen) ).setParseAction(pushOperation)
-anyKindTest = ( Keyword("node") + Suppress(lParen) + Suppress(rParen) ).setParseAction(pushOperation)
-kindTest = ( documentTest | elementTest | attributeTest | schemaElementTest | 
-             schemaAttributeTest | PITest | commentTest | textTest | anyKindTest )
-wildcard = ( Combine( ncName + prefixOp + wildOp ) | Combine( wildOp + prefixOp + ncName ) | wildOp )
-nameTest = ( qName | wildcard )
-nodeTest = ( kindTest | nameTest )
-abbrevForwardStep = ( ( Literal("@") + nodeTest).setParseAction(pushAttr) |
-                      ( nodeTest ) )
-atomicType = qName
-itemType = ( kindTest | Keyword("item") + lParen + rParen | atomicType )
-occurrenceIndicator = ( occurOptionalOp | multOp | plusOp ) # oneOf("? * +")
-sequenceType = ( ( Keyword("empty-sequence") + lParen + rParen ) | 
-                 ( itemType + Optional(occurrenceIndicator) ) )
-singleType  = ( atomicType + Optional( occurOptionalOp ) )
-contextItem = decimalPoint
-pathDescOp = Literal("//")
-pathStepOp = Literal("/")
-pathOp = pathStepOp | pathDescOp
-pathRootOp = Regex(r"(/$|/[^/])")
-axisOp = Literal("::")
-forwardAxis = ((Keyword("child") + axisOp) |
-               (Keyword("descendant") + axisOp) |
-               (Keyword("attribute") + axisOp) |
-               (Keyword("self") + axisOp) |
-               (Keyword("descendant-or-self") + axisOp) |
-               (Keyword("following-sibling") + axisOp) |
-               (Keyword("following") + axisOp) |
-               (Keyword("namespace") + axisOp))
-forwardStep = ( ( forwardAxis + nodeTest) | abbrevForwardStep )
-reverseAxis = ((Keyword("parent") + axisOp) |
-               (Keyword("ancestor") + axisOp) |
-               (Keyword("preceding-sibling") + axisOp) |
-               (Keyword("preceding") + axisOp) |
-               (Keyword("ancestor-or-self") + axisOp))
-abbrevReverseStep = Literal("..")
-reverseStep = ( ( reverseAxis + nodeTest ) | abbrevReverseStep )
-step = ( forwardStep | reverseStep )
-
-expr = Forward()
-atom = ( 
-         ( forOp - (variableRef + inOp + expr).setParseAction(pushRangeVar) + 
-                 ZeroOrMore( Suppress(commaOp) + (variableRef + inOp + expr).setParseAction(pushRangeVar) ) - 
-                 (returnOp + expr).setParseAction(pushExpr) ).setParseAction(pushOperation) |
-         ( quantifiedOp - (variableRef + inOp + expr).setParseAction(pushRangeVar) + 
-                 ZeroOrMore( Suppress(commaOp) + (variableRef + inOp + expr ).setParseAction(pushRangeVar) ) - 
-                 (satisfiesOp + expr).setParseAction(pushExpr) ).setParseAction(pushOperation) |
-         ( (ifOp - Suppress(lParen) + Group(expr) + Suppress(rParen)).setParseAction(pushExpr) - 
-           (thenOp + expr).setParseAction(pushOperation) - 
-           (elseOp + expr).setParseAction(pushOperation) ).setParseAction(pushOperation) |
-         ( qName + Suppress(lParen) + Optional(delimitedList(expr)) + Suppress(rParen) ).setParseAction(pushFunction) |
-         ( floatLiteral ).setParseAction(pushFloat) |
-         ( decimalLiteral ).setParseAction(pushDecimal) |
-         ( integerLiteral ).setParseAction(pushInt) |
-         ( quotedString ).setParseAction(pushQuotedString) |
-         ( variableRef ).setParseAction(pushVarRef)  |
-         ( abbrevReverseStep ).setParseAction(pushOperation)  |
-         ( contextItem ).setParseAction(pushOperation)  |
-         ( qName ).setParseAction(pushQName) |
-         ( Suppress(lParen) - Optional(expr) - ZeroOrMore( commaOp.setParseAction(pushOp) - expr ) - Suppress(rParen) ).setParseAction(pushSequence)
-       )
-#stepExpr = ( ( atom + ZeroOrMore( (lPred.setParseAction( pushOp ) - expr - Suppress(rPred)).setParseAction(pushPredicate) ) ) | 
-#             ( (reverseStep | forwardStep) + ZeroOrMore( (lPred.setParseAction( pushOp ) - expr - Suppress(rPred)).setParseAction(pushPredicate) ) ) )
-stepExpr = ( ( atom + ZeroOrMore( (lPred.setParseAction( pushOp ) - expr - Suppress(rPred)).setParseAction(pushPredicate) ) ) | 
-             ( step + ZeroOrMore( (lPred.setParseAction( pushOp ) - expr - Suppress(rPred)).setParseAction(pushPredicate) ) ) )
-relativePathExpr = stepExpr + ZeroOrMore( ( ( pathDescOp | pathStepOp ) + stepExpr ).setParseAction( pushOperation ) )
-pathExpr = ( ( pathDescOp + relativePathExpr ).setParseAction( pushRootStep ) |
-             ( pathStepOp + relativePathExpr ).setParseAction( pushRootStep ) |
-             ( relativePathExpr ) |
-             ( ( pathRootOp ).setParseAction( pushRootStep ) ) 
+xpathExpr = None
+
+def compileXPathGrammar():
+    """Returns the XPath 2 grammar, compiling it on first use.
+
+    The pyparsing constructs are defined in this function so that importing this module (by
+    ModelFormulaObject and hence every controller) does not import pyparsing and build the grammar,
+    which is only needed when formula or XPath expressions are parsed.
+    """
+    global xpathExpr
+    if xpathExpr is not None:
+        return xpathExpr
+    if sys.version[0] >= '3':
+        # python 3 requires modified parser to allow release of global objects when closing DTS
+        from arelle.pyparsing.pyparsing_py3 import (Word, Keyword, alphas,
+                     Literal, CaselessLiteral,
+                     Combine, Optional, nums, Or, Forward, Group, ZeroOrMore, StringEnd, alphanums,
+                     ParserElement, quotedString, delimitedList, Suppress, Regex)
+    else:
+        # installed for python 2.7 and clean packages, otherwise use tweaked version
+        from arelle.pyparsing.pyparsing_py2 import (Word, Keyword, alphas,
+                     Literal, CaselessLiteral,
+                     Combine, Optional, nums, Or, Forward, Group, ZeroOrMore, StringEnd, alphanums,
+                     ParserElement, quotedString, delimitedList, Suppress, Regex)
+
+    ParserElement.enablePackrat()
+    # define grammar
+    variableRef = Regex("[$]"  # variable prefix
+                        # optional prefix part
+                        "([A-Za-z\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD_]"
+                        "[A-Za-z0-9\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD\u0300-\u036F\u203F-\u2040\xB7_.-]*:)?"
+                        # localname part
+                        "([A-Za-z\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD_]"
+                        "[A-Za-z0-9\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD\u0300-\u036F\u203F-\u2040\xB7_.-]*)"
+                        )
+    # for now :: axis step is expected in QName production (processed in parser's QName structure)
+    #qName = Word(alphas + '_',alphanums + ':_-.*') # note: this will pick up forward and reverse axes and handle by pushQName
+
+    # try to match axis step, prefix, and localname, allowin wildcard prefix or localname
+    # don't grab occurence indicator if on qname, e.g., not * of xs:string*
+    qName = Regex("([A-Za-z-]+::)?"  # axis step part (just ansi characters)
+                  # prefix or wildcard-prefix part
+                  "([A-Za-z\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD_]"
+                  "[A-Za-z0-9\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD\u0300-\u036F\u203F-\u2040\xB7_.-]*:|[*]:)?"
+                  # localname or wildcard-localname part  
+                  "([A-Za-z\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD_]"
+                  "[A-Za-z0-9\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD\u0300-\u036F\u203F-\u2040\xB7_.-]*|[*])"
+                  )
+    ''' above qName definition allows double :: and excludes non-ascii letters
+    qName = Regex("[_A-Za-z\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD]"
+                  r"[_\-\." 
+                  "\xB7A-Za-z0-9\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD\u0300-\u036F\u203F-\u2040]*"
+                  "[:]?"
+                  r"[_\-\." 
+                  "\xB7A-Za-z0-9\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD\u0300-\u036F\u203F-\u2040]*")
+    '''    
+    ncName = Word(alphas + '_',alphanums + '_-.')
+    prefixOp = Literal(":")
+
+    decimalPoint = Literal('.')
+    exponentLiteral = CaselessLiteral('e')
+    plusorminusLiteral = Literal('+') | Literal('-')
+    digits = Word(nums) 
+    integerLiteral = Combine( Optional(plusorminusLiteral) + digits )
+    decimalFractionLiteral = Combine( Optional(plusorminusLiteral) + decimalPoint + digits )
+    infLiteral = Combine( Optional(plusorminusLiteral) + Literal("INF") )
+    nanLiteral = Literal("NaN")
+    floatLiteral = ( Combine( integerLiteral +
+                         ( ( decimalPoint + Optional(digits) + exponentLiteral + integerLiteral ) |
+                           ( exponentLiteral + integerLiteral ) )
+                         ) | 
+                     Combine( decimalFractionLiteral + exponentLiteral + integerLiteral ) |
+                     infLiteral | nanLiteral ) 
+    decimalLiteral =  ( Combine( integerLiteral + decimalPoint + Optional(digits) ) |
+                        decimalFractionLiteral )
+
+
+    #emptySequence = Literal( "(" ) + Literal( ")" )
+    lParen  = Literal( "(" )
+    rParen  = Literal( ")" )
+    lPred  = Literal( "[" )
+    rPred  = Literal( "]" )
+    expOp = Literal( "^" )
+
+    commaOp = Literal(",")
+    forOp = Keyword("for").setParseAction(pushOp)
+    someOp = Keyword("some")
+    everyOp = Keyword("every")
+    quantifiedOp = ( someOp | everyOp ).setParseAction(pushOp)
+    inOp = Keyword("in")
+    returnOp = Keyword("return").setParseAction(pushOp)
+    satisfiesOp = Keyword("satisfies").setParseAction(pushOp)
+    ifOp = Keyword("if").setParseAction(pushOp)
+    thenOp = Keyword("then").setParseAction(pushOp)
+    elseOp = Keyword("else").setParseAction(pushOp)
+    andOp = Keyword("and")
+    orOp = Keyword("or")
+    eqValueOp = Keyword("eq")
+    neValueOp = Keyword("ne")
+    ltValueOp = Keyword("lt")
+    leValueOp = Keyword("le")
+    gtValueOp = Keyword("gt")
+    geValueOp = Keyword("ge")
+    valueCompOp = eqValueOp | neValueOp | ltValueOp | leValueOp | gtValueOp | geValueOp
+    isNodeOp = Keyword("is")
+    precedesNodeOp = Literal("<<")
+    followsNodeOp = Literal(">>")
+    nodeCompOp = isNodeOp | precedesNodeOp | followsNodeOp
+    neGeneralOp = Literal("!=")
+    leGeneralOp = Literal("<=")
+    ltGeneralOp = Literal("<")
+    geGeneralOp = Literal(">=")
+    gtGeneralOp = Literal(">")
+    eqGeneralOp = Literal("=")
+    generalCompOp = neGeneralOp | leGeneralOp | ltGeneralOp | geGeneralOp | gtGeneralOp | eqGeneralOp
+    comparisonOp = ( nodeCompOp | valueCompOp | generalCompOp ).setParseAction(pushOp)
+    toOp = Keyword("to").setParseAction(pushOp)
+    plusOp  = Literal("+")
+    minusOp = Literal("-")
+    plusMinusOp  = ( plusOp | minusOp ).setParseAction(pushOp)
+    multOp  = Literal("*")
+    divOp   = Keyword("div")
+    idivOp  = Keyword("idiv")
+    modOp  = Keyword("mod")
+    multDivOp = ( multOp | divOp | idivOp | modOp ).setParseAction(pushOp)
+    unionWordOp = Keyword("union")
+    unionSymbOp = Literal("|")
+    unionOp = unionWordOp | unionSymbOp
+    intersectOp = Keyword("intersect")
+    exceptOp = Keyword("except")
+    intersectExceptOp = intersectOp | exceptOp
+    instanceOp = Keyword("instance")
+    ofOp = Keyword("of")
+    treatOp = Keyword("treat")
+    asOp = Keyword("as")
+    castableOp = Keyword("castable")
+    castOp = Keyword("cast")
+    unaryOp  = plusOp | minusOp
+    occurOptionalOp = Literal("?")
+    occurAnyOp = multOp
+    occurAtLeastOnceOp = plusOp
+    occurrenceOp = occurOptionalOp | occurAnyOp | occurAtLeastOnceOp
+    wildOp = multOp
+    typeName = qName
+    elementName = qName
+    attributeName = qName
+    elementDeclaration = elementName
+    schemaElementTest = ( Keyword("schema-element") + Suppress(lParen) + elementDeclaration + Suppress(rParen) ).setParseAction(pushOperation)
+    elementNameOrWildcard = ( elementName | wildOp )
+    elementTest = ( Keyword("element") + Suppress(lParen) + Optional( elementNameOrWildcard + Optional( Suppress(commaOp) + typeName + Optional( Literal("?") ) ) ) + Suppress(rParen) ).setParseAction(pushOperation)
+    attributeDeclaration = ( attributeName )
+    schemaAttributeTest = ( Keyword("schema-attribute") + Suppress(lParen) + attributeDeclaration + Suppress(rParen) ).setParseAction(pushOperation)
+    attribNameOrWildcard = ( attributeName | wildOp )
+    attributeTest = ( Keyword("attribute") + Suppress(lParen) + Optional( attribNameOrWildcard + Optional( commaOp + typeName ) ) + Suppress(rParen) ).setParseAction(pushOperation)
+    PITest = ( Keyword("processing-instruction") + Suppress(lParen) + Optional( ncName | quotedString ) + Suppress(rParen) ).setParseAction(pushOperation)
+    commentTest = ( Keyword("comment") + Suppress(lParen) + Suppress(rParen) ).setParseAction(pushOperation)
+    textTest = ( Keyword("text") + Suppress(lParen) + Suppress(rParen) ).setParseAction(pushOperation)
+    documentTest = ( Keyword("document-node") + Suppress(lParen) + Optional(elementTest | schemaElementTest) + Suppress(rParen) ).setParseAction(pushOperation)
+    anyKindTest = ( Keyword("node") + Suppress(lParen) + Suppress(rParen) ).setParseAction(pushOperation)
+    kindTest = ( documentTest | elementTest | attributeTest | schemaElementTest | 
+                 schemaAttributeTest | PITest | commentTest | textTest | anyKindTest )
+    wildcard = ( Combine( ncName + prefixOp + wildOp ) | Combine( wildOp + prefixOp + ncName ) | wildOp )
+    nameTest = ( qName | wildcard )
+    nodeTest = ( kindTest | nameTest )
+    abbrevForwardStep = ( ( Literal("@") + nodeTest).setParseAction(pushAttr) |
+                          ( nodeTest ) )
+    atomicType = qName
+    itemType = ( kindTest | Keyword("item") + lParen + rParen | atomicType )
+    occurrenceIndicator = ( occurOptionalOp | multOp | plusOp ) # oneOf("? * +")
+    sequenceType = ( ( Keyword("empty-sequence") + lParen + rParen ) | 
+                     ( itemType + Optional(occurrenceIndicator) ) )
+    singleType  = ( atomicType + Optional( occurOptionalOp ) )
+    contextItem = decimalPoint
+    pathDescOp = Literal("//")
+    pathStepOp = Literal("/")
+    pathOp = pathStepOp | pathDescOp
+    pathRootOp = Regex(r"(/$|/[^/])")
+    axisOp = Literal("::")
+    forwardAxis = ((Keyword("child") + axisOp) |
+                   (Keyword("descendant") + axisOp) |
+                   (Keyword("attribute") + axisOp) |
+                   (Keyword("self") + axisOp) |
+                   (Keyword("descendant-or-self") + axisOp) |
+                   (Keyword("following-sibling") + axisOp) |
+                   (Keyword("following") + axisOp) |
+                   (Keyword("namespace") + axisOp))
+    forwardStep = ( ( forwardAxis + nodeTest) | abbrevForwardStep )
+    reverseAxis = ((Keyword("parent") + axisOp) |
+                   (Keyword("ancestor") + axisOp) |
+                   (Keyword("preceding-sibling") + axisOp) |
+                   (Keyword("preceding") + axisOp) |
+                   (Keyword("ancestor-or-self") + axisOp))
+    abbrevReverseStep = Literal("..")
+    reverseStep = ( ( reverseAxis + nodeTest ) | abbrevReverseStep )
+    step = ( forwardStep | reverseStep )
+
+    expr = Forward()
+    atom = ( 
+             ( forOp - (variableRef + inOp + expr).setParseAction(pushRangeVar) + 
+                     ZeroOrMore( Suppress(commaOp) + (variableRef + inOp + expr).setParseAction(pushRangeVar) ) - 
+                     (returnOp + expr).setParseAction(pushExpr) ).setParseAction(pushOperation) |
+             ( quantifiedOp - (variableRef + inOp + expr).setParseAction(pushRangeVar) + 
+                     ZeroOrMore( Suppress(commaOp) + (variableRef + inOp + expr ).setParseAction(pushRangeVar) ) - 
+                     (satisfiesOp + expr).setParseAction(pushExpr) ).setParseAction(pushOperation) |
+             ( (ifOp - Suppress(lParen) + Group(expr) + Suppress(rParen)).setParseAction(pushExpr) - 
+               (thenOp + expr).setParseAction(pushOperation) - 
+               (elseOp + expr).setParseAction(pushOperation) ).setParseAction(pushOperation) |
+             ( qName + Suppress(lParen) + Optional(delimitedList(expr)) + Suppress(rParen) ).setParseAction(pushFunction) |
+             ( floatLiteral ).setParseAction(pushFloat) |
+             ( decimalLiteral ).setParseAction(pushDecimal) |
+             ( integerLiteral ).setParseAction(pushInt) |
+             ( quotedString ).setParseAction(pushQuotedString) |
+             ( variableRef ).setParseAction(pushVarRef)  |
+             ( abbrevReverseStep ).setParseAction(pushOperation)  |
+             ( contextItem ).setParseAction(pushOperation)  |
+             ( qName ).setParseAction(pushQName) |
+             ( Suppress(lParen) - Optional(expr) - ZeroOrMore( commaOp.setParseAction(pushOp) - expr ) - Suppress(rParen) ).setParseAction(pushSequence)
            )
+    #stepExpr = ( ( atom + ZeroOrMore( (lPred.setParseAction( pushOp ) - expr - Suppress(rPred)).setParseAction(pushPredicate) ) ) | 
+    #             ( (reverseStep | forwardStep) + ZeroOrMore( (lPred.setParseAction( pushOp ) - expr - Suppress(rPred)).setParseAction(pushPredicate) ) ) )
+    stepExpr = ( ( atom + ZeroOrMore( (lPred.setParseAction( pushOp ) - expr - Suppress(rPred)).setParseAction(pushPredicate) ) ) | 
+                 ( step + ZeroOrMore( (lPred.setParseAction( pushOp ) - expr - Suppress(rPred)).setParseAction(pushPredicate) ) ) )
+    relativePathExpr = stepExpr + ZeroOrMore( ( ( pathDescOp | pathStepOp ) + stepExpr ).setParseAction( pushOperation ) )
+    pathExpr = ( ( pathDescOp + relativePathExpr ).setParseAction( pushRootStep ) |
+                 ( pathStepOp + relativePathExpr ).setParseAction( pushRootStep ) |
+                 ( relativePathExpr ) |
+                 ( ( pathRootOp ).setParseAction( pushRootStep ) ) 
+               )
 
              
-valueExpr = pathExpr
-
-#filterExpr = ( atom + ZeroOrMore( (Suppress(lPred) - expr - Suppress(rPred)).setParseAction(pushPredicate) ) )
-#axisStep = ( (reverseStep | forwardStep) + ZeroOrMore( (Suppress(lPred) - expr - Suppress(rPred)).setParseAction(pushPredicate) ) )         
-#stepExpr = filterExpr | axisStep
-#relativePathExpr = ( stepExpr + ZeroOrMore( ( pathStepOp | pathDescOp ) + stepExpr ).setParseAction( pushOperation ) )
-#pathExpr = ( ( pathDescOp + relativePathExpr ) |
-#             ( pathStepOp + relativePathExpr ) |
-#             ( relativePathExpr ) |
-#             ( pathStepOp ) )
-#valueExpr = pathExpr
-unaryExpr = ( plusMinusOp + valueExpr ).setParseAction( pushUnaryOperation ) | valueExpr
-castExpr = unaryExpr + ZeroOrMore( ( castOp + asOp + singleType ).setParseAction( pushOperation ) )
-castableExpr = castExpr + ZeroOrMore( ( castableOp + asOp + singleType ).setParseAction( pushOperation ) )
-treatExpr = castableExpr + ZeroOrMore( ( treatOp + asOp + sequenceType ).setParseAction( pushOperation ) )
-instanceOfExpr = treatExpr + ZeroOrMore( ( instanceOp + Suppress(ofOp) + sequenceType ).setParseAction( pushOperation ) )
-intersectExceptExpr = instanceOfExpr + ZeroOrMore( ( intersectExceptOp + instanceOfExpr ).setParseAction( pushOperation ) )
-unionExpr = intersectExceptExpr + ZeroOrMore( ( unionOp + intersectExceptExpr ).setParseAction( pushOperation ) )
-multiplicitaveExpr = unionExpr + ZeroOrMore( ( multDivOp + unionExpr ).setParseAction( pushOperation ) )
-additiveExpr = multiplicitaveExpr + ZeroOrMore( ( plusMinusOp + multiplicitaveExpr ).setParseAction( pushOperation ) )
-rangeExpr = additiveExpr + ZeroOrMore( ( toOp + additiveExpr ).setParseAction( pushOperation ) )
-comparisonExpr = rangeExpr + ZeroOrMore( ( comparisonOp + rangeExpr ).setParseAction( pushOperation ) )
-andExpr = comparisonExpr + ZeroOrMore( ( andOp + comparisonExpr ).setParseAction( pushOperation ) )
-orExpr = andExpr + ZeroOrMore( ( orOp + andExpr ).setParseAction( pushOperation ) )
-
-expr << orExpr
-xpathExpr = expr + StringEnd()
+    valueExpr = pathExpr
+
+    #filterExpr = ( atom + ZeroOrMore( (Suppress(lPred) - expr - Suppress(rPred)).setParseAction(pushPredicate) ) )
+    #axisStep = ( (reverseStep | forwardStep) + ZeroOrMore( (Suppress(lPred) - expr - Suppress(rPred)).setParseAction(pushPredicate) ) )         
+    #stepExpr = filterExpr | axisStep
+    #relativePathExpr = ( stepExpr + ZeroOrMore( ( pathStepOp | pathDescOp ) + stepExpr ).setParseAction( pushOperation ) )
+    #pathExpr = ( ( pathDescOp + relativePathExpr ) |
+    #             ( pathStepOp + relativePathExpr ) |
+    #             ( relativePathExpr ) |
+    #             ( pathStepOp ) )
+    #valueExpr = pathExpr
+    unaryExpr = ( plusMinusOp + valueExpr ).setParseAction( pushUnaryOperation ) | valueExpr
+    castExpr = unaryExpr + ZeroOrMore( ( castOp + asOp + singleType ).setParseAction( pushOperation ) )
+    castableExpr = castExpr + ZeroOrMore( ( castableOp + asOp + singleType ).setParseAction( pushOperation ) )
+    treatExpr = castableExpr + ZeroOrMore( ( treatOp + asOp + sequenceType ).setParseAction( pushOperation ) )
+    instanceOfExpr = treatExpr + ZeroOrMore( ( instanceOp + Suppress(ofOp) + sequenceType ).setParseAction( pushOperation ) )
+    intersectExceptExpr = instanceOfExpr + ZeroOrMore( ( intersectExceptOp + instanceOfExpr ).setParseAction( pushOperation ) )
+    unionExpr = intersectExceptExpr + ZeroOrMore( ( unionOp + intersectExceptExpr ).setParseAction( pushOperation ) )
+    multiplicitaveExpr = unionExpr + ZeroOrMore( ( multDivOp + unionExpr ).setParseAction( pushOperation ) )
+    additiveExpr = multiplicitaveExpr + ZeroOrMore( ( plusMinusOp + multiplicitaveExpr ).setParseAction( pushOperation ) )
+    rangeExpr = additiveExpr + ZeroOrMore( ( toOp + additiveExpr ).setParseAction( pushOperation ) )
+    comparisonExpr = rangeExpr + ZeroOrMore( ( comparisonOp + rangeExpr ).setParseAction( pushOperation ) )
+    andExpr = comparisonExpr + ZeroOrMore( ( andOp + comparisonExpr ).setParseAction( pushOperation ) )
+    orExpr = andExpr + ZeroOrMore( ( orOp + andExpr ).setParseAction( pushOperation ) )
+
+    expr << orExpr
+    xpathExpr = expr + StringEnd()
+    return xpathExpr
+
+# characters of XML names, as in the grammar's qName and variableRef
+ncNameStartChar = ("[A-Za-z\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F"
+                   "\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD_]")
+ncNameChar = ("[A-Za-z0-9\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F"
+              "\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD\u0300-\u036F\u203F-\u2040\xB7_.-]")
+ncNamePattern = ncNameStartChar + ncNameChar + "*"
+qNamePattern = re.compile("([A-Za-z-]+::)?(" + ncNamePattern + ":|[*]:)?(" + ncNamePattern + "|[*])")
+variableRefPattern = re.compile("[$](" + ncNamePattern + ":)?" + ncNamePattern)
+numericLiteralPattern = re.compile(r"(?:[0-9]+(?:[.][0-9]*)?|[.][0-9]+)(?:[eE][+-]?[0-9]+)?")
+signedNumericLiteralPattern = re.compile(r"[+-]?(?:[0-9]+(?:[.][0-9]*)?|[.][0-9]+)(?:[eE][+-]?[0-9]+)?")
+quotedStringPattern = re.compile(r'''(?:"(?:[^"\n\r\\]|(?:"")|(?:\\x[0-9a-fA-F]+)|(?:\\.))*")|'''
+                                 r"""(?:'(?:[^'\n\r\\]|(?:'')|(?:\\x[0-9a-fA-F]+)|(?:\\.))*')""")
+piTargetPattern = re.compile("[A-Za-z_][A-Za-z0-9_.-]*")
+emptySequencePattern = re.compile("empty-sequence[ \t\n\r]*[(][ \t\n\r]*[)]")
+itemTypePattern = re.compile("item[ \t\n\r]*[(][ \t\n\r]*[)]")
+kindTestPattern = re.compile("(document-node|element|attribute|schema-element|schema-attribute|"
+                             "processing-instruction|comment|text|node)[ \t\n\r]*[(]")
+stepStartPattern = re.compile(ncNameStartChar + "|[*@$(.0-9\"']")
+keywordIdentChars = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_$")
+whitespaceChars = " \t\n\r"
+
+class XPathSyntaxError(Exception):
+    """Syntax error of an XPath expression, raised by XPathDescentParser.
+
+    Has the msg, loc, lineno, column and line of a pyparsing ParseException, for the err:XPST0003
+    message and its exceptionErrorIndication.
+    """
+    def __init__(self, sourceStr, loc, expected):
+        self.sourceStr = sourceStr
+        self.loc = loc
+        self.msg = "Expected " + expected
+        self.args = (self.msg,)
+    @property
+    def lineno(self):
+        return self.sourceStr.count("\n", 0, self.loc) + 1
+    @property
+    def column(self):
+        if self.loc < len(self.sourceStr) and self.sourceStr[self.loc] == "\n":
+            return 1
+        return self.loc - self.sourceStr.rfind("\n", 0, self.loc)
+    @property
+    def line(self):
+        lastCR = self.sourceStr.rfind("\n", 0, self.loc)
+        nextCR = self.sourceStr.find("\n", self.loc)
+        if nextCR >= 0:
+            return self.sourceStr[lastCR+1:nextCR]
+        return self.sourceStr[lastCR+1:]
+    def __str__(self):
+        return "%s (at char %d), (line:%d, col:%d)" % (self.msg, self.loc, self.lineno, self.column)
+
+class XPathGrammarFallback(Exception):
+    """Raised by XPathDescentParser for constructs which the pyparsing grammar parses irregularly: a "/"
+    not followed by a step, names starting with INF or NaN, and for, some, every or if not starting their
+    expressions.  Such expressions are parsed by the grammar, so that their expression stacks (or syntax
+    errors) are unchanged.
+    """
+
+class XPathDescentParser:
+    """Recursive descent parser of an XPath 2 expression.
+
+    Produces the same expression stack as the pyparsing grammar's parse actions: each production
+    returns a list of tokens, where a binary operation is the tokens of its first operand followed by
+    an OperationDef for each further operator, having the tokens of its right operand as args.
+    QNames, variable references and function names are resolved (and their errors logged) by the
+    same functions as used by the grammar's parse actions, so parse must be called with the module's
+    modelXbrl and xmlElement set (as by the parse function).  Constructs which the grammar parses
+    irregularly raise XPathGrammarFallback, see descentParserExprStack.
+    """
+    def __init__(self, sourceStr):
+        self.sourceStr = sourceStr
+        self.loc = 0
+        self.end = len(sourceStr)
+
+    def parse(self):
+        toks = self.expr()
+        if self.skip() < self.end:
+            self.error("end of text")
+        return toks
+
+    def error(self, expected):
+        raise XPathSyntaxError(self.sourceStr, self.loc, expected)
+
+    def skip(self):
+        s, loc, end = self.sourceStr, self.loc, self.end
+        while loc < end and s[loc] in whitespaceChars:
+            loc += 1
+        self.loc = loc
+        return loc
+
+    def peek(self, text):
+        # skips whitespace, True if text is next
+        return self.sourceStr.startswith(text, self.skip())
+
+    def expect(self, text):
+        if not self.peek(text):
+            self.error('"{}"'.format(text))
+        loc = self.loc
+        self.loc += len(text)
+        return loc
+
+    def keyword(self, word):
+        # skips whitespace, consumes word if it is not part of a longer name and returns its location, else None
+        s, loc = self.sourceStr, self.skip()
+        endLoc = loc + len(word)
+        if (s.startswith(word, loc) and
+            (endLoc >= self.end or s[endLoc] not in keywordIdentChars) and
+            (loc == 0 or s[loc-1] not in keywordIdentChars)):
+            self.loc = endLoc
+            return loc
+        return None
+
+    def expectKeyword(self, word):
+        loc = self.keyword(word)
+        if loc is None:
+            self.error('"{}"'.format(word))
+        return loc
+
+    def operator(self, symbols, keywords):
+        # consumes the next operator symbol or keyword, returning (location, operator), else None
+        loc = self.skip()
+        for symbol in symbols:
+            if self.sourceStr.startswith(symbol, loc):
+                self.loc = loc + len(symbol)
+                return loc, symbol
+        for word in keywords:
+            if self.keyword(word) is not None:
+                return loc, word
+        return None
+
+    def binary(self, operand, symbols, keywords):
+        toks = operand()
+        op = self.operator(symbols, keywords)
+        while op is not None:
+            toks.append(OperationDef(self.sourceStr, op[0], op[1], operand(), False))
+            op = self.operator(symbols, keywords)
+        return toks
+
+    def expr(self):
+        return self.binary(self.andExpr, (), ("or",))
+
+    def andExpr(self):
+        return self.binary(self.comparisonExpr, (), ("and",))
+
+    def comparisonExpr(self):
+        return self.binary(self.rangeExpr, ("<<", ">>", "!=", "<=", ">=", "<", ">", "="),
+                           ("is", "eq", "ne", "lt", "le", "gt", "ge"))
+
+    def rangeExpr(self):
+        return self.binary(self.additiveExpr, (), ("to",))
+
+    def additiveExpr(self):
+        return self.binary(self.multiplicativeExpr, ("+", "-"), ())
+
+    def multiplicativeExpr(self):
+        return self.binary(self.unionExpr, ("*",), ("div", "idiv", "mod"))
+
+    def unionExpr(self):
+        return self.binary(self.intersectExceptExpr, ("|",), ("union",))
+
+    def intersectExceptExpr(self):
+        return self.binary(self.instanceOfExpr, (), ("intersect", "except"))
+
+    def typeOperations(self, operand, name, secondKeyword, typeProduction):
+        # instance of, treat as, castable as and cast as, args are the type tokens (after "as" if any)
+        toks = operand()
+        loc = self.keyword(name)
+        while loc is not None:
+            self.expectKeyword(secondKeyword)
+            args = typeProduction()
+            if secondKeyword == "as":
+                args.insert(0, "as")
+            toks.append(OperationDef(self.sourceStr, loc, name, args, False))
+            loc = self.keyword(name)
+        return toks
+
+    def instanceOfExpr(self):
+        return self.typeOperations(self.treatExpr, "instance", "of", self.sequenceType)
+
+    def treatExpr(self):
+        return self.typeOperations(self.castableExpr, "treat", "as", self.sequenceType)
+
+    def castableExpr(self):
+        return self.typeOperations(self.castExpr, "castable", "as", self.singleType)
+
+    def castExpr(self):
+        return self.typeOperations(self.unaryExpr, "cast", "as", self.singleType)
+
+    def unaryExpr(self):
+        loc = self.skip()
+        sign = self.sourceStr[loc:loc+1]
+        if sign == "+" or sign == "-":
+            self.loc = loc + 1
+            return [OperationDef(self.sourceStr, loc, "u" + sign, self.pathExpr(signedLiteral=True), False)]
+        return self.pathExpr()
+
+    def pathExpr(self, signedLiteral=False):
+        s, loc = self.sourceStr, self.skip()
+        if s.startswith("//", loc):
+            self.loc = loc + 2
+            return [OperationDef(s, loc, "rootDescendant", self.relativePathExpr(), False)]
+        if s.startswith("/", loc):
+            self.loc = loc + 1
+            if stepStartPattern.match(s, self.skip()):
+                return [OperationDef(s, loc, "rootChild", self.relativePathExpr(), False)]
+            raise XPathGrammarFallback() # lone "/"
+        return self.relativePathExpr(signedLiteral)
+
+    def relativePathExpr(self, signedLiteral=False):
+        toks = self.stepExpr(signedLiteral)
+        s = self.sourceStr
+        while True:
+            loc = self.skip()
+            if s.startswith("//", loc):
+                op = "//"
+            elif s.startswith("/", loc):
+                op = "/"
+            else:
+                return toks
+            self.loc = loc + len(op)
+            # op is first token for OperationDef's wildcard step special case
+            toks.append(OperationDef(s, loc, op, [op] + self.stepExpr(), True))
+
+    def stepExpr(self, signedLiteral=False):
+        toks = self.primary(signedLiteral)
+        while self.peek("["):
+            loc = self.loc
+            self.loc += 1
+            predicate = self.expr()
+            self.expect("]")
+            toks.append(OperationDef(self.sourceStr, loc, "predicate", predicate, False))
+        return toks
+
+    def primary(self, signedLiteral=False):
+        s, loc = self.sourceStr, self.skip()
+        c = s[loc:loc+1]
+        if c == "$":
+            return [self.variableRef()]
+        if c == "(":
+            return [self.sequence()]
+        if c == '"' or c == "'":
+            return [self.stringLiteral()]
+        if c == "@":
+            self.loc = loc + 1
+            return self.attributeStep()
+        if c and c in "0123456789.+-":
+            m = (signedNumericLiteralPattern if signedLiteral else numericLiteralPattern).match(s, loc)
+            if m is not None:
+                self.loc = m.end()
+                number = m.group()
+                if "e" in number or "E" in number:
+                    return [float(number)]
+                elif "." in number:
+                    return [Decimal(number)]
+                return [_INT(number)]
+            if s.startswith("..", loc):
+                self.loc = loc + 2
+                return [OperationDef(s, loc, "..", [], False)]
+            if c == ".":
+                self.loc = loc + 1
+                return [OperationDef(s, loc, ".", [], False)]
+        for word in ("for", "some", "every", "if"):
+            if self.keyword(word) is not None:
+                if word == "if" and self.peek("("):
+                    return [self.ifExpr(loc)]
+                if word != "if" and self.peek("$"):
+                    return [self.forExpr(loc, word)]
+                raise XPathGrammarFallback() # keyword not starting its expression
+        m = qNamePattern.match(s, loc)
+        if m is None:
+            self.error("expression")
+        self.loc = m.end()
+        name = m.group()
+        if self.peek("("):
+            return self.functionCall(loc, name)
+        if name.startswith(("INF", "NaN")):
+            raise XPathGrammarFallback() # INF or NaN literal
+        qnameDef = stepQNameDef(loc, name)
+        if qnameDef is None:
+            return []
+        return [qnameDef]
+
+    def attributeStep(self):
+        kindTest = self.kindTest()
+        if kindTest is not None:
+            return [kindTest]
+        toks = self.typeName() # attribute name test
+        for qnameDef in toks:
+            qnameDef.isAttribute = True
+        return toks
+
+    def variableRef(self):
+        m = variableRefPattern.match(self.sourceStr, self.loc)
+        if m is None:
+            self.error("variable reference")
+        self.loc = m.end()
+        return VariableRef(m.start(), variableRefQName(m.group()[1:]))
+
+    def stringLiteral(self):
+        s, loc = self.sourceStr, self.loc
+        m = quotedStringPattern.match(s, loc)
+        if m is None:
+            self.error("quoted string")
+        self.loc = m.end()
+        q = s[loc]
+        return m.group()[1:-1].replace(q+q, q)
+
+    def sequence(self):
+        loc = self.expect("(")
+        toks = []
+        if not self.peek(")"):
+            toks.extend(self.expr())
+            while self.peek(","):
+                toks.append(OpDef(self.loc, [","]))
+                self.loc += 1
+                toks.extend(self.expr())
+        self.expect(")")
+        return OperationDef(self.sourceStr, loc, "sequence", toks, False)
+
+    def functionCall(self, loc, name):
+        qnameDef = stepQNameDef(loc, name)
+        self.expect("(")
+        args = []
+        if not self.peek(")"):
+            args.extend(self.expr())
+            while self.peek(","):
+                self.loc += 1
+                args.extend(self.expr())
+        self.expect(")")
+        if qnameDef is None: # error has been logged
+            return args
+        checkFunctionName(qnameDef)
+        return [OperationDef(self.sourceStr, loc, qnameDef, args, False)]
+
+    def forExpr(self, loc, name):
+        # for, some and every: range variable declarations followed by return or satisfies expression
+        args = []
+        while True:
+            self.skip()
+            varRef = self.variableRef()
+            self.expectKeyword("in")
+            args.append(RangeDecl(varRef.loc, [varRef, "in"] + self.expr()))
+            if not self.peek(","):
+                break
+            self.loc += 1
+        word = "return" if name == "for" else "satisfies"
+        exprLoc = self.expectKeyword(word)
+        args.append(Expr(exprLoc, [OpDef(exprLoc, [word])] + self.expr()))
+        return OperationDef(self.sourceStr, loc, name, args, False)
+
+    def ifExpr(self, loc):
+        self.expect("(")
+        test = self.expr()
+        self.expect(")")
+        thenLoc = self.expectKeyword("then")
+        thenOp = OperationDef(self.sourceStr, thenLoc, "then", self.expr(), False)
+        elseLoc = self.expectKeyword("else")
+        elseOp = OperationDef(self.sourceStr, elseLoc, "else", self.expr(), False)
+        return OperationDef(self.sourceStr, loc, "if", [Expr(loc, [OpDef(loc, ["if"]), test]), thenOp, elseOp], False)
+
+    def typeName(self):
+        s, loc = self.sourceStr, self.skip()
+        m = qNamePattern.match(s, loc)
+        if m is None:
+            self.error("QName")
+        self.loc = m.end()
+        qnameDef = stepQNameDef(loc, m.group())
+        if qnameDef is None:
+            return []
+        return [qnameDef]
+
+    def singleType(self):
+        toks = self.typeName()
+        if self.peek("?"):
+            self.loc += 1
+            toks.append("?")
+        return toks
+
+    def sequenceType(self):
+        s, loc = self.sourceStr, self.skip()
+        m = emptySequencePattern.match(s, loc)
+        if m is not None:
+            self.loc = m.end()
+            return ["empty-sequence", "(", ")"]
+        kindTest = self.kindTest()
+        if kindTest is not None:
+            toks = [kindTest]
+        else:
+            m = itemTypePattern.match(s, loc)
+            if m is not None:
+                self.loc = m.end()
+                toks = ["item", "(", ")"]
+            else:
+                toks = self.typeName()
+        loc = self.skip()
+        occurrence = s[loc:loc+1]
+        if occurrence and occurrence in "?*+":
+            self.loc = loc + 1
+            toks.append(occurrence)
+        return toks
+
+    def kindTest(self):
+        # node kind test, returns None if not a kind test
+        s, loc = self.sourceStr, self.skip()
+        m = kindTestPattern.match(s, loc)
+        if m is None:
+            return None
+        self.loc = m.end()
+        kind = m.group(1)
+        args = []
+        if not self.peek(")"):
+            if kind == "document-node":
+                elementTest = self.kindTest()
+                if elementTest is None or elementTest.name not in ("element", "schema-element"):
+                    self.error("element test")
+                args.append(elementTest)
+            elif kind == "element":
+                args = self.typeName()
+                if self.peek(","):
+                    self.loc += 1
+                    args.extend(self.typeName())
+                    if self.peek("?"):
+                        self.loc += 1
+                        args.append("?")
+            elif kind == "attribute":
+                args = self.typeName()
+                if self.peek(","):
+                    args.append(OpDef(self.loc, [","]))
+                    self.loc += 1
+                    args.extend(self.typeName())
+            elif kind in ("schema-element", "schema-attribute"):
+                args = self.typeName()
+            elif kind == "processing-instruction":
+                if s[self.loc:self.loc+1] in ("'", '"'):
+                    args.append(self.stringLiteral())
+                else:
+                    m = piTargetPattern.match(s, self.loc)
+                    if m is None:
+                        self.error("NCName")
+                    self.loc = m.end()
+                    args.append(m.group())
+        self.expect(")")
+        return OperationDef(s, loc, kind, args, False)
+
 
     
 # map operator symbols to corresponding arithmetic operations
@@ -670,17 +1158,151 @@ def initializeParser(modelManager):
     global isInitialized, FunctionIxt
     if not isInitialized:
         from arelle import FunctionIxt
-        modelManager.showStatus(_("initializing formula xpath2 grammar"))
-        startedAt = time.time()
-        xpathExpr.parseString( "0", parseAll=True )
-        modelManager.addToLog(format_string(modelManager.locale, 
-                                    _("Formula xpath2 grammar initialized in %.2f secs"), 
-                                    time.time() - startedAt))
-        modelManager.showStatus(None)
         isInitialized = True
         return True # was initialized on this call
     return False # had already been initialized
 
+class InternedProgs:
+    """Parsed XPath expressions of a DTS, shared by resources (such as the many formula resources
+    generated with identical test, fallback value or period expressions).  An expression is shared where its
+    normalized source and trace type are the same, and where the namespace prefixes used by its QNames and
+    variable references have the same bindings.  Tokens are not changed after parsing, so each resource's
+    program is its own ProgHeader followed by the shared tokens.
+    """
+    def __init__(self):
+        self.progs = defaultdict(list) # key (sourceStr, traceType), value list of (namespace bindings, tokens)
+        self.parseCount = 0
+        self.internedCount = 0
+        self.parseTime = 0.0
+
+    def tokens(self, sourceStr, traceType, element):
+        # tokens of sourceStr, parsed for an element with the same namespace bindings, else None
+        for bindings, toks in self.progs.get((sourceStr, traceType), ()):
+            if all(namespaceBinding(element, prefix, isQNameDef) == namespaceURI
+                   for prefix, namespaceURI, isQNameDef in bindings):
+                self.internedCount += 1
+                return toks
+        return None
+
+    def intern(self, sourceStr, traceType, toks):
+        bindings = set()
+        if namespaceBindings(toks, bindings):
+            self.progs[sourceStr, traceType].append((tuple(bindings), toks))
+
+def modelXbrlInternedProgs(modelXbrl):
+    try:
+        return modelXbrl.internedXPathProgs
+    except AttributeError:
+        modelXbrl.internedXPathProgs = InternedProgs()
+        return modelXbrl.internedXPathProgs
+
+def profileStatInternedProgs(modelXbrl):
+    # profile statistic of XPath parsing, counting expressions parsed and shared
+    internedProgs = modelXbrlInternedProgs(modelXbrl)
+    modelXbrl.profileStat(_("parseXPath ({0} parsed, {1} interned)").format(internedProgs.parseCount, internedProgs.internedCount),
+                          internedProgs.parseTime)
+
+def namespaceBinding(element, prefix, isQNameDef):
+    # namespace of prefix as resolved for QNameDefs (by stepQNameDef) or variable references (by variableRefQName)
+    namespaceURI = XmlUtil.xmlns(element, prefix)
+    if namespaceURI is None and prefix and isQNameDef:
+        namespaceURI = defaultNsmap.get(prefix)
+    return namespaceURI
+
+def namespaceBindings(toks, bindings):
+    # adds (prefix, namespaceURI, isQNameDef) of QNames in toks to bindings, False if toks can't be interned
+    for tok in toks:
+        if isinstance(tok, QNameDef):
+            if tok.prefix is not None or (tok.localName != '*' and tok.namespaceURI != '*'): # not a wildcard
+                if tok.namespaceURI == XbrlConst.xff and tok.localName == "uncovered-aspect":
+                    return False # validity depends on element
+                if tok.prefix != '*':
+                    bindings.add((tok.prefix, tok.namespaceURI, True))
+        elif isinstance(tok, VariableRef):
+            if tok.name.prefix:
+                bindings.add((tok.name.prefix, tok.name.namespaceURI, False))
+        elif isinstance(tok, OperationDef):
+            if not namespaceBindings((tok.name,), bindings) or not namespaceBindings(tok.args, bindings):
+                return False
+        elif isinstance(tok, RangeDecl):
+            if not namespaceBindings((tok.rangeVar,), bindings) or not namespaceBindings(tok.bindingSeq, bindings):
+                return False
+        elif isinstance(tok, Expr):
+            if not namespaceBindings(tok.expr, bindings):
+                return False
+        elif isinstance(tok, (list, tuple)):
+            if not namespaceBindings(tok, bindings):
+                return False
+    return True
+
+def exprStackSignature(tok):
+    # nested tuples of the productions (with their locations) of an expression stack, for comparison of parsers
+    if isinstance(tok, QNameDef):
+        return ("QName", tok.loc, tok.prefix, tok.namespaceURI, tok.localName, tok.isAttribute, tok.axis)
+    elif isinstance(tok, OperationDef):
+        return ("Operation", tok.loc, exprStackSignature(tok.name), exprStackSignature(tok.args))
+    elif isinstance(tok, OpDef):
+        return ("Op", tok.loc, tok.name)
+    elif isinstance(tok, VariableRef):
+        return ("VariableRef", tok.loc, tok.name)
+    elif isinstance(tok, RangeDecl):
+        return ("RangeDecl", tok.loc, exprStackSignature(tok.rangeVar), exprStackSignature(tok.bindingSeq))
+    elif isinstance(tok, Expr):
+        return ("Expr", tok.loc, tok.name, exprStackSignature(tok.expr))
+    elif isinstance(tok, ProgHeader):
+        return ("ProgHeader", tok.name)
+    elif isinstance(tok, float) and tok != tok:
+        return ("float", "NaN")
+    elif isinstance(tok, _STR_BASE) or not hasattr(tok, "__iter__"):
+        return (type(tok).__name__, tok)
+    return tuple(exprStackSignature(t) for t in tok) # list, tuple or pyparsing ParseResults
+
+def grammarExprStack(sourceStr):
+    # expression stack of sourceStr by the pyparsing grammar (leaving the expression stack being parsed unchanged)
+    global exprStack
+    priorExprStack = exprStack
+    exprStack = [None] # in place of ProgHeader, which parse actions' replacements stop at
+    try:
+        compileXPathGrammar().parseString( sourceStr, parseAll=True )
+        return exprStack[1:]
+    finally:
+        exprStack = priorExprStack
+
+def descentParserExprStack(sourceStr):
+    # expression stack of sourceStr by the descent parser, or by the pyparsing grammar where it falls back
+    global deferredParseErrors
+    deferredParseErrors = errors = []
+    try:
+        return XPathDescentParser(sourceStr).parse()
+    except XPathGrammarFallback:
+        del errors[:] # grammar parse actions log their own errors
+        deferredParseErrors = None
+        return grammarExprStack(sourceStr)
+    finally:
+        deferredParseErrors = None
+        for codes, msg, args in errors:
+            parseError(codes, msg, **args)
+
+def compareGrammarParser(sourceStr, element, name):
+    # parse sourceStr by both the pyparsing grammar and the descent parser, warning if they differ
+    results = []
+    for parser, parserName in ((grammarExprStack, "grammar"),
+                               (descentParserExprStack, "descent parser")):
+        startedAt = time.time()
+        try:
+            results.append(exprStackSignature(parser(sourceStr)))
+        except parseExceptions() + (XPathSyntaxError,):
+            results.append("syntax error")
+        except Exception as err:
+            results.append(repr(err))
+        modelXbrl.profileStat(_("parse xpath ({})").format(parserName), time.time() - startedAt)
+    if results[0] != results[1]:
+        modelXbrl.warning("arelle:xpathParserMismatch",
+            _("XPath parsers produce different results for %(name)s: %(source)s\ngrammar: %(grammar)s\ndescent parser: %(descent)s"),
+            modelObject=element,
+            name=name,
+            source=sourceStr, grammar=results[0], descent=results[1])
+
 def exceptionErrorIndication(exception):
     errorAt = exception.column
     source = ''
@@ -748,7 +1370,19 @@ def parse(modelObject, xpathExpression, element, name, traceType):
                 source=normalizedExpr)
             exprStack.append( ProgHeader(modelObject,name,element,normalizedExpr,traceType) )
 
-            L = xpathExpr.parseString( normalizedExpr, parseAll=True )
+            internedProgs = modelXbrlInternedProgs(modelXbrl)
+            toks = internedProgs.tokens(normalizedExpr, traceType, element)
+            if toks is None:
+                errorCount = parseErrorCount
+                startedAt = time.time()
+                if formulaOptions.compareGrammarParser:
+                    compareGrammarParser(normalizedExpr, element, name)
+                toks = descentParserExprStack(normalizedExpr)
+                internedProgs.parseCount += 1
+                internedProgs.parseTime += time.time() - startedAt
+                if errorCount == parseErrorCount and getattr(element, "nsmap", None) is not None:
+                    internedProgs.intern(normalizedExpr, traceType, toks) # no errors depend on element
+            exprStack.extend( toks )
             
             #modelXbrl.error( _("AST {0} {1}").format(name, L),
             #    "info", "formula:trace")
@@ -762,7 +1396,7 @@ def parse(modelObject, xpathExpression, element, name, traceType):
                 name=name,
                 source=exprStack)
                 
-        except (ParseException, ParseSyntaxException) as err:
+        except parseExceptions() + (XPathSyntaxError,) as err: # pyparsing exceptions if parsed by the grammar
             modelXbrl.error("err:XPST0003",
                 _("Parse error in %(name)s error: %(error)s \n%(source)s"),
                 modelObject=element,
@@ -858,6 +1492,91 @@ def prefixDeclarations(exprStack, xmlnsDict, element):
         elif hasattr(p, '__iter__') and not isinstance(p, _STR_BASE):
             prefixDeclarations(p, xmlnsDict, element)
 
+# dependence of an expression on its context item (a fact for general and period date filters)
+CONTEXT_ITEM_INDEPENDENT = 0 # context item is not used, e.g., $v gt 0
+CONTEXT_DEPENDENT = 1 # context item is only used for its xbrl context, e.g., xfi:period(.) eq $p
+CONTEXT_ITEM_DEPENDENT = 2 # context item is otherwise used (or its use can't be determined), e.g., . gt 0
+
+# xfi functions whose result for a fact argument depends only on the fact's context
+XFI_CONTEXT_FUNCTIONS = {'context', 'period', 'entity', 'identifier', 'segment', 'scenario',
+                         'fact-segment-remainder', 'fact-scenario-remainder',
+                         'fact-explicit-dimensions', 'fact-typed-dimensions',
+                         'fact-has-explicit-dimension', 'fact-has-typed-dimension',
+                         'fact-explicit-dimension-value', 'fact-typed-dimension-value'}
+# fn functions which don't use the context item when called without arguments
+FN_NO_CONTEXT_ITEM_FUNCTIONS = {'true', 'false', 'current-dateTime', 'current-date', 'current-time',
+                                'implicit-timezone', 'default-collation', 'static-base-uri'}
+# fn functions with an optional argument which defaults to the context item
+FN_OPTIONAL_CONTEXT_ITEM_FUNCTIONS = {'lang', 'id', 'idref', 'element-with-id'}
+CONTEXT_ITEM_OPS = {'.', '..', 'contextItem', 'contextItemParent'}
+# operations evaluated relative to the result preceding them (the left operand of a path or predicate)
+INNER_FOCUS_OPS = {'/', '//', 'predicate'}
+# operations whose QName arguments are type names, not path steps
+TYPE_NAME_OPS = {'instance', 'cast', 'castable', 'treat'}
+
+def isContextItemArg(args):
+    # first argument (in flattened function args) is just the context item
+    if not args or not isinstance(args[0], OperationDef) or args[0].name not in ('.', 'contextItem') or args[0].args:
+        return False
+    if len(args) == 1:
+        return True
+    nextArg = args[1] # must begin the next argument, not be an operation on the context item
+    return (isinstance(nextArg, (VariableRef, _STR_NUM_TYPES)) or
+            (isinstance(nextArg, OperationDef) and
+             (isinstance(nextArg.name, QNameDef) or nextArg.name in ('sequence', '.', 'contextItem'))))
+
+def contextItemDependence(exprStack, typeNames=False):
+    """Determines how the value of a compiled expression depends on its context item, so filters may
+    evaluate it once per filter (or per fact context) instead of once per fact.  Uncertain uses of the
+    context item are considered CONTEXT_ITEM_DEPENDENT.
+
+    :returns: int -- CONTEXT_ITEM_INDEPENDENT, CONTEXT_DEPENDENT or CONTEXT_ITEM_DEPENDENT
+    """
+    dependence = CONTEXT_ITEM_INDEPENDENT
+    if not exprStack:
+        return dependence
+    priorOperand = False
+    for p in exprStack:
+        if isinstance(p, ProgHeader):
+            continue
+        if isinstance(p, QNameDef):
+            if not typeNames: # a path step relative to the context item
+                return CONTEXT_ITEM_DEPENDENT
+        elif isinstance(p, OperationDef):
+            op = p.name
+            if isinstance(op, QNameDef): # function call
+                if op.namespaceURI == XbrlConst.xfi and op.localName in XFI_CONTEXT_FUNCTIONS and isContextItemArg(p.args):
+                    dependence = max(dependence, CONTEXT_DEPENDENT, contextItemDependence(p.args[1:]))
+                elif op.unprefixed or op.namespaceURI == XbrlConst.fn:
+                    if ((not p.args and op.localName not in FN_NO_CONTEXT_ITEM_FUNCTIONS) or
+                        op.localName in FN_OPTIONAL_CONTEXT_ITEM_FUNCTIONS):
+                        return CONTEXT_ITEM_DEPENDENT
+                    dependence = max(dependence, contextItemDependence(p.args))
+                elif op.namespaceURI in (XbrlConst.xfi, XbrlConst.xff, XbrlConst.xsd):
+                    dependence = max(dependence, contextItemDependence(p.args))
+                else: # custom and plug-in functions may use the context item
+                    return CONTEXT_ITEM_DEPENDENT
+            elif op in CONTEXT_ITEM_OPS:
+                return CONTEXT_ITEM_DEPENDENT
+            elif op in INNER_FOCUS_OPS:
+                if not priorOperand: # applies to the context item
+                    return CONTEXT_ITEM_DEPENDENT
+                # arguments are evaluated with the prior operand's items as context item
+            elif op in ('rootChild', 'rootDescendant'):
+                pass # root of input instance, arguments are relative to it
+            else:
+                dependence = max(dependence, contextItemDependence(p.args, op in TYPE_NAME_OPS))
+        elif isinstance(p, Expr):
+            dependence = max(dependence, contextItemDependence(p.expr))
+        elif isinstance(p, RangeDecl):
+            dependence = max(dependence, contextItemDependence(p.bindingSeq))
+        elif hasattr(p, '__iter__') and not isinstance(p, _STR_BASE):
+            dependence = max(dependence, contextItemDependence(p, typeNames))
+        if dependence == CONTEXT_ITEM_DEPENDENT:
+            break
+        priorOperand = True
+    return dependence
+
 def clearProg(exprStack):
     if exprStack:
         for p in exprStack:
@@ -970,19 +1689,37 @@ def codeModule(code):
         ''' + \
         ''.join(code)
 
-def parser_unit_test():
-    #initialize
-    xpathExpr.parseString( "0", parseAll=True )
-
-    test1 = "3*7+5"
-    test1a = "5+3*7"
-    test1b = "(5+3)*7"
-    test2a ="concat('abc','def')" 
-    test2b ="'abc'" 
-    test3 = "if (sum(1,2,3) gt 123) then 33 else 44"
-    test3a = "sum(1,2,3,min(4,5,6))"
-    
-    '''
+def parser_unit_test(testExpressionsFile=None):
+    """Compares the descent parser with the pyparsing grammar on test expressions (the ones below, or those
+    of a file, one per line), reporting expressions parsed differently, those the descent parser leaves to
+    the grammar, and each parser's throughput:
+
+       python -m arelle.XPathParser [test expressions file]
+    """
+    global modelXbrl, xmlElement, pluginCustomFunctions
+    from arelle import Cntlr, ModelXbrl, ModelDocument
+    cntlr = Cntlr.Cntlr(logFileName="logToPrint")
+    cntlr.webCache.workOffline = True
+    modelXbrl = ModelXbrl.create(cntlr.modelManager, ModelDocument.Type.LINKBASE, "http://arelle.org/xpath-parser-test.xml",
+        initialXml='<link:linkbase xmlns:link="http://www.xbrl.org/2003/linkbase"'
+                   ' xmlns:xfi="http://www.xbrl.org/2008/function/instance"'
+                   ' xmlns:xff="http://www.xbrl.org/2010/function/formula"'
+                   ' xmlns:xs="http://www.w3.org/2001/XMLSchema"'
+                   ' xmlns:xbrli="http://www.xbrl.org/2003/instance"'
+                   ' xmlns:xbrldi="http://xbrl.org/2006/xbrldi"'
+                   ' xmlns:p="http://arelle.org/xpath-parser-test/p"'
+                   ' xmlns:v="http://arelle.org/xpath-parser-test/v"/>')
+    xmlElement = modelXbrl.modelDocument.xmlRootElement
+    pluginCustomFunctions = {}
+    initializeParser(cntlr.modelManager)
+    if testExpressionsFile:
+        import io
+        with io.open(testExpressionsFile, 'rt', encoding='utf-8') as f:
+            tests = [line.strip() for line in f if line.strip()]
+    else:
+        tests = [
+                 "3*7+5", "5+3*7", "(5+3)*7", "concat('abc','def')", "'abc'",
+                 "if (sum(1,2,3) gt 123) then 33 else 44", "sum(1,2,3,min(4,5,6))",
                  "for $a in $b, $c in $d, $e in $f return 'foo'",
                  "for $a in $b, $c in $d return (3 + 4)",
                  "some $a in $b, $c in $d satisfies (3 * $a + 4 * $b)",
@@ -1009,22 +1746,22 @@ def parser_unit_test():
                  "(( 1 + 2) * ( -3 + 1)) + 1",
                  "$a+$b+$c",
                  "(1,2,3)", "((1+2*3),(4))", "for $a in ($b,4,5) return ('foo','bar')",
-                 "$a/b/c", 
-                 "-$a", 
+                 "$a/b/c",
+                 "-$a",
                  "$a[2]", "$a[id=$b]", "/a/b/c [ @id='abc' ]",
-                 "foo/bar", 
+                 "foo/bar",
                  "/",
-                 "//foo/bar", 
-                 "/foo/bar", 
-                 "/foo/bar[@id=3]", 
-                 "/foo[@x='y']/bar[@id=3]", 
-                 "//foo/bar", 
-                 "/foo/bar", 
-                 "/foo/bar[@id=3]", 
-                 "/foo[@x='y']/bar[@id=3]", 
+                 "//foo/bar",
+                 "/foo/bar",
+                 "/foo/bar[@id=3]",
+                 "/foo[@x='y']/bar[@id=3]",
+                 "//foo/bar",
+                 "/foo/bar",
+                 "/foo/bar[@id=3]",
+                 "/foo[@x='y']/bar[@id=3]",
                  "/foo[@x='y']",
-                 "/foo/bar[@id=3]", 
-                 "/foo[@x='y']/bar[@id=3]", 
+                 "/foo/bar[@id=3]",
+                 "/foo[@x='y']/bar[@id=3]",
                  "123", "123.45", "123e6", "123.45e6", "'abc'",
                  "(1,2,3)",
                  "(1)",
@@ -1041,19 +1778,12 @@ def parser_unit_test():
                  "sum( $a, $b )",
                  "concat ('abc' , 'def', 'a''s')",
                  "for $a in $b, $c in $d, $e in $f return 'foo'",
-                  for $pd in $v:PDkids,
-                      $ev in $v:EVkids[
-                         xfi:fact-dimension-s-equal2(., $pd,
-                              QName('http://www.example.com/wgt-avg',
-                             'ExposuresDimension'))
-                          ]
-                      return $pd * $ev
                  "/a/b/c",
                  "//", "//a", "a//b",
                  "/", "/a", "a",
                  "/a/b/c", "/a//b/c", "a/b//c", "a//b/c",
                  "/a/b/c[@id='abc']",
-                 "$a[2]", "$a[id=$b]", 
+                 "$a[2]", "$a[id=$b]",
                  "/a/b/c",
                  "//", "//a", "a//b",
                  "/", "/a", "a",
@@ -1067,10 +1797,10 @@ def parser_unit_test():
                  "$a instance of element(foo, bar?)",
                  "$a instance of element(*, bar?)",
                  "/a/b/c[@id='abc']",
-                 "$a[2]", "$a[id=$b]", 
+                 "$a[2]", "$a[id=$b]",
                  "$a is /a/b/c",
                  "$a is //b[2]",
-                 "//b[2]", "/b[2] * 2 = $a", 
+                 "//b[2]", "/b[2] * 2 = $a",
                  "../a/b",
                  "/a/b/text( ) eq 'z'",
                  "/a/b/node()",
@@ -1084,67 +1814,53 @@ def parser_unit_test():
                  "node-name(/a/b/c)",
                  "()", "(1)",
                  "empty( () )",
-    '''
-    #tests = [locals()[t] for t in locals().keys() if t.startswith("test")]
-    tests = [test1, test1a, test1b, test2a, test2b, test3, test3a]
-    
-    log = []
-    for test in (
-                 "concat('abc','def')",
-                 "a/b",
-                 "123",
-                 "0.005",
-                 ".005",
-                 "./*[local-name() eq 'a']",
-                 ".",
-                 "..",
-                 "a/*[1]",
-                 "a/*:z[1]",
-                 "a/z:*[1]",
+                 "for $pd in $v:PDkids, $ev in $v:EVkids[xfi:fact-dimension-s-equal2(., $pd, "
+                     "QName('http://www.example.com/wgt-avg', 'ExposuresDimension'))] return $pd * $ev",
+                 "a/b", "0.005", ".005", "./*[local-name() eq 'a']", ".", "..",
+                 "a/*[1]", "a/*:z[1]", "a/xbrli:*[1]",
                  "//*[@id eq 'context-for-xpath-rule']//xbrldi:explicitMember[2]",
-                 ):
-        # Start with a blank exprStack and a blank varStack
-        exprStack = []
-        xmlElement = None
-
-        # try parsing the input string
+                 "$a instance of empty-sequence()", "$a instance of item()*", "$a treat as xs:decimal+",
+                 "$a castable as xs:date?", "$a cast as xs:date", "$a instance of attribute(foo, xs:string)",
+                 "$a union $b | $c", "$a intersect $b except $c", "$a idiv 2 mod 3", "--1",
+                 "child::a/descendant::b/@c", "ancestor-or-self::*", "(1 to 10)[. mod 2 = 0]",
+                 "xfi:period($a) eq xfi:period($b) and xfi:decimals($a) ge -3",
+                 "INF * 2", "(NaN)", "a/NaN", "INFX", "for", "if/a", "for-each(1)", "$a eq some",
+                 "(/)", "/ = $a", "$a = /",
+                 ]
+    results = {}
+    for parser, parserName in ((grammarExprStack, "grammar"),
+                               (descentParserExprStack, "descent parser")):
+        results[parserName] = parserResults = []
+        startedAt = time.time()
+        for test in tests:
+            try:
+                parserResults.append(exprStackSignature(parser(normalizeExpr(test))))
+            except parseExceptions() + (XPathSyntaxError,):
+                parserResults.append("syntax error")
+            except Exception as err:
+                parserResults.append(repr(err))
+        duration = time.time() - startedAt
+        print("{0}: {1} expressions in {2:.3f} secs, {3:.0f} expressions/sec".format(
+              parserName, len(tests), duration, len(tests) / (duration or 1e-6)))
+    mismatches = 0
+    for test, grammarResult, descentResult in zip(tests, results["grammar"], results["descent parser"]):
+        if grammarResult != descentResult:
+            mismatches += 1
+            print("parsed differently: {0}\n   grammar: {1}\n   descent parser: {2}".format(test, grammarResult, descentResult))
+    print("{0} of {1} expressions parsed differently".format(mismatches, len(tests)))
+    fallbacks = 0
+    for test in tests:
         try:
-            L=xpathExpr.parseString( normalizeExpr( test ), parseAll=True )
-        except (ParseException, ParseSyntaxException) as err:
-            L=['Parse Failure',test,err]
-        
-        # show result of parsing the input string
-        if debug_flag: log.append("{0}->{1}".format(test, L))
-        if len(L)==0 or L[0] != 'Parse Failure':
-            if debug_flag: 
-                log.append("exprStack={0}".format(exprStack))
-                '''
-                code = []
-                compile(exprStack, code)
-                print ("code=", ''.join(code))
-                '''
-            # calculate result , store a copy in ans , display the result to user
-            '''
-            result=evaluateStack(exprStack)
-            variables['ans']=result
-            print (result)
-    
-            # Assign result to a variable if required
-            if debug_flag: print ("var=",varStack)
-            if len(varStack)==1:
-                variables[varStack.pop()]=result
-            if debug_flag: print ("variables=",variables)
-            '''
-        else:
-            log.append('Parse Failure')
-            log.append(L[2].line)
-            log.append(" "*(L[2].column-1) + "^")
-            log.append(L[2])
-
-    print ("see log in c:\\temp\\testLog.txt")
-    import io
-    with io.open("c:\\temp\\testLog.txt", 'wt', encoding='utf-8') as f:
-        f.write('\n'.join(str(l) for l in log))
+            XPathDescentParser(normalizeExpr(test)).parse()
+        except XPathGrammarFallback:
+            fallbacks += 1
+        except Exception:
+            pass
+    print("{0} of {1} expressions parsed by the grammar as fallback of the descent parser".format(fallbacks, len(tests)))
+    modelXbrl.close()
+    cntlr.close()
 
 if __name__ == "__main__":
-    parser_unit_test()
\ No newline at end of file
+    import builtins
+    builtins.__dict__['_'] = lambda message: message # gettext is set up by controllers
+    parser_unit_test(sys.argv[1] if len(sys.argv) > 1 else None)
\ No newline at end of file
@@ -69,6 +69,34 @@ def equalityHash(elt, equalMode=S_EQUAL, excludeIDs=NO_IDs_EXCLUDED):
     else:
         return hash(None)
 
+def equalityKey(elt, equalMode=S_EQUAL, excludeIDs=NO_IDs_EXCLUDED):
+    # hashable key of elt's qname, value, attributes and child element keys, equal keys are sEqual (given equalMode)
+    # returns None if any value is unhashable (such as a list type value)
+    if elt is None:
+        return ()
+    dts = elt.modelXbrl
+    if not hasattr(elt,"xValid"):
+        xmlValidate(dts, elt)
+    value = elt.sValue if equalMode == S_EQUAL else elt.xValue
+    if isinstance(value,float) and math.isnan(value):
+        value = (value,elt)    # ensure this NaN only compares to itself and no other NaN
+    childKeys = []
+    for child in childElements(elt):
+        childKey = equalityKey(child, equalMode, excludeIDs if excludeIDs != TOP_IDs_EXCLUDED else NO_IDs_EXCLUDED)
+        if childKey is None:
+            return None
+        childKeys.append(childKey)
+    key = (elt.elementQname,
+           value,
+           tuple(sorted(attributeDict(dts, elt, (), equalMode, excludeIDs, distinguishNaNs=True).items(),
+                        key=lambda item: item[0])),
+           tuple(childKeys))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
 def sEqual(dts1, elt1, elt2, equalMode=S_EQUAL, excludeIDs=NO_IDs_EXCLUDED, dts2=None, ns2ns1Tbl=None):
     if dts2 is None: dts2 = dts1
     if elt1.localName != elt2.localName:
@@ -268,10 +268,12 @@ def checkFootnoteHrefs(modelXbrl, footnoteLink):
 
 def dropContext(modelXbrl, cntx):
     del modelXbrl.contexts[cntx.id]
+    modelXbrl.clearMatchIndexes()
     dropObject(modelXbrl, cntx)
     
 def dropUnit(modelXbrl, unit):
     del modelXbrl.units[unit.id]
+    modelXbrl.clearMatchIndexes()
     dropObject(modelXbrl, unit)
     
 def dropFootnoteLink(modelXbrl, footnoteLink):
@@ -285,6 +287,7 @@ def dropFact(modelXbrl, fact, facts):
         dropFact(modelXbrl, fact.modelTupleFacts[0], fact.modelTupleFacts)
     modelXbrl.factsInInstance.discard(fact)
     facts.remove(fact)
+    modelXbrl.clearFactIndexes()
     modelXbrl.modelObjects[fact.objectIndex] = None # objects found by index, can't remove position from list
     fact.modelDocument.modelObjects.remove(fact)
     fact.clear()
@@ -25,6 +25,7 @@ from arelle import XbrlConst, ModelDocument, ModelXbrl, PackageManager, Validate
 from arelle.ModelObject import ModelObject
 from arelle.ModelValue import qname, dateTime, DATETIME, yearMonthDuration, dayTimeDuration
 from arelle.PrototypeInstanceObject import DimValuePrototype
+from arelle.PluginManager import pluginClassMethods
 from arelle.PythonUtil import attrdict
 from arelle.UrlUtil import isHttpUrl, isAbsolute as isAbsoluteUri, relativeUrlPattern
 from arelle.XbrlConst import (qnLinkLabel, standardLabelRoles, qnLinkReference, standardReferenceRoles,
@@ -1002,6 +1003,7 @@ def loadFromOIM(cntlr, error, warning, modelXbrl, oimFile, mappedUri):
         if isCSVorXL:
             currentAction = "loading CSV facts tables"
             _dir = os.path.dirname(oimFile)
+            csvTableRows = defaultdict(int) # data rows read per table, for throughput reporting
 
             def csvFacts():
                 for tableId, table in tables.items():
@@ -1258,6 +1260,7 @@ def loadFromOIM(cntlr, error, warning, modelXbrl, oimFile, mappedUri):
                                 paramColsUsed = set()
                                 if isXL and all(cell.value in (None, "") for cell in row): # skip empty excel rows
                                     continue
+                                csvTableRows[tableId] += 1
                                 rowPropGroups = {} # colName, propGroupObject for property groups in this row
                                 rowPropGroupsUsed = set() # colNames used by propertiesFrom of fact col producing a fact
                                 for propGrpName, propGrpObjects in propertyGroups.items():
@@ -1481,6 +1484,37 @@ def loadFromOIM(cntlr, error, warning, modelXbrl, oimFile, mappedUri):
         
         numFactCreationXbrlErrors = 0
         
+        # streaming of CSV/XL facts to Streaming.ValidateFacts plugins in batches, releasing processed facts
+        streamFacts = (isCSVorXL and getattr(cntlr, "oimStreaming", False) and
+                       any(True for pluginMethod in pluginClassMethods("Streaming.ValidateFacts")))
+        if streamFacts:
+            modelXbrl.isStreamingMode = True
+            streamedFactsBatch = [] # facts not yet delivered to plug-ins
+            heldFacts = [] # facts delivered to plug-ins whose release a plug-in has blocked
+            numStreamedFacts = 0
+            linkedFactIds = set() # facts referenced by links are retained for footnote creation
+            for links in footnotes:
+                for ftGroups in links.values():
+                    for ftSrcIdTgtIds in ftGroups.values():
+                        for ftSrcId, ftTgtIds in ftSrcIdTgtIds.items():
+                            linkedFactIds.add(ftSrcId)
+                            linkedFactIds.update(ftTgtIds)
+            for pluginMethod in pluginClassMethods("Streaming.Start"):
+                pluginMethod(modelXbrl)
+            def streamFactsBatch():
+                factsHaveBeenProcessed = True
+                # each fact is delivered once, a plug-in can block release of delivered facts (which remain 
+                # in the model) if required data not yet available, until it processes a later batch
+                for pluginMethod in pluginClassMethods("Streaming.ValidateFacts"):
+                    if not pluginMethod(modelXbrl, streamedFactsBatch):
+                        factsHaveBeenProcessed = False
+                heldFacts.extend(streamedFactsBatch)
+                del streamedFactsBatch[:]
+                if factsHaveBeenProcessed:
+                    releaseStreamedFacts(modelXbrl, [f for f in heldFacts if f.id not in linkedFactIds])
+                    del heldFacts[:]
+        factsStartedAt = time.time()
+        
         for id, fact in factItems:
             
             dimensions = fact.get("dimensions", EMPTY_DICT)
@@ -1849,8 +1883,29 @@ def loadFromOIM(cntlr, error, warning, modelXbrl, oimFile, mappedUri):
                     error("xbrle:invalidFactValue",
                           _("Fact %(factId)s value error noted above."),
                           modelObject=modelXbrl, factId=id)
+            if streamFacts:
+                streamedFactsBatch.append(f)
+                numStreamedFacts += 1
+                if len(streamedFactsBatch) >= OIM_STREAMING_BATCH_SIZE:
+                    streamFactsBatch()
+            
+        if streamFacts:
+            if streamedFactsBatch:
+                streamFactsBatch()
+            for pluginMethod in pluginClassMethods("Streaming.Finish"):
+                pluginMethod(modelXbrl)
             
         if isCSVorXL: # check report parameters used
+            factsTime = time.time() - factsStartedAt
+            numRows = sum(csvTableRows.values())
+            modelXbrl.profileStat(_("load OIM CSV facts"), factsTime)
+            if streamFacts or modelXbrl.modelManager.collectProfileStats:
+                modelXbrl.info("arelleOIMloader:throughput",
+                               _("Loaded %(rows)s table rows into %(facts)s facts in %(time).2f secs, %(rate)s rows/sec%(streamed)s"),
+                               modelObject=modelXbrl, rows=numRows, time=factsTime,
+                               facts=numStreamedFacts if streamFacts else len(modelXbrl.facts),
+                               rate=int(numRows / factsTime) if factsTime > 0 else numRows,
+                               streamed=", streamed to validation" if streamFacts else "")
             unmappedReportParams = reportParameters.keys() - reportParametersUsed
             if unmappedReportParams:
                 error("xbrlce:unmappedReportParameter", 
@@ -2087,6 +2142,23 @@ def loadFromOIM(cntlr, error, warning, modelXbrl, oimFile, mappedUri):
 
 lastFilePath = None
 lastFilePathIsOIM = False
+OIM_STREAMING_BATCH_SIZE = 1000
+
+def releaseStreamedFacts(modelXbrl, facts):
+    # release facts processed by Streaming.ValidateFacts plugins from the instance document and model
+    if facts:
+        releasedFacts = set(facts)
+        modelXbrl.facts[:] = [f for f in modelXbrl.facts if f not in releasedFacts]
+        modelXbrl.clearFactIndexes()
+        for fact in facts:
+            modelXbrl.factsInInstance.discard(fact)
+            modelXbrl.modelObjects[fact.objectIndex] = None # objects found by index, can't remove position from list
+            if fact.id:
+                fact.modelDocument.idObjects.pop(fact.id, None)
+            parent = fact.getparent()
+            if parent is not None:
+                parent.remove(fact)
+            fact.clear()
 
 def isOimLoadable(modelXbrl, mappedUri, normalizedUri, filepath, **kwargs):
     global lastFilePath, lastFilePathIsOIM
@@ -2292,6 +2364,19 @@ def excelLoaderOptionExtender(parser, *args, **kwargs):
                       action="store", 
                       dest="saveOIMinstance", 
                       help=_("Save a instance loaded from OIM into this file name."))
+    parser.add_option("--oimStreaming", 
+                      action="store_true", 
+                      dest="oimStreaming", 
+                      help=_("Stream facts loaded from xBRL-CSV tables in batches to streaming validation plug-ins "
+                             "(Streaming.ValidateFacts), releasing each batch after it is processed."))
+    
+def oimLoaderSetup(cntlr, options, *args, **kwargs):
+    # per run, the controller may run several jobs (such as the web server or daemon)
+    cntlr.oimStreaming = getattr(options, "oimStreaming", False) or False
+    if cntlr.oimStreaming and getattr(options, "saveOIMinstance", None):
+        cntlr.addToLog(_("--oimStreaming is ignored with --saveOIMinstance, which saves all facts of the instance"),
+                       messageCode="arelleOIMloader:streamingIgnored", level=logging.WARNING)
+        cntlr.oimStreaming = False
     
 __pluginInfo__ = {
     'name': 'Load From OIM',
@@ -2305,6 +2390,7 @@ __pluginInfo__ = {
     'ModelDocument.PullLoader': oimLoader,
     'CntlrWinMain.Xbrl.Loaded': guiXbrlLoaded,
     'CntlrCmdLine.Options': excelLoaderOptionExtender,
+    'CntlrCmdLine.Utility.Run': oimLoaderSetup,
     'CntlrCmdLine.Xbrl.Loaded': cmdLineXbrlLoaded,
     'Validate.XBRL.Finally': validateFinally
 }
@@ -6,7 +6,6 @@ Created on Dec 12, 2013
 '''
 from arelle.ModelDtsObject import ModelConcept
 from arelle.ModelInstanceObject import ModelFact
-from arelle.XmlUtil import xmlstring
 
 # key for use in dFact only when there's a dim that behaves as or is typed
 def metDimTypedKey(fact):
@@ -16,7 +15,7 @@ def metDimTypedKey(fact):
         key += '|' + '|'.join(sorted("{}({})".format(dim.dimensionQname,
                                                      dim.memberQname if dim.isExplicit
                                                      else "nil" if dim.typedMember.get("{http://www.w3.org/2001/XMLSchema-instance}nil") in ("true", "1")
-                                                     else xmlstring(dim.typedMember, stripXmlns=True))
+                                                     else dim.typedMemberXml)
                                     for dim in cntx.qnameDims.values()))
     return key
 
@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+
+'''
+saveColumnarFacts.py is a plug-in that saves the facts of an instance into a columnar
+(Apache Parquet or Arrow IPC) file with typed columns, for analytics tools which otherwise
+would re-parse fact list or xBRL-CSV output.
+
+One row per item fact: concept, entity, period, unit, decimals, numeric value, string value,
+language, nil, and a column for each dimension reported in the instance.  The numeric value
+is a decimal column, with precision and scale wide enough for every numeric fact of the
+instance, so values are exact; when no decimal type can hold them all (or a float fact is
+INF or NaN) it is a float64 column.  Rows are written in chunks (record batches) so memory
+use does not grow with the number of facts.
+
+Requires pyarrow.  The file type is chosen by the file name suffix: .parquet for Parquet,
+otherwise (.arrow, .feather) Arrow IPC file format.
+
+(c) Copyright 2026 Arelle contributors, licensed under the Apache License, Version 2.0 (see License.txt).
+'''
+import os, time, datetime
+from decimal import Decimal
+from math import isinf, isnan
+from arelle import ModelDocument
+from arelle.ValidateXbrlCalcs import inferredDecimals
+
+DEFAULT_CHUNK_SIZE = 65536
+
+def columnarDatetime(dt):
+    if dt is None:
+        return None
+    return datetime.datetime(dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second)
+
+def columnarNumericValue(value):
+    # exact decimal value (float facts by their shortest representation), None if invalid
+    if isinstance(value, Decimal):
+        return value if value.is_finite() else None
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return Decimal(value)
+    if isinstance(value, float):
+        if isinf(value) or isnan(value):
+            return None
+        return Decimal(repr(value))
+    return None # invalid value
+
+def numericValueType(pa, values):
+    # narrowest decimal type holding all values exactly, else float64
+    scale = intDigits = 0
+    for value in values:
+        if isinstance(value, float) and (isinf(value) or isnan(value)):
+            return pa.float64()
+        d = columnarNumericValue(value)
+        if d is not None:
+            sign, digits, exponent = d.as_tuple()
+            scale = max(scale, -exponent)
+            intDigits = max(intDigits, len(digits) + exponent)
+    precision = max(intDigits + scale, 1)
+    if precision <= 38:
+        return pa.decimal128(precision, scale)
+    if precision <= 76 and hasattr(pa, "decimal256"): # pyarrow 3.0 and later
+        return pa.decimal256(precision, scale)
+    return pa.float64()
+
+def saveColumnarFacts(modelXbrl, columnarFile, chunkSize=DEFAULT_CHUNK_SIZE):
+    try:
+        import pyarrow as pa
+    except ImportError:
+        modelXbrl.error("arelle:columnarFactsMissingLibrary",
+                        _("Missing library, please install pyarrow to save columnar facts"),
+                        modelObject=modelXbrl)
+        return
+    isParquet = columnarFile.endswith(".parquet")
+    if isParquet:
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            modelXbrl.error("arelle:columnarFactsMissingLibrary",
+                            _("Missing library, pyarrow installation does not support parquet"),
+                            modelObject=modelXbrl)
+            return
+    startedAt = time.time()
+
+    # dimension columns, from contexts of the instance (their facts are not yet visited)
+    dimQnames = sorted(set(dimQname
+                           for cntx in modelXbrl.contexts.values()
+                           for dimQname in cntx.qnameDims.keys()
+                           if dimQname is not None))
+    dimColumnNames = [str(dimQname) for dimQname in dimQnames]
+    numericType = numericValueType(pa, (fact.xValue
+                                        for fact in modelXbrl.factsInInstance
+                                        if fact.isItem and fact.concept is not None and fact.concept.isNumeric
+                                        and fact.context is not None and not fact.isNil))
+    isFloatNumericValue = pa.types.is_floating(numericType)
+    fields = [pa.field("concept", pa.string()),
+              pa.field("entityScheme", pa.string()),
+              pa.field("entity", pa.string()),
+              pa.field("periodStart", pa.timestamp("s")),
+              pa.field("periodEnd", pa.timestamp("s")), # instant or end, as xbrl end of day (midnight following date)
+              pa.field("unit", pa.string()),
+              pa.field("decimals", pa.float64()), # INF is infinity, absent or precision-only is null
+              pa.field("numericValue", numericType), # exact decimal, unless too wide for decimal types
+              pa.field("stringValue", pa.string()),
+              pa.field("language", pa.string()),
+              pa.field("isNil", pa.bool_())]
+    fields.extend(pa.field(name, pa.string()) for name in dimColumnNames)
+    schema = pa.schema(fields)
+    numColumns = len(fields)
+    dimColumnIndex = dict((dimQname, i + 11) for i, dimQname in enumerate(dimQnames))
+
+    # per-context and per-unit column values are computed once
+    cntxColumns = {}
+    unitColumns = {}
+    def contextColumns(cntx):
+        try:
+            return cntxColumns[cntx]
+        except KeyError:
+            scheme, identifier = cntx.entityIdentifier
+            if cntx.isStartEndPeriod:
+                start, end = columnarDatetime(cntx.startDatetime), columnarDatetime(cntx.endDatetime)
+            elif cntx.isInstantPeriod:
+                start, end = None, columnarDatetime(cntx.instantDatetime)
+            else: # forever
+                start = end = None
+            dims = []
+            for dimQname, dimValue in cntx.qnameDims.items():
+                if dimQname in dimColumnIndex:
+                    if dimValue.isExplicit:
+                        memValue = str(dimValue.memberQname)
+                    else:
+                        memValue = dimValue.stringValue
+                    dims.append((dimColumnIndex[dimQname], memValue))
+            cols = cntxColumns[cntx] = (scheme, identifier, start, end, dims)
+            return cols
+    def unitColumn(unit):
+        if unit is None:
+            return None
+        try:
+            return unitColumns[unit]
+        except KeyError:
+            value = unitColumns[unit] = unit.value
+            return value
+
+    writer = sink = None
+    try:
+        if isParquet:
+            writer = pq.ParquetWriter(columnarFile, schema)
+            def writeBatch(batch):
+                writer.write_table(pa.Table.from_batches([batch], schema=schema))
+        else:
+            sink = pa.OSFile(columnarFile, "wb")
+            writer = pa.ipc.new_file(sink, schema)
+            writeBatch = writer.write_batch
+
+        columns = [[] for i in range(numColumns)]
+        numRows = 0
+        numFacts = 0
+        def flush():
+            writeBatch(pa.RecordBatch.from_arrays([pa.array(columns[i], type=fields[i].type)
+                                                   for i in range(numColumns)],
+                                                  schema=schema))
+            for column in columns:
+                del column[:]
+
+        for fact in modelXbrl.factsInInstance:
+            if not fact.isItem or fact.context is None or fact.concept is None:
+                continue
+            scheme, identifier, start, end, dims = contextColumns(fact.context)
+            concept = fact.concept
+            numericValue = decimals = None
+            isNil = fact.isNil
+            if concept.isNumeric:
+                if not isNil:
+                    numericValue = fact.xValue
+                    if isFloatNumericValue:
+                        if not isinstance(numericValue, (Decimal, int, float)) or isinstance(numericValue, bool):
+                            numericValue = None # invalid value
+                        else:
+                            numericValue = float(numericValue)
+                    else:
+                        numericValue = columnarNumericValue(numericValue)
+                if fact.decimals is not None:
+                    decimals = inferredDecimals(fact)
+                    if isinf(decimals):
+                        decimals = float("inf")
+            columns[0].append(str(fact.qname))
+            columns[1].append(scheme)
+            columns[2].append(identifier)
+            columns[3].append(start)
+            columns[4].append(end)
+            columns[5].append(unitColumn(fact.unit))
+            columns[6].append(decimals)
+            columns[7].append(numericValue)
+            columns[8].append(None if isNil else fact.value)
+            columns[9].append(fact.xmlLang if not concept.isNumeric else None)
+            columns[10].append(isNil)
+            for i in range(11, numColumns):
+                columns[i].append(None)
+            for i, memValue in dims:
+                columns[i][-1] = memValue
+            numRows += 1
+            numFacts += 1
+            if numRows >= chunkSize:
+                flush()
+                numRows = 0
+        if numRows or numFacts == 0:
+            flush()
+        writer.close()
+        writer = None
+        if sink is not None:
+            sink.close()
+            sink = None
+    except (IOError, EnvironmentError) as err:
+        modelXbrl.error("arelle:columnarFactsSaveError",
+                        _("Unable to save columnar facts file %(file)s: %(error)s"),
+                        modelObject=modelXbrl, file=columnarFile, error=err)
+        return
+    except (pa.ArrowInvalid, pa.ArrowTypeError) as err:
+        modelXbrl.error("arelle:columnarFactsConversionError",
+                        _("Unable to convert facts to columns of columnar facts file %(file)s: %(error)s"),
+                        modelObject=modelXbrl, file=columnarFile, error=err)
+        return
+    finally:
+        # release the file when saving failed (the failure has been reported)
+        for openFile in (writer, sink):
+            if openFile is not None:
+                try:
+                    openFile.close()
+                except (IOError, EnvironmentError, pa.ArrowException):
+                    pass
+    modelXbrl.profileStat(_("save columnar facts"), time.time() - startedAt)
+    modelXbrl.info("arelle:columnarFacts",
+                   _("Saved %(count)s facts with %(dims)s dimension columns to %(file)s"),
+                   modelObject=modelXbrl, count=numFacts, dims=len(dimQnames),
+                   file=os.path.basename(columnarFile))
+
+def saveColumnarFactsMenuEntender(cntlr, menu, *args, **kwargs):
+    # Extend menu with an item for the save columnar facts plugin
+    menu.add_command(label="Save columnar facts",
+                     underline=0,
+                     command=lambda: saveColumnarFactsMenuCommand(cntlr) )
+
+def saveColumnarFactsMenuCommand(cntlr):
+    # save columnar facts menu item has been invoked
+    if (cntlr.modelManager is None or cntlr.modelManager.modelXbrl is None or cntlr.modelManager.modelXbrl.modelDocument is None or
+        cntlr.modelManager.modelXbrl.modelDocument.type not in (ModelDocument.Type.INSTANCE, ModelDocument.Type.INLINEXBRL,
+                                                                ModelDocument.Type.INLINEXBRLDOCUMENTSET)):
+        return
+    columnarFile = cntlr.uiFileDialog("save",
+            title=_("arelle - Save columnar facts file"),
+            initialdir=cntlr.config.setdefault("columnarFactsFileDir","."),
+            filetypes=[(_("Parquet file .parquet"), "*.parquet"), (_("Arrow file .arrow"), "*.arrow")],
+            defaultextension=".parquet")
+    if not columnarFile:
+        return False
+    cntlr.config["columnarFactsFileDir"] = os.path.dirname(columnarFile)
+    cntlr.saveConfig()
+
+    import threading
+    thread = threading.Thread(target=lambda
+                                  _modelXbrl=cntlr.modelManager.modelXbrl,
+                                  _columnarFile=columnarFile:
+                                        saveColumnarFacts(_modelXbrl, _columnarFile))
+    thread.daemon = True
+    thread.start()
+
+def saveColumnarFactsCommandLineOptionExtender(parser, *args, **kwargs):
+    # extend command line options with a save columnar facts option
+    parser.add_option("--saveColumnarFacts",
+                      action="store",
+                      dest="saveColumnarFacts",
+                      help=_("Save instance facts in a columnar file, Parquet if the file name ends in .parquet, "
+                             "otherwise Arrow IPC (requires pyarrow)"))
+    parser.add_option("--columnarChunkSize",
+                      action="store",
+                      type="int",
+                      dest="columnarChunkSize",
+                      help=_("Number of facts written per columnar record batch (default {})").format(DEFAULT_CHUNK_SIZE))
+
+def saveColumnarFactsCommandLineXbrlRun(cntlr, options, modelXbrl, *args, **kwargs):
+    # extend XBRL-loaded run processing for this option
+    columnarFile = getattr(options, "saveColumnarFacts", None)
+    if columnarFile:
+        if (modelXbrl is None or
+            modelXbrl.modelDocument.type not in (ModelDocument.Type.INSTANCE, ModelDocument.Type.INLINEXBRL,
+                                                 ModelDocument.Type.INLINEXBRLDOCUMENTSET)):
+            cntlr.addToLog("No XBRL instance has been loaded.")
+            return
+        saveColumnarFacts(modelXbrl, columnarFile, getattr(options, "columnarChunkSize", None) or DEFAULT_CHUNK_SIZE)
+
+__pluginInfo__ = {
+    'name': 'Save Columnar Facts',
+    'version': '1.0',
+    'description': "This plug-in saves instance facts in a columnar (Parquet or Arrow) file with typed columns.",
+    'license': 'Apache-2',
+    'author': 'Arelle contributors',
+    'copyright': '(c) Copyright 2026 Arelle contributors',
+    # classes of mount points (required)
+    'CntlrWinMain.Menu.Tools': saveColumnarFactsMenuEntender,
+    'CntlrCmdLine.Options': saveColumnarFactsCommandLineOptionExtender,
+    'CntlrCmdLine.Xbrl.Run': saveColumnarFactsCommandLineXbrlRun,
+}
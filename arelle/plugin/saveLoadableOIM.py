@@ -6,6 +6,7 @@ saveLoadableOIM.py is an example of a plug-in that will save a re-loadable JSON
 (c) Copyright 2015 Mark V Systems Limited, All rights reserved.
 '''
 import sys, os, io, time, regex as re, json, csv, zipfile
+from itertools import chain
 from decimal import Decimal
 from math import isinf, isnan
 from collections import defaultdict, OrderedDict
@@ -44,6 +45,13 @@ else:
     csvOpenMode = 'wb' # for 2.7
     csvOpenNewline = None
     
+def openOimOutput(filename, outputZip=None, encoding="utf-8", newline=None):
+    # output text file, or entry of outputZip written as it is streamed (not buffered in memory)
+    if outputZip:
+        return io.TextIOWrapper(outputZip.open(os.path.basename(filename), "w", force_zip64=True),
+                                encoding=encoding, newline=newline)
+    return io.open(filename, "w", encoding=encoding, newline=newline)
+
 def saveLoadableOIM(modelXbrl, oimFile, outputZip=None):
     
     isJSON = oimFile.endswith(".json")
@@ -353,38 +361,36 @@ def saveLoadableOIM(modelXbrl, oimFile, outputZip=None):
         
     
     if isJSON:
-        # save JSON
-        oimReport["facts"] = oimFacts = OrderedDict()
-        
-        def saveJsonFacts(facts, oimFacts, parentFact):
+        # save JSON, each fact is written as it is produced so the report is not built in memory
+        # (output is the same as json.dumps(oimReport, indent=1) with facts in oimReport["facts"])
+        def jsonFacts(facts):
             for fact in facts:
-                oimFact = factAspects(fact)
-                id = fact.id if fact.id else "f{}".format(fact.objectIndex)
-                oimFacts[id] = oimFact
+                yield (fact.id if fact.id else "f{}".format(fact.objectIndex)), factAspects(fact)
                 if fact.modelTupleFacts:
-                    saveJsonFacts(fact.modelTupleFacts, oimFacts, fact)
-                
-        saveJsonFacts(modelXbrl.facts, oimFacts, None)
+                    for jsonFact in jsonFacts(fact.modelTupleFacts):
+                        yield jsonFact
         
-        # add footnotes as pseudo facts
-        for ftObj in footnoteFacts:
-            ftId = ftObj.id if ftObj.id else "f{}".format(ftObj.objectIndex)
-            oimFacts[ftId] = oimFact = OrderedDict()
-            oimFact["value"] = ftObj.viewText()
-            oimFact["dimensions"] = OrderedDict((("concept", "xbrl:note"),
-                                              ("noteId", ftId)))
-            if ftObj.xmlLang:
-                oimFact["dimensions"]["language"] = ftObj.xmlLang.lower()
+        def jsonFootnoteFacts():
+            # add footnotes as pseudo facts (footnoteFacts is complete after all facts are produced)
+            for ftObj in footnoteFacts:
+                ftId = ftObj.id if ftObj.id else "f{}".format(ftObj.objectIndex)
+                oimFact = OrderedDict()
+                oimFact["value"] = ftObj.viewText()
+                oimFact["dimensions"] = OrderedDict((("concept", "xbrl:note"),
+                                                  ("noteId", ftId)))
+                if ftObj.xmlLang:
+                    oimFact["dimensions"]["language"] = ftObj.xmlLang.lower()
+                yield ftId, oimFact
             
-        if outputZip:
-            fh = io.StringIO()
-        else:
-            fh = open(oimFile, "w", encoding="utf-8")
-        fh.write(json.dumps(oimReport, indent=1))
-        if outputZip:
-            fh.seek(0)
-            outputZip.writestr(os.path.basename(oimFile),fh.read())
-        fh.close()
+        with openOimOutput(oimFile, outputZip) as fh:
+            fh.write("{\n")
+            for key, value in oimReport.items():
+                fh.write(" {}: {},\n".format(json.dumps(key), json.dumps(value, indent=1).replace("\n", "\n ")))
+            fh.write(' "facts": {')
+            i = -1
+            for i, (id, oimFact) in enumerate(chain(jsonFacts(modelXbrl.facts), jsonFootnoteFacts())):
+                fh.write("{}\n  {}: {}".format("," if i else "", json.dumps(id), json.dumps(oimFact, indent=1).replace("\n", "\n  ")))
+            fh.write("\n }\n}" if i >= 0 else "}\n}")
 
     elif isCSVorXL:
         # save CSV
@@ -476,7 +482,7 @@ def saveLoadableOIM(modelXbrl, oimFile, outputZip=None):
                 _filename = _baseURL + filesuffix
                 if csvTable is not None:
                     csvTable["url"] = os.path.basename(_filename) # located in same directory with metadata
-                _csvinfo["file"] = open(_filename, csvOpenMode, newline=csvOpenNewline, encoding='utf-8-sig')
+                _csvinfo["file"] = openOimOutput(_filename, outputZip, newline='', encoding='utf-8-sig')
                 _csvinfo["writer"] = csv.writer(_csvinfo["file"], dialect="excel")
             def _writerow(row, header=False):
                 _csvinfo["writer"].writerow(row)
@@ -560,8 +566,8 @@ def saveLoadableOIM(modelXbrl, oimFile, outputZip=None):
             
         # save metadata
         if isCSV:
-            with open(_baseURL + "-metadata.json", "w", encoding="utf-8") as fh:
-                fh.write(json.dumps(oimReport, ensure_ascii=False, indent=2, sort_keys=False))
+            with openOimOutput(_baseURL + "-metadata.json", outputZip) as fh:
+                json.dump(oimReport, fh, ensure_ascii=False, indent=2, sort_keys=False)
         elif isXL:
             _open(None, "metadata")
             _writerow(["metadata"], header=True)
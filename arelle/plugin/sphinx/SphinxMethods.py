@@ -19,6 +19,7 @@ from arelle.ModelRelationshipSet import ModelRelationshipSet
 from arelle.ModelValue import QName, dayTimeDuration, DayTimeDuration
 from arelle.ModelXbrl import ModelXbrl
 from arelle.ValidateXbrlCalcs import inferredDecimals, inferredPrecision, roundValue
+from arelle.FunctionUtil import numericSum
 from arelle import XbrlConst, XmlUtil
 evaluate = None # initialized at end
 SphinxException = None
@@ -1030,7 +1031,7 @@ def _any(node, sphinxContext, args):
     return any(args)
 
 def _avg(node, sphinxContext, args):
-    return sum(args) / len(args)
+    return numericSum(args) / len(args)
 
 def _count(node, sphinxContext, args):
     return len(args)
@@ -1093,7 +1094,7 @@ def _set(node, sphinxContext, args):
     return set(args)
 
 def _sum(node, sphinxContext, args):
-    return sum(args)
+    return numericSum(args)
 
 def _var(node, sphinxContext, args):
     return _notImplemented(node, sphinxContext)
@@ -778,10 +778,12 @@ def checkFootnoteHrefs(modelXbrl, footnoteLink):
 
 def dropContext(modelXbrl, cntx):
     del modelXbrl.contexts[cntx.id]
+    modelXbrl.clearMatchIndexes()
     dropObject(modelXbrl, cntx)
     
 def dropUnit(modelXbrl, unit):
     del modelXbrl.units[unit.id]
+    modelXbrl.clearMatchIndexes()
     dropObject(modelXbrl, unit)
     
 def dropFootnoteLink(modelXbrl, footnoteLink):
@@ -795,6 +797,7 @@ def dropFact(modelXbrl, fact, facts):
         dropFact(modelXbrl, fact.modelTupleFacts[0], fact.modelTupleFacts)
     modelXbrl.factsInInstance.discard(fact)
     facts.remove(fact)
+    modelXbrl.clearFactIndexes()
     modelXbrl.modelObjects[fact.objectIndex] = None # objects found by index, can't remove position from list
     if fact.id:
         fact.modelDocument.idObjects.pop(fact.id, None)
@@ -8,6 +8,7 @@ import os, sys, re
 from arelle import PluginManager
 from arelle import ModelDocument, XbrlConst, XmlUtil, UrlUtil, LeiUtil
 from arelle.HashUtil import md5hash, Md5Sum
+from arelle.DuplicateFacts import DuplicateFactIndex
 from arelle.ModelDtsObject import ModelConcept, ModelType, ModelLocator, ModelResource
 from arelle.ModelFormulaObject import Aspect
 from arelle.ModelObject import ModelObject
@@ -270,7 +271,6 @@ def validateFacts(val, factsToCheck):
                         modelObject=fIndicator, filingIndicator=_value,
                         messageCodes=("EIOPA.1.6.a", "EIOPA.1.6.b"))
                 
-    otherFacts = {} # (contextHash, unitHash, xmlLangHash) : fact
     nilFacts = []
     stringFactsWithXmlLang = []
     nonMonetaryNonPureFacts = []
@@ -297,29 +297,6 @@ def validateFacts(val, factsToCheck):
                     isEnum = concept.typeQname in qnEnumerationItemTypes
                 else:
                     isNumeric = isString = isEnum = False # error situation
-            k = (f.getparent().objectIndex,
-                 f.qname,
-                 f.context.contextDimAwareHash if f.context is not None else None,
-                 f.unit.hash if f.unit is not None else None,
-                 hash(f.xmlLang))
-            if k not in otherFacts:
-                otherFacts[k] = {f}
-            else:
-                matches = [o
-                           for o in otherFacts[k]
-                           if (f.getparent().objectIndex == o.getparent().objectIndex and
-                               f.qname == o.qname and
-                               f.context.isEqualTo(o.context) if f.context is not None and o.context is not None else True) and
-                               # (f.unit.isEqualTo(o.unit) if f.unit is not None and o.unit is not None else True) and
-                              (f.xmlLang == o.xmlLang)]
-                if matches:
-                    contexts = [f.contextID] + [o.contextID for o in matches]
-                    modelXbrl.error(("EBA.2.16", "EIOPA.S.2.16" if val.isEIOPAfullVersion else "EIOPA.S.2.16.a"),
-                                    _('Facts are duplicates %(fact)s contexts %(contexts)s.'),
-                                    modelObject=[f] + matches, fact=f.qname, contexts=', '.join(contexts),
-                                    messageCodes=("EBA.2.16", "EIOPA.S.2.16", "EIOPA.S.2.16.a"))
-                else:
-                    otherFacts[k].add(f)
             if isNumeric:
                 if f.precision:
                     modelXbrl.error(("EBA.2.17", "EIOPA.2.18.a"),
@@ -452,6 +429,20 @@ def validateFacts(val, factsToCheck):
                     _("Fact %(fact)s of context %(contextID)s has footnotes.'"),
                     modelObject=f, fact=f.qname, contextID=f.contextID)
                 
+    if factsToCheck is modelXbrl.facts:
+        duplicateFactIndex = modelXbrl.duplicateFactIndex
+    else: # streaming batch
+        duplicateFactIndex = DuplicateFactIndex(modelXbrl, factsToCheck)
+    for dupSet in duplicateFactIndex:
+        if dupSet.facts[0].qname == qnFilingIndicator:
+            continue # filing indicators of the fIndicators tuple
+        for fList in dupSet.languageSets.values(): # duplicates are of the same xml:lang
+            if len(fList) > 1:
+                modelXbrl.error(("EBA.2.16", "EIOPA.S.2.16" if val.isEIOPAfullVersion else "EIOPA.S.2.16.a"),
+                                _('Facts are duplicates %(fact)s contexts %(contexts)s.'),
+                                modelObject=fList.facts, fact=fList.facts[0].qname, contexts=', '.join(f.contextID for f in fList),
+                                messageCodes=("EBA.2.16", "EIOPA.S.2.16", "EIOPA.S.2.16.a"))
+
     if nilFacts:
         modelXbrl.error(("EBA.2.19", "EIOPA.S.2.19"),
                 _('Nil facts MUST NOT be present in the instance: %(nilFacts)s.'),
@@ -23,7 +23,6 @@ from arelle.PluginManager import pluginClassMethods
 from arelle.PrototypeDtsObject import LinkPrototype, LocPrototype, ArcPrototype
 from arelle.PythonUtil import pyNamedObject, strTruncate
 from arelle.UrlUtil import isHttpUrl
-from arelle.ValidateXbrlCalcs import inferredDecimals, rangeValue
 from arelle.XmlValidate import VALID
 from .DTS import checkFilingDTS
 from .Consts import submissionTypesAllowingWellKnownSeasonedIssuer, \
@@ -771,9 +770,8 @@ def validateFiling(val, modelXbrl, isEFM=False, isGFM=False):
         #    factLangStartsWith = disclosureSystem.defaultXmlLang
         requiredFactLang = disclosureSystem.defaultXmlLang
 
-        #6.5.12 equivalent facts
+        #6.5.14 fact languages, 6.5.37 insignificant digits
         factsForLang = {}
-        factForConceptContextUnitHash = defaultdict(list)
         keysNotDefaultLang = {}
         for f1 in modelXbrl.facts:
             if f1.context is not None and f1.concept is not None and f1.concept.type is not None:
@@ -802,40 +800,27 @@ def validateFiling(val, modelXbrl, isEFM=False, isGFM=False):
                                   "Please correct the fact value and resubmit."),
                                 edgarCode="du-0537-Nonzero-Digits-Truncated",
                                 modelObject=f1, fact=f1.qname, contextID=f1.contextID, decimals=f1.decimals, value=f1.value)
-                # 6.5.12 test
-                factForConceptContextUnitHash[f1.conceptContextUnitHash].append(f1)
         # 6.5.12 test
-        aspectEqualFacts = defaultdict(list)
-        for hashEquivalentFacts in factForConceptContextUnitHash.values():
-            if len(hashEquivalentFacts) > 1:
-                for f in hashEquivalentFacts:
-                    aspectEqualFacts[(f.qname,f.contextID,f.unitID,
-                                      f.xmlLang if f.concept.type.isWgnStringFactType else None)].append(f)
-                for fList in aspectEqualFacts.values():
-                    f0 = fList[0]
-                    if f0.concept.isNumeric:
-                        if any(f.isNil for f in fList):
-                            _inConsistent = not all(f.isNil for f in fList)
-                        elif all(inferredDecimals(f) == inferredDecimals(f0) for f in fList[1:]): # same decimals
-                            v0 = rangeValue(f0.value)
-                            _inConsistent = not all(rangeValue(f.value) == v0 for f in fList[1:])
-                        else: # not all have same decimals
-                            aMax, bMin = rangeValue(f0.value, inferredDecimals(f0))
-                            for f in fList[1:]:
-                                a, b = rangeValue(f.value, inferredDecimals(f))
-                                if a > aMax: aMax = a
-                                if b < bMin: bMin = b
-                            _inConsistent = (bMin < aMax)
-                    else:
-                        _inConsistent = any(not f.isVEqualTo(f0) for f in fList[1:])
-                    if _inConsistent:
-                        modelXbrl.error(("EFM.6.05.12", "GFM.1.02.11"),
-                            "The instance document contained an element, %(fact)s that was used more than once in contexts equivalent to %(contextID)s: values %(values)s.  "
-                            "Please ensure there are no duplicate combinations of concept and context in the instance.",
-                            edgarCode="du-0512-Duplicate-Facts",
-                            modelObject=fList, fact=f0.qname, contextID=f0.contextID, values=", ".join(strTruncate(f.value, 128) for f in fList))
-                aspectEqualFacts.clear()
-        del factForConceptContextUnitHash, aspectEqualFacts
+        for dupSet in modelXbrl.duplicateFactIndex:
+            concept = dupSet.facts[0].concept
+            if concept is None or concept.type is None:
+                continue
+            # WGN string facts are duplicates of facts of the same language
+            for fSet in (dupSet.languageSets.values() if concept.type.isWgnStringFactType else (dupSet,)):
+                fList = fSet.facts
+                if len(fList) < 2:
+                    continue
+                f0 = fList[0]
+                if concept.isNumeric: # duplicates of the same decimals must have the same values
+                    _inConsistent = fSet.isInconsistent or (fSet.hasSameDecimals and not fSet.isComplete)
+                else:
+                    _inConsistent = any(not f.isVEqualTo(f0) for f in fList[1:])
+                if _inConsistent:
+                    modelXbrl.error(("EFM.6.05.12", "GFM.1.02.11"),
+                        "The instance document contained an element, %(fact)s that was used more than once in contexts equivalent to %(contextID)s: values %(values)s.  "
+                        "Please ensure there are no duplicate combinations of concept and context in the instance.",
+                        edgarCode="du-0512-Duplicate-Facts",
+                        modelObject=fList, fact=f0.qname, contextID=f0.contextID, values=", ".join(strTruncate(f.value, 128) for f in fList))
         val.modelXbrl.profileActivity("... filer fact checks", minTimeToShow=1.0)
 
         #6.5.14 facts without english text
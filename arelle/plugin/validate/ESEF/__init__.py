@@ -38,7 +38,6 @@ from arelle.PythonUtil import strTruncate
 from arelle.UrlUtil import isHttpUrl, scheme
 from arelle.XmlValidate import VALID, lexicalPatterns
 
-from arelle.ValidateXbrlCalcs import inferredDecimals, rangeValue
 from arelle.XbrlConst import (ixbrl11, xhtml, link, parentChild, summationItem, standardLabel,
                               all as hc_all, notAll as hc_notAll, hypercubeDimension, dimensionDomain, domainMember,
                               qnLinkLoc, qnLinkFootnoteArc, qnLinkFootnote, qnIXbrl11Footnote, iso17442)
@@ -478,30 +477,13 @@ def validateXbrlFinally(val, *args, **kwargs):
                 _("Context period startDate, endDate and instant elements should be in whole days without a timezone: %(contextIds)s"),
                 modelObject=contextsWithPeriodTimeZone, contextIds=", ".join(c.id for c in contextsWithPeriodTimeZone))
         
-        # identify unique contexts and units
-        mapContext = {}
-        mapUnit = {}
-        uniqueContextHashes = {}
-        for context in modelXbrl.contexts.values():
-            h = context.contextDimAwareHash
-            if h in uniqueContextHashes:
-                if context.isEqualTo(uniqueContextHashes[h]):
-                    mapContext[context] = uniqueContextHashes[h]
-            else:
-                uniqueContextHashes[h] = context
-        del uniqueContextHashes
-        uniqueUnitHashes = {}
+        # equal contexts are mapped to the first of them by the duplicate fact index
+        mapContext = modelXbrl.duplicateFactIndex.mapContext
         utrValidator = ValidateUtr(modelXbrl)
         utrUnitIds = set(u.unitId
                          for unitItemType in utrValidator.utrItemTypeEntries.values()
                          for u in unitItemType.values())
         for unit in modelXbrl.units.values():
-            h = unit.hash
-            if h in uniqueUnitHashes:
-                if unit.isEqualTo(uniqueUnitHashes[h]):
-                    mapUnit[unit] = uniqueUnitHashes[h]
-            else:
-                uniqueUnitHashes[h] = unit
             # check if any custom measure is in UTR
             for measureTerm in unit.measures:
                 for measure in measureTerm:
@@ -511,11 +493,9 @@ def validateXbrlFinally(val, *args, **kwargs):
                             modelXbrl.warning("ESEF.RTS.III.1.G1-7-1.customUnitInUtr",
                                 _("Custom measure SHOULD NOT duplicate a UnitID of UTR: %(measure)s"),
                                 modelObject=unit, measure=measure)
-        del uniqueUnitHashes
         
         reportedMandatory = set()
         precisionFacts = set()
-        numFactsByConceptContextUnit = defaultdict(list)
         textFactsByConceptContext = defaultdict(list)
         footnotesRelationshipSet = modelXbrl.relationshipSet(XbrlConst.factFootnote, XbrlConst.defaultLinkRole)
         noLangFacts = []
@@ -532,7 +512,6 @@ def validateXbrlFinally(val, *args, **kwargs):
                 if f.precision is not None:
                     precisionFacts.add(f)
                 if f.isNumeric:
-                    numFactsByConceptContextUnit[(f.qname, mapContext.get(f.context,f.context), mapUnit.get(f.unit, f.unit))].append(f)
                     if f.concept is not None and not f.isNil and f.xValid >= VALID and f.xValue > 1 and f.concept.type is not None and (
                         f.concept.type.qname == PERCENT_TYPE or f.concept.type.isDerivedFrom(PERCENT_TYPE)):
                         modelXbrl.warning("ESEF.2.2.2.percentGreaterThan100",
@@ -574,25 +553,14 @@ def validateXbrlFinally(val, *args, **kwargs):
         
             
         # 2.2.4 test
-        for fList in numFactsByConceptContextUnit.values():
-            if len(fList) > 1:
-                f0 = fList[0]
-                if any(f.isNil for f in fList):
-                    _inConsistent = not all(f.isNil for f in fList)
-                elif all(inferredDecimals(f) == inferredDecimals(f0) for f in fList[1:]): # same decimals
-                    v0 = rangeValue(f0.value)
-                    _inConsistent = not all(rangeValue(f.value) == v0 for f in fList[1:])
-                else: # not all have same decimals
-                    aMax, bMin = rangeValue(f0.value, inferredDecimals(f0))
-                    for f in fList[1:]:
-                        a, b = rangeValue(f.value, inferredDecimals(f))
-                        if a > aMax: aMax = a
-                        if b < bMin: bMin = b
-                    _inConsistent = (bMin < aMax)
-                if _inConsistent:
-                    modelXbrl.error(("ESEF.2.2.4.inconsistentDuplicateNumericFactInInlineXbrlDocument"),
-                        "Inconsistent duplicate numeric facts MUST NOT appear in the content of an inline XBRL document. %(fact)s that was used more than once in contexts equivalent to %(contextID)s: values %(values)s.  ",
-                        modelObject=fList, fact=f0.qname, contextID=f0.contextID, values=", ".join(strTruncate(f.value, 128) for f in fList))
+        for dupSet in modelXbrl.duplicateFactIndex:
+            fList = dupSet.facts
+            f0 = fList[0]
+            # duplicates of the same decimals must have the same values
+            if f0.isNumeric and (dupSet.isInconsistent or (dupSet.hasSameDecimals and not dupSet.isComplete)):
+                modelXbrl.error(("ESEF.2.2.4.inconsistentDuplicateNumericFactInInlineXbrlDocument"),
+                    "Inconsistent duplicate numeric facts MUST NOT appear in the content of an inline XBRL document. %(fact)s that was used more than once in contexts equivalent to %(contextID)s: values %(values)s.  ",
+                    modelObject=fList, fact=f0.qname, contextID=f0.contextID, values=", ".join(strTruncate(f.value, 128) for f in fList))
 
         if precisionFacts:
             modelXbrl.warning("ESEF.2.2.1.precisionAttributeUsed",
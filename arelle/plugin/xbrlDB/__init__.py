@@ -167,7 +167,8 @@ def storeIntoDB(dbConnection, modelXbrl, rssItem=None, **kwargs):
     else:
         modelXbrl.modelManager.addToLog('Server at "{0}:{1}" is not recognized to be either a Postgres or a Rexter service.'.format(host, port))
         return
-    result = insertIntoDB(modelXbrl, host=host, port=port, user=user, password=password, database=db, timeout=timeout, product=product, rssItem=rssItem, **kwargs)
+    with modelXbrl.traceSpan("storeIntoDB", "database", host=host, database=db, product=product or dbType):
+        result = insertIntoDB(modelXbrl, host=host, port=port, user=user, password=password, database=db, timeout=timeout, product=product, rssItem=rssItem, **kwargs)
     if kwargs.get("logStoredMsg", result): # if false/None result and no logStoredMsg parameter then skip the message
         modelXbrl.modelManager.addToLog(format_string(modelXbrl.modelManager.locale, 
                               _("stored to database in %.2f secs"), 
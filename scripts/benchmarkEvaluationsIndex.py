@@ -0,0 +1,164 @@
+'''
+Regression test and benchmark of FormulaEvaluator's EvaluationsIndex, which decides whether
+a variable set evaluation is unnecessary (duplicates, or is a fallback evaluation subsumed by,
+a prior evaluation).
+
+The regression test compares the index with the prior implementation (scan of the prior
+evaluations matching by per-variable hash buckets) on randomized evaluation streams of a
+variable set with fallback variables and variables depending on them.  Evaluations present
+their variables in varying orders, as evaluations of differently ordered variable bindings do.
+
+The benchmark times a fallback-heavy stream of evaluations (default 100,000) with the index,
+and, up to --legacyLimit evaluations (default 5,000), with the prior implementation (whose time
+grows quadratically with the number of evaluations).
+
+The formula conformance suite (scripts/runFormulaTests.sh) remains the regression test of
+formula processing as a whole.
+
+Usage: python scripts/benchmarkEvaluationsIndex.py [--regression] [--benchmark]
+           [--evaluations n] [--legacyLimit n] [--seed n]
+
+(c) Copyright 2026 Arelle contributors, licensed under the Apache License, Version 2.0 (see License.txt).
+'''
+import sys, os, time, random, argparse
+from collections import defaultdict
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from arelle import Cntlr # imports the model modules in the order which resolves their circular imports
+from arelle.FormulaEvaluator import EvaluationsIndex
+
+class Variable:
+    def __init__(self, refs):
+        self.refs = refs
+
+    def variableRefs(self):
+        return self.refs
+
+class VariableBinding:
+    def __init__(self, var):
+        self.var = var
+        self.isFallback = False
+
+class LegacyEvaluations:
+    ''' The prior implementation of evaluationIsUnnecessary, with its per-variable hash index
+    '''
+    def __init__(self):
+        self.evaluations = []
+        self.evaluationHashDicts = {}
+
+    def add(self, evaluation):
+        for vQn, vBoundFact in evaluation.items():
+            if vQn not in self.evaluationHashDicts: self.evaluationHashDicts[vQn] = defaultdict(set)
+            self.evaluationHashDicts[vQn][hash(vBoundFact)].add(len(self.evaluations))
+        self.evaluations.append(evaluation)
+
+    def isUnnecessary(self, thisEval, varBindings):
+        otherEvals = self.evaluations
+        if otherEvals:
+            otherEvalHashDicts = self.evaluationHashDicts
+            if all(e is None for e in thisEval.values()):
+                return True
+            otherEvalSets = [otherEvalHashDicts[vQn][hash(vBoundFact)]
+                             for vQn, vBoundFact in thisEval.items()
+                             if vBoundFact is not None
+                             if vQn in otherEvalHashDicts
+                             if hash(vBoundFact) in otherEvalHashDicts[vQn]]
+            if otherEvalSets:
+                matchingEvals = [otherEvals[i] for i in set.intersection(*otherEvalSets)]
+            else:
+                matchingEvals = otherEvals
+            vQnDependentOnOtherVarFallenBackButBoundInOtherEval = set(
+                vQn
+                for vQn, vBoundFact in thisEval.items()
+                if vBoundFact is not None and vQn in varBindings and
+                   any(varBindings[varRefQn].isFallback and
+                       any(m[varRefQn] is not None for m in matchingEvals)
+                       for varRefQn in varBindings[vQn].var.variableRefs()
+                       if varRefQn in varBindings))
+            return any(all([vBoundFact == matchingEval[vQn]
+                            for vQn, vBoundFact in thisEval.items()
+                            if vBoundFact is not None
+                            and vQn not in vQnDependentOnOtherVarFallenBackButBoundInOtherEval])
+                       for matchingEval in matchingEvals)
+        return False
+
+def variableSet(numVars, rng):
+    # variables v0..vn, each later variable may reference earlier ones
+    vQns = ["v{}".format(i) for i in range(numVars)]
+    varBindings = {}
+    for i, vQn in enumerate(vQns):
+        refs = set(rng.sample(vQns[:i], min(i, rng.randint(0, 2))))
+        varBindings[vQn] = VariableBinding(Variable(refs))
+    return vQns, varBindings
+
+def evaluationStream(vQns, varBindings, count, factsPerVar, fallbackRate, rng):
+    # yields evaluations, setting isFallback of the variable bindings as an evaluation would
+    for _i in range(count):
+        evaluation = {}
+        for vQn in vQns:
+            fallback = rng.random() < fallbackRate
+            varBindings[vQn].isFallback = fallback
+            evaluation[vQn] = None if fallback else "f{}_{}".format(vQn, rng.randrange(factsPerVar))
+        items = list(evaluation.items())
+        rng.shuffle(items) # vary the order of the variables among evaluations
+        yield dict(items)
+
+def regression(seed, streams=300):
+    rng = random.Random(seed)
+    checked = unnecessary = 0
+    for stream in range(streams):
+        vQns, varBindings = variableSet(rng.randint(1, 6), rng)
+        index = EvaluationsIndex([])
+        legacy = LegacyEvaluations()
+        for evaluation in evaluationStream(vQns, varBindings, rng.randint(1, 200),
+                                           rng.randint(1, 4), rng.choice((0.0, 0.2, 0.5)), rng):
+            expected = legacy.isUnnecessary(evaluation, varBindings)
+            result = index.isUnnecessary(evaluation, varBindings)
+            if result != expected:
+                print("FAIL stream {} evaluation {}: {} expected {}".format(stream, evaluation, result, expected))
+                return False
+            checked += 1
+            if not result:
+                index.add(evaluation)
+                legacy.add(evaluation)
+            else:
+                unnecessary += 1
+    print("regression passed: {} evaluations ({} unnecessary) in {} streams".format(checked, unnecessary, streams))
+    return True
+
+def benchmark(implementation, count, seed):
+    rng = random.Random(seed)
+    vQns, varBindings = variableSet(3, rng)
+    evaluations = implementation()
+    startedAt = time.perf_counter()
+    unnecessary = 0
+    # fallback-heavy, mostly binding facts of no prior evaluation (which the prior implementation
+    # compared with every prior evaluation)
+    for evaluation in evaluationStream(vQns, varBindings, count, count * 10, 0.6, rng):
+        if evaluations.isUnnecessary(evaluation, varBindings):
+            unnecessary += 1
+        else:
+            evaluations.add(evaluation)
+    return time.perf_counter() - startedAt, unnecessary
+
+def main():
+    parser = argparse.ArgumentParser(description="EvaluationsIndex regression test and benchmark")
+    parser.add_argument("--regression", action="store_true", help="compare with the prior implementation")
+    parser.add_argument("--benchmark", action="store_true", help="time a stream of evaluations")
+    parser.add_argument("--evaluations", type=int, default=100000, help="evaluations to benchmark")
+    parser.add_argument("--legacyLimit", type=int, default=5000, help="evaluations to benchmark with the prior implementation")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    if not args.regression and not args.benchmark:
+        args.regression = args.benchmark = True
+    if args.regression and not regression(args.seed):
+        sys.exit(1)
+    if args.benchmark:
+        seconds, unnecessary = benchmark(lambda: EvaluationsIndex([]), args.evaluations, args.seed)
+        print("index: {} evaluations ({} unnecessary) {:.3f} sec".format(args.evaluations, unnecessary, seconds))
+        legacyCount = min(args.evaluations, args.legacyLimit)
+        if legacyCount > 0:
+            seconds, unnecessary = benchmark(LegacyEvaluations, legacyCount, args.seed)
+            print("prior implementation: {} evaluations ({} unnecessary) {:.3f} sec".format(legacyCount, unnecessary, seconds))
+
+if __name__ == "__main__":
+    main()
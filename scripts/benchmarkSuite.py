@@ -0,0 +1,670 @@
+'''
+Benchmark suite of the core processing pipeline, on reproducible synthetic taxonomies and
+instances generated (deterministically, from the scenario parameters) into a work directory.
+
+Each scenario runs in its own process, timing separately: load, XBRL 2.1 (and XDT) validation,
+dimension validation, calculation, formula, table rendering and OIM (and columnar) export, with
+peak memory (ru_maxrss) after each phase.  Results are written as json, including the git commit,
+so results of different commits may be compared:
+
+  python scripts/benchmarkSuite.py [--scenarios instance,inline,...] [--scale 0.1]
+                                   [--workdir dir] [--output results.json] [--webcache dir]
+  python scripts/benchmarkSuite.py --compare base.json new.json [--threshold 0.10]
+  python scripts/benchmarkSuite.py --list
+
+Scenario sizes are given at full scale (e.g. 100k formula output facts, 1M facts for the columnar
+vs xBRL-CSV export comparison, 510k transformed inline facts) and multiplied by --scale (default 0.1).
+
+A scenario whose load logs errors or loads no facts is recorded as failed, without timing its other
+phases, and the suite exits with status 1; failed scenarios are reported but not compared.
+
+No network access is used: the web cache works offline, on the minimal XBRL base schemas (instance,
+linkbase, xbrldt, xbrldi, generic link, formula and table schemas of www.xbrl.org, declaring only what
+the generated taxonomies use) bundled in scripts/benchmarkSchemas, laid out as a web cache directory.
+--webcache instead uses a web cache directory having the official schemas, e.g. from a prior online
+run of arelleCmdLine, whose larger DTS takes longer to load.
+pyarrow (columnar export) and regex (OIM export plug-in) are optional, when missing those
+phases are recorded as skipped.
+
+(c) Copyright 2026 Arelle contributors, licensed under the Apache License, Version 2.0 (see License.txt).
+'''
+import sys, os, time, json, subprocess, tempfile, resource, logging, platform, argparse
+from collections import OrderedDict, defaultdict
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# full scale scenario parameters:
+#   concepts: monetary items reported in every context, with a calculation of their Total
+#   contexts: contexts of the main hypercube, each a distinct combination of members of the explicit dimensions
+#   members: members of each explicit dimension
+#   listRows: rows of the typed dimension list (an amount and a count fact per row)
+#   assertions: value assertions (over the items, and one over the list rows if any)
+#   outputFormula: formula producing a Doubled fact for each Item0 fact
+#   table: table linkbase with concept (x) by first dimension member (y) breakdowns
+#   exports: OIM and columnar exports to time
+#   transforms: (inline) numbers displayed in thousands with ixt transformation formats
+SCENARIOS = OrderedDict((
+    ("instance", dict(format="instance", concepts=50, contexts=2000, dims=3, members=10, listRows=1000,
+                      assertions=50, outputFormula=False, table=True, exports=("oimJson",))),
+    ("inline", dict(format="inline", concepts=50, contexts=2000, dims=3, members=10, listRows=1000,
+                    assertions=50, outputFormula=False, table=False, exports=("oimJson",))),
+    ("inlineTransforms", dict(format="inline", concepts=50, contexts=10000, dims=3, members=10, listRows=0,
+                              assertions=0, outputFormula=False, table=False, exports=(), transforms=True)),
+    ("typedList", dict(format="instance", concepts=2, contexts=10, dims=1, members=10, listRows=50000,
+                       assertions=2, outputFormula=False, table=False, exports=())),
+    ("formulaOutput", dict(format="instance", concepts=1, contexts=100000, dims=2, members=100, listRows=0,
+                           assertions=0, outputFormula=True, table=False, exports=())),
+    ("columnarVsCsv", dict(format="instance", concepts=100, contexts=10000, dims=2, members=100, listRows=0,
+                           assertions=0, outputFormula=False, table=False, exports=("oimCsv", "columnar"))),
+    ))
+SCALED_PARAMETERS = ("contexts", "listRows")
+MICRO_BENCHMARKS = ("importTime", "xpathParse")
+XPATH_EXPRESSIONS = 20000 # distinct expressions parsed by the xpathParse micro benchmark, at full scale
+BUNDLED_WEB_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarkSchemas")
+
+NS = "http://example.com/bench"
+ROLE = NS + "/role/"
+NAMESPACES = ('xmlns:xs="http://www.w3.org/2001/XMLSchema" xmlns:xbrli="http://www.xbrl.org/2003/instance" '
+              'xmlns:link="http://www.xbrl.org/2003/linkbase" xmlns:xlink="http://www.w3.org/1999/xlink" '
+              'xmlns:xbrldt="http://xbrl.org/2005/xbrldt" xmlns:xbrldi="http://xbrl.org/2006/xbrldi" '
+              'xmlns:iso4217="http://www.xbrl.org/2003/iso4217" xmlns:bench="{}"'.format(NS))
+XBRLDT_ARCROLES = ("all", "hypercube-dimension", "dimension-domain", "domain-member", "dimension-default")
+
+def scaledParameters(scenario, scale):
+    params = dict(SCENARIOS[scenario])
+    for name in SCALED_PARAMETERS:
+        if params[name]:
+            params[name] = max(1, int(params[name] * scale))
+    return params
+
+# synthetic taxonomy and instance generation
+
+def conceptNames(p):
+    return ["Item{}".format(i) for i in range(p["concepts"])]
+
+def memberName(dim, member):
+    return "Dim{}Member{}".format(dim, member)
+
+def contextMembers(p, c):
+    # distinct member combination per context, and a distinct year when combinations are exhausted
+    members = []
+    for dim in range(p["dims"]):
+        members.append(c % p["members"])
+        c //= p["members"]
+    return members, 2000 + c
+
+def factValue(c, i):
+    return (c * 7 + i * 13) % 1000
+
+def generateSchema(p, linkbases):
+    elements = []
+    def element(name, type, substitutionGroup="xbrli:item", abstract=False, extra=""):
+        elements.append('<xs:element id="bench_{0}" name="{0}" type="{1}" substitutionGroup="{2}"{3}{4} '
+                        'xbrli:periodType="duration" nillable="true"/>'.format(
+                            name, type, substitutionGroup, ' abstract="true"' if abstract else "", extra))
+    for name in conceptNames(p) + ["Total", "Doubled", "ListAmount"]:
+        element(name, "xbrli:monetaryItemType")
+    element("ListCount", "xbrli:integerItemType")
+    for name in ("LineItems", "ListLineItems"):
+        element(name, "xbrli:stringItemType", abstract=True)
+    for name in ("Hypercube", "ListHypercube"):
+        element(name, "xbrli:stringItemType", "xbrldt:hypercubeItem", abstract=True)
+    for dim in range(p["dims"]):
+        element("Dim{}".format(dim), "xbrli:stringItemType", "xbrldt:dimensionItem", abstract=True)
+        element("Dim{}Domain".format(dim), "xbrli:stringItemType", abstract=True)
+        for member in range(p["members"]):
+            element(memberName(dim, member), "xbrli:stringItemType", abstract=True)
+    element("RowDim", "xbrli:stringItemType", "xbrldt:dimensionItem", abstract=True,
+            extra=' xbrldt:typedDomainRef="#bench_RowId"')
+    elements.append('<xs:element id="bench_RowId" name="RowId" type="xs:token"/>')
+    return ('<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<xs:schema {0} xmlns:generic="http://xbrl.org/2008/generic" targetNamespace="{1}" '
+            'elementFormDefault="qualified" attributeFormDefault="unqualified">\n'
+            '<xs:annotation><xs:appinfo>\n{2}\n{3}\n</xs:appinfo></xs:annotation>\n'
+            '<xs:import namespace="http://www.xbrl.org/2003/instance" schemaLocation="http://www.xbrl.org/2003/xbrl-instance-2003-12-31.xsd"/>\n'
+            '<xs:import namespace="http://xbrl.org/2005/xbrldt" schemaLocation="http://www.xbrl.org/2005/xbrldt-2005.xsd"/>\n'
+            '{4}\n</xs:schema>\n').format(
+                NAMESPACES, NS,
+                "\n".join('<link:roleType roleURI="{0}{1}" id="{1}"><link:definition>{1}</link:definition>{2}'
+                          '</link:roleType>'.format(ROLE, role, "".join("<link:usedOn>{}</link:usedOn>".format(usedOn) for usedOn in usedOns))
+                          for role, usedOns in (("main", ("link:definitionLink", "link:calculationLink")),
+                                                ("list", ("link:definitionLink",)),
+                                                ("table", ("generic:link",)))),
+                "\n".join('<link:linkbaseRef xlink:type="simple" xlink:href="{}" '
+                          'xlink:arcrole="http://www.w3.org/1999/xlink/properties/linkbase"/>'.format(linkbase)
+                          for linkbase in linkbases),
+                "\n".join(elements))
+
+def loc(name, label=None):
+    return '<link:loc xlink:type="locator" xlink:href="bench.xsd#bench_{0}" xlink:label="{1}"/>'.format(name, label or name)
+
+def linkbase(content, extraNamespaces="", schemaLocations=""):
+    return ('<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<link:linkbase {} {} xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+            'xsi:schemaLocation="http://www.xbrl.org/2003/linkbase http://www.xbrl.org/2003/xbrl-linkbase-2003-12-31.xsd{}">\n'
+            '{}\n</link:linkbase>\n').format(NAMESPACES, extraNamespaces, schemaLocations, content)
+
+def roleAndArcroleRefs(roles, arcroles):
+    return "\n".join(['<link:roleRef roleURI="{0}{1}" xlink:type="simple" xlink:href="bench.xsd#{1}"/>'.format(ROLE, role)
+                      for role in roles] +
+                     ['<link:arcroleRef arcroleURI="{}" xlink:type="simple" xlink:href="{}"/>'.format(arcrole, href)
+                      for arcrole, href in arcroles])
+
+def generateDefinitionLinkbase(p):
+    def arc(arcrole, fromName, toName, order, extra=""):
+        return ('<link:definitionArc xlink:type="arc" xlink:arcrole="http://xbrl.org/int/dim/arcrole/{}" '
+                'xlink:from="{}" xlink:to="{}" order="{}"{}/>'.format(arcrole, fromName, toName, order, extra))
+    closed = ' xbrldt:contextElement="segment" xbrldt:closed="true"'
+    main = [loc("LineItems"), loc("Hypercube"), arc("all", "LineItems", "Hypercube", 1, closed)]
+    for order, name in enumerate(conceptNames(p) + ["Total", "Doubled"]):
+        main += [loc(name), arc("domain-member", "LineItems", name, order + 1)]
+    for dim in range(p["dims"]):
+        dimName, domainName = "Dim{}".format(dim), "Dim{}Domain".format(dim)
+        # the default arc is to another locator of the domain, arcs between the same locators would be duplicates
+        main += [loc(dimName), loc(domainName), loc(domainName, domainName + "Default"),
+                 arc("hypercube-dimension", "Hypercube", dimName, dim + 1),
+                 arc("dimension-domain", dimName, domainName, 1),
+                 arc("dimension-default", dimName, domainName + "Default", 1)]
+        for member in range(p["members"]):
+            main += [loc(memberName(dim, member)), arc("domain-member", domainName, memberName(dim, member), member + 1)]
+    listLink = [loc(name) for name in ("ListLineItems", "ListHypercube", "RowDim", "ListAmount", "ListCount")]
+    listLink += [arc("all", "ListLineItems", "ListHypercube", 1, closed),
+                 arc("domain-member", "ListLineItems", "ListAmount", 1),
+                 arc("domain-member", "ListLineItems", "ListCount", 2),
+                 arc("hypercube-dimension", "ListHypercube", "RowDim", 1)]
+    return linkbase("\n".join(
+        [roleAndArcroleRefs(("main", "list"),
+                            (("http://xbrl.org/int/dim/arcrole/" + arcrole, "http://www.xbrl.org/2005/xbrldt-2005.xsd#" + arcrole)
+                             for arcrole in XBRLDT_ARCROLES))] +
+        ['<link:definitionLink xlink:type="extended" xlink:role="{}{}">\n{}\n</link:definitionLink>'.format(
+            ROLE, role, "\n".join(content)) for role, content in (("main", main), ("list", listLink))]))
+
+def generateCalculationLinkbase(p):
+    arcs = [loc("Total")]
+    for order, name in enumerate(conceptNames(p)):
+        arcs += [loc(name), '<link:calculationArc xlink:type="arc" xlink:arcrole="http://www.xbrl.org/2003/arcrole/summation-item" '
+                            'xlink:from="Total" xlink:to="{}" order="{}" weight="1"/>'.format(name, order + 1)]
+    return linkbase(roleAndArcroleRefs(("main",), ()) +
+                    '\n<link:calculationLink xlink:type="extended" xlink:role="{}main">\n{}\n</link:calculationLink>'.format(
+                        ROLE, "\n".join(arcs)))
+
+def generateLabelLinkbase(p):
+    names = conceptNames(p) + ["Total", "Doubled", "ListAmount", "ListCount"]
+    return linkbase('<link:labelLink xlink:type="extended" xlink:role="http://www.xbrl.org/2003/role/link">\n{}\n</link:labelLink>'.format(
+        "\n".join('{0}<link:label xlink:type="resource" xlink:label="label_{1}" xlink:role="http://www.xbrl.org/2003/role/label" '
+                  'xml:lang="en">{1} label</link:label><link:labelArc xlink:type="arc" '
+                  'xlink:arcrole="http://www.xbrl.org/2003/arcrole/concept-label" xlink:from="{1}" xlink:to="label_{1}"/>'.format(
+                      loc(name), name) for name in names)))
+
+FORMULA_NAMESPACES = ('xmlns:generic="http://xbrl.org/2008/generic" xmlns:variable="http://xbrl.org/2008/variable" '
+                      'xmlns:va="http://xbrl.org/2008/assertion/value" xmlns:formula="http://xbrl.org/2008/formula" '
+                      'xmlns:cf="http://xbrl.org/2008/filter/concept" xmlns:table="http://xbrl.org/2014/table"')
+FORMULA_SCHEMA_LOCATIONS = (" http://xbrl.org/2008/generic http://www.xbrl.org/2008/generic-link.xsd"
+                            " http://xbrl.org/2008/variable http://www.xbrl.org/2008/variable.xsd"
+                            " http://xbrl.org/2008/assertion/value http://www.xbrl.org/2008/value-assertion.xsd"
+                            " http://xbrl.org/2008/formula http://www.xbrl.org/2008/formula.xsd"
+                            " http://xbrl.org/2008/filter/concept http://www.xbrl.org/2008/concept-filter.xsd")
+VARIABLE_ARCROLES = (("http://xbrl.org/arcrole/2008/variable-set", "http://www.xbrl.org/2008/variable.xsd#variable-set"),
+                     ("http://xbrl.org/arcrole/2008/variable-filter", "http://www.xbrl.org/2008/variable.xsd#variable-filter"))
+
+def genericLink(resources, role="http://www.xbrl.org/2008/role/link"):
+    return '<generic:link xlink:type="extended" xlink:role="{}">\n{}\n</generic:link>'.format(role, "\n".join(resources))
+
+def factVariable(variableSetLabel, name, concept, label):
+    return ('<variable:factVariable xlink:type="resource" xlink:label="{0}" bindAsSequence="false"/>'
+            '<cf:conceptName xlink:type="resource" xlink:label="{0}_filter"><cf:concept><cf:qname>bench:{1}</cf:qname></cf:concept></cf:conceptName>'
+            '<variable:variableArc xlink:type="arc" xlink:arcrole="http://xbrl.org/arcrole/2008/variable-set" xlink:from="{2}" xlink:to="{0}" name="{3}"/>'
+            '<variable:variableFilterArc xlink:type="arc" xlink:arcrole="http://xbrl.org/arcrole/2008/variable-filter" xlink:from="{0}" '
+            'xlink:to="{0}_filter" complement="false" cover="true"/>'.format(label, concept, variableSetLabel, name))
+
+def generateFormulaLinkbase(p):
+    resources = []
+    names = conceptNames(p)
+    for a in range(p["assertions"]):
+        label = "assertion{}".format(a)
+        if p["listRows"] and a == p["assertions"] - 1: # list rows assertion, variables matched by typed dimension value
+            resources.append('<va:valueAssertion xlink:type="resource" xlink:label="{0}" id="{0}" test="$amount ge $count * 0" '
+                             'aspectModel="dimensional" implicitFiltering="true"/>'.format(label))
+            resources.append(factVariable(label, "amount", "ListAmount", label + "_amount"))
+            resources.append(factVariable(label, "count", "ListCount", label + "_count"))
+        else:
+            resources.append('<va:valueAssertion xlink:type="resource" xlink:label="{0}" id="{0}" test="$v ge 0" '
+                             'aspectModel="dimensional" implicitFiltering="true"/>'.format(label))
+            resources.append(factVariable(label, "v", names[a % len(names)], label + "_v"))
+    if p["outputFormula"]:
+        resources.append('<formula:formula xlink:type="resource" xlink:label="doubled" id="doubled" value="$v * 2" source="v" '
+                         'aspectModel="dimensional" implicitFiltering="true"><formula:decimals>0</formula:decimals>'
+                         '<formula:aspects><formula:concept><formula:qname>bench:Doubled</formula:qname></formula:concept>'
+                         '</formula:aspects></formula:formula>')
+        resources.append(factVariable("doubled", "v", names[0], "doubled_v"))
+    return linkbase('<link:roleRef roleURI="http://www.xbrl.org/2008/role/link" xlink:type="simple" '
+                    'xlink:href="http://www.xbrl.org/2008/generic-link.xsd#standard-link-role"/>\n' +
+                    roleAndArcroleRefs((), VARIABLE_ARCROLES) + "\n" + genericLink(resources),
+                    FORMULA_NAMESPACES, FORMULA_SCHEMA_LOCATIONS)
+
+def generateTableLinkbase(p):
+    resources = ['<table:table xlink:type="resource" xlink:label="table" id="benchTable" parentChildOrder="parent-first"/>']
+    def breakdown(axis, order, nodes):
+        resources.append('<table:breakdown xlink:type="resource" xlink:label="{0}" id="breakdown_{0}" parentChildOrder="parent-first"/>'
+                         '<table:tableBreakdownArc xlink:type="arc" xlink:arcrole="http://xbrl.org/arcrole/2014/table-breakdown" '
+                         'xlink:from="table" xlink:to="{0}" axis="{0}" order="{1}"/>'.format(axis, order))
+        for i, aspect in enumerate(nodes):
+            resources.append('<table:ruleNode xlink:type="resource" xlink:label="{0}{1}">{2}</table:ruleNode>'
+                             '<table:breakdownTreeArc xlink:type="arc" xlink:arcrole="http://xbrl.org/arcrole/2014/breakdown-tree" '
+                             'xlink:from="{0}" xlink:to="{0}{1}" order="{3}"/>'.format(axis, i, aspect, i + 1))
+    breakdown("x", 1, ['<formula:concept><formula:qname>bench:{}</formula:qname></formula:concept>'.format(name)
+                       for name in conceptNames(p) + ["Total"]])
+    if p["dims"]:
+        breakdown("y", 2, ['<formula:explicitDimension dimension="bench:Dim0"><formula:member><formula:qname>bench:{}'
+                           '</formula:qname></formula:member></formula:explicitDimension>'.format(memberName(0, member))
+                           for member in range(p["members"])])
+    # table in its own role, the role definition names the rendered table
+    return linkbase(roleAndArcroleRefs(("table",), (("http://xbrl.org/arcrole/2014/" + arcrole, "http://www.xbrl.org/2014/table.xsd#" + arcrole)
+                                                    for arcrole in ("table-breakdown", "breakdown-tree"))) + "\n" +
+                    genericLink(resources, ROLE + "table"),
+                    FORMULA_NAMESPACES,
+                    FORMULA_SCHEMA_LOCATIONS + " http://xbrl.org/2014/table http://www.xbrl.org/2014/table.xsd")
+
+def contextXml(id, year, segment):
+    return ('<xbrli:context id="{}"><xbrli:entity><xbrli:identifier scheme="http://example.com/entity">BENCH</xbrli:identifier>'
+            '{}</xbrli:entity><xbrli:period><xbrli:startDate>{}-01-01</xbrli:startDate><xbrli:endDate>{}-12-31</xbrli:endDate>'
+            '</xbrli:period></xbrli:context>\n').format(id, "<xbrli:segment>{}</xbrli:segment>".format(segment) if segment else "", year, year)
+
+def writeContextsAndUnits(fh, p):
+    for c in range(p["contexts"]):
+        members, year = contextMembers(p, c)
+        fh.write(contextXml("c{}".format(c), year,
+                            "".join('<xbrldi:explicitMember dimension="bench:Dim{}">bench:{}</xbrldi:explicitMember>'.format(
+                                dim, memberName(dim, member)) for dim, member in enumerate(members))))
+    for r in range(p["listRows"]):
+        fh.write(contextXml("r{}".format(r), 2000,
+                            '<xbrldi:typedMember dimension="bench:RowDim"><bench:RowId>row{}</bench:RowId></xbrldi:typedMember>'.format(r)))
+    fh.write('<xbrli:unit id="EUR"><xbrli:measure>iso4217:EUR</xbrli:measure></xbrli:unit>\n'
+             '<xbrli:unit id="pure"><xbrli:measure>xbrli:pure</xbrli:measure></xbrli:unit>\n')
+
+def facts(p):
+    # (concept, contextID, unitID, value) in document order
+    names = conceptNames(p)
+    for c in range(p["contexts"]):
+        for i, name in enumerate(names):
+            yield name, "c{}".format(c), "EUR", factValue(c, i)
+        yield "Total", "c{}".format(c), "EUR", sum(factValue(c, i) for i in range(len(names)))
+    for r in range(p["listRows"]):
+        yield "ListAmount", "r{}".format(r), "EUR", factValue(r, 0)
+        yield "ListCount", "r{}".format(r), "pure", r % 10
+
+def generateInstance(path, p):
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write('<?xml version="1.0" encoding="UTF-8"?>\n<xbrli:xbrl {}>\n'
+                 '<link:schemaRef xlink:type="simple" xlink:href="bench.xsd"/>\n'.format(NAMESPACES))
+        writeContextsAndUnits(fh, p)
+        for concept, contextID, unitID, value in facts(p):
+            fh.write('<bench:{0} contextRef="{1}" unitRef="{2}" decimals="0">{3}</bench:{0}>\n'.format(concept, contextID, unitID, value))
+        fh.write('</xbrli:xbrl>\n')
+
+IXT_NAMESPACE = "http://www.xbrl.org/inlineXBRL/transformation/2020-02-12"
+INLINE_FORMATS = (("num-dot-decimal", lambda value: "{:,}.00".format(value)),
+                  ("num-comma-decimal", lambda value: "{:,}".format(value).replace(",", ".") + ",00"))
+
+def generateInlineDocument(path, p):
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write('<?xml version="1.0" encoding="UTF-8"?>\n<html xmlns="http://www.w3.org/1999/xhtml" '
+                 'xmlns:ix="http://www.xbrl.org/2013/inlineXBRL" xmlns:ixt="{}" {}>\n<head><title>Benchmark</title></head>\n<body>\n'
+                 '<div style="display:none"><ix:header><ix:references><link:schemaRef xlink:type="simple" xlink:href="bench.xsd"/>'
+                 '</ix:references><ix:resources>\n'.format(IXT_NAMESPACE, NAMESPACES))
+        writeContextsAndUnits(fh, p)
+        fh.write('</ix:resources></ix:header></div>\n<table>\n')
+        for i, (concept, contextID, unitID, value) in enumerate(facts(p)):
+            if p.get("transforms"): # value in thousands, alternately as 1,234.00 and 1.234,00
+                ixFormat, display = INLINE_FORMATS[i % len(INLINE_FORMATS)]
+                fh.write('<tr><td>{0} {1}</td><td><ix:nonFraction name="bench:{0}" contextRef="{1}" unitRef="{2}" decimals="0" '
+                         'format="ixt:{3}" scale="3">{4}</ix:nonFraction></td></tr>\n'.format(concept, contextID, unitID, ixFormat, display(value)))
+            else:
+                fh.write('<tr><td>{0} {1}</td><td><ix:nonFraction name="bench:{0}" contextRef="{1}" unitRef="{2}" decimals="0">{3}'
+                         '</ix:nonFraction></td></tr>\n'.format(concept, contextID, unitID, value))
+        fh.write('</table>\n</body>\n</html>\n')
+
+def generateScenario(scenarioDir, p):
+    # returns the entry point file
+    os.makedirs(scenarioDir, exist_ok=True)
+    entryPoint = os.path.join(scenarioDir, "bench.xhtml" if p["format"] == "inline" else "bench.xbrl")
+    linkbases = OrderedDict((("bench-def.xml", generateDefinitionLinkbase),
+                             ("bench-cal.xml", generateCalculationLinkbase),
+                             ("bench-lab.xml", generateLabelLinkbase)))
+    if p["assertions"] or p["outputFormula"]:
+        linkbases["bench-formula.xml"] = generateFormulaLinkbase
+    if p["table"]:
+        linkbases["bench-table.xml"] = generateTableLinkbase
+    for fileName, generator in [("bench.xsd", lambda p: generateSchema(p, linkbases))] + list(linkbases.items()):
+        with open(os.path.join(scenarioDir, fileName), "w", encoding="utf-8") as fh:
+            fh.write(generator(p))
+    if p["format"] == "inline":
+        generateInlineDocument(entryPoint, p)
+    else:
+        generateInstance(entryPoint, p)
+    return entryPoint
+
+# measurement, in the scenario process
+
+def peakRssMB():
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1) # ru_maxrss is in KB on linux
+
+class LogCounter(logging.Handler):
+    def __init__(self):
+        super(LogCounter, self).__init__(logging.INFO)
+        self.errors = 0
+        self.errorCodes = defaultdict(int)
+    def emit(self, logRecord):
+        if logRecord.levelno >= logging.ERROR - 2: # includes ERROR-SEMANTIC and ASSERTION-NOT-SATISFIED
+            self.errors += 1
+            self.errorCodes[getattr(logRecord, "messageCode", "")] += 1
+
+def runPhases(scenario, entryPoint, p, webCacheDir):
+    import builtins
+    builtins._ = lambda message: message
+    from arelle import Cntlr
+    from arelle.ModelFormulaObject import FormulaOptions
+    scenarioDir = os.path.dirname(entryPoint)
+    cntlr = Cntlr.Cntlr(logFileName=os.path.join(scenarioDir, "bench.log"), logFileMode="w")
+    cntlr.webCache.cacheDir = webCacheDir
+    cntlr.webCache.workOffline = True
+    logCounter = LogCounter()
+    cntlr.logger.addHandler(logCounter)
+    modelManager = cntlr.modelManager
+    modelManager.formulaOptions = FormulaOptions()
+    modelManager.formulaOptions.formulaAction = "run"
+    phases = OrderedDict()
+    state = {}
+
+    def phase(name, function):
+        errorsBefore = logCounter.errors
+        startedAt = time.time()
+        result = {}
+        try:
+            skipReason = function()
+        except Exception as err:
+            skipReason = None
+            result["exception"] = "{}: {}".format(type(err).__name__, err)
+        result["seconds"] = round(time.time() - startedAt, 3)
+        result["peakRssMB"] = peakRssMB()
+        result["errors"] = logCounter.errors - errorsBefore
+        if skipReason:
+            result = {"skipped": skipReason}
+        phases[name] = result
+
+    def load():
+        modelXbrl = state["modelXbrl"] = modelManager.load(entryPoint)
+        if modelXbrl.modelDocument is None:
+            raise IOError("{} not loaded".format(entryPoint))
+    phase("load", load)
+    modelXbrl = state.get("modelXbrl")
+    if modelXbrl is None or modelXbrl.modelDocument is None:
+        return phases, logCounter, {}, "not loaded"
+    # timings of a partially loaded model (such as missing schemas of --webcache) are not comparable
+    if phases["load"]["errors"]:
+        return phases, logCounter, {"facts": len(modelXbrl.facts)}, "load logged {} errors".format(phases["load"]["errors"])
+    if not modelXbrl.facts:
+        return phases, logCounter, {"facts": 0}, "no facts loaded"
+
+    def xbrlValidation():
+        # XBRL 2.1 and XDT, formulas and calculations are separate phases
+        hasFormulae = modelXbrl.hasFormulae
+        modelXbrl.hasFormulae = False
+        modelManager.validateCalcLB = False
+        modelManager.validate()
+        modelXbrl.hasFormulae = hasFormulae
+    phase("xbrlValidation", xbrlValidation)
+
+    def dimensionValidation():
+        from arelle import ValidateXbrl, ValidateXbrlDimensions, XbrlConst
+        val = ValidateXbrl.ValidateXbrl(modelXbrl)
+        val.modelXbrl = modelXbrl
+        val.validateEnum = bool(XbrlConst.enums & set(modelXbrl.namespaceDocs.keys())) # as set by ValidateXbrl.validate
+        ValidateXbrlDimensions.loadDimensionDefaults(val)
+        val.checkContextsDimensions(modelXbrl.contexts.values())
+        val.checkFactsDimensions(modelXbrl.facts)
+    phase("dimensionValidation", dimensionValidation)
+
+    def calculation():
+        from arelle import ValidateXbrlCalcs
+        ValidateXbrlCalcs.validate(modelXbrl, inferDecimals=True, deDuplicate=False)
+    phase("calculation", calculation)
+
+    def formula():
+        if not modelXbrl.hasFormulae:
+            return "no formulae"
+        from arelle import ValidateXbrlDimensions, ValidateFormula
+        ValidateXbrlDimensions.loadDimensionDefaults(modelXbrl)
+        modelXbrl.parameters = modelManager.formulaOptions.typedParameters(modelXbrl.prefixedNamespaces)
+        ValidateFormula.validate(modelXbrl, compileOnly=False)
+    phase("formula", formula)
+
+    def tableRendering():
+        if not modelXbrl.modelRenderingTables:
+            return "no table linkbase"
+        from arelle import RenderingEvaluator, ViewFileRenderedGrid
+        RenderingEvaluator.init(modelXbrl)
+        ViewFileRenderedGrid.viewRenderedGrid(modelXbrl, os.path.join(scenarioDir, "bench-table.html"))
+    phase("tableRendering", tableRendering)
+
+    def oimExport(fileName):
+        def export():
+            try:
+                from arelle.plugin.saveLoadableOIM import saveLoadableOIM
+            except ImportError as err:
+                return "saveLoadableOIM plug-in not importable: {}".format(err)
+            saveLoadableOIM(modelXbrl, os.path.join(scenarioDir, fileName))
+        return export
+    def columnarExport():
+        try:
+            import pyarrow # noqa, saveColumnarFacts logs an error rather than raising when it is missing
+        except ImportError:
+            return "pyarrow not installed"
+        from arelle.plugin.saveColumnarFacts import saveColumnarFacts
+        saveColumnarFacts(modelXbrl, os.path.join(scenarioDir, "bench-facts.parquet"))
+    exporters = {"oimJson": oimExport("bench-oim.json"),
+                 "oimCsv": oimExport("bench-oim.csv"),
+                 "columnar": columnarExport}
+    for export in p["exports"]:
+        phase(export, exporters[export])
+
+    counts = {"facts": len(modelXbrl.facts),
+              "contexts": len(modelXbrl.contexts),
+              "variableSets": len(modelXbrl.modelVariableSets)}
+    if modelXbrl.formulaOutputInstance is not None:
+        counts["outputFacts"] = len(modelXbrl.formulaOutputInstance.facts)
+    return phases, logCounter, counts, None
+
+def runScenario(scenario, entryPoint, params, webCacheDir):
+    startedAt = time.time()
+    phases, logCounter, counts, failed = runPhases(scenario, entryPoint, params, webCacheDir)
+    result = {"scenario": scenario,
+              "parameters": params,
+              "counts": counts,
+              "phases": phases,
+              "seconds": round(time.time() - startedAt, 3),
+              "peakRssMB": peakRssMB(),
+              "errors": logCounter.errors,
+              "errorCodes": dict(sorted(logCounter.errorCodes.items(), key=lambda item: -item[1])[:10])}
+    if failed:
+        result["failed"] = failed
+    return result
+
+# micro benchmarks
+
+def importTime():
+    # python -X importtime of the command line controller, cumulative microseconds of its top level import
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", "import arelle.CntlrCmdLine"],
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True).stderr
+    cumulative = {}
+    for line in output.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _self, cumul, module = line[12:].split("|")
+            if cumul.strip().isdigit():
+                cumulative[module.strip()] = int(cumul)
+    return {"seconds": round(cumulative.get("arelle.CntlrCmdLine", 0) / 1e6, 3),
+            "arelleModules": sum(1 for module in cumulative if module.startswith("arelle")),
+            "modules": len(cumulative)}
+
+def xpathParse(scale):
+    # distinct expressions, so that interned parses are not reused
+    import builtins
+    builtins._ = lambda message: message
+    from arelle import Cntlr, ModelXbrl, ModelDocument, XPathParser
+    from arelle.ModelFormulaObject import FormulaOptions, Trace
+    cntlr = Cntlr.Cntlr(logFileName="logToBuffer")
+    cntlr.webCache.workOffline = True
+    cntlr.modelManager.formulaOptions = FormulaOptions()
+    modelXbrl = ModelXbrl.create(cntlr.modelManager, ModelDocument.Type.LINKBASE, "http://arelle.org/xpath-benchmark.xml",
+        initialXml='<link:linkbase xmlns:link="http://www.xbrl.org/2003/linkbase"'
+                   ' xmlns:xfi="http://www.xbrl.org/2008/function/instance"'
+                   ' xmlns:xs="http://www.w3.org/2001/XMLSchema"/>')
+    element = modelXbrl.modelDocument.xmlRootElement
+    XPathParser.initializeParser(cntlr.modelManager)
+    templates = ("$a{0} + {0} * $b div 3",
+                 "if (sum($v{0}) gt {0}) then xfi:period($v{0}) else ()",
+                 "for $x in $seq{0} return ($x * {0}, concat('a{0}', string($x)))",
+                 "some $f in $facts[. ge {0}] satisfies xfi:concept-name($f) eq xs:QName('xfi:x{0}')",
+                 "count($items{0}[@id = 'i{0}']/child::*) = {0} and not(empty($z))")
+    expressions = [templates[i % len(templates)].format(i) for i in range(max(len(templates), int(XPATH_EXPRESSIONS * scale)))]
+    startedAt = time.time()
+    for i, expression in enumerate(expressions):
+        XPathParser.parse(element, expression, element, "bench{}".format(i), Trace.VARIABLE)
+    seconds = time.time() - startedAt
+    return {"expressions": len(expressions),
+            "seconds": round(seconds, 3),
+            "expressionsPerSecond": round(len(expressions) / seconds, 1) if seconds else None,
+            "errors": sum(1 for entry in cntlr.logHandler.logRecordBuffer if entry.levelno >= logging.ERROR),
+            "peakRssMB": peakRssMB()}
+
+# driver
+
+def gitCommit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL,
+                                       cwd=os.path.dirname(os.path.abspath(__file__))).decode("ascii").strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def runInSubprocess(args):
+    completed = subprocess.run([sys.executable, os.path.abspath(__file__)] + args,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    if completed.returncode != 0:
+        return {"failed": "exit status {}".format(completed.returncode), "stderr": completed.stderr[-2000:]}
+    return json.loads(completed.stdout.splitlines()[-1])
+
+def runSuite(scenarios, scale, workdir, webCacheDir):
+    results = OrderedDict((("commit", gitCommit()),
+                           ("python", platform.python_version()),
+                           ("platform", platform.platform()),
+                           ("scale", scale),
+                           ("baseSchemas", "bundled" if webCacheDir == BUNDLED_WEB_CACHE else "webcache"),
+                           ("startedAt", time.strftime("%Y-%m-%dT%H:%M:%S")),
+                           ("scenarios", OrderedDict())))
+    for scenario in scenarios:
+        if scenario in MICRO_BENCHMARKS:
+            result = runInSubprocess(["--run-micro", scenario, str(scale)])
+        else:
+            params = scaledParameters(scenario, scale)
+            startedAt = time.time()
+            entryPoint = generateScenario(os.path.join(workdir, scenario), params)
+            generationSeconds = round(time.time() - startedAt, 3)
+            result = runInSubprocess(["--run-scenario", scenario, entryPoint, json.dumps(params), "--webcache", webCacheDir])
+            result["generationSeconds"] = generationSeconds
+        results["scenarios"][scenario] = result
+        print(json.dumps({scenario: result}), file=sys.stderr)
+    return results
+
+def measurements(results):
+    # flattened (scenario.phase, metric) -> value of time and memory metrics
+    flat = {}
+    for scenario, result in results.get("scenarios", {}).items():
+        if "failed" in result:
+            continue
+        for phase, phaseResult in result.get("phases", {"total": result}).items():
+            for metric in ("seconds", "peakRssMB"):
+                if isinstance(phaseResult.get(metric), (int, float)):
+                    flat[("{}.{}".format(scenario, phase), metric)] = phaseResult[metric]
+    return flat
+
+def compare(baseFile, newFile, threshold):
+    with open(baseFile, encoding="utf-8") as fh:
+        base = json.load(fh)
+    with open(newFile, encoding="utf-8") as fh:
+        new = json.load(fh)
+    for setting in ("scale", "baseSchemas"):
+        if base.get(setting) != new.get(setting):
+            print("warning: {} differs, {} vs {}".format(setting, base.get(setting), new.get(setting)))
+    baseMeasurements = measurements(base)
+    newMeasurements = measurements(new)
+    regressions = 0
+    print("{:<40} {:<10} {:>12} {:>12} {:>8}".format("scenario.phase", "metric", (base.get("commit") or "")[:12], (new.get("commit") or "")[:12], "change"))
+    for key in sorted(baseMeasurements.keys() & newMeasurements.keys()):
+        baseValue, newValue = baseMeasurements[key], newMeasurements[key]
+        change = (newValue - baseValue) / baseValue if baseValue else 0
+        flag = ""
+        if change > threshold and (key[1] != "seconds" or newValue - baseValue > 0.05): # ignore sub 50ms timing noise
+            flag = " regression"
+            regressions += 1
+        print("{:<40} {:<10} {:>12} {:>12} {:>+7.1%}{}".format(key[0], key[1], baseValue, newValue, change, flag))
+    for key in sorted(baseMeasurements.keys() ^ newMeasurements.keys()):
+        print("{:<40} {:<10} only in {}".format(key[0], key[1], "base" if key in baseMeasurements else "new"))
+    for name, results in (("base", base), ("new", new)):
+        for scenario, result in results.get("scenarios", {}).items():
+            if "failed" in result:
+                print("{:<40} failed in {}: {}".format(scenario, name, result["failed"]))
+                if name == "new":
+                    regressions += 1
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark suite of the core processing pipeline on generated taxonomies and instances")
+    parser.add_argument("--scenarios", default=",".join(list(SCENARIOS.keys()) + list(MICRO_BENCHMARKS)),
+                        help="comma separated scenarios and micro benchmarks to run (default all, see --list)")
+    parser.add_argument("--scale", type=float, default=0.1, help="multiplier of the full scale scenario sizes")
+    parser.add_argument("--workdir", default=os.path.join(tempfile.gettempdir(), "arelle-benchmark"),
+                        help="directory of the generated scenario files")
+    parser.add_argument("--output", help="results json file (default standard output)")
+    parser.add_argument("--webcache", default=BUNDLED_WEB_CACHE,
+                        help="web cache directory having the official XBRL base schemas (default the bundled minimal schemas)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="compare two results json files")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative increase reported as a regression by --compare")
+    parser.add_argument("--list", action="store_true", help="list the scenarios and micro benchmarks")
+    # a scenario or micro benchmark, in its own process
+    parser.add_argument("--run-scenario", nargs=3, metavar=("SCENARIO", "ENTRYPOINT", "PARAMETERS"), help=argparse.SUPPRESS)
+    parser.add_argument("--run-micro", nargs=2, metavar=("BENCHMARK", "SCALE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.run_scenario:
+        scenario, entryPoint, params = args.run_scenario
+        print(json.dumps(runScenario(scenario, entryPoint, json.loads(params), args.webcache)))
+        return
+    if args.run_micro:
+        print(json.dumps(importTime() if args.run_micro[0] == "importTime" else xpathParse(float(args.run_micro[1]))))
+        return
+    if args.list:
+        for scenario, params in SCENARIOS.items():
+            print(scenario, json.dumps(params))
+        for micro in MICRO_BENCHMARKS:
+            print(micro)
+        return
+    if args.compare:
+        regressions = compare(args.compare[0], args.compare[1], args.threshold)
+        sys.exit(1 if regressions else 0)
+    scenarios = args.scenarios.split(",")
+    unknown = [s for s in scenarios if s not in SCENARIOS and s not in MICRO_BENCHMARKS]
+    if unknown:
+        parser.error("unknown scenarios: {}".format(", ".join(unknown)))
+    if not os.path.isdir(args.webcache):
+        parser.error("--webcache {} is not a directory".format(args.webcache))
+    results = runSuite(scenarios, args.scale, args.workdir, os.path.abspath(args.webcache))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=1)
+    else:
+        print(json.dumps(results, indent=1))
+    failed = [scenario for scenario, result in results["scenarios"].items() if "failed" in result]
+    if failed:
+        sys.exit("failed scenarios: {}".format(", ".join(failed)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+'''
+Peak memory (RSS) and time of parsing a large xml document by FileSource's text file
+(file(stripDeclaration=True), decoded and declaration stripped) and by its binary xmlFile.
+
+Each read path is measured in its own process, on a generated instance-like document
+(with a non-ascii character per fact so that it is not pure ascii), plain or in a zip archive.
+
+Usage: python scripts/benchmarkXmlFileRead.py [megabytes (default 200)] [--zip]
+
+(c) Copyright 2026 Arelle contributors, licensed under the Apache License, Version 2.0 (see License.txt).
+'''
+import sys, os, time, json, subprocess, tempfile, zipfile, resource
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def generateDocument(path, megabytes):
+    fact = ('<ex:Fact{0} contextRef="c{1}" unitRef="EUR" decimals="0" id="f{2}">'
+            '{2}</ex:Fact{0}><ex:Text{0} contextRef="c{1}">Säule {2}</ex:Text{0}>\n')
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                 '<xbrli:xbrl xmlns:xbrli="http://www.xbrl.org/2003/instance" xmlns:ex="http://example.com/ex">\n')
+        i = 0
+        while fh.tell() < megabytes * 1000000:
+            fh.write(''.join(fact.format(n % 97, n % 1000, n) for n in range(i, i + 1000)))
+            i += 1000
+        fh.write('</xbrli:xbrl>\n')
+
+def measure(path, readPath):
+    import builtins
+    builtins._ = lambda message: message
+    from lxml import etree
+    from arelle import Cntlr, FileSource
+    cntlr = Cntlr.Cntlr(logFileName="logToBuffer")
+    cntlr.webCache.workOffline = True
+    fileSource = FileSource.openFileSource(path, cntlr)
+    if fileSource.isArchive:
+        fileSource.open()
+    rssBefore = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    startedAt = time.time()
+    if readPath == "text":
+        fh = fileSource.file(path, stripDeclaration=True)[0]
+    else:
+        fh = fileSource.xmlFile(path)[0]
+    tree = etree.parse(fh, base_url=path)
+    fh.close()
+    elapsed = time.time() - startedAt
+    peakRss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {"readPath": readPath,
+            "elements": sum(1 for _elt in tree.iter()),
+            "seconds": round(elapsed, 3),
+            "peakRssMB": round(peakRss / 1024, 1), # ru_maxrss is in KB on linux
+            "rssBeforeParseMB": round(rssBefore / 1024, 1)}
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == "--measure":
+        print(json.dumps(measure(sys.argv[2], sys.argv[3])))
+        return
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    megabytes = int(args[0]) if args else 200
+    with tempfile.TemporaryDirectory() as tempDir: # the generated document is removed when done
+        path = os.path.join(tempDir, "benchmark-instance.xml")
+        generateDocument(path, megabytes)
+        if "--zip" in sys.argv:
+            with zipfile.ZipFile(path + ".zip", "w", zipfile.ZIP_DEFLATED) as zf:
+                zf.write(path, "benchmark-instance.xml")
+            os.remove(path)
+            path = os.path.join(path + ".zip", "benchmark-instance.xml")
+        results = []
+        for readPath in ("text", "binary"):
+            output = subprocess.check_output([sys.executable, __file__, "--measure", path, readPath])
+            results.append(json.loads(output.decode("utf-8")))
+            print(json.dumps(results[-1]))
+    print(json.dumps({"documentMB": megabytes,
+                      "peakRssRatio": round(results[0]["peakRssMB"] / results[1]["peakRssMB"], 2)}))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+#!/bin/bash
+
+# Run XBRL Formula Conformance Suite tests (regression test of formula processing,
+# including evaluation duplicate detection, see also scripts/benchmarkEvaluationsIndex.py)
+
+LOGDIR=${LOGDIR:-~/temp}
+
+ARELLEDIR=$(dirname "$0")/..
+
+TESTCASESROOT=${TESTCASESROOT:-~/conformance-formula/trunk}
+TESTCASESINDEXFILE=${TESTCASESROOT}/index.xml
+
+OUTPUTLOGFILE=${LOGDIR}/Formula-test-log.txt
+OUTPUTERRFILE=${LOGDIR}/Formula-test-err.txt
+OUTPUTCSVFILE=${LOGDIR}/Formula-test-report.csv
+
+rm -f ${LOGDIR}/Formula-test-*
+
+python3 ${ARELLEDIR}/arelleCmdLine.py --file "$TESTCASESINDEXFILE" --validate --csvTestReport "$OUTPUTCSVFILE" --logFile "$OUTPUTLOGFILE" 2>  "$OUTPUTERRFILE"